@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - HTTP Servis İstemcisi.
+Bu modül, `inspareai serve` ile başlatılan servise bağlanan ince istemciyi içerir.
+CLI ve Streamlit, INSPAREAI_SERVER_URL ayarlandığında modelleri kendi süreçlerinde
+yüklemek yerine bu istemciyi kullanır. Yalnızca standart kütüphaneyi kullanır.
+"""
+
+import json
+from urllib.parse import quote
+from urllib.request import Request, urlopen
+from urllib.error import HTTPError, URLError
+
+
+class ServerError(Exception):
+    """Servis erişilemediğinde veya hata döndürdüğünde yükseltilir"""
+
+
+class InspareClient:
+    """InspareAI HTTP servisinin uç noktalarını saran istemci"""
+
+    def __init__(self, base_url, timeout=300):
+        """
+        Args:
+            base_url: Servis adresi (ör. http://127.0.0.1:8765)
+            timeout: İstek zaman aşımı (saniye)
+        """
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def _open(self, path, payload=None, accept="application/json"):
+        """İsteği gönderir ve açık yanıt nesnesini döndürür"""
+        data = None if payload is None else json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        headers = {"Accept": accept}
+        if data is not None:
+            headers["Content-Type"] = "application/json; charset=utf-8"
+        request = Request(self.base_url + path, data=data, headers=headers)
+        try:
+            return urlopen(request, timeout=self.timeout)
+        except HTTPError as e:
+            try:
+                message = json.loads(e.read().decode('utf-8')).get("error", str(e))
+            except Exception:
+                message = str(e)
+            raise ServerError(f"{e.code}: {message}") from None
+        except URLError as e:
+            raise ServerError(f"InspareAI servisine bağlanılamadı ({self.base_url}): {e.reason}") from None
+
+    def _json(self, path, payload=None):
+        with self._open(path, payload) as response:
+            return json.loads(response.read().decode('utf-8'))
+
+    def health(self):
+        """Servis durumunu döndürür"""
+        return self._json("/health")
+
+    def query(self, question, quick=False):
+        """Soruyu yanıtlar ve tam yanıtı döndürür"""
+        return self._json("/quick" if quick else "/query", {"question": question})["answer"]
+
+    def stream(self, question, quick=False, progress_callback=None):
+        """
+        Yanıtı Server-Sent Events üzerinden parça parça verir.
+        Servisin gönderdiği aşama olayları ("progress") progress_callback'e iletilir.
+
+        Yields:
+            str: Yanıt parçaları
+        """
+        path = "/quick" if quick else "/query"
+        with self._open(path, {"question": question, "stream": True}, accept="text/event-stream") as response:
+            event, data = None, []
+            for raw_line in response:
+                line = raw_line.decode('utf-8').rstrip('\r\n')
+                if line.startswith("event:"):
+                    event = line[6:].strip()
+                elif line.startswith("data:"):
+                    data.append(line[5:].strip())
+                elif not line and data:
+                    payload = json.loads("\n".join(data))
+                    if event == "done":
+                        return
+                    if event == "error":
+                        raise ServerError(payload.get("error", "Bilinmeyen akış hatası"))
+                    if event != "progress":
+                        yield payload.get("text", "")
+                    elif progress_callback is not None:
+                        progress_callback(payload)
+                    event, data = None, []
+
+    def list_transcripts(self):
+        """Transkript dosyalarının listesini döndürür"""
+        return self._json("/transcripts")["transcripts"]
+
+    def get_transcript(self, name):
+        """Transkript dosyasının içeriğini döndürür"""
+        return self._json("/transcripts/" + quote(name))["content"]
@@ -0,0 +1,265 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - HTTP Sorgu Servisi.
+Bu modül, `inspareai serve` komutuyla başlatılan uzun ömürlü HTTP servisini içerir.
+Vektör veritabanı, embedding modeli ve LLM modelleri süreç başına bir kez yüklenir
+ve tüm istemciler tarafından paylaşılır. Yanıtlar Server-Sent Events (SSE) ile
+parça parça gönderilebilir. Sunucu yalnızca asyncio kullanır; ek bağımlılık gerektirmez.
+
+Uç noktalar:
+    GET  /health                 Servis durumu ve LLM zamanlayıcı metrikleri
+    POST /query                  {"question": "...", "stream": false} - normal sorgu
+    POST /quick                  {"question": "...", "stream": false} - hızlı yanıt modu
+    GET  /transcripts            Transkript dosyalarının listesi
+    GET  /transcripts/<dosya>    Transkript içeriği
+
+"stream": true gönderildiğinde veya Accept başlığı text/event-stream olduğunda yanıt
+`data: {"text": "..."}` olayları olarak akar ve `event: done` ile biter. Sorgu hattının
+aşamaları (anahtar kelimeler, belge getirme, ilk parça...) `event: progress` olarak gönderilir.
+"""
+
+import os
+import sys
+import json
+import asyncio
+import argparse
+from urllib.parse import unquote
+
+from inspareai.core.runtime import get_runtime
+from inspareai.core.async_query import aquery_transcripts, aquick_query, astream_query
+from inspareai.cli.command_handler import list_transcript_files, view_transcript
+from inspareai.config.constants import SERVER_HOST, SERVER_PORT, SERVER_MAX_BODY_BYTES
+
+_STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class HTTPError(Exception):
+    """İstemciye durum kodu ve mesajla döndürülecek hata"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+async def _read_request(reader):
+    """
+    HTTP isteğini okur.
+
+    Returns:
+        tuple: (method, path, headers, body), bağlantı kapandıysa None
+    """
+    request_line = await reader.readline()
+    if not request_line.strip():
+        return None
+    try:
+        method, target, _ = request_line.decode('latin-1').split(' ', 2)
+    except ValueError:
+        raise HTTPError(400, "Geçersiz istek satırı")
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    length = int(headers.get('content-length') or 0)
+    if length > SERVER_MAX_BODY_BYTES:
+        raise HTTPError(413, "İstek gövdesi çok büyük")
+    body = await reader.readexactly(length) if length else b''
+    return method.upper(), unquote(target.split('?', 1)[0]), headers, body
+
+
+def _response_head(status, content_type, extra_headers=()):
+    """HTTP yanıt başlığını oluşturur"""
+    lines = [f"HTTP/1.1 {status} {_STATUS_TEXT.get(status, '')}",
+             f"Content-Type: {content_type}",
+             "Connection: close"]
+    lines.extend(extra_headers)
+    return ("\r\n".join(lines) + "\r\n").encode('latin-1')
+
+
+async def _send_json(writer, status, payload):
+    """JSON yanıtı gönderir"""
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    writer.write(_response_head(status, "application/json; charset=utf-8",
+                                [f"Content-Length: {len(body)}"]) + b"\r\n" + body)
+    await writer.drain()
+
+
+def _sse_event(data, event=None):
+    """Tek bir Server-Sent Events olayını kodlar"""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data, ensure_ascii=False)}\n\n".encode('utf-8')
+
+
+class QueryServer:
+    """
+    Paylaşılan çalışma zamanı üzerinden sorguları yanıtlayan asyncio HTTP sunucusu.
+    Her bağlantı tek bir istek taşır; eşzamanlı istekler aynı olay döngüsünde işlenir.
+    """
+
+    def __init__(self, host=SERVER_HOST, port=SERVER_PORT, transcripts_dir="transcripts"):
+        """
+        Args:
+            host: Dinlenecek adres
+            port: Dinlenecek port (0 ise boş bir port seçilir)
+            transcripts_dir: Transkript dosyalarının bulunduğu dizin
+        """
+        self.host = host
+        self.port = port
+        self.transcripts_dir = transcripts_dir
+        self._server = None
+
+    async def start(self):
+        """Sunucuyu başlatır; port 0 verildiyse seçilen port self.port'a yazılır"""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        print(f"InspareAI servisi http://{self.host}:{self.port} adresinde dinleniyor")
+
+    async def serve_forever(self):
+        """Sunucuyu başlatır ve kapatılana kadar çalıştırır"""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """Yeni bağlantıları kabul etmeyi bırakır"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        """Tek bir bağlantıdaki isteği işler"""
+        try:
+            request = await _read_request(reader)
+            if request is not None:
+                await self._dispatch(writer, *request)
+        except HTTPError as e:
+            await _send_json(writer, e.status, {"error": e.message})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            # İstemci bağlantıyı kapattı; akış varsa üreteç kapatılarak LLM isteği de durur
+            pass
+        except Exception as e:
+            print(f"Servis hatası: {e}")
+            try:
+                await _send_json(writer, 500, {"error": str(e)})
+            except ConnectionError:
+                pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _dispatch(self, writer, method, path, headers, body):
+        """İsteği ilgili uç noktaya yönlendirir"""
+        if path == "/health":
+            runtime = get_runtime()
+            health = {"status": "ok", "warm": runtime.is_loaded("retriever")}
+            if runtime.is_loaded("scheduler"):
+                health["scheduler"] = runtime.scheduler.stats()
+            return await _send_json(writer, 200, health)
+
+        if path in ("/query", "/quick"):
+            if method != "POST":
+                raise HTTPError(405, "Bu uç nokta yalnızca POST kabul eder")
+            try:
+                payload = json.loads(body or b"{}")
+            except ValueError:
+                raise HTTPError(400, "İstek gövdesi geçerli JSON değil")
+            question = payload.get("question") if isinstance(payload, dict) else None
+            if not isinstance(question, str):
+                raise HTTPError(400, "'question' alanı gerekli")
+            quick = path == "/quick"
+            if payload.get("stream") or "text/event-stream" in headers.get("accept", ""):
+                return await self._stream_answer(writer, question, quick)
+            answer = await (aquick_query(question) if quick else aquery_transcripts(question))
+            return await _send_json(writer, 200, {"answer": answer})
+
+        if path == "/transcripts":
+            return await _send_json(writer, 200, {"transcripts": list_transcript_files(self.transcripts_dir)})
+
+        if path.startswith("/transcripts/"):
+            name = path[len("/transcripts/"):]
+            if not name.endswith(".txt"):
+                name += ".txt"
+            # Yalnızca listelenen dosyalar okunabilir (dizin dışına çıkılamaz)
+            if name not in list_transcript_files(self.transcripts_dir):
+                raise HTTPError(404, f"{name} bulunamadı")
+            content = view_transcript(os.path.join(self.transcripts_dir, name))
+            return await _send_json(writer, 200, {"name": name, "content": content})
+
+        raise HTTPError(404, f"Bilinmeyen uç nokta: {path}")
+
+    async def _stream_answer(self, writer, question, quick):
+        """Yanıt parçalarını Server-Sent Events olarak gönderir"""
+        writer.write(_response_head(200, "text/event-stream; charset=utf-8", ["Cache-Control: no-cache"]) + b"\r\n")
+        await writer.drain()
+
+        # Aşama olayları (düşünme süreci) "progress" olayı olarak gönderilir
+        def send_progress(event):
+            writer.write(_sse_event(event, event="progress"))
+
+        stream = astream_query(question, quick=quick, progress_callback=send_progress)
+        try:
+            async for chunk in stream:
+                writer.write(_sse_event({"text": chunk}))
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            raise
+        except Exception as e:
+            print(f"Akış hatası: {e}")
+            writer.write(_sse_event({"error": str(e)}, event="error"))
+        finally:
+            await stream.aclose()
+        writer.write(_sse_event({}, event="done"))
+        await writer.drain()
+
+
+def warm_up():
+    """Vektör veritabanını, yanıt önbelleklerini ve LLM modellerini önceden yükler"""
+    runtime = get_runtime()
+    print("Çalışma zamanı ısıtılıyor...")
+    if not runtime.vector_db_available():
+        print("UYARI: Vektör veritabanı yüklenemedi; sorgular hata mesajı döndürecek.")
+        return
+    runtime.answer_store
+    runtime.semantic_cache
+    runtime.default_model
+    runtime.emergency_model
+
+
+async def serve(host=SERVER_HOST, port=SERVER_PORT, warm=True):
+    """Servisi başlatır; warm True ise bileşenler ilk istekten önce yüklenir"""
+    if warm:
+        await asyncio.get_running_loop().run_in_executor(None, warm_up)
+    await QueryServer(host, port).serve_forever()
+
+
+def main(argv=None):
+    """`inspareai serve` giriş noktası"""
+    parser = argparse.ArgumentParser(prog="inspareai serve", description="InspareAI HTTP sorgu servisi")
+    parser.add_argument("--host", default=SERVER_HOST, help=f"Dinlenecek adres (varsayılan {SERVER_HOST})")
+    parser.add_argument("--port", type=int, default=SERVER_PORT, help=f"Dinlenecek port (varsayılan {SERVER_PORT})")
+    parser.add_argument("--no-warmup", action="store_true", help="Modelleri ilk istekte yükle")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.host, args.port, warm=not args.no_warmup))
+    except KeyboardInterrupt:
+        print("\nServis durduruldu.")
+    finally:
+        from inspareai.utils.cache import save_cache
+        save_cache()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,18 +4,49 @@
 """
 InspareAI - API Ana Modül.
 Bu modül, Streamlit arayüzünden kullanılan API fonksiyonlarını içerir.
+INSPAREAI_SERVER_URL ayarlandığında sorgular ve transkriptler `inspareai serve`
+servisinden alınır; modeller Streamlit sürecinde yüklenmez.
 """
 
-import time
+import os
 from typing import Callable, List, Dict, Any
 
 from inspareai.core.query import query_transcripts, quick_query
 from inspareai.cli.command_handler import list_transcript_files, view_transcript
+from inspareai.config.constants import SERVER_URL
+
+
+def _server_client():
+    """Servis adresi ayarlıysa HTTP istemcisini, aksi halde None döndürür"""
+    if not SERVER_URL:
+        return None
+    from inspareai.api.client import InspareClient
+    return InspareClient(SERVER_URL)
+
+
+def _format_progress(event: Dict[str, Any]) -> str:
+    """Sorgu aşama olayını düşünme sürecinde gösterilecek satıra çevirir"""
+    stage = event["stage"]
+    duration = event.get("duration", 0.0)
+    if stage == "cache_hit":
+        return "⚡ Yanıt önbellekten alındı"
+    if stage == "keywords":
+        keywords = ", ".join(event.get("keywords", [])[:6]) or "yok"
+        return f"🔍 Anahtar kelimeler: {keywords} ({duration:.2f} sn)"
+    if stage == "retrieved":
+        return f"📑 {event['count']} ilgili doküman parçası bulundu ({duration:.2f} sn)"
+    if stage == "filtered":
+        return f"📋 {event['count']} parça yanıt için seçildi ({duration:.2f} sn)"
+    if stage == "first_token":
+        return f"🧠 Yanıt oluşturuluyor... (ilk parça {event['elapsed']:.2f} sn)"
+    return f"✅ Tamamlandı ({event['elapsed']:.2f} sn)"
 
 
 def stream_query(prompt: str, callback: Callable, hizli_mod: bool = False, dusunme_sureci: bool = False) -> str:
     """
     Sorguyu akış şeklinde yanıtlar ve aşamaları gösterir.
+    Düşünme süreci, sorgu hattının gerçek aşama olaylarından (progress_callback)
+    oluşturulur ve olaylar geldikçe gösterilir; yanıta ek gecikme eklemez.
     
     Args:
         prompt (str): Kullanıcı sorusu veya konuşma geçmişiyle birlikte bağlamlı soru
@@ -36,45 +67,31 @@ def stream_query(prompt: str, callback: Callable, hizli_mod: bool = False, dusun
         full_response.append(chunk)
         full_text = "".join(full_response)
         callback(full_text + cursor_character)
-        
-    # Bağlamlı soru mu kontrol et
-    has_conversation_context = "konuşma geçmişini dikkate alarak" in prompt.lower()
     
-    # Düşünme süreci aşamaları
+    # Düşünme süreci: aşamalar yanıtın ilk parçası gelene kadar gösterilir
+    progress_callback = None
     if dusunme_sureci:
-        if has_conversation_context:
-            callback("💬 Konuşma geçmişi analiz ediliyor...")
-            time.sleep(0.5)
-            callback("💬 Konuşma geçmişi analiz ediliyor...\n🔄 Bağlam ilişkilendiriliyor...")
-            time.sleep(0.5)
-        
-        callback("🔍 Anahtar kelimeler analiz ediliyor...")
-        time.sleep(0.5)
-        callback(("🔍 Anahtar kelimeler analiz ediliyor...\n"
-                "📑 İlgili dokümanlar aranıyor..."))
-        time.sleep(0.5)
-        callback(("🔍 Anahtar kelimeler analiz ediliyor...\n"
-                "📑 İlgili dokümanlar aranıyor...\n"
-                "📋 Dokümanlar filtreleniyor..."))
-        time.sleep(0.5)
+        thinking_lines = []
+        if "konuşma geçmişini dikkate alarak" in prompt.lower():
+            thinking_lines.append("💬 Konuşma geçmişi dikkate alınıyor")
+            callback("\n".join(thinking_lines))
         
-        if has_conversation_context:
-            callback(("🔍 Anahtar kelimeler analiz ediliyor...\n"
-                    "📑 İlgili dokümanlar aranıyor...\n"
-                    "📋 Dokümanlar filtreleniyor...\n"
-                    "🧠 Önceki konuşma bağlamıyla yanıt oluşturuluyor...\n\n"))
-        else:
-            callback(("🔍 Anahtar kelimeler analiz ediliyor...\n"
-                    "📑 İlgili dokümanlar aranıyor...\n"
-                    "📋 Dokümanlar filtreleniyor...\n"
-                    "🧠 Yanıt oluşturuluyor...\n\n"))
-        time.sleep(0.5)
+        def progress_callback(event):
+            if full_response:
+                return
+            thinking_lines.append(_format_progress(event))
+            callback("\n".join(thinking_lines) + "\n\n")
     
     # Sorgu işleme
-    if hizli_mod:
-        result = quick_query(prompt, stream_callback=stream_to_callback)
+    client = _server_client()
+    if client is not None:
+        for chunk in client.stream(prompt, quick=hizli_mod, progress_callback=progress_callback):
+            stream_to_callback(chunk)
+        result = ""
+    elif hizli_mod:
+        result = quick_query(prompt, stream_callback=stream_to_callback, progress_callback=progress_callback)
     else:
-        result = query_transcripts(prompt, stream_callback=stream_to_callback)
+        result = query_transcripts(prompt, stream_callback=stream_to_callback, progress_callback=progress_callback)
     
     # Akış yoksa direkt yanıtı döndür
     if not full_response:
@@ -95,6 +112,9 @@ def get_transcript_list() -> List[str]:
     Returns:
         List[str]: Transkript dosyalarının listesi
     """
+    client = _server_client()
+    if client is not None:
+        return client.list_transcripts()
     return list_transcript_files()
 
 
@@ -108,4 +128,7 @@ def get_transcript_content(file_path: str) -> str:
     Returns:
         str: Dosyanın içeriği
     """
+    client = _server_client()
+    if client is not None:
+        return client.get_transcript(os.path.basename(file_path))
     return view_transcript(file_path)
@@ -5,4 +5,19 @@
 InspareAI - Komut Satırı Arayüzü Modülü
 ---------------------------------------
 Bu paket, InspareAI sisteminin komut satırı arayüzü bileşenlerini içerir.
-"""
\ No newline at end of file
+"""
+
+import sys
+
+
+def main(argv=None):
+    """
+    `inspareai` komutunun giriş noktası.
+    `inspareai serve` HTTP sorgu servisini, diğer argümanlar komut satırı arayüzünü başlatır.
+    """
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] == "serve":
+        from inspareai.api.server import main as serve_main
+        return serve_main(argv[1:])
+    from inspareai.cli.interface import main as cli_main
+    return cli_main(argv)
@@ -9,12 +9,35 @@ Bu modül, komut satırı arayüzü için komut işleme fonksiyonlarını içeri
 import os
 import sys
 import re
+import traceback
 from datetime import datetime
 import json
 
 from inspareai.core.query import query_transcripts, quick_query
 from inspareai.utils.cache import save_cache
 
+# use_server() çağrıldığında sorgular ve transkriptler bu HTTP istemcisi üzerinden yapılır
+_client = None
+
+
+def use_server(url):
+    """
+    CLI'yi verilen adresteki InspareAI servisinin (inspareai serve) ince istemcisi yapar.
+    
+    Args:
+        url (str): Servis adresi (ör. http://127.0.0.1:8765)
+    """
+    global _client
+    from inspareai.api.client import InspareClient
+    _client = InspareClient(url)
+
+
+def _answer(question, quick=False):
+    """Soruyu servis ayarlıysa servise, değilse bu süreçteki sorgu hattına gönderir"""
+    if _client is not None:
+        return _client.query(question, quick=quick)
+    return quick_query(question) if quick else query_transcripts(question)
+
 
 def print_banner():
     """
@@ -118,7 +141,7 @@ def handle_interactive_mode():
                 
             # Transkript listesini göster
             elif user_query.lower() in ['list', 'liste', 'dosyalar']:
-                files = list_transcript_files()
+                files = _client.list_transcripts() if _client is not None else list_transcript_files()
                 if files:
                     print("\nMevcut Transkript Dosyaları:")
                     for i, file in enumerate(files, 1):
@@ -133,6 +156,9 @@ def handle_interactive_mode():
                 parts = user_query.split(' ', 1)
                 if len(parts) > 1:
                     file_name = parts[1].strip()
+                    if _client is not None:
+                        print(_client.get_transcript(file_name))
+                        continue
                     file_path = os.path.join("transcripts", file_name)
                     if not file_name.endswith('.txt'):
                         file_path += '.txt'
@@ -144,7 +170,7 @@ def handle_interactive_mode():
                 query_text = user_query.split(':', 1)[1].strip()
                 if query_text:
                     print("\nHızlı yanıt modu kullanılıyor...")
-                    result = quick_query(query_text)
+                    result = _answer(query_text, quick=True)
                     print("\nYANIT:\n")
                     print(result)
                 else:
@@ -157,7 +183,7 @@ def handle_interactive_mode():
                 start_time = datetime.now()
                 
                 # Sorguyu işle
-                result = query_transcripts(user_query)
+                result = _answer(user_query)
                 
                 elapsed = (datetime.now() - start_time).total_seconds()
                 print("\nYANIT:\n")
@@ -180,7 +206,7 @@ def handle_single_query_mode(query):
         query (str): Yanıtlanacak sorgu
     """
     try:
-        result = query_transcripts(query)
+        result = _answer(query)
         print(result)
         save_cache()  # İşlem tamamlandığında önbelleği kaydet
     except Exception as e:
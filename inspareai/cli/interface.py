@@ -8,13 +8,17 @@ Bu modül, komut satırı arayüzünün giriş noktasını içerir.
 
 import sys
 import argparse
-from inspareai.cli.command_handler import handle_interactive_mode, handle_single_query_mode
+from inspareai.cli.command_handler import handle_interactive_mode, handle_single_query_mode, use_server
+from inspareai.config.constants import SERVER_URL
 
 
-def parse_args():
+def parse_args(argv=None):
     """
     Komut satırı argümanlarını ayrıştırır.
     
+    Args:
+        argv (list): Argümanlar (None ise sys.argv kullanılır)
+        
     Returns:
         argparse.Namespace: Ayrıştırılmış komut satırı argümanları
     """
@@ -29,20 +33,32 @@ def parse_args():
         help='Tek seferlik sorgu. Bu parametre verildiğinde etkileşimli mod çalışmaz.'
     )
     
+    parser.add_argument(
+        '--server',
+        type=str,
+        default=SERVER_URL or None,
+        help='Sorguları bu adresteki InspareAI servisine gönder (ör. http://127.0.0.1:8765). '
+             'Varsayılan: INSPAREAI_SERVER_URL'
+    )
+    
     parser.add_argument(
         '--version', 
         action='version', 
         version='InspareAI v3.2'
     )
     
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
-def main():
+def main(argv=None):
     """
     CLI ana giriş noktası.
     """
-    args = parse_args()
+    args = parse_args(argv)
+    
+    # İnce istemci modu: modeller yüklenmez, sorgular servise gider
+    if args.server:
+        use_server(args.server)
     
     # Tek seferlik sorgu modu
     if args.query:
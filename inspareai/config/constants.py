@@ -6,6 +6,8 @@ InspareAI - Sabit değerler ve konfigürasyon.
 Bu modül, uygulama genelinde kullanılan tüm sabit değerleri içerir.
 """
 
+import os
+
 # Maksimum döküman sayısı ve filtreleme limitleri
 MAX_DOCUMENTS = 70  # İşlenecek maksimum döküman sayısı
 MAX_DOCS_PER_SPEAKER = 15  # Konuşmacı başına maksimum döküman sayısı
@@ -24,13 +26,53 @@ PRIMARY_TIMEOUT = 30  # İlk LLM yanıt zaman aşımı (saniye)
 SECONDARY_TIMEOUT = 30  # İkincil LLM yanıt zaman aşımı (saniye)
 EMERGENCY_TIMEOUT = 15  # Acil durum LLM yanıt zaman aşımı (saniye)
 
+# LLM istek zamanlayıcısı: Ollama'ya aynı anda gönderilecek en fazla üretim sayısı
+LLM_MAX_CONCURRENCY = int(os.environ.get("INSPAREAI_LLM_MAX_CONCURRENCY", "2") or 2)
+# Öncelik sınıfı başına sırada en fazla bekleme süresi (saniye); aşan iş modele gönderilmez
+LLM_QUEUE_DEADLINES = {"interactive": 30, "quick": 20, "batch": 120}
+
 # Önbellek parametreleri
-CACHE_CLEAN_THRESHOLD = 100  # Bellek önbelleği temizleme eşiği
-CACHE_KEEP_COUNT = 50  # Bellek önbelleğinde tutulacak öğe sayısı
-DISK_CACHE_SAVE_INTERVAL = 5  # Önbelleğin diske kaydedilme sıklığı
+MEMORY_CACHE_MAX_BYTES = 32 * 1024 * 1024  # Bellek önbelleğindeki yanıtların toplam bayt sınırı
+ANSWER_CACHE_TTL = 7 * 24 * 3600  # Yanıt deposundaki kayıtların geçerlilik süresi (saniye)
+ANSWER_CACHE_MAX_ENTRIES = 10000  # Yanıt deposunda tutulacak en fazla yanıt sayısı
+EMBEDDING_CACHE_MAX_ENTRIES = 500000  # Embedding önbelleğinde tutulacak en fazla vektör sayısı
+QUERY_VECTOR_CACHE_SIZE = 1024  # Bellekte tutulacak en fazla sorgu vektörü
+RETRIEVAL_CACHE_SIZE = 256  # Bellekte tutulacak en fazla belge getirme sonucu
+SEMANTIC_CACHE_THRESHOLD = 0.92  # Anlamsal önbellekte yanıtın yeniden kullanılacağı en düşük benzerlik
+SEMANTIC_CACHE_NEAR_MISS_MARGIN = 0.05  # Eşiğin bu kadar altındaki eşleşmeler yakın ıska sayılır
+SEMANTIC_CACHE_MAX_ENTRIES = 2000  # Anlamsal önbellekte tutulacak en fazla yanıt
+SEMANTIC_CACHE_SAVE_INTERVAL = 30.0  # Anlamsal önbellek değişikliklerinin diske yazılmadan önce biriktiği süre (sn)
+
+# Hibrit (sözcüksel + vektör) arama parametreleri
+BM25_K1 = 1.5  # BM25 terim frekansı doygunluk parametresi
+BM25_B = 0.75  # BM25 belge uzunluğu normalizasyonu
+LEXICAL_TOP_K = 8  # Sözcüksel aramadan alınacak sonuç sayısı
+RRF_K = 60  # Reciprocal-rank fusion sabiti
+
+# Vektör arama arka ucu: "chroma" (HNSW) veya "numpy" (bellek eşlemeli tam arama)
+VECTOR_BACKEND = os.environ.get("INSPAREAI_VECTOR_BACKEND", "chroma").strip().lower()
+# NumPy arka ucunda ilk tarama için nicemlenmiş vektör kopyası: "int8", "float16" veya "none"
+VECTOR_QUANTIZATION = os.environ.get("INSPAREAI_VECTOR_QUANTIZATION", "int8").strip().lower()
+QUANTIZED_RESCORE_CANDIDATES = 300  # Tam hassasiyetli vektörlerle yeniden puanlanacak aday sayısı
+# NumPy indeksinde vektörlerin PCA ile indirgeneceği boyut (0: indirgeme yok)
+PCA_DIMENSIONS = int(os.environ.get("INSPAREAI_PCA_DIMENSIONS", "0") or 0)
+
+# HTTP sorgu servisi (inspareai serve)
+SERVER_HOST = os.environ.get("INSPAREAI_SERVER_HOST", "127.0.0.1")
+SERVER_PORT = int(os.environ.get("INSPAREAI_SERVER_PORT", "8765") or 8765)
+# Ayarlanırsa CLI ve Streamlit sorguları bu adresteki servise gönderir (ör. http://127.0.0.1:8765)
+SERVER_URL = os.environ.get("INSPAREAI_SERVER_URL", "").strip()
+SERVER_MAX_BODY_BYTES = 64 * 1024  # İstek gövdesinin en fazla boyutu
 
 # Veri dosyaları
-CACHE_FILE = "query_cache.json"
+CACHE_FILE = "query_cache.json"  # Eski JSON yanıt önbelleği (ilk açılışta yanıt deposuna aktarılır)
+ANSWER_STORE_FILE = "query_cache.sqlite3"
+SEMANTIC_CACHE_FILE = "semantic_cache.npz"
+EMBEDDING_CACHE_DIR = "embedding_cache"
+EMBEDDING_CACHE_FILE = "embedding_cache/embeddings.sqlite3"
+LEXICAL_INDEX_FILE = "chrome_langchain_db/bm25_index.npz"
+INDEX_MANIFEST_FILE = "chrome_langchain_db/index_manifest.json"  # vector.py her indekslemede yeniden yazar
+NUMPY_INDEX_DIR = "chrome_langchain_db/numpy_index"
 TRANSCRIPT_DIR = "transcripts"
 
 # Kronolojik analiz anahtar kelimeleri
@@ -0,0 +1,403 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - Asenkron Sorgu İşleme.
+Bu modül, query_transcripts ve quick_query fonksiyonlarının asyncio karşılıklarını içerir.
+LLM ve embedding çağrıları Ollama'nın asenkron istemcisiyle yapılır; anahtar kelime
+çıkarma sorgu vektörü beklenirken eşzamanlı çalışır ve zaman aşımı kademesi her istek
+için ayrı bir thread havuzu açmadan uygulanır. Böylece tek bir süreç çok sayıda
+eşzamanlı oturuma hizmet verebilir.
+
+Örnek:
+    answer = await aquery_transcripts("Ahlak nedir?")
+    async for chunk in astream_query("Ahlak nedir?"):
+        print(chunk, end="")
+"""
+
+import time
+import asyncio
+import functools
+import traceback
+
+from inspareai.core.runtime import get_runtime
+from inspareai.core.retrieval import (retrieve_relevant_documents, filter_and_prepare_documents,
+                                     format_context, format_sources, is_vector_db_available,
+                                     _aembed_query)
+from inspareai.core.query import (INVALID_QUESTION_MESSAGE, VECTOR_DB_UNAVAILABLE_MESSAGE,
+                                 NO_DOCUMENTS_MESSAGE, GENERATION_FAILED_MESSAGE, BUSY_MESSAGE,
+                                 _lookup_cached_answer, _lookup_semantic_answer, _store_answer,
+                                 _build_system_instruction, _secondary_prompt, _emergency_prompt,
+                                 _quick_prompt, _fallback_answer, _inflight_key, _Progress)
+from inspareai.utils.text import extract_keywords
+from inspareai.utils.streaming import astream_llm_response
+from inspareai.utils.singleflight import AsyncSingleFlight
+from inspareai.core.scheduler import llm_priority, RequestShed
+from inspareai.config.constants import (MIN_RESPONSE_LENGTH, PRIMARY_TIMEOUT,
+                                      SECONDARY_TIMEOUT, EMERGENCY_TIMEOUT)
+from inspareai.config.prompts import QUERY_TEMPLATE
+
+# Aynı anda sorulan aynı sorular tek bir üretim görevinde birleştirilir
+_inflight = AsyncSingleFlight()
+
+
+async def _with_timeout(awaitable, seconds):
+    """awaitable'ı en fazla seconds saniye bekler, aşılırsa asyncio.TimeoutError yükseltir"""
+    if hasattr(asyncio, "timeout"):  # Python 3.11+
+        async with asyncio.timeout(seconds):
+            return await awaitable
+    return await asyncio.wait_for(awaitable, seconds)
+
+
+async def _run_sync(func, *args):
+    """Engelleyici bir fonksiyonu olay döngüsünü bekletmeden varsayılan thread havuzunda çalıştırır"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args))
+
+
+def _validate(question):
+    """Soru geçersizse kullanıcıya gösterilecek mesajı, geçerliyse None döndürür"""
+    if not question or len(question.strip()) < 2:
+        return INVALID_QUESTION_MESSAGE
+    return None
+
+
+async def _aprepare(runtime, question, fingerprint=None, progress=None):
+    """
+    Anahtar kelimeleri ve sorgu vektörünü eşzamanlı hesaplar, ardından belgeleri getirir.
+    fingerprint verilirse belge getirmeden önce anlamsal önbelleğe bakılır.
+    progress (_Progress) verilirse keywords, retrieved ve cache_hit olayları bildirilir.
+
+    Returns:
+        tuple: (anlamsal önbellekteki yanıt veya None, sorgu vektörü, belgeler)
+    """
+    progress = progress or _Progress()
+    stage_start = time.time()
+    # Anahtar kelime çıkarma (CPU) ve sorgu vektörü (Ollama isteği) birbirini beklemez
+    keywords, question_embedding = await asyncio.gather(
+        _run_sync(extract_keywords, question),
+        _aembed_query(runtime, question),
+    )
+    progress.finished("keywords", stage_start, keywords=list(keywords))
+    if fingerprint is not None:
+        cached_answer = await _run_sync(_lookup_semantic_answer, runtime, fingerprint, question_embedding)
+        if cached_answer is not None:
+            progress.emit("cache_hit", semantic=True)
+            return cached_answer, question_embedding, []
+
+    # Sorgu vektörü LRU önbellekte olduğundan belge getirme yeniden embedding istemez
+    stage_start = time.time()
+    docs = await _run_sync(retrieve_relevant_documents, question, keywords)
+    progress.finished("retrieved", stage_start, count=len(docs))
+    return None, question_embedding, docs
+
+
+def _build_prompt(question, docs):
+    """Belgeleri filtreler ve normal mod prompt'unu oluşturur (prompt, bağlam, filtrelenmiş belgeler)"""
+    from langchain_core.prompts import ChatPromptTemplate
+
+    filtered_docs = filter_and_prepare_documents(docs, question)
+    context = format_context(filtered_docs)
+    prompt = ChatPromptTemplate.from_template(QUERY_TEMPLATE).format(
+        system_instruction=_build_system_instruction(question),
+        question=question,
+        context=context
+    )
+    return prompt, context, filtered_docs
+
+
+async def _agenerate(runtime, question, prompt, context):
+    """
+    Zaman aşımı kademesiyle yanıt üretir: ana prompt, basit prompt ve acil durum modeli.
+    Zamanlayıcının düşürdüğü istek (RequestShed) kademeye sokulmaz, çağırana iletilir.
+
+    Returns:
+        str: LLM yanıtı, hiçbir adım başarılı olmazsa None
+    """
+    try:
+        llm_result = str(await _with_timeout(runtime.default_model.ainvoke(prompt), PRIMARY_TIMEOUT))
+        if len(llm_result.strip()) < MIN_RESPONSE_LENGTH:
+            raise ValueError("Yetersiz yanıt uzunluğu")
+        return llm_result
+    except RequestShed:
+        raise
+    except asyncio.TimeoutError:
+        print(f"LLM yanıt zaman aşımı ({PRIMARY_TIMEOUT}s). İkincil yöntem deneniyor...")
+        try:
+            simple_prompt = _secondary_prompt(question, context)
+            return str(await _with_timeout(runtime.default_model.ainvoke(simple_prompt), SECONDARY_TIMEOUT))
+        except RequestShed:
+            raise
+        except Exception as e:
+            print(f"İkincil deneme başarısız: {e!r}")
+    except Exception as e:
+        print(f"LLM yanıt hatası: {e}")
+
+    try:
+        emergency_prompt = _emergency_prompt(question)
+        return str(await _with_timeout(runtime.emergency_model.ainvoke(emergency_prompt), EMERGENCY_TIMEOUT))
+    except RequestShed:
+        raise
+    except Exception as e:
+        print(f"Acil durum yanıtı alınamadı: {e!r}")
+        return None
+
+
+async def _astream_with_fallback(runtime, prompt, emergency_prompt):
+    """
+    Ana modelin yanıtını stream eder. İlk parça PRIMARY_TIMEOUT içinde gelmezse
+    veya akış hiç başlamadan hata oluşursa acil durum modeline geçilir. Zamanlayıcının
+    düşürdüğü istek (RequestShed) acil durum modeline gönderilmez, çağırana iletilir.
+    """
+    stream = astream_llm_response(runtime.default_model, prompt)
+    try:
+        first_chunk = await _with_timeout(stream.__anext__(), PRIMARY_TIMEOUT)
+    except StopAsyncIteration:
+        return
+    except RequestShed:
+        await stream.aclose()
+        raise
+    except Exception as e:
+        print(f"Stream modunda hata: {e!r}. Acil durum modeli deneniyor...")
+        await stream.aclose()
+        async for chunk in astream_llm_response(runtime.emergency_model, emergency_prompt):
+            yield chunk
+        return
+
+    yield first_chunk
+    async for chunk in stream:
+        yield chunk
+
+
+async def aquery_transcripts(question):
+    """
+    query_transcripts'in asenkron karşılığı.
+    Aynı soru zaten yanıtlanıyorsa o üretimin sonucunu bekler.
+
+    Args:
+        question: Kullanıcı sorusu
+
+    Returns:
+        str: Kaynaklarıyla birlikte oluşturulan yanıt
+    """
+    if not isinstance(question, str):
+        return await _aquery_transcripts(question)
+    return await _inflight.do(_inflight_key("normal", question, False), lambda: _aquery_transcripts(question))
+
+
+async def _aquery_transcripts(question):
+    """aquery_transcripts'in gövdesi - her çağrı kendi belge getirme ve LLM üretimini yapar"""
+    print(f"Sorgu işleniyor: \"{question}\"")
+    start_time = time.time()
+
+    invalid = _validate(question)
+    if invalid:
+        return invalid
+    if not await _run_sync(is_vector_db_available):
+        return VECTOR_DB_UNAVAILABLE_MESSAGE
+
+    runtime = get_runtime()
+    docs = []
+    try:
+        # Yanıt önbellekleri (bellek, SQLite, anlamsal) senkron sürümle ortaktır
+        fingerprint = runtime.answer_fingerprint
+        cache_key = question.strip().lower()
+        cached_answer = await _run_sync(_lookup_cached_answer, runtime, fingerprint, cache_key)
+        if cached_answer is not None:
+            return cached_answer
+
+        cached_answer, question_embedding, docs = await _aprepare(runtime, question, fingerprint)
+        if cached_answer is not None:
+            return cached_answer
+        if not docs:
+            return NO_DOCUMENTS_MESSAGE
+        print(f"Toplam {len(docs)} ilgili belge parçası bulundu")
+
+        prompt, context, filtered_docs = _build_prompt(question, docs)
+        llm_result = await _agenerate(runtime, question, prompt, context)
+        if llm_result is None:
+            return GENERATION_FAILED_MESSAGE
+
+        result = f"{llm_result}\n\n{format_sources(filtered_docs[:15])}"
+        await _run_sync(_store_answer, runtime, fingerprint, cache_key, question, question_embedding, result)
+
+        print(f"Sorgu işlendi. Toplam süre: {time.time() - start_time:.2f} saniye")
+        return result
+
+    except RequestShed as e:
+        # Aşırı yükte düşürülen istek yeniden denenmez ve önbelleğe yazılmaz
+        print(f"LLM isteği düşürüldü: {e}")
+        return BUSY_MESSAGE
+    except Exception as e:
+        print(f"Genel hata: {e}")
+        traceback.print_exc()
+        if docs:
+            return _fallback_answer(docs, e)
+        return f"İşlem sırasında bir hata oluştu: {str(e)}"
+
+
+async def aquick_query(question):
+    """
+    quick_query'nin asenkron karşılığı - daha az belge ve kısa prompt ile hızlı yanıt.
+    Aynı soru zaten yanıtlanıyorsa o üretimin sonucunu bekler.
+
+    Args:
+        question: Kullanıcı sorusu
+
+    Returns:
+        str: Oluşturulan yanıt
+    """
+    with llm_priority("quick"):
+        return await _inflight.do(_inflight_key("quick", question, False), lambda: _aquick_query(question))
+
+
+async def _aquick_query(question):
+    """aquick_query'nin gövdesi"""
+    print(f"Hızlı yanıt modu: \"{question}\"")
+
+    # "!" işareti varsa kaldır
+    if question.startswith("!"):
+        question = question[1:].strip()
+
+    try:
+        runtime = get_runtime()
+        _, _, docs = await _aprepare(runtime, question)
+
+        # Daha az sayıda belge kullan
+        filtered_docs = docs[:10]
+        quick_prompt = _quick_prompt(question, format_context(filtered_docs))
+        response = await _with_timeout(runtime.default_model.ainvoke(quick_prompt), PRIMARY_TIMEOUT)
+
+        # Kaynakları ekle
+        return f"{response}\n\n{format_sources(filtered_docs[:5])}"
+
+    except RequestShed as e:
+        print(f"LLM isteği düşürüldü: {e}")
+        return BUSY_MESSAGE
+    except Exception as e:
+        print(f"Hızlı yanıt hatası: {e!r}")
+        return f"Hızlı yanıt oluşturulamadı: {str(e)}"
+
+
+async def astream_query(question, quick=False, progress_callback=None):
+    """
+    Yanıtı async generator olarak parça parça verir.
+    Parçaların birleşimi aquery_transcripts / aquick_query yanıtıyla aynı biçimdedir
+    (kaynaklar sonda ayrı bir parça olarak gönderilir). Normal modda tamamlanan yanıt
+    önbelleklere kaydedilir; önbellekte bulunan yanıt tek parça olarak gönderilir.
+
+    Aynı soru zaten akıtılıyorsa yeni üretim başlatılmaz, liderin parçaları (baştan
+    itibaren) bu aboneye de dağıtılır. Üretim yalnızca son abone ayrıldığında iptal edilir.
+
+    Args:
+        question: Kullanıcı sorusu
+        quick: True ise hızlı yanıt modu kullanılır
+        progress_callback: Aşama olaylarını alacak callback fonksiyonu (bkz. query_transcripts).
+            Olaylar üretimle birlikte dağıtıldığından geç katılan abone de alır.
+
+    Yields:
+        str: Yanıt parçaları
+    """
+    progress = _Progress(progress_callback)
+    if not isinstance(question, str):
+        yield INVALID_QUESTION_MESSAGE
+        return
+    key = _inflight_key("quick" if quick else "normal", question, True)
+    stream = _inflight.stream(key, lambda: _astream_query(question, quick))
+    try:
+        async for item in stream:
+            if isinstance(item, dict):
+                # Öğe tüm abonelerle paylaşılır; kopyası üzerinden iletilir
+                event = dict(item)
+                progress.emit(event.pop("stage"), **event)
+            else:
+                yield item
+    finally:
+        await stream.aclose()
+    progress.emit("done")
+
+
+async def _astream_query(question, quick=False):
+    """
+    astream_query'nin gövdesi. Aşama olayları (sözlük) yanıt parçalarıyla aynı akışta
+    verilir; böylece single-flight aboneleri de alır. astream_query bunları ayırır.
+    """
+    events = []
+    progress = _Progress(events.append)
+
+    if quick and question.startswith("!"):
+        question = question[1:].strip()
+
+    invalid = _validate(question)
+    if invalid:
+        yield invalid
+        return
+    if not await _run_sync(is_vector_db_available):
+        yield VECTOR_DB_UNAVAILABLE_MESSAGE
+        return
+
+    runtime = get_runtime()
+    emergency_prompt = _emergency_prompt(question)
+
+    if quick:
+        _, _, docs = await _aprepare(runtime, question, progress=progress)
+        filtered_docs = docs[:10]
+        progress.emit("filtered", duration=0.0, count=len(filtered_docs))
+        for event in events:
+            yield event
+        prompt = _quick_prompt(question, format_context(filtered_docs))
+        try:
+            started = False
+            async for chunk in _astream_with_fallback(runtime, prompt, emergency_prompt):
+                if not started:
+                    started = True
+                    yield {"stage": "first_token", "elapsed": round(time.time() - progress.start, 3)}
+                yield chunk
+        except RequestShed as e:
+            print(f"LLM isteği düşürüldü: {e}")
+            yield BUSY_MESSAGE
+            return
+        yield f"\n\n{format_sources(filtered_docs[:5])}"
+        return
+
+    fingerprint = runtime.answer_fingerprint
+    cache_key = question.strip().lower()
+    cached_answer = await _run_sync(_lookup_cached_answer, runtime, fingerprint, cache_key)
+    if cached_answer is None:
+        cached_answer, question_embedding, docs = await _aprepare(runtime, question, fingerprint, progress)
+    else:
+        progress.emit("cache_hit")
+    for event in events:
+        yield event
+    events.clear()
+    if cached_answer is not None:
+        yield cached_answer
+        return
+    if not docs:
+        yield NO_DOCUMENTS_MESSAGE
+        return
+
+    stage_start = time.time()
+    prompt, _, filtered_docs = _build_prompt(question, docs)
+    progress.finished("filtered", stage_start, count=len(filtered_docs))
+    yield events.pop()
+    parts = []
+    try:
+        async for chunk in _astream_with_fallback(runtime, prompt, emergency_prompt):
+            if not parts:
+                yield {"stage": "first_token", "elapsed": round(time.time() - progress.start, 3)}
+            parts.append(chunk)
+            yield chunk
+    except RequestShed as e:
+        # Düşürülen istek önbelleğe yazılmaz
+        print(f"LLM isteği düşürüldü: {e}")
+        yield BUSY_MESSAGE
+        return
+    if not parts:
+        yield GENERATION_FAILED_MESSAGE
+        return
+
+    sources = f"\n\n{format_sources(filtered_docs[:15])}"
+    yield sources
+    await _run_sync(_store_answer, runtime, fingerprint, cache_key, question, question_embedding,
+                    "".join(parts) + sources)
@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - Sözcüksel (BM25) arama indeksi.
+Bu modül, kök haline getirilmiş kelimeler üzerinde dizi tabanlı bir ters indeks
+(inverted index) oluşturur, diske kaydeder ve BM25 ile sorgular. Sonuçlar vektör
+aramasıyla reciprocal-rank fusion (RRF) kullanılarak birleştirilir.
+"""
+
+import os
+import time
+
+import numpy as np
+
+from inspareai.config.constants import BM25_K1, BM25_B, RRF_K
+from inspareai.utils.text import tokenize_and_stem
+
+LEXICAL_INDEX_VERSION = 1
+
+
+class BM25Index:
+    """
+    Dizi tabanlı BM25 ters indeksi.
+
+    Terimler sıralı bir sözlükte tutulur; her terimin posting listesi (belge
+    numarası, terim frekansı) `term_offsets[i]:term_offsets[i + 1]` aralığındaki
+    bitişik dizilerdedir. Sorgu sırasında yalnızca sorgu terimlerinin posting
+    listeleri okunur ve puanlar tek bir NumPy dizisinde toplanır.
+    """
+
+    def __init__(self, doc_ids, doc_lengths, terms, term_offsets, postings_docs, postings_tfs,
+                 k1=BM25_K1, b=BM25_B, corpus_hash=None):
+        self.doc_ids = doc_ids
+        self.doc_lengths = doc_lengths.astype(np.float32)
+        self.terms = terms
+        self.term_offsets = term_offsets
+        self.postings_docs = postings_docs
+        self.postings_tfs = postings_tfs.astype(np.float32)
+        self.k1 = k1
+        self.b = b
+        self.corpus_hash = corpus_hash
+
+        doc_count = len(doc_ids)
+        self.avg_doc_length = float(self.doc_lengths.mean()) if doc_count else 0.0
+        document_frequency = np.diff(term_offsets).astype(np.float32)
+        self.idf = np.log(1.0 + (doc_count - document_frequency + 0.5) / (document_frequency + 0.5))
+        self._term_index = {term: i for i, term in enumerate(terms.tolist())}
+
+        # BM25 payda normalizasyonu belge başına bir kez hesaplanır
+        if doc_count:
+            self._length_norm = k1 * (1.0 - b + b * self.doc_lengths / max(self.avg_doc_length, 1e-9))
+        else:
+            self._length_norm = np.zeros(0, dtype=np.float32)
+
+    def __len__(self):
+        return len(self.doc_ids)
+
+    @classmethod
+    def build(cls, documents, k1=BM25_K1, b=BM25_B, corpus_hash=None):
+        """
+        (chunk_id, metin) çiftlerinden indeks oluşturur.
+
+        Args:
+            documents: (chunk_id, metin) çiftleri üreten iterable
+            k1: BM25 terim frekansı doygunluk parametresi
+            b: BM25 belge uzunluğu normalizasyon parametresi
+            corpus_hash: İndeksin oluşturulduğu korpusun özeti
+
+        Returns:
+            BM25Index: Oluşturulan indeks
+        """
+        doc_ids = []
+        doc_lengths = []
+        postings = {}
+
+        for doc_number, (doc_id, text) in enumerate(documents):
+            tokens = tokenize_and_stem(text)
+            doc_ids.append(doc_id)
+            doc_lengths.append(len(tokens))
+
+            counts = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for token, count in counts.items():
+                postings.setdefault(token, []).append((doc_number, count))
+
+        terms = sorted(postings)
+        term_offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        for i, term in enumerate(terms):
+            term_offsets[i + 1] = term_offsets[i] + len(postings[term])
+
+        postings_docs = np.empty(int(term_offsets[-1]), dtype=np.int32)
+        postings_tfs = np.empty(int(term_offsets[-1]), dtype=np.uint16)
+        for i, term in enumerate(terms):
+            entries = postings[term]
+            start, end = term_offsets[i], term_offsets[i + 1]
+            postings_docs[start:end] = [doc for doc, _ in entries]
+            postings_tfs[start:end] = [min(count, 65535) for _, count in entries]
+
+        return cls(np.array(doc_ids), np.array(doc_lengths, dtype=np.int32), np.array(terms),
+                   term_offsets, postings_docs, postings_tfs, k1=k1, b=b, corpus_hash=corpus_hash)
+
+    def save(self, path):
+        """İndeksi sıkıştırılmış npz dosyası olarak atomik şekilde kaydeder"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp.npz"
+        np.savez_compressed(
+            tmp_path,
+            version=np.array(LEXICAL_INDEX_VERSION),
+            doc_ids=self.doc_ids,
+            doc_lengths=self.doc_lengths.astype(np.int32),
+            terms=self.terms,
+            term_offsets=self.term_offsets,
+            postings_docs=self.postings_docs,
+            postings_tfs=self.postings_tfs.astype(np.uint16),
+            params=np.array([self.k1, self.b], dtype=np.float64),
+            corpus_hash=np.array(self.corpus_hash or ""),
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Kaydedilmiş indeksi yükler.
+
+        Returns:
+            BM25Index: Yüklenen indeks, dosya yoksa veya sürüm uyumsuzsa None
+        """
+        if not os.path.exists(path):
+            return None
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["version"]) != LEXICAL_INDEX_VERSION:
+                print("UYARI: Sözcüksel indeks sürümü uyumsuz, yok sayılıyor.")
+                return None
+            k1, b = data["params"].tolist()
+            return cls(data["doc_ids"], data["doc_lengths"], data["terms"], data["term_offsets"],
+                       data["postings_docs"], data["postings_tfs"], k1=k1, b=b,
+                       corpus_hash=str(data["corpus_hash"]) or None)
+
+    def search(self, query_tokens, top_k=10):
+        """
+        Kök haline getirilmiş sorgu kelimeleriyle BM25 araması yapar.
+
+        Args:
+            query_tokens (list): Sorgu kelimeleri (tokenize_and_stem çıktısı)
+            top_k (int): Döndürülecek en fazla sonuç
+
+        Returns:
+            list: (chunk_id, puan) çiftleri, puana göre azalan sırada
+        """
+        if not len(self.doc_ids):
+            return []
+
+        scores = np.zeros(len(self.doc_ids), dtype=np.float32)
+        matched = False
+        for token in set(query_tokens):
+            term = self._term_index.get(token)
+            if term is None:
+                continue
+            matched = True
+            start, end = self.term_offsets[term], self.term_offsets[term + 1]
+            docs = self.postings_docs[start:end]
+            tfs = self.postings_tfs[start:end]
+            # Her belge bir terimin posting listesinde en fazla bir kez bulunur
+            scores[docs] += self.idf[term] * tfs * (self.k1 + 1.0) / (tfs + self._length_norm[docs])
+
+        if not matched:
+            return []
+
+        candidate_count = min(top_k, int(np.count_nonzero(scores)))
+        if candidate_count == 0:
+            return []
+        top = np.argpartition(-scores, candidate_count - 1)[:candidate_count]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(str(self.doc_ids[i]), float(scores[i])) for i in top]
+
+
+def build_lexical_index(documents, path, corpus_hash=None):
+    """
+    Belgelerden BM25 indeksini oluşturur ve kaydeder.
+
+    Args:
+        documents: (chunk_id, metin) çiftleri üreten iterable
+        path: İndeks dosyasının yolu
+        corpus_hash: İndeksin oluşturulduğu korpusun özeti
+
+    Returns:
+        BM25Index: Oluşturulan indeks
+    """
+    start_time = time.time()
+    print("Sözcüksel (BM25) indeks oluşturuluyor...")
+    index = BM25Index.build(documents, corpus_hash=corpus_hash)
+    index.save(path)
+    print(f"Sözcüksel indeks oluşturuldu: {len(index)} parça, {len(index.terms)} terim, "
+          f"{time.time() - start_time:.1f} saniye")
+    return index
+
+
+def reciprocal_rank_fusion(rankings, k=RRF_K):
+    """
+    Birden fazla sıralamayı reciprocal-rank fusion ile birleştirir.
+
+    Args:
+        rankings (list): Her biri kimlik listesi olan sıralamalar (en iyi ilk)
+        k (int): RRF sabiti - büyük değerler alt sıraların etkisini artırır
+
+    Returns:
+        list: (kimlik, RRF puanı) çiftleri, puana göre azalan sırada
+    """
+    scores = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking):
+            scores[item] = scores.get(item, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(scores.items(), key=lambda pair: pair[1], reverse=True)
@@ -6,8 +6,6 @@ InspareAI - LLM Model Yapılandırması.
 Bu modül, LLM modellerin yapılandırmasını ve yönetimini içerir.
 """
 
-from langchain_ollama import OllamaLLM
-
 def create_model(model_name="llama3.1", temperature=0.5, num_threads=8):
     """
     Ana LLM modelini oluşturur.
@@ -20,6 +18,7 @@ def create_model(model_name="llama3.1", temperature=0.5, num_threads=8):
     Returns:
         OllamaLLM: Yapılandırılmış LLM modeli
     """
+    from langchain_ollama import OllamaLLM
     return OllamaLLM(
         model=model_name, 
         temperature=temperature,      # Tutarlı ama yaratıcı yanıtlar için hafif arttırıldı
@@ -41,6 +40,7 @@ def create_emergency_model():
     Returns:
         OllamaLLM: Acil durum için yapılandırılmış basit model
     """
+    from langchain_ollama import OllamaLLM
     return OllamaLLM(
         model="llama3.1", 
         temperature=0.3,
@@ -50,6 +50,9 @@ def create_emergency_model():
         num_thread=4
     )
 
-# Varsayılan model örneği
-default_model = create_model()
-emergency_model = create_emergency_model()
+# Varsayılan model örnekleri ilk erişimde çalışma zamanından oluşturulur
+def __getattr__(name):
+    if name in ("default_model", "emergency_model"):
+        from inspareai.core.runtime import get_runtime
+        return getattr(get_runtime(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,539 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - Bellek eşlemeli NumPy vektör indeksi.
+Bu modül, Chroma'ya alternatif, süreç içinde çalışan tam (exact) arama yapan bir
+vektör indeksi içerir. Parça vektörleri birim uzunlukta tek bir float32 `.npy`
+matrisinde, parça metinleri ve meta verileri ise satır başlangıçları `offsets.npy`
+dosyasında tutulan bir JSONL tablosunda saklanır. Her iki dosya da bellek
+eşlemeli (mmap) açılır; sorgu tek bir matris-vektör çarpımıdır, HNSW kaynaklı
+recall kaybı yoktur.
+
+İsteğe bağlı olarak vektörlerin int8 (boyut başına ölçekli) veya float16
+nicemlenmiş bir kopyası da yazılır. Bu durumda ilk tarama nicemlenmiş kopya
+üzerinde yapılır, yalnızca en iyi birkaç yüz aday float32 vektörlerle yeniden
+puanlanır; böylece bellekte tutulması gereken kısım int8 için ~4 kat küçülür.
+
+Oluşturma sırasında vektörler korpus üzerinde eğitilen bir PCA izdüşümüyle daha
+düşük boyuta da indirgenebilir. İzdüşüm (ortalama + bileşenler) indeksle birlikte
+saklanır ve sorgu vektörlerine otomatik olarak uygulanır.
+"""
+
+import os
+import json
+import mmap
+import time
+import shutil
+
+import numpy as np
+
+from inspareai.config.constants import (NUMPY_INDEX_DIR, VECTOR_QUANTIZATION, QUANTIZED_RESCORE_CANDIDATES,
+                                        PCA_DIMENSIONS)
+from inspareai.core.retrieval import _mmr_select, _normalize_rows
+
+NUMPY_INDEX_VERSION = 1
+
+# İndeks klasöründeki dosyalar
+EMBEDDINGS_FILE = "embeddings.npy"
+CHUNKS_FILE = "chunks.jsonl"
+OFFSETS_FILE = "offsets.npy"
+INFO_FILE = "index.json"
+QUANTIZED_FILE = "quantized.npy"
+SCALES_FILE = "scales.npy"
+PCA_FILE = "pca.npz"
+
+QUANTIZATION_TYPES = ("none", "int8", "float16")
+
+# Nicemlenmiş tarama ve nicemleme sırasında bir seferde işlenecek satır sayısı
+# (float32'ye açılan blok işlemci önbelleğine sığacak kadar küçük tutulur)
+SCAN_BLOCK_ROWS = 2048
+
+# PCA eğitimi için örneklenecek en fazla vektör ve recall ölçümündeki sorgu sayısı
+PCA_FIT_SAMPLE = 50000
+PCA_RECALL_QUERIES = 200
+PCA_RECALL_K = 10
+
+
+class NumpyRetriever:
+    """as_retriever() ile oluşturulan, LangChain retriever'ı gibi kullanılabilen basit retriever"""
+
+    def __init__(self, index, search_type="similarity", search_kwargs=None):
+        self.index = index
+        self.search_type = search_type
+        self.search_kwargs = dict(search_kwargs or {})
+
+    def invoke(self, query, **kwargs):
+        """Sorguyla ilgili belgeleri döndürür"""
+        k = self.search_kwargs.get("k", 4)
+        where = self.search_kwargs.get("filter")
+        if self.search_type == "mmr":
+            return self.index.max_marginal_relevance_search(
+                query, k=k, fetch_k=self.search_kwargs.get("fetch_k", 20),
+                lambda_mult=self.search_kwargs.get("lambda_mult", 0.5), filter=where)
+        return self.index.similarity_search(query, k=k, filter=where)
+
+    def get_relevant_documents(self, query):
+        """Eski LangChain retriever arayüzü ile uyumluluk"""
+        return self.invoke(query)
+
+
+class NumpyVectorIndex:
+    """
+    Bellek eşlemeli, tam arama yapan vektör indeksi.
+
+    Chroma vectorstore'un retrieval modülünde kullanılan kısmını sağlar:
+    similarity_search, max_marginal_relevance_search, as_retriever ve saklı
+    vektörleriyle birlikte aday getiren query_with_embeddings / get_with_embeddings.
+    """
+
+    def __init__(self, path, embedding_function=None, rescore_candidates=QUANTIZED_RESCORE_CANDIDATES):
+        """
+        Args:
+            path: İndeks klasörü
+            embedding_function: Metin sorgularını vektörleştirmek için embedding modeli
+            rescore_candidates: Nicemlenmiş taramadan sonra float32 ile yeniden puanlanacak aday sayısı
+        """
+        self.path = path
+        self.embedding_function = embedding_function
+        self.rescore_candidates = rescore_candidates
+
+        with open(os.path.join(path, INFO_FILE), 'r', encoding='utf-8') as f:
+            self.info = json.load(f)
+
+        self.embeddings = np.load(os.path.join(path, EMBEDDINGS_FILE), mmap_mode="r")
+        self.offsets = np.load(os.path.join(path, OFFSETS_FILE), mmap_mode="r")
+        self.pca_mean = None
+        self.pca_components = None
+        if os.path.exists(os.path.join(path, PCA_FILE)):
+            with np.load(os.path.join(path, PCA_FILE)) as pca:
+                self.pca_mean = pca["mean"]
+                self.pca_components = pca["components"]
+        self.quantized = None
+        self.scales = None
+        if self.quantization != "none":
+            self.quantized = np.load(os.path.join(path, QUANTIZED_FILE), mmap_mode="r")
+            if self.quantization == "int8":
+                self.scales = np.load(os.path.join(path, SCALES_FILE))
+        self._chunks_file = open(os.path.join(path, CHUNKS_FILE), 'rb')
+        self._chunks = (mmap.mmap(self._chunks_file.fileno(), 0, access=mmap.ACCESS_READ)
+                        if len(self.offsets) > 1 else b"")
+        self._ids = None
+        self._id_rows = None
+        self._metadatas = None
+
+    def __len__(self):
+        return len(self.embeddings)
+
+    @property
+    def corpus_hash(self):
+        """İndeksin oluşturulduğu korpusun özeti"""
+        return self.info.get("corpus_hash")
+
+    @property
+    def quantization(self):
+        """İlk taramada kullanılan nicemleme türü ("none", "int8" veya "float16")"""
+        return self.info.get("quantization", "none")
+
+    @property
+    def pca_dimensions(self):
+        """İndeks oluşturulurken istenen PCA boyutu (0: indirgeme yok)"""
+        return self.info.get("pca_dimensions", 0)
+
+    @classmethod
+    def load(cls, path=NUMPY_INDEX_DIR, embedding_function=None):
+        """
+        Kaydedilmiş indeksi yükler.
+
+        Returns:
+            NumpyVectorIndex: Yüklenen indeks, klasör yoksa veya sürüm uyumsuzsa None
+        """
+        info_path = os.path.join(path, INFO_FILE)
+        if not os.path.exists(info_path):
+            return None
+        try:
+            with open(info_path, 'r', encoding='utf-8') as f:
+                version = json.load(f).get("version")
+        except (OSError, ValueError) as e:
+            print(f"UYARI: NumPy indeks bilgisi okunamadı: {e}")
+            return None
+        if version != NUMPY_INDEX_VERSION:
+            print("UYARI: NumPy indeks sürümü uyumsuz, yok sayılıyor.")
+            return None
+        return cls(path, embedding_function=embedding_function)
+
+    @staticmethod
+    def build(records, count, path=NUMPY_INDEX_DIR, quantization=VECTOR_QUANTIZATION, pca_dimensions=0, **info):
+        """
+        (chunk_id, metin, meta veri, vektör) kayıtlarından indeksi diske yazar.
+        Vektörler sırayla bellek eşlemeli matrise yazılır; önce geçici klasöre
+        yazılıp tamamlandığında eski indeksin yerine taşınır.
+
+        Args:
+            records: (chunk_id, metin, meta veri, vektör) kayıtları üreten iterable
+            count: Kayıt sayısı
+            path: İndeks klasörü
+            quantization: İlk tarama kopyasının türü - "int8", "float16" veya "none"
+            pca_dimensions: Vektörlerin PCA ile indirgeneceği boyut (0: indirgeme yok)
+            **info: index.json dosyasına eklenecek bilgiler (ör. corpus_hash)
+
+        Returns:
+            int: Yazılan kayıt sayısı
+        """
+        if quantization not in QUANTIZATION_TYPES:
+            raise ValueError(f"Bilinmeyen nicemleme türü: {quantization}")
+
+        tmp_path = path + ".tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+
+        matrix = None
+        offsets = np.zeros(count + 1, dtype=np.int64)
+        written = 0
+        with open(os.path.join(tmp_path, CHUNKS_FILE), 'wb') as chunks_file:
+            for chunk_id, text, metadata, vector in records:
+                if written >= count:
+                    break
+                vector = _normalize_rows(np.asarray(vector, dtype=np.float32)[None, :])[0]
+                if matrix is None:
+                    matrix = np.lib.format.open_memmap(os.path.join(tmp_path, EMBEDDINGS_FILE), mode="w+",
+                                                       dtype=np.float32, shape=(count, len(vector)))
+                matrix[written] = vector
+                line = json.dumps([chunk_id, text, metadata or {}], ensure_ascii=False).encode('utf-8') + b"\n"
+                chunks_file.write(line)
+                offsets[written + 1] = offsets[written] + len(line)
+                written += 1
+
+        if matrix is None:
+            np.save(os.path.join(tmp_path, EMBEDDINGS_FILE), np.zeros((0, 0), dtype=np.float32))
+            dimension = 0
+        else:
+            dimension = matrix.shape[1]
+            matrix.flush()
+            del matrix
+            if written < count:
+                # Koleksiyon okuma sırasında küçüldüyse matris gerçek boyuta indirilir
+                full = np.load(os.path.join(tmp_path, EMBEDDINGS_FILE), mmap_mode="r")[:written].copy()
+                np.save(os.path.join(tmp_path, EMBEDDINGS_FILE), full)
+        np.save(os.path.join(tmp_path, OFFSETS_FILE), offsets[:written + 1])
+        if pca_dimensions:
+            pca_info = _write_pca_projection(tmp_path, pca_dimensions)
+            if pca_info:
+                info["pca"] = pca_info
+                dimension = pca_info["dimensions"]
+        if quantization != "none":
+            _write_quantized(tmp_path, quantization)
+
+        info.update({
+            "version": NUMPY_INDEX_VERSION,
+            "count": written,
+            "dimension": dimension,
+            "quantization": quantization,
+            "pca_dimensions": pca_dimensions,
+            "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        })
+        with open(os.path.join(tmp_path, INFO_FILE), 'w', encoding='utf-8') as f:
+            json.dump(info, f, ensure_ascii=False, indent=2)
+
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp_path, path)
+        return written
+
+    def _row(self, row):
+        """Bir satırın (chunk_id, metin, meta veri) kaydını JSONL tablosundan okur"""
+        return json.loads(self._chunks[int(self.offsets[row]):int(self.offsets[row + 1])])
+
+    def _document(self, row):
+        """Bir satırı Document nesnesine dönüştürür"""
+        from langchain_core.documents import Document
+
+        chunk_id, text, metadata = self._row(row)
+        return Document(page_content=text, metadata=metadata, id=chunk_id)
+
+    def _load_table(self):
+        """Kimlik ve meta veri sütunlarını ilk ihtiyaç duyulduğunda bir kez okur"""
+        if self._ids is None:
+            rows = [self._row(row) for row in range(len(self))]
+            self._ids = [chunk_id for chunk_id, _, _ in rows]
+            self._metadatas = [metadata for _, _, metadata in rows]
+            self._id_rows = {chunk_id: row for row, chunk_id in enumerate(self._ids)}
+
+    def _filter_mask(self, where):
+        """Basit eşitlik filtresini ({"alan": değer, ...}) satır maskesine dönüştürür"""
+        if any(key.startswith("$") or isinstance(value, dict) for key, value in where.items()):
+            raise ValueError("NumPy indeksi yalnızca {'alan': değer} biçimindeki eşitlik filtrelerini destekler.")
+        self._load_table()
+        return np.array([all(metadata.get(key) == value for key, value in where.items())
+                         for metadata in self._metadatas], dtype=bool)
+
+    def project_query(self, query_embedding):
+        """
+        Sorgu vektörünü indeksin vektör uzayına taşır.
+        PCA yoksa veya vektör zaten indirgenmiş boyuttaysa olduğu gibi döndürülür.
+        """
+        query = np.asarray(query_embedding, dtype=np.float32)
+        if self.pca_components is None or query.shape[-1] != self.pca_components.shape[1]:
+            return query
+        return (query - self.pca_mean) @ self.pca_components.T
+
+    def _scan_quantized(self, query):
+        """Nicemlenmiş kopya üzerinde tüm satırların yaklaşık benzerlik puanlarını hesaplar"""
+        if self.scales is not None:
+            # int8 kodları boyut başına ölçekle çarpılmış vektörlerdir: x ≈ kod * ölçek
+            query = query * self.scales
+        scores = np.empty(len(self), dtype=np.float32)
+        # Bloklar önbelleğe sığan tek bir float32 tampona açılır (her blok için yeni dizi ayrılmaz)
+        buffer = np.empty((min(SCAN_BLOCK_ROWS, len(self)), self.quantized.shape[1]), dtype=np.float32)
+        for start in range(0, len(self), SCAN_BLOCK_ROWS):
+            block = self.quantized[start:start + SCAN_BLOCK_ROWS]
+            converted = buffer[:len(block)]
+            np.copyto(converted, block, casting="unsafe")
+            np.matmul(converted, query, out=scores[start:start + len(block)])
+        return scores
+
+    def _top_rows(self, query_embedding, k, where=None):
+        """Sorguya en benzer k satırı benzerlik sırasıyla döndürür"""
+        if not len(self) or k <= 0:
+            return np.zeros(0, dtype=np.int64)
+        query = _normalize_rows(self.project_query(query_embedding)[None, :])[0]
+        quantized = self.quantized is not None
+        scores = self._scan_quantized(query) if quantized else self.embeddings @ query
+        if where:
+            scores = np.where(self._filter_mask(where), scores, -np.inf)
+            k = min(k, int(np.isfinite(scores).sum()))
+            if k <= 0:
+                return np.zeros(0, dtype=np.int64)
+        k = min(k, len(scores))
+        if not quantized:
+            top = np.argpartition(-scores, k - 1)[:k]
+            return top[np.argsort(-scores[top], kind="stable")]
+
+        # En iyi adaylar float32 vektörlerle yeniden puanlanır; okuma sırası için satırlar sıralanır
+        candidate_count = min(max(k, self.rescore_candidates), int(np.isfinite(scores).sum()))
+        candidates = np.sort(np.argpartition(-scores, candidate_count - 1)[:candidate_count])
+        exact = np.asarray(self.embeddings[candidates]) @ query
+        order = np.argsort(-exact, kind="stable")[:k]
+        return candidates[order]
+
+    def query_with_embeddings(self, query_embedding, k, where=None):
+        """
+        Sorgu vektörüne en yakın parçaları saklı vektörleriyle birlikte getirir.
+
+        Returns:
+            tuple: (belgeler listesi, (n, d) boyutlu embedding matrisi)
+        """
+        rows = self._top_rows(query_embedding, k, where)
+        return [self._document(row) for row in rows], np.asarray(self.embeddings[rows])
+
+    def get_with_embeddings(self, ids):
+        """
+        Kimliği verilen parçaları saklı vektörleriyle birlikte getirir (bulunmayanlar atlanır).
+
+        Returns:
+            tuple: (belgeler listesi, (n, d) boyutlu embedding matrisi)
+        """
+        self._load_table()
+        rows = [self._id_rows[chunk_id] for chunk_id in ids if chunk_id in self._id_rows]
+        return [self._document(row) for row in rows], np.asarray(self.embeddings[rows])
+
+    def similarity_search_by_vector(self, embedding, k=4, filter=None):
+        """Vektöre en benzer k belgeyi döndürür"""
+        return [self._document(row) for row in self._top_rows(embedding, k, filter)]
+
+    def similarity_search(self, query, k=4, filter=None):
+        """Metin sorgusuna en benzer k belgeyi döndürür"""
+        return self.similarity_search_by_vector(self.embedding_function.embed_query(query), k=k, filter=filter)
+
+    def max_marginal_relevance_search(self, query, k=4, fetch_k=20, lambda_mult=0.5, filter=None):
+        """Metin sorgusu için MMR ile hem alakalı hem çeşitli k belgeyi döndürür"""
+        query_embedding = self.project_query(self.embedding_function.embed_query(query))
+        docs, embeddings = self.query_with_embeddings(query_embedding, fetch_k, where=filter)
+        return [docs[i] for i in _mmr_select(query_embedding, embeddings, k, lambda_mult)]
+
+    def as_retriever(self, search_type="similarity", search_kwargs=None):
+        """LangChain retriever'ı gibi kullanılabilen bir retriever döndürür"""
+        return NumpyRetriever(self, search_type=search_type, search_kwargs=search_kwargs)
+
+    def close(self):
+        """Bellek eşlemeli dosyaları kapatır"""
+        if isinstance(self._chunks, mmap.mmap):
+            self._chunks.close()
+        self._chunks_file.close()
+
+
+def _projection_recall(full, reduced, k=PCA_RECALL_K, queries=PCA_RECALL_QUERIES, seed=0):
+    """
+    İndirgenmiş vektörlerle bulunan en yakın k komşunun tam boyutlu aramadaki
+    komşularla örtüşme oranını (recall@k) ölçer. Sorgu olarak rastgele seçilen
+    saklı vektörler kullanılır; vektörün kendisi sonuçlardan çıkarılır.
+    """
+    if len(full) <= k:
+        return 1.0
+    rows = np.random.default_rng(seed).choice(len(full), min(queries, len(full)), replace=False)
+    hits = 0
+    for start in range(0, len(rows), 32):
+        batch = rows[start:start + 32]
+        columns = np.arange(len(batch))
+        found = []
+        for matrix in (full, reduced):
+            scores = np.asarray(matrix) @ np.asarray(matrix[batch]).T
+            scores[batch, columns] = -np.inf
+            found.append(np.argpartition(-scores, k - 1, axis=0)[:k])
+        hits += sum(len(np.intersect1d(found[0][:, i], found[1][:, i])) for i in columns)
+    return hits / (len(rows) * k)
+
+
+def _write_pca_projection(path, dimensions):
+    """
+    Klasördeki vektörleri korpus üzerinde eğitilen PCA ile indirger.
+
+    İzdüşüm pca.npz dosyasına yazılır, embeddings.npy indirgenmiş (birim uzunlukta)
+    vektörlerle değiştirilir. scikit-learn yoksa veya boyut zaten küçükse indirgeme
+    atlanır.
+
+    Returns:
+        dict: PCA bilgileri (boyut, açıklanan varyans, recall@k), indirgeme yapılmadıysa None
+    """
+    matrix = np.load(os.path.join(path, EMBEDDINGS_FILE), mmap_mode="r")
+    if not (0 < dimensions < min(matrix.shape)):
+        print(f"UYARI: PCA boyutu ({dimensions}) vektör boyutu ve parça sayısından küçük olmalı, indirgeme atlandı.")
+        return None
+    try:
+        from sklearn.decomposition import PCA
+    except ImportError:
+        print("UYARI: scikit-learn bulunamadı, PCA indirgemesi atlandı.")
+        return None
+
+    start_time = time.time()
+    rows = np.arange(len(matrix))
+    if len(rows) > PCA_FIT_SAMPLE:
+        rows = np.sort(np.random.default_rng(0).choice(len(matrix), PCA_FIT_SAMPLE, replace=False))
+    pca = PCA(n_components=dimensions, svd_solver="randomized", random_state=0).fit(np.asarray(matrix[rows]))
+    mean = pca.mean_.astype(np.float32)
+    components = pca.components_.astype(np.float32)
+
+    reduced_path = os.path.join(path, "reduced." + EMBEDDINGS_FILE)
+    reduced = np.lib.format.open_memmap(reduced_path, mode="w+", dtype=np.float32,
+                                        shape=(len(matrix), dimensions))
+    for start in range(0, len(matrix), SCAN_BLOCK_ROWS):
+        block = np.asarray(matrix[start:start + SCAN_BLOCK_ROWS])
+        reduced[start:start + len(block)] = _normalize_rows((block - mean) @ components.T)
+    reduced.flush()
+
+    pca_info = {
+        "dimensions": dimensions,
+        "source_dimension": matrix.shape[1],
+        "explained_variance": round(float(pca.explained_variance_ratio_.sum()), 4),
+        f"recall_at_{PCA_RECALL_K}": round(_projection_recall(matrix, reduced), 4),
+    }
+    del matrix, reduced
+    np.savez(os.path.join(path, PCA_FILE), mean=mean, components=components)
+    os.replace(reduced_path, os.path.join(path, EMBEDDINGS_FILE))
+    print(f"PCA: {pca_info['source_dimension']} -> {dimensions} boyut, açıklanan varyans "
+          f"{pca_info['explained_variance']:.3f}, tam boyuta göre recall@{PCA_RECALL_K} "
+          f"{pca_info[f'recall_at_{PCA_RECALL_K}']:.3f} ({time.time() - start_time:.1f} saniye)")
+    return pca_info
+
+
+def _write_quantized(path, quantization):
+    """
+    Klasördeki float32 vektör matrisinin nicemlenmiş kopyasını bloklar halinde yazar.
+
+    int8 için her boyut ayrı ölçeklenir (ölçek = boyuttaki en büyük mutlak değer / 127);
+    vektörler birim uzunlukta olduğundan ölçekler küçük ve kararlıdır.
+    """
+    matrix = np.load(os.path.join(path, EMBEDDINGS_FILE), mmap_mode="r")
+    dtype = np.int8 if quantization == "int8" else np.float16
+    if not matrix.size:
+        np.save(os.path.join(path, QUANTIZED_FILE), np.zeros(matrix.shape, dtype=dtype))
+        if quantization == "int8":
+            np.save(os.path.join(path, SCALES_FILE), np.ones(matrix.shape[1], dtype=np.float32))
+        return
+
+    quantized = np.lib.format.open_memmap(os.path.join(path, QUANTIZED_FILE), mode="w+",
+                                          dtype=dtype, shape=matrix.shape)
+    if quantization == "int8":
+        max_abs = np.zeros(matrix.shape[1], dtype=np.float32)
+        for start in range(0, len(matrix), SCAN_BLOCK_ROWS):
+            np.maximum(max_abs, np.abs(matrix[start:start + SCAN_BLOCK_ROWS]).max(axis=0), out=max_abs)
+        scales = np.where(max_abs > 0, max_abs / 127.0, 1.0).astype(np.float32)
+        np.save(os.path.join(path, SCALES_FILE), scales)
+
+    for start in range(0, len(matrix), SCAN_BLOCK_ROWS):
+        block = np.asarray(matrix[start:start + SCAN_BLOCK_ROWS])
+        if quantization == "int8":
+            block = np.clip(np.rint(block / scales), -127, 127)
+        quantized[start:start + len(block)] = block.astype(dtype)
+    quantized.flush()
+    del quantized
+
+
+def export_numpy_index(vectorstore, path=NUMPY_INDEX_DIR, page_size=2000, **info):
+    """
+    Chroma koleksiyonundaki parçaları ve saklı vektörlerini NumPy indeksine aktarır.
+
+    Args:
+        vectorstore: Chroma vektör veritabanı
+        path: İndeks klasörü
+        page_size: Koleksiyondan bir seferde okunacak parça sayısı
+        **info: index.json dosyasına eklenecek bilgiler (ör. corpus_hash) ve
+            NumpyVectorIndex.build seçenekleri (quantization, pca_dimensions)
+
+    Returns:
+        int: Aktarılan parça sayısı
+    """
+    start_time = time.time()
+    print("NumPy vektör indeksi oluşturuluyor...")
+    collection = vectorstore._collection
+    count = collection.count()
+
+    def records():
+        offset = 0
+        while True:
+            page = collection.get(limit=page_size, offset=offset,
+                                  include=["documents", "metadatas", "embeddings"])
+            if not page["ids"]:
+                break
+            yield from zip(page["ids"], page["documents"], page["metadatas"], page["embeddings"])
+            offset += len(page["ids"])
+
+    written = NumpyVectorIndex.build(records(), count, path=path, **info)
+    print(f"NumPy vektör indeksi oluşturuldu: {written} parça, {time.time() - start_time:.1f} saniye")
+    return written
+
+
+def load_numpy_index(collection_name, embedding, path=NUMPY_INDEX_DIR, pca_dimensions=PCA_DIMENSIONS):
+    """
+    NumPy indeksini yükler; yoksa, korpus veya indeks ayarları değiştiyse Chroma
+    koleksiyonundan yeniden oluşturur.
+
+    Args:
+        collection_name: Kaynak Chroma koleksiyonunun adı
+        embedding: Sorgular için embedding modeli
+        path: İndeks klasörü
+        pca_dimensions: Vektörlerin PCA ile indirgeneceği boyut (0: indirgeme yok)
+
+    Returns:
+        NumpyVectorIndex: Güncel indeks
+    """
+    from vector import load_index_manifest
+
+    manifest = load_index_manifest() or {}
+    index = NumpyVectorIndex.load(path, embedding_function=embedding)
+    if (index is not None and manifest.get("corpus_hash") == index.corpus_hash
+            and index.info.get("collection_name") == collection_name
+            and index.quantization == VECTOR_QUANTIZATION
+            and index.pca_dimensions == pca_dimensions):
+        print(f"NumPy vektör indeksi yüklendi. {len(index)} doküman parçası mevcut.")
+        return index
+
+    if index is not None:
+        index.close()
+        print("NumPy vektör indeksi güncel değil, yeniden oluşturuluyor...")
+
+    from vector import load_vectorstore
+    vectorstore = load_vectorstore(collection_name=collection_name, embedding=embedding)
+    manifest = load_index_manifest() or {}
+    export_numpy_index(vectorstore, path=path, collection_name=collection_name, pca_dimensions=pca_dimensions,
+                       corpus_hash=manifest.get("corpus_hash"))
+    return NumpyVectorIndex.load(path, embedding_function=embedding)
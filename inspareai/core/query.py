@@ -9,61 +9,275 @@ Bu modül, kullanıcı sorgusunu işleme ve LLM yanıtı oluşturma fonksiyonlar
 import time
 import traceback
 import os
-from concurrent.futures import ThreadPoolExecutor, TimeoutError
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
+from concurrent.futures import ThreadPoolExecutor
 
-from inspareai.core.model import default_model, emergency_model
+from inspareai.core.runtime import get_runtime
 from inspareai.core.retrieval import (retrieve_relevant_documents, 
                                      filter_and_prepare_documents, 
                                      format_context, format_sources, 
-                                     save_analysis, VECTOR_DB_AVAILABLE)
+                                     save_analysis, is_vector_db_available, _embed_query)
 from inspareai.utils.text import extract_keywords
+from inspareai.utils.chunk_schema import read_chunk
 from inspareai.utils.streaming import create_academic_formatted_stream, stream_llm_response
-from inspareai.utils.cache import save_cache, clear_memory_cache, query_cache, memory_cache
+from inspareai.utils.cache import memory_cache, normalize_question
+from inspareai.utils.singleflight import SingleFlight
+from inspareai.core.scheduler import llm_priority, current_priority, RequestShed
 from inspareai.config.constants import (MIN_RESPONSE_LENGTH, PRIMARY_TIMEOUT,
-                                      SECONDARY_TIMEOUT, EMERGENCY_TIMEOUT,
-                                      DISK_CACHE_SAVE_INTERVAL)
+                                      SECONDARY_TIMEOUT, EMERGENCY_TIMEOUT)
 from inspareai.config.prompts import (SYSTEM_INSTRUCTION, QUERY_TEMPLATE,
                                     CHRONOLOGICAL_INSTRUCTION,
                                     SPEAKER_ANALYSIS_INSTRUCTION,
                                     COMPARISON_ANALYSIS_INSTRUCTION)
 
 
-def query_transcripts(question, stream_callback=None):
+INVALID_QUESTION_MESSAGE = "Lütfen geçerli bir soru girin."
+VECTOR_DB_UNAVAILABLE_MESSAGE = "Vektör veritabanı kullanılamıyor. Lütfen vector.py dosyasının varlığını kontrol edin ve uygun bir embedding modeli seçin."
+NO_DOCUMENTS_MESSAGE = "Bu soruyla ilgili bilgi bulunamadı. Lütfen farklı bir soru sorun veya daha genel bir ifade kullanın."
+GENERATION_FAILED_MESSAGE = "Şu anda yanıt oluşturulamıyor. Lütfen daha sonra tekrar deneyin."
+BUSY_MESSAGE = "Sistem şu anda yoğun; isteğiniz sırada beklerken zaman aşımına uğradı. Lütfen biraz sonra tekrar deneyin."
+QUICK_SYSTEM_INSTRUCTION = "Transkript dosyalarındaki bilgilere dayanarak kısa ve öz yanıtlar ver. Sadece ilgili bilgileri kullan."
+
+
+def _lookup_cached_answer(runtime, fingerprint, cache_key):
+    """Yanıtı bellek önbelleğinde, yoksa kalıcı yanıt deposunda arar"""
+    # Bellek önbelleğinde bu soru var mı? (Eski parmak izli kayıtlar LRU ile zamanla atılır)
+    cached_answer = memory_cache.get((fingerprint, cache_key))
+    if cached_answer is not None:
+        print("Bellek önbelleğinden yanıt alınıyor...")
+        return cached_answer
+    
+    # Kalıcı yanıt deposunda var mı? (Diğer CLI/Streamlit süreçlerinin yanıtları da buradadır)
+    cached_answer = runtime.answer_store.get(cache_key, fingerprint)
+    if cached_answer is not None:
+        print("Önbellekten yanıt alınıyor...")
+    return cached_answer
+
+
+def _lookup_semantic_answer(runtime, fingerprint, question_embedding):
+    """Anlamsal önbellekte benzer bir soru arar"""
+    semantic_hit = runtime.semantic_cache.lookup(question_embedding, fingerprint)
+    if semantic_hit is None:
+        return None
+    answer, matched_question, similarity = semantic_hit
+    print(f"Anlamsal önbellekten yanıt alınıyor (benzerlik {similarity:.3f}): \"{matched_question}\"")
+    return answer
+
+
+def _store_answer(runtime, fingerprint, cache_key, question, question_embedding, result):
+    """Yanıtı bellek, anlamsal ve kalıcı yanıt önbelleklerine kaydeder"""
+    # Bellek önbelleğine kaydet (bayt sınırı aşılırsa en eski yanıtlar atılır)
+    memory_cache.put((fingerprint, cache_key), result)
+    
+    # Anlamsal önbelleğe kaydet
+    runtime.semantic_cache.add(question, question_embedding, result, fingerprint)
+    
+    # Kalıcı yanıt deposuna kaydet
+    runtime.answer_store.put(cache_key, question, result, fingerprint)
+
+
+def _build_system_instruction(question):
+    """Soru tipine (kronolojik, konuşmacı, karşılaştırma) göre sistem talimatını oluşturur"""
+    # Her sorgu için sistem talimatının bir kopyasını oluştur
+    query_system_instruction = SYSTEM_INSTRUCTION
+    
+    # Kronolojik analiz
+    is_chronological = any(word in question.lower() for word in ["kronoloji", "zaman", "sıra", "gelişme", "tarihsel", "süreç"])
+    if is_chronological:
+        query_system_instruction += CHRONOLOGICAL_INSTRUCTION
+    
+    # Konuşmacı analizi
+    is_speaker_specific = "speaker" in question.lower() or "konuşmacı" in question.lower()
+    if is_speaker_specific:
+        query_system_instruction += SPEAKER_ANALYSIS_INSTRUCTION
+        
+    # Karşılaştırma analizi
+    is_comparison = any(word in question.lower() for word in ["karşılaştır", "fark", "benzerlik", "benzer", "farklı"])
+    if is_comparison:
+        query_system_instruction += COMPARISON_ANALYSIS_INSTRUCTION
+    
+    return query_system_instruction
+
+
+def _secondary_prompt(question, context):
+    """Birincil yanıt zaman aşımına uğradığında kullanılan basit prompt"""
+    return f"Sistem talimatı: Sen bir transkript analiz uzmanısın. \nSoru: {question}\n\nTranskriptler:\n{context[:5000]}\n\nÖzet bir analiz yap:"
+
+
+def _emergency_prompt(question):
+    """Acil durum modeli için en kısa prompt"""
+    return f"Soru: {question}\n\nYanıt ver:"
+
+
+def _quick_prompt(question, context):
+    """Hızlı yanıt modu prompt'u"""
+    return f"Sistem: {QUICK_SYSTEM_INSTRUCTION}\nSoru: {question}\nBağlam:\n{context}\n\nYanıt:"
+
+
+def _generate_until(model, prompt, deadline):
+    """
+    Yanıtı akış olarak alır; deadline (time.monotonic) aşılırsa akışı kapatıp TimeoutError yükseltir.
+    Akışın kapatılması Ollama isteğini sonlandırır ve zamanlayıcıdaki yeri hemen boşaltır;
+    zaman aşımından sonra arka planda süren bir üretim kalmaz. Sırada bekleme süresi
+    zamanlayıcının sınırıyla kısıtlıdır (aşılırsa RequestShed).
+    """
+    if time.monotonic() >= deadline:
+        raise TimeoutError("LLM yanıt süresi doldu")
+    if not (hasattr(model, 'stream') and callable(model.stream)):
+        return str(model.invoke(prompt))
+    parts = []
+    stream = model.stream(prompt)
+    try:
+        for chunk in stream:
+            parts.append(str(chunk))
+            if time.monotonic() >= deadline:
+                raise TimeoutError("LLM yanıt süresi doldu")
+    finally:
+        stream.close()
+    return "".join(parts)
+
+
+def _fallback_answer(docs, error):
+    """LLM yanıt veremediğinde getirilen belge parçalarından yapılandırılmış bir yanıt oluşturur"""
+    # Doğrudan dokümanlardan daha gelişmiş bir yanıt oluştur
+    simple_result = f"Yanıt oluşturulurken bir sorun oluştu ({str(error)}), ancak şu ilgili bilgileri buldum:\n\n"
+    
+    # Hata durumunda daha bilgilendirici ve yapılandırılmış yanıt
+    simple_result += "### İlgili Bilgi Parçaları\n\n"
+    
+    for i, doc in enumerate(docs[:7], 1):
+        chunk = read_chunk(doc)
+        source = chunk.source.split('/')[-1]
+        time_info = chunk.time if chunk.has_time else 'Zaman bilgisi yok'
+        speaker = chunk.speaker or 'Bilinmiyor'
+        content = chunk.content
+        
+        # Metni kısalt
+        content = content[:300] + ("..." if len(content) > 300 else "")
+        
+        simple_result += f"**{i}. Bilgi Parçası:**\n"
+        simple_result += f"- Kaynak: {source}\n"
+        simple_result += f"- Zaman: {time_info}\n"
+        simple_result += f"- Konuşmacı: {speaker}\n"
+        simple_result += f"- İçerik: {content}\n\n"
+    
+    return simple_result + "\nSistem şu anda yanıt üretmekte zorlanıyor. Lütfen sorunuzu daha açık bir şekilde yeniden sormayı deneyin."
+
+
+class _Progress:
+    """
+    Sorgu aşamalarını gerçek süreleriyle progress_callback'e bildirir.
+    Her olay bir sözlüktür: {"stage": ..., "elapsed": başlangıçtan beri geçen saniye, ...}.
+    Aşamalar: cache_hit, keywords (keywords, duration), retrieved (count, duration),
+    filtered (count, duration), first_token (yalnızca akışta) ve done.
+    """
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.start = time.time()
+
+    def emit(self, stage, **data):
+        """Olayı iletir; callback hataları sorguyu durdurmaz"""
+        if self.callback is None:
+            return
+        event = {"stage": stage, "elapsed": round(time.time() - self.start, 3)}
+        event.update(data)
+        try:
+            self.callback(event)
+        except Exception as e:
+            print(f"İlerleme bildirimi hatası: {e}")
+
+    def finished(self, stage, started, **data):
+        """started zamanında başlayan aşamanın bittiğini süresiyle bildirir"""
+        self.emit(stage, duration=round(time.time() - started, 3), **data)
+
+    def watch_first_token(self, stream_callback):
+        """İlk yanıt parçası geldiğinde first_token olayını gönderen akış callback'i döndürür"""
+        if self.callback is None:
+            return stream_callback
+        waiting = [True]
+
+        def callback(chunk):
+            if waiting[0]:
+                waiting[0] = False
+                self.emit("first_token")
+            stream_callback(chunk)
+        return callback
+
+
+# Aynı anda sorulan aynı sorular tek bir belge getirme ve LLM üretimiyle yanıtlanır
+_inflight = SingleFlight()
+
+
+def _inflight_key(mode, question, streaming):
+    """Eşzamanlı sorgu birleştirme anahtarı: mod, akış ve normalleştirilmiş soru"""
+    return (mode, streaming, normalize_question(question.lstrip("!")))
+
+
+def query_transcripts(question, stream_callback=None, progress_callback=None):
     """
     Ana sorgulama fonksiyonu - Performans optimizasyonlu
+    Aynı soru başka bir oturumda yanıtlanırken gelirse onun sonucunu bekler; akış
+    modunda liderin yanıt parçaları bu çağrının callback'ine de iletilir.
     
     Args:
         question: Kullanıcı sorusu
         stream_callback: Yanıtı parça parça işlemek için callback fonksiyonu
+        progress_callback: Aşama olaylarını (bkz. _Progress) alacak callback fonksiyonu.
+            Başka bir oturumun üretimine bağlanan çağrı yalnızca done olayını alır.
     """
+    progress = _Progress(progress_callback)
+    if not isinstance(question, str):
+        return _query_transcripts(question, stream_callback, progress)
+    key = _inflight_key("normal", question, stream_callback is not None)
+    if stream_callback:
+        result = _inflight.stream(key, lambda emit: _query_transcripts(question, emit, progress), stream_callback)
+    else:
+        result = _inflight.do(key, lambda: _query_transcripts(question, progress=progress))
+    progress.emit("done")
+    return result
+
+
+def _query_transcripts(question, stream_callback=None, progress=None):
+    """query_transcripts'in gövdesi - her çağrı kendi belge getirme ve LLM üretimini yapar"""
     print(f"Sorgu işleniyor: \"{question}\"")
     start_time = time.time()
+    progress = progress or _Progress()
     
     # Giriş kontrolü
     if not question or len(question.strip()) < 2:
-        return "Lütfen geçerli bir soru girin."
+        return INVALID_QUESTION_MESSAGE
         
     # Vektör veritabanı kullanılabilir mi?
-    if not VECTOR_DB_AVAILABLE:
-        return "Vektör veritabanı kullanılamıyor. Lütfen vector.py dosyasının varlığını kontrol edin ve uygun bir embedding modeli seçin."
+    if not is_vector_db_available():
+        return VECTOR_DB_UNAVAILABLE_MESSAGE
+    
+    # LLM modelleri ve LangChain bileşenleri ilk sorguda yüklenir
+    from langchain_core.prompts import ChatPromptTemplate
+    from langchain_core.output_parsers import StrOutputParser
+    runtime = get_runtime()
+    default_model = runtime.default_model
+    emergency_model = runtime.emergency_model
     
     try:
         # Performans izleme
         stage_times = {}
         
-        # Önbellekte bu soru var mı?
+        # Yanıt önbellekleri indeks ve prompt parmak iziyle etiketlenir; eski kayıtlar eşleşmez
+        fingerprint = runtime.answer_fingerprint
+        
+        # Bellek önbelleğinde veya kalıcı yanıt deposunda bu soru var mı?
         cache_key = question.strip().lower()
-        if cache_key in query_cache:
-            print("Önbellekten yanıt alınıyor...")
-            return query_cache[cache_key]
+        cached_answer = _lookup_cached_answer(runtime, fingerprint, cache_key)
+        if cached_answer is not None:
+            progress.emit("cache_hit")
+            return cached_answer
         
-        # Bellek önbelleğinde var mı?
-        if cache_key in memory_cache:
-            print("Bellek önbelleğinden yanıt alınıyor...")
-            memory_cache[cache_key]["timestamp"] = time.time()
-            return memory_cache[cache_key]["response"]
+        # Anlamsal önbellekte benzer bir soru var mı? (Sorgu vektörü belge getirmede yeniden kullanılır)
+        question_embedding = _embed_query(runtime, question)
+        cached_answer = _lookup_semantic_answer(runtime, fingerprint, question_embedding)
+        if cached_answer is not None:
+            progress.emit("cache_hit", semantic=True)
+            return cached_answer
         
         # Anahtar kelimeleri çıkar
         kw_start = time.time()
@@ -72,6 +286,7 @@ def query_transcripts(question, stream_callback=None):
         if keywords:
             print(f"Çıkarılan anahtar kelimeler: {', '.join(keywords)}")
         stage_times["anahtar_kelimeler"] = time.time() - kw_start
+        progress.finished("keywords", kw_start, keywords=list(keywords))
             
         # İlgili dokümanları getir
         retrieval_start = time.time()
@@ -87,16 +302,17 @@ def query_transcripts(question, stream_callback=None):
         
         # Doküman bulunamadıysa bildir
         if not docs:
-            no_docs_message = "Bu soruyla ilgili bilgi bulunamadı. Lütfen farklı bir soru sorun veya daha genel bir ifade kullanın."
-            return no_docs_message
+            return NO_DOCUMENTS_MESSAGE
         
         print(f"Toplam {len(docs)} ilgili belge parçası bulundu")
+        progress.finished("retrieved", retrieval_start, count=len(docs))
         
         # Belge filtreleme ve hazırlama
         filtering_start = time.time()
         print("Belgeler filtreleniyor ve hazırlanıyor...")
         filtered_docs = filter_and_prepare_documents(docs, question)
         stage_times["filtreleme"] = time.time() - filtering_start
+        progress.finished("filtered", filtering_start, count=len(filtered_docs))
             
         # Prompt hazırlama
         prompt_start = time.time()
@@ -109,25 +325,8 @@ def query_transcripts(question, stream_callback=None):
         context = format_context(filtered_docs)
         stage_times["prompt_hazirlama"] = time.time() - prompt_start
         
-        # Her sorgu için sistem talimatının bir kopyasını oluştur
-        query_system_instruction = SYSTEM_INSTRUCTION
-        
         # Özel sorgu tipi algılama ve prompt özelleştirme
-        
-        # Kronolojik analiz
-        is_chronological = any(word in question.lower() for word in ["kronoloji", "zaman", "sıra", "gelişme", "tarihsel", "süreç"])
-        if is_chronological:
-            query_system_instruction += CHRONOLOGICAL_INSTRUCTION
-        
-        # Konuşmacı analizi
-        is_speaker_specific = "speaker" in question.lower() or "konuşmacı" in question.lower()
-        if is_speaker_specific:
-            query_system_instruction += SPEAKER_ANALYSIS_INSTRUCTION
-            
-        # Karşılaştırma analizi
-        is_comparison = any(word in question.lower() for word in ["karşılaştır", "fark", "benzerlik", "benzer", "farklı"])
-        if is_comparison:
-            query_system_instruction += COMPARISON_ANALYSIS_INSTRUCTION
+        query_system_instruction = _build_system_instruction(question)
         
         # Giriş değerlerini hazırla
         input_values = {
@@ -139,9 +338,18 @@ def query_transcripts(question, stream_callback=None):
         # LLM yanıtını al
         llm_start = time.time()
         print("LLM yanıtı alınıyor...")
+        streamed_parts = []
+        if stream_callback:
+            stream_callback = progress.watch_first_token(stream_callback)
+            client_callback = stream_callback
+
+            # Başarılı akışın metni önbelleğe yazılmak üzere biriktirilir
+            def stream_callback(chunk):
+                streamed_parts.append(chunk)
+                client_callback(chunk)
         
         # Zincir fonksiyonu
-        def execute_chain():
+        def execute_chain(deadline=None):
             try:
                 # Streaming desteği ile akademik formatı kullan
                 print("Akademik formatlı streaming yanıt oluşturuluyor...")
@@ -161,9 +369,12 @@ def query_transcripts(question, stream_callback=None):
                     # Normal modda prompt'u önceden formatla
                     print("Birinci zincir yöntemi deneniyor...")
                     formatted_prompt = query_prompt.format(**input_values)
-                    response = default_model.invoke(formatted_prompt)
+                    response = _generate_until(default_model, formatted_prompt, deadline)
                     return StrOutputParser().parse(response)
-                
+            
+            except (RequestShed, TimeoutError):
+                # Düşürülen veya süresi dolan istek aynı modele yeniden gönderilmez
+                raise
             except Exception as e1:
                 print(f"Birinci zincir yöntemi başarısız: {e1}")
                 
@@ -175,17 +386,23 @@ def query_transcripts(question, stream_callback=None):
                         question=question,
                         context=context
                     )
-                    response = default_model.invoke(prompt_text)
+                    if stream_callback:
+                        response = default_model.invoke(prompt_text)
+                    else:
+                        response = _generate_until(default_model, prompt_text, deadline)
                     return StrOutputParser().parse(response)
-                    
+                
+                except (RequestShed, TimeoutError):
+                    raise
                 except Exception as e2:
                     print(f"İkinci zincir yöntemi başarısız: {e2}")
                     
                     # Son çare yöntemi
                     print("Son çare yöntemi deneniyor...")
                     direct_prompt = f"Sistem: {SYSTEM_INSTRUCTION}\n\nSoru: {question}\n\nBağlam: {context[:5000]}\n\nYanıt:"
-                    response = default_model.invoke(direct_prompt)
-                    return str(response)
+                    if stream_callback:
+                        return str(default_model.invoke(direct_prompt))
+                    return _generate_until(default_model, direct_prompt, deadline)
         
         try:
             # Streaming işlev kullanılıyorsa farklı işle
@@ -195,6 +412,8 @@ def query_transcripts(question, stream_callback=None):
                     llm_result = execute_chain()
                     # Stream modunda execute_chain() None döndürecek
                     stage_times["llm_yaniti"] = time.time() - llm_start
+                except RequestShed:
+                    raise
                 except Exception as stream_e:
                     print(f"Stream modunda hata: {stream_e}")
                     # Acil durum yanıtı oluştur
@@ -202,48 +421,60 @@ def query_transcripts(question, stream_callback=None):
                     emergency_result = stream_llm_response(emergency_model, emergency_prompt, stream_callback)
                     stage_times["llm_yaniti"] = time.time() - llm_start
                     return emergency_result
+                
+                if llm_result is None and streamed_parts:
+                    # Kaynakları da akışa ekle ve birincil akışın yanıtını önbelleklere kaydet
+                    source_info = f"\n\n{format_sources(filtered_docs[:15])}"
+                    stream_callback(source_info)
+                    result = "".join(streamed_parts)
+                    _store_answer(runtime, fingerprint, cache_key, question, question_embedding, result)
+                    print(f"Sorgu işlendi. Toplam süre: {time.time() - start_time:.2f} saniye")
+                    return result
             else:
-                # Normal mod - Paralel işleme ile zaman aşımı kontrolü
-                with ThreadPoolExecutor() as executor:
-                    future = executor.submit(execute_chain)
+                # Normal mod - zaman aşımı kademesi. Her adım kendi süresi dolunca akışı
+                # kapatır; böylece vazgeçilen üretim zamanlayıcıda yer tutmaya devam etmez.
+                try:
+                    llm_result = execute_chain(time.monotonic() + PRIMARY_TIMEOUT)
+                    
+                    # Yanıt kalitesini kontrol et
+                    if not llm_result or len(llm_result.strip()) < MIN_RESPONSE_LENGTH:
+                        raise ValueError("Yetersiz yanıt uzunluğu")
+                    
+                except RequestShed:
+                    raise
+                except TimeoutError:
+                    print(f"LLM yanıt zaman aşımı ({PRIMARY_TIMEOUT}s). İkincil yöntem deneniyor...")
+                    # İkinci deneme - daha basit prompt ile
                     try:
-                        llm_result = future.result(timeout=PRIMARY_TIMEOUT)
-                        
-                        # Yanıt kalitesini kontrol et
-                        if not llm_result or len(llm_result.strip()) < MIN_RESPONSE_LENGTH:
-                            raise ValueError("Yetersiz yanıt uzunluğu")
-                        
-                    except TimeoutError:
-                        print(f"LLM yanıt zaman aşımı ({PRIMARY_TIMEOUT}s). İkincil yöntem deneniyor...")
-                        # İkinci deneme - daha basit prompt ile
-                        try:
-                            simple_prompt = f"Sistem talimatı: Sen bir transkript analiz uzmanısın. \nSoru: {question}\n\nTranskriptler:\n{context[:5000]}\n\nÖzet bir analiz yap:"
-                            future2 = executor.submit(lambda: default_model.invoke(simple_prompt))
-                            llm_result = future2.result(timeout=SECONDARY_TIMEOUT)
-                            llm_result = str(llm_result)
-                            
-                        except (TimeoutError, Exception) as e3:
-                            print(f"İkincil deneme başarısız: {e3}")
-                            # Son çare - acil durum prompt
-                            emergency_prompt = f"Soru: {question}\n\nYanıt ver:"
-                            future3 = executor.submit(lambda: emergency_model.invoke(emergency_prompt))
-                            try:
-                                llm_result = future3.result(timeout=EMERGENCY_TIMEOUT)
-                                llm_result = str(llm_result)
-                            except Exception as e4:
-                                print(f"Acil durum yanıtı alınamadı: {e4}")
-                                return "Şu anda yanıt oluşturulamıyor. Lütfen daha sonra tekrar deneyin."
+                        simple_prompt = _secondary_prompt(question, context)
+                        llm_result = _generate_until(default_model, simple_prompt,
+                                                     time.monotonic() + SECONDARY_TIMEOUT)
                     
-                    except Exception as e:
-                        print(f"LLM yanıt hatası: {e}")
-                        # Acil durum yanıtı
+                    except RequestShed:
+                        raise
+                    except Exception as e3:
+                        print(f"İkincil deneme başarısız: {e3}")
+                        # Son çare - acil durum prompt
                         try:
-                            emergency_prompt = f"Soru: {question}\n\nYanıt ver:"
-                            llm_result = emergency_model.invoke(emergency_prompt)
-                            llm_result = str(llm_result)
-                        except Exception as ee:
-                            print(f"Acil durum yanıtı alınamadı: {ee}")
-                            return "Şu anda yanıt oluşturulamıyor. Lütfen daha sonra tekrar deneyin."
+                            llm_result = _generate_until(emergency_model, _emergency_prompt(question),
+                                                         time.monotonic() + EMERGENCY_TIMEOUT)
+                        except RequestShed:
+                            raise
+                        except Exception as e4:
+                            print(f"Acil durum yanıtı alınamadı: {e4}")
+                            return GENERATION_FAILED_MESSAGE
+                
+                except Exception as e:
+                    print(f"LLM yanıt hatası: {e}")
+                    # Acil durum yanıtı
+                    try:
+                        llm_result = _generate_until(emergency_model, _emergency_prompt(question),
+                                                     time.monotonic() + EMERGENCY_TIMEOUT)
+                    except RequestShed:
+                        raise
+                    except Exception as ee:
+                        print(f"Acil durum yanıtı alınamadı: {ee}")
+                        return GENERATION_FAILED_MESSAGE
                 
                 stage_times["llm_yaniti"] = time.time() - llm_start
                 
@@ -256,20 +487,8 @@ def query_transcripts(question, stream_callback=None):
                 # Normal mod - Kullanılan kaynakları ekle
                 result = f"{llm_result}\n\n{source_info}"
                 
-                # Bellek önbelleğine kaydet
-                memory_cache[cache_key] = {
-                    "response": result, 
-                    "timestamp": time.time()
-                }
-                
-                # Disk önbelleğine kaydet
-                query_cache[cache_key] = result
-                if len(query_cache) % DISK_CACHE_SAVE_INTERVAL == 0:
-                    save_cache()
-                
-                # Periyodik olarak bellek önbelleğini temizle
-                if len(memory_cache) % 10 == 0:
-                    clear_memory_cache()
+                # Yanıt önbelleklerine kaydet
+                _store_answer(runtime, fingerprint, cache_key, question, question_embedding, result)
                 
                 stage_times["sonlandirma"] = time.time() - formatting_start
                 
@@ -284,38 +503,18 @@ def query_transcripts(question, stream_callback=None):
                     print(f" - {stage}: {duration:.2f} saniye")
                 
                 return result
-            
+        
+        except RequestShed as e:
+            # Aşırı yükte düşürülen istek yeniden denenmez ve önbelleğe yazılmaz
+            print(f"LLM isteği düşürüldü: {e}")
+            return BUSY_MESSAGE
         except Exception as e:
             print(f"LLM yanıtı alınırken hata: {e}")
             print("=== HATA DETAYLARI ===")
             traceback.print_exc()
             print("=====================")
             
-            # Doğrudan dokümanlardan daha gelişmiş bir yanıt oluştur
-            simple_result = f"Yanıt oluşturulurken bir sorun oluştu ({str(e)}), ancak şu ilgili bilgileri buldum:\n\n"
-            
-            # Hata durumunda daha bilgilendirici ve yapılandırılmış yanıt
-            simple_result += "### İlgili Bilgi Parçaları\n\n"
-            
-            for i, doc in enumerate(docs[:7], 1):
-                source = doc.metadata.get('source', 'Bilinmiyor').split('/')[-1]
-                time_info = doc.metadata.get('time', 'Zaman bilgisi yok')
-                speaker = doc.metadata.get('speaker', 'Bilinmiyor')
-                
-                content = doc.page_content
-                if 'Content: ' in content:
-                    content = content.split('Content: ')[-1]
-                
-                # Metni kısalt
-                content = content[:300] + ("..." if len(content) > 300 else "")
-                
-                simple_result += f"**{i}. Bilgi Parçası:**\n"
-                simple_result += f"- Kaynak: {source}\n"
-                simple_result += f"- Zaman: {time_info}\n"
-                simple_result += f"- Konuşmacı: {speaker}\n"
-                simple_result += f"- İçerik: {content}\n\n"
-            
-            return simple_result + "\nSistem şu anda yanıt üretmekte zorlanıyor. Lütfen sorunuzu daha açık bir şekilde yeniden sormayı deneyin."
+            return _fallback_answer(docs, e)
         
     except Exception as e:
         print(f"Genel hata: {e}")
@@ -323,21 +522,35 @@ def query_transcripts(question, stream_callback=None):
         return f"İşlem sırasında bir hata oluştu: {str(e)}"
 
 
-def quick_query(question, stream_callback=None):
+def quick_query(question, stream_callback=None, progress_callback=None):
     """
     Hızlı yanıt modu - Optimize edilmiş ve basitleştirilmiş sorgu fonksiyonu
+    Eşzamanlı aynı sorular query_transcripts'teki gibi birleştirilir.
     
     Args:
         question: Kullanıcı sorusu
         stream_callback: Yanıtı parça parça işlemek için callback fonksiyonu
+        progress_callback: Aşama olaylarını alacak callback fonksiyonu (bkz. query_transcripts)
         
     Returns:
         str: Oluşturulan yanıt
     """
+    progress = _Progress(progress_callback)
+    key = _inflight_key("quick", question, stream_callback is not None)
+    if stream_callback:
+        result = _inflight.stream(key, lambda emit: _quick_query(question, emit, progress), stream_callback)
+    else:
+        # Akışsız hızlı sorgular "quick" sınıfında sıraya girer; parallel_query'nin "batch" önceliği korunur
+        with llm_priority("batch" if current_priority() == "batch" else "quick"):
+            result = _inflight.do(key, lambda: _quick_query(question, progress=progress))
+    progress.emit("done")
+    return result
+
+
+def _quick_query(question, stream_callback=None, progress=None):
+    """quick_query'nin gövdesi - her çağrı kendi belge getirme ve LLM üretimini yapar"""
     print(f"Hızlı yanıt modu: \"{question}\"")
-    
-    # Hızlı yanıt için daha kısa ve basit bir sistem talimatı
-    quick_system = "Transkript dosyalarındaki bilgilere dayanarak kısa ve öz yanıtlar ver. Sadece ilgili bilgileri kullan."
+    progress = progress or _Progress()
     
     # "!" işareti varsa kaldır
     if question.startswith("!"):
@@ -345,19 +558,25 @@ def quick_query(question, stream_callback=None):
         
     try:
         # Normal sorgudan daha basit ve hızlı bir işlem
+        default_model = get_runtime().default_model
+        stage_start = time.time()
         keywords = extract_keywords(question)
+        progress.finished("keywords", stage_start, keywords=list(keywords))
+        stage_start = time.time()
         docs = retrieve_relevant_documents(question, keywords)
+        progress.finished("retrieved", stage_start, count=len(docs))
         
         # Daha az sayıda belge kullan
         filtered_docs = docs[:10]
+        progress.emit("filtered", duration=0.0, count=len(filtered_docs))
         context = format_context(filtered_docs)
         
         # Daha basit prompt
-        quick_prompt = f"Sistem: {quick_system}\nSoru: {question}\nBağlam:\n{context}\n\nYanıt:"
+        quick_prompt = _quick_prompt(question, context)
         
         # Stream modunda veya normal modda çalıştır
         if stream_callback:
-            stream_llm_response(default_model, quick_prompt, stream_callback)
+            stream_llm_response(default_model, quick_prompt, progress.watch_first_token(stream_callback))
             return None
         else:
             response = default_model.invoke(quick_prompt)
@@ -366,15 +585,25 @@ def quick_query(question, stream_callback=None):
             # Kaynakları ekle
             sources = format_sources(filtered_docs[:5])
             return f"{result}\n\n{sources}"
-            
+    
+    except RequestShed as e:
+        print(f"LLM isteği düşürüldü: {e}")
+        return BUSY_MESSAGE
     except Exception as e:
         print(f"Hızlı yanıt hatası: {e}")
         return f"Hızlı yanıt oluşturulamadı: {str(e)}"
 
 
+def _batch_quick_query(question):
+    """quick_query'yi toplu iş önceliğiyle çalıştırır (bağlam thread havuzuna aktarılmaz)"""
+    with llm_priority("batch"):
+        return quick_query(question)
+
+
 def parallel_query(questions):
     """
-    Birden fazla soruyu paralel olarak işleyebilir
+    Birden fazla soruyu paralel olarak işleyebilir.
+    LLM çağrıları "batch" sınıfında sıraya girer; etkileşimli sorguların önüne geçmez.
     
     Args:
         questions: Sorulacak soruların listesi
@@ -385,7 +614,7 @@ def parallel_query(questions):
     results = []
     
     with ThreadPoolExecutor(max_workers=4) as executor:
-        futures = [executor.submit(quick_query, q) for q in questions]
+        futures = [executor.submit(_batch_quick_query, q) for q in questions]
         for future in futures:
             try:
                 results.append(future.result(timeout=60))
@@ -6,38 +6,210 @@ InspareAI - Belge İşleme ve Vektör Veritabanı Erişimi.
 Bu modül, vektör veritabanı sorgulama ve belgeleri işleme fonksiyonlarını içerir.
 """
 
-import re
 import numpy as np
 from datetime import datetime
 import os
 import concurrent.futures
 from typing import List, Dict, Any
 
-# Hata durumunda vector modülünü güvenli şekilde import et
-try:
-    from vector import retriever, vectorstore
-    VECTOR_DB_AVAILABLE = True
-except ImportError as e:
-    print(f"UYARI: vector.py dosyası bulunamadı veya içe aktarılamadı: {str(e)}")
-    VECTOR_DB_AVAILABLE = False
-    retriever = None
-    vectorstore = None
-except Exception as e:
-    print(f"UYARI: Vektör veritabanı yüklenirken hata oluştu: {str(e)}")
-    VECTOR_DB_AVAILABLE = False
-    retriever = None
-    vectorstore = None
-
 from inspareai.config.constants import (MAX_DOCUMENTS, MAX_DOCS_PER_SPEAKER, 
                                       OTHER_DOCS_LIMIT, CONTENT_MAX_LENGTH, 
                                       FILENAME_MAX_LENGTH, CHRONO_KEYWORDS, 
-                                      COMPARISON_KEYWORDS)
-from inspareai.utils.text import calculate_relevance, extract_keywords
+                                      COMPARISON_KEYWORDS, LEXICAL_TOP_K)
+from inspareai.utils.text import calculate_relevance_batch, extract_keywords
+from inspareai.utils.chunk_schema import read_chunk, chunk_speaker, chunk_time_range
+from inspareai.utils.cache import normalize_question, query_vector_cache, retrieval_cache
+from inspareai.core.runtime import get_runtime
+from inspareai.core.lexical_index import reciprocal_rank_fusion
+
+
+def is_vector_db_available():
+    """
+    Vektör veritabanının kullanılabilir olup olmadığını döndürür.
+    Veritabanı ilk çağrıda yüklenir (vector modülü içe aktarılırken yüklenmez).
+    """
+    return get_runtime().vector_db_available()
+
+
+def __getattr__(name):
+    # Geriye uyumluluk: eski modül değişkenleri ilk erişimde çalışma zamanından okunur
+    if name == "VECTOR_DB_AVAILABLE":
+        return is_vector_db_available()
+    if name in ("retriever", "vectorstore"):
+        runtime = get_runtime()
+        return getattr(runtime, name) if runtime.vector_db_available() else None
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _normalize_rows(matrix):
+    """Satır vektörlerini birim uzunluğa getirir (sıfır vektörler sıfır kalır)"""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _embed_query(runtime, question):
+    """Sorgu vektörünü bellek içi LRU önbellekten veya embedding modelinden alır"""
+    key = (runtime.embedding_model, question)
+    vector = query_vector_cache.get(key)
+    if vector is None:
+        vector = runtime.embeddings.embed_query(question)
+        query_vector_cache.put(key, vector)
+    return vector
+
+
+async def _aembed_query(runtime, question):
+    """_embed_query'nin asenkron karşılığı - aynı LRU önbelleği doldurur"""
+    key = (runtime.embedding_model, question)
+    vector = query_vector_cache.get(key)
+    if vector is None:
+        vector = await runtime.embeddings.aembed_query(question)
+        query_vector_cache.put(key, vector)
+    return vector
+
+
+def _get_documents(vectorstore, ids):
+    """
+    Kimliği verilen parçaları verilen sırayla getirir (bulunmayanlar atlanır).
+    
+    Args:
+        vectorstore: Chroma vektör veritabanı veya NumpyVectorIndex
+        ids (list): Parça kimlikleri
+        
+    Returns:
+        list: Belgeler listesi
+    """
+    from langchain_core.documents import Document
+    
+    if hasattr(vectorstore, "get_with_embeddings"):
+        return vectorstore.get_with_embeddings(ids)[0]
+    
+    results = vectorstore._collection.get(ids=list(ids), include=["documents", "metadatas"])
+    by_id = {doc_id: Document(page_content=text, metadata=metadata or {}, id=doc_id)
+             for doc_id, text, metadata in zip(results["ids"], results["documents"], results["metadatas"])}
+    return [by_id[doc_id] for doc_id in ids if doc_id in by_id]
+
+
+def _query_candidates(vectorstore, query_embedding, fetch_k, where=None):
+    """
+    Vektör veritabanından aday belgeleri saklı embedding'leriyle birlikte getirir.
+    
+    Args:
+        vectorstore: Chroma vektör veritabanı veya NumpyVectorIndex
+        query_embedding (list): Sorgu vektörü
+        fetch_k (int): Getirilecek aday sayısı
+        where (dict, optional): Metadata filtresi
+        
+    Returns:
+        tuple: (belgeler listesi, (n, d) boyutlu embedding matrisi)
+    """
+    # NumPy arka ucu adayları doğrudan kendi matrisinden getirir
+    if hasattr(vectorstore, "query_with_embeddings"):
+        return vectorstore.query_with_embeddings(query_embedding, fetch_k, where=where)
+    
+    from langchain_core.documents import Document
+    
+    results = vectorstore._collection.query(
+        query_embeddings=[query_embedding],
+        n_results=fetch_k,
+        where=where,
+        include=["documents", "metadatas", "embeddings"]
+    )
+    
+    docs = [
+        Document(page_content=text, metadata=metadata or {}, id=doc_id)
+        for doc_id, text, metadata in zip(results["ids"][0], results["documents"][0], results["metadatas"][0])
+    ]
+    embeddings = np.asarray(results["embeddings"][0], dtype=np.float32) if docs else np.zeros((0, 0), dtype=np.float32)
+    return docs, embeddings
+
+
+def _mmr_select(query_embedding, embeddings, k, lambda_mult):
+    """
+    Maximal Marginal Relevance seçimini NumPy ile yapar.
+    Benzerlik matrisi bir kez hesaplanır; her adımda yalnızca en son seçilen
+    belgeye olan benzerlikler güncellenir.
+    
+    Returns:
+        list: Seçilen adayların indeksleri (seçim sırasıyla)
+    """
+    count = len(embeddings)
+    k = min(k, count)
+    if k <= 0:
+        return []
+    
+    candidates = _normalize_rows(embeddings)
+    query = _normalize_rows(np.asarray(query_embedding, dtype=np.float32)[None, :])[0]
+    similarity_to_query = candidates @ query
+    
+    selected = [int(np.argmax(similarity_to_query))]
+    redundancy = candidates @ candidates[selected[0]]
+    mask = np.zeros(count, dtype=bool)
+    mask[selected[0]] = True
+    
+    while len(selected) < k:
+        scores = lambda_mult * similarity_to_query - (1 - lambda_mult) * redundancy
+        scores[mask] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        mask[best] = True
+        redundancy = np.maximum(redundancy, candidates @ candidates[best])
+    
+    return selected
+
+
+def _merge_lexical_results(vectorstore, lexical_index, keywords, docs, doc_embeddings):
+    """
+    Vektör sonuçlarını BM25 sonuçlarıyla reciprocal-rank fusion kullanarak birleştirir.
+    Yalnızca sözcüksel aramada bulunan parçalar saklı embedding'leriyle birlikte getirilir.
+    
+    Args:
+        vectorstore: Chroma vektör veritabanı veya NumpyVectorIndex
+        lexical_index (BM25Index): Sözcüksel indeks
+        keywords (list): Kök haline getirilmiş sorgu kelimeleri
+        docs (list): Vektör aramasından gelen belgeler (benzerlik sırasıyla)
+        doc_embeddings (array): Belgelerin saklı vektörleri
+        
+    Returns:
+        tuple: (birleştirilmiş belgeler, vektörleri)
+    """
+    from langchain_core.documents import Document
+    
+    lexical_hits = lexical_index.search(keywords, top_k=LEXICAL_TOP_K)
+    if not lexical_hits:
+        return docs, doc_embeddings
+    
+    by_id = {doc.id: (doc, embedding) for doc, embedding in zip(docs, doc_embeddings)}
+    missing_ids = [doc_id for doc_id, _ in lexical_hits if doc_id not in by_id]
+    if missing_ids and hasattr(vectorstore, "get_with_embeddings"):
+        for doc, embedding in zip(*vectorstore.get_with_embeddings(missing_ids)):
+            by_id[doc.id] = (doc, embedding)
+    elif missing_ids:
+        fetched = vectorstore._collection.get(ids=missing_ids, include=["documents", "metadatas", "embeddings"])
+        for doc_id, text, metadata, embedding in zip(fetched["ids"], fetched["documents"],
+                                                     fetched["metadatas"], fetched["embeddings"]):
+            by_id[doc_id] = (Document(page_content=text, metadata=metadata or {}, id=doc_id),
+                             np.asarray(embedding, dtype=np.float32))
+    
+    fused = reciprocal_rank_fusion([[doc.id for doc in docs], [doc_id for doc_id, _ in lexical_hits]])
+    merged = [by_id[doc_id] for doc_id, _ in fused if doc_id in by_id]
+    if not merged:
+        return docs, doc_embeddings
+    
+    return [doc for doc, _ in merged], np.stack([embedding for _, embedding in merged])
 
 
 def retrieve_relevant_documents(question, keywords=None):
     """
     Sorguyla ilgili dokümanları vektör veritabanından getirir.
+    Sorgu vektörü bir kez hesaplanır; adayların saklı embedding'leri hem MMR
+    seçiminde hem de puanlamada yeniden kullanılır. Sözcüksel (BM25) indeks varsa
+    sonuçları vektör sonuçlarıyla RRF ile birleştirilir.
+    
+    Sıralanmış parça kimlikleri ve puanları; normalleştirilmiş soru, anahtar
+    kelimeler, retriever parametreleri ve indeks parmak iziyle bellek içi LRU
+    önbellekte tutulur. Tekrarlanan sorularda yalnızca parçalar kimlikle okunur.
     
     Args:
         question (str): Kullanıcı sorusu
@@ -46,34 +218,66 @@ def retrieve_relevant_documents(question, keywords=None):
     Returns:
         list: İlgili belgelerin listesi
     """
-    if not VECTOR_DB_AVAILABLE or retriever is None:
+    if not is_vector_db_available():
         raise ValueError("Vektör veritabanı kullanılamıyor.")
+    runtime = get_runtime()
     
     if keywords is None:
         keywords = extract_keywords(question)
         
     try:
-        # Retriever'ı optimize et
-        if hasattr(retriever, 'search_kwargs'):
-            if retriever.search_kwargs.get("search_type", None) != "mmr":
-                # MMR'yi etkinleştir - çeşitliliği artırır
-                retriever.search_kwargs["search_type"] = "mmr"
-                retriever.search_kwargs["fetch_k"] = max(retriever.search_kwargs.get("fetch_k", 50), 50)
-                retriever.search_kwargs["lambda_mult"] = 0.8  # Alaka-çeşitlilik dengesi
+        # Retriever ayarları - MMR ile alaka-çeşitlilik dengesi
+        search_kwargs = getattr(runtime.retriever, 'search_kwargs', {})
+        k = search_kwargs.get("k", 8)
+        fetch_k = max(search_kwargs.get("fetch_k", 50), 50)
+        lambda_mult = 0.8
+        
+        # Aynı soru aynı indeks üzerinde daha önce yanıtlandıysa sıralamayı önbellekten al
+        cache_key = (normalize_question(question), tuple(keywords), k, fetch_k, lambda_mult,
+                     repr(search_kwargs.get("filter")), runtime.index_fingerprint)
+        cached = retrieval_cache.get(cache_key)
+        if cached is not None:
+            docs = _get_documents(runtime.vectorstore, [doc_id for doc_id, _ in cached])
+            if len(docs) == len(cached):
+                for doc, (_, score) in zip(docs, cached):
+                    if score is not None:
+                        doc.metadata["final_score"] = score
+                return docs
+        
+        # Sorgu vektörünü bir kez hesapla ve adayları embedding'leriyle getir
+        query_embedding = _embed_query(runtime, question)
+        if hasattr(runtime.vectorstore, "project_query"):
+            # İndeks vektörleri indirgenmiş bir uzaydaysa sorgu da aynı uzaya taşınır
+            query_embedding = runtime.vectorstore.project_query(query_embedding)
+        candidates, candidate_embeddings = _query_candidates(
+            runtime.vectorstore, query_embedding, fetch_k, where=search_kwargs.get("filter")
+        )
         
-        # Dokümanları getir
-        docs = retriever.invoke(question)
+        # MMR seçimi - adaylar Chroma'nın benzerlik sırasında kalır
+        selected = sorted(_mmr_select(query_embedding, candidate_embeddings, k, lambda_mult))
+        docs = [candidates[i] for i in selected]
+        doc_embeddings = candidate_embeddings[selected]
+        
+        # Vektör aramasının kaçırdığı, sorgu kelimelerini içeren parçaları BM25 ile ekle
+        lexical_index = runtime.lexical_index
+        if lexical_index is not None and keywords and search_kwargs.get("filter") is None:
+            docs, doc_embeddings = _merge_lexical_results(runtime.vectorstore, lexical_index,
+                                                          keywords, docs, doc_embeddings)
         
         # Optimize edilmiş sıralama için belgeleri puanlandır
-        docs = score_and_sort_documents(docs, question, keywords)
+        docs = score_and_sort_documents(docs, question, keywords,
+                                        query_embedding=query_embedding,
+                                        doc_embeddings=doc_embeddings)
         
+        if all(doc.id for doc in docs):
+            retrieval_cache.put(cache_key, tuple((doc.id, doc.metadata.get("final_score")) for doc in docs))
         return docs
     except Exception as e:
         print(f"Doküman getirilirken hata: {e}")
         raise e
 
 
-def score_and_sort_documents(docs, question, keywords):
+def score_and_sort_documents(docs, question, keywords, query_embedding=None, doc_embeddings=None):
     """
     Belgeleri alakalarına göre puanlandırır ve sıralar.
     
@@ -81,45 +285,48 @@ def score_and_sort_documents(docs, question, keywords):
         docs (list): Belgeler listesi
         question (str): Kullanıcı sorusu
         keywords (list): Anahtar kelimeler
+        query_embedding (list, optional): Retriever'ın hesapladığı sorgu vektörü
+        doc_embeddings (array, optional): Belgelerin veritabanındaki saklı vektörleri
         
     Returns:
         list: Sıralanmış belgeler
     """
-    def cosine_similarity(vec1, vec2):
-        vec1 = np.array(vec1)
-        vec2 = np.array(vec2)
-        if np.linalg.norm(vec1) == 0 or np.linalg.norm(vec2) == 0:
-            return 0.0
-        return float(np.dot(vec1, vec2) / (np.linalg.norm(vec1) * np.linalg.norm(vec2)))
-    
-    # Paralel puanlama için
-    if keywords and hasattr(vectorstore, 'embed_query') and hasattr(vectorstore, 'embed_documents'):
+    if not keywords:
+        return docs
+    
+    # Anahtar kelime puanları tüm belgeler için bir kez hesaplanır
+    kw_scores = calculate_relevance_batch(docs, keywords)
+    
+    if docs and query_embedding is not None and doc_embeddings is not None and len(doc_embeddings) == len(docs):
         try:
-            # Soru ve belge vektörlerini oluştur
-            question_emb = vectorstore.embed_query(question)
-            doc_texts = [doc.page_content for doc in docs]
-            doc_embs = vectorstore.embed_documents(doc_texts)
+            # Tüm benzerlikleri tek bir matris çarpımıyla hesapla
+            query = _normalize_rows(np.asarray(query_embedding, dtype=np.float32)[None, :])[0]
+            emb_scores = np.maximum(_normalize_rows(doc_embeddings) @ query, 0.0)
+            
+            question_lower = question.lower()
+            speaker_query = "speaker" in question_lower
             
             # Her belge için alaka puanını hesapla
-            for i, doc in enumerate(docs):
-                kw_score = calculate_relevance(doc, keywords)
-                emb_score = cosine_similarity(question_emb, doc_embs[i])
-                emb_score = max(emb_score, 0.0)
+            for doc, kw_score, emb_score in zip(docs, kw_scores, emb_scores):
                 kw_score_norm = min(max(kw_score / 2.0, 0.0), 1.0)
                 
                 # Puanlama formülü
-                doc.final_score = 0.75 * kw_score_norm + 0.25 * emb_score
+                final_score = 0.75 * kw_score_norm + 0.25 * float(emb_score)
                 
                 # Konuşmacı puanlaması
-                if "speaker" in question.lower() and doc.metadata.get("speaker", "").lower() in question.lower():
-                    doc.final_score *= 1.5  # Konuşmacı eşleşirse fazladan puan
+                if speaker_query and chunk_speaker(doc.metadata).lower() in question_lower:
+                    final_score *= 1.5  # Konuşmacı eşleşirse fazladan puan
+                
+                # Document alan eklemeye izin vermediği için puan metadata'da tutulur
+                doc.metadata["final_score"] = final_score
             
-            return sorted(docs, key=lambda d: getattr(d, 'final_score', 0), reverse=True)
+            return sorted(docs, key=lambda d: d.metadata.get('final_score', 0), reverse=True)
         except Exception as e:
             print(f"Gelişmiş sıralama uygulanamadı: {e}")
     
     # Varsayılan sıralama
-    return sorted(docs, key=lambda doc: calculate_relevance(doc, keywords), reverse=True) if keywords else docs
+    order = sorted(range(len(docs)), key=lambda i: kw_scores[i], reverse=True)
+    return [docs[i] for i in order]
 
 
 def filter_and_prepare_documents(docs, question):
@@ -154,8 +361,8 @@ def filter_and_prepare_documents(docs, question):
         
         if speaker_matches:
             # İlgili konuşmacıların belgelerini başa al
-            speaker_docs = [doc for doc in filtered_docs if doc.metadata.get("speaker", "").upper() in speaker_matches]
-            other_docs = [doc for doc in filtered_docs if doc.metadata.get("speaker", "").upper() not in speaker_matches]
+            speaker_docs = [doc for doc in filtered_docs if chunk_speaker(doc.metadata).upper() in speaker_matches]
+            other_docs = [doc for doc in filtered_docs if chunk_speaker(doc.metadata).upper() not in speaker_matches]
             filtered_docs = speaker_docs + other_docs[:max(OTHER_DOCS_LIMIT, MAX_DOCUMENTS-len(speaker_docs))]
     
     # Karşılaştırma analizi için belge çeşitliliği
@@ -163,7 +370,7 @@ def filter_and_prepare_documents(docs, question):
         # Farklı konuşmacılardan belgeleri dengeli şekilde dahil et
         speaker_groups = {}
         for doc in filtered_docs:
-            speaker = doc.metadata.get("speaker", "Unknown")
+            speaker = chunk_speaker(doc.metadata) or "Unknown"
             if speaker not in speaker_groups:
                 speaker_groups[speaker] = []
             speaker_groups[speaker].append(doc)
@@ -196,38 +403,23 @@ def format_context(docs):
     context_parts = []
     
     for i, doc in enumerate(docs, 1):
+        # Şema 1 ve şema 2 parçaları aynı alanlarla okunur
+        chunk = read_chunk(doc)
+        
         # Dosya adını kısalt
-        source = doc.metadata.get('source', 'Bilinmiyor')
+        source = chunk.source
         if len(source) > FILENAME_MAX_LENGTH:
             source = source[:FILENAME_MAX_LENGTH-3] + "..."
         
-        # Zaman bilgisini doğru şekilde biçimlendir
-        time_info = doc.metadata.get('time', '')
-        if not time_info or time_info == "00:00:00 - 00:00:00":
-            start_time = doc.metadata.get('start_time', '')
-            end_time = doc.metadata.get('end_time', '')
-            if start_time and end_time:
-                time_info = f"{start_time} - {end_time}"
+        time_info = chunk.time if chunk.has_time else ""
         
-        # İçeriği temizle ve biçimlendir
-        try:
-            if not hasattr(doc, 'page_content') or doc.page_content is None:
-                content = "Belge içeriği alınamadı"
-            else:
-                content = doc.page_content
-                if 'Content: ' in content:
-                    content = content.split('Content: ')[-1]
-                content = content.strip()
-            
-            # İçeriği belirli bir uzunluğa kısalt
-            if len(content) > CONTENT_MAX_LENGTH:
-                content = content[:CONTENT_MAX_LENGTH-3] + "..."
-        except Exception as e:
-            print(f"İçerik işlenirken hata: {e}")
-            content = "Belge içeriği işlenirken hata oluştu"
+        # İçeriği belirli bir uzunluğa kısalt
+        content = chunk.content.strip() or "Belge içeriği alınamadı"
+        if len(content) > CONTENT_MAX_LENGTH:
+            content = content[:CONTENT_MAX_LENGTH-3] + "..."
         
         # Belge parçasını biçimlendir
-        context_part = f"[Belge {i}]\nDosya: {source}\nZaman: {time_info}\nKonuşmacı: {doc.metadata.get('speaker', 'Bilinmiyor')}\nİçerik: {content}"
+        context_part = f"[Belge {i}]\nDosya: {source}\nZaman: {time_info}\nKonuşmacı: {chunk.speaker or 'Bilinmiyor'}\nİçerik: {content}"
         context_parts.append(context_part)
     
     return "\n\n".join(context_parts)
@@ -244,18 +436,8 @@ def sort_documents_chronologically(docs):
         list: Kronolojik olarak sıralanmış belgeler
     """
     def extract_time(doc):
-        """Belgeden zaman bilgisini çıkarır"""
-        time_str = doc.metadata.get('time', '')
-        
-        if not time_str or time_str == "00:00:00 - 00:00:00":
-            start_time = doc.metadata.get('start_time', '00:00:00')
-            return start_time
-        
-        # Zaman bilgisini ayrıştır
-        match = re.search(r'(\d+:\d+:\d+)', time_str)
-        if match:
-            return match.group(1)
-        return "00:00:00"
+        """Belgenin başlangıç saniyesini döndürür"""
+        return chunk_time_range(doc.metadata)[0]
     
     # Belgeleri zamanına göre sırala
     try:
@@ -284,41 +466,14 @@ def format_sources(docs):
     
     # Her bir dokümanı işle ve dosyalara göre grupla
     for i, doc in enumerate(docs, 1):
-        source = doc.metadata.get("source", "Bilinmiyor")
-        
-        # Zaman bilgisini doğrudan metadata'dan al
-        time_info = doc.metadata.get("time", "")
-        
-        # Eğer time bilgisi yoksa veya varsayılan değerse, start_time ve end_time'ı kontrol et
-        if not time_info or time_info == "Bilinmiyor" or time_info == "00:00:00 - 00:00:00":
-            start_time = doc.metadata.get("start_time", "")
-            end_time = doc.metadata.get("end_time", "")
-            if start_time and end_time:
-                # Varsayılan değerleri kontrol et
-                if start_time != "00:00:00" or end_time != "00:00:00":
-                    time_info = f"{start_time} - {end_time}"
-                else:
-                    # İçerikte zaman bilgisi var mı kontrol et
-                    content = doc.page_content
-                    time_match = re.search(r"Time:\s*(\d+:\d+:\d+\s*-\s*\d+:\d+:\d+)", content)
-                    if time_match:
-                        time_info = time_match.group(1)
-                    else:
-                        time_info = "Zaman bilgisi yok"
-            else:
-                time_info = "Zaman bilgisi yok"
-        
-        # Konuşmacı bilgisini al
-        speaker = doc.metadata.get("speaker", "Bilinmiyor")
-        if speaker == "Bilinmiyor":
-            # İçerikte konuşmacı bilgisi var mı kontrol et
-            content = doc.page_content
-            speaker_match = re.search(r"Speaker:\s*([A-Za-z0-9]+)", content)
-            if speaker_match:
-                speaker = speaker_match.group(1)
+        # Kaynak, zaman ve konuşmacı bilgisi şemadan bağımsız okunur
+        chunk = read_chunk(doc)
+        source = chunk.source
+        time_info = chunk.time if chunk.has_time else "Zaman bilgisi yok"
+        speaker = chunk.speaker or "Bilinmiyor"
         
         # İçerik örneği (ilk 50 karakter)
-        content = doc.page_content.split('Content: ')[-1] if 'Content: ' in doc.page_content else doc.page_content
+        content = chunk.content
         content_preview = content[:50] + "..." if len(content) > 50 else content
         
         # Dosya bazlı gruplama
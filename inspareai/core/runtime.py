@@ -0,0 +1,302 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - Çalışma zamanı bileşenleri.
+Bu modül, embedding modeli, vektör veritabanı, retriever ve LLM modelleri gibi
+pahalı bileşenleri ilk kullanıldıklarında oluşturan ve saklayan Runtime nesnesini içerir.
+Modüllerin içe aktarılması bu bileşenleri oluşturmaz; böylece `--version`, testler ve
+Streamlit açılışı yalnızca gerçekten kullandıkları bileşenlerin bedelini öder.
+"""
+
+import os
+import time
+import threading
+
+from inspareai.config.constants import VECTOR_BACKEND, PCA_DIMENSIONS, INDEX_MANIFEST_FILE
+
+# Desteklenen vektör arama arka uçları
+VECTOR_BACKENDS = ("chroma", "numpy")
+
+# Retriever için varsayılan arama parametreleri
+RETRIEVER_SEARCH_KWARGS = {
+    "k": 8,                # Transkriptlerden 8 en alakalı sonuç
+    "fetch_k": 30,         # Daha az aday (daha hızlı işleme)
+    "lambda_mult": 0.7,    # Çeşitlilik için lambda değeri düşürüldü
+    "filter": None         # Gerektiğinde filtre eklemek için hazır
+}
+
+# Başarısız oluşturulan bileşen bu süre (saniye) boyunca yeniden denenmez
+FAILURE_BACKOFF_SECONDS = 10.0
+
+# İndeks manifesti değiştiğinde (başka bir süreç yeniden indeksledi) yeniden yüklenen bileşenler
+INDEX_DEPENDENT_KEYS = ("index_fingerprint", "source_table", "lexical_index", "vectorstore", "retriever")
+
+# Manifest henüz hiç kontrol edilmedi
+_UNSEEN = object()
+
+
+class Runtime:
+    """
+    Tembel (lazy) ve tek seferlik oluşturulan çalışma zamanı bileşenleri.
+
+    Her bileşen ilk erişimde fabrika fonksiyonu ile oluşturulur ve saklanır.
+    Oluşturma sırasında hata olursa hata FAILURE_BACKOFF_SECONDS boyunca saklanır ve
+    bu sürede tekrar denenmeden yeniden fırlatılır; süre dolunca (veya reset() ile)
+    bileşen yeniden oluşturulmaya çalışılır. Böylece geçici bir sorun (ör. Ollama henüz
+    açılmamış) süreç yeniden başlatılana kadar kalıcı olmaz.
+    """
+
+    def __init__(self, embedding_model="nomic-embed-text", collection_name="turkce_transkript",
+                 vector_backend=VECTOR_BACKEND, pca_dimensions=PCA_DIMENSIONS):
+        """
+        Args:
+            embedding_model: Kullanılacak embedding modelinin adı
+            collection_name: Vektör veritabanı koleksiyonunun adı
+            vector_backend: Vektör arama arka ucu - "chroma" veya "numpy"
+            pca_dimensions: NumPy indeksinde PCA ile indirgenecek boyut (0: indirgeme yok)
+        """
+        if vector_backend not in VECTOR_BACKENDS:
+            print(f"UYARI: Bilinmeyen vektör arka ucu '{vector_backend}', 'chroma' kullanılacak.")
+            vector_backend = "chroma"
+        self.embedding_model = embedding_model
+        self.collection_name = collection_name
+        self.vector_backend = vector_backend
+        self.pca_dimensions = pca_dimensions
+        self._instances = {}
+        self._errors = {}
+        self._lock = threading.RLock()
+        self._manifest_stamp = _UNSEEN
+
+    def _get(self, key, factory):
+        """Bileşeni bir kez oluşturur ve saklar (thread-safe)"""
+        if key in self._instances:
+            return self._instances[key]
+
+        with self._lock:
+            if key in self._instances:
+                return self._instances[key]
+            if key in self._errors:
+                error, retry_at = self._errors[key]
+                if time.monotonic() < retry_at:
+                    raise error
+            try:
+                instance = factory()
+            except Exception as e:
+                self._errors[key] = (e, time.monotonic() + FAILURE_BACKOFF_SECONDS)
+                raise
+            self._errors.pop(key, None)
+            self._instances[key] = instance
+            return instance
+
+    def is_loaded(self, key):
+        """Bileşenin oluşturulmuş olup olmadığını döndürür"""
+        return key in self._instances
+
+    def configure(self, embedding_model=None, collection_name=None, vector_backend=None, pca_dimensions=None):
+        """Ayarları değiştirir ve etkilenen bileşenleri sıfırlar"""
+        with self._lock:
+            if pca_dimensions is not None and pca_dimensions != self.pca_dimensions:
+                if pca_dimensions < 0:
+                    raise ValueError(f"Geçersiz PCA boyutu: {pca_dimensions}")
+                self.pca_dimensions = pca_dimensions
+                self.reset("index_fingerprint")
+                if self.vector_backend == "numpy":
+                    self.reset("vectorstore", "retriever")
+            if vector_backend is not None and vector_backend != self.vector_backend:
+                if vector_backend not in VECTOR_BACKENDS:
+                    raise ValueError(f"Bilinmeyen vektör arka ucu: {vector_backend}")
+                self.vector_backend = vector_backend
+                self.reset("vectorstore", "retriever", "index_fingerprint")
+            if embedding_model is not None and embedding_model != self.embedding_model:
+                self.embedding_model = embedding_model
+                self.reset("embeddings", "vectorstore", "retriever", "lexical_index", "index_fingerprint")
+            if collection_name is not None and collection_name != self.collection_name:
+                self.collection_name = collection_name
+                self.reset("vectorstore", "retriever", "lexical_index", "source_table", "index_fingerprint")
+
+    def reset(self, *keys):
+        """Belirtilen (veya tüm) bileşenleri ve saklanan hataları temizler"""
+        with self._lock:
+            for key in keys or list(self._instances) + list(self._errors):
+                self._instances.pop(key, None)
+                self._errors.pop(key, None)
+
+    @property
+    def embeddings(self):
+        """Önbellekli embedding modeli"""
+        def factory():
+            from vector import create_embeddings
+            return create_embeddings(self.embedding_model)
+        return self._get("embeddings", factory)
+
+    @property
+    def vectorstore(self):
+        """Vektör veritabanı - Chroma veya NumPy indeksi (yoksa oluşturulur)"""
+        def factory():
+            if self.vector_backend == "numpy":
+                from inspareai.core.numpy_index import load_numpy_index
+                return load_numpy_index(self.collection_name, self.embeddings,
+                                        pca_dimensions=self.pca_dimensions)
+            from vector import load_vectorstore
+            return load_vectorstore(collection_name=self.collection_name, embedding=self.embeddings)
+        return self._get("vectorstore", factory)
+
+    @property
+    def retriever(self):
+        """MMR tabanlı retriever"""
+        def factory():
+            return self.vectorstore.as_retriever(
+                search_type="mmr",        # Maximum Marginal Relevance - hem alakalı hem de çeşitli sonuçlar
+                search_kwargs=dict(RETRIEVER_SEARCH_KWARGS)
+            )
+        return self._get("retriever", factory)
+
+    @property
+    def lexical_index(self):
+        """BM25 sözcüksel indeksi (oluşturulmamışsa None)"""
+        def factory():
+            from inspareai.core.lexical_index import BM25Index
+            from inspareai.config.constants import LEXICAL_INDEX_FILE
+            index = BM25Index.load(LEXICAL_INDEX_FILE)
+            if index is None:
+                print("UYARI: Sözcüksel indeks bulunamadı, yalnızca vektör araması kullanılacak. "
+                      "Oluşturmak için: python vector.py --incremental")
+            return index
+        return self._get("lexical_index", factory)
+
+    @property
+    def source_table(self):
+        """İndeks manifestindeki dosya tablosu: kaynak numarası -> dosya adı"""
+        def factory():
+            from vector import load_index_manifest
+            manifest = load_index_manifest() or {}
+            return {int(source_id): filename for source_id, filename in manifest.get("sources", {}).items()}
+        return self._get("source_table", factory)
+
+    def _check_index_manifest(self):
+        """
+        İndeks manifesti başka bir süreçte (ör. `python vector.py --incremental`) yeniden
+        yazıldıysa parmak izini ve indekse bağlı bileşenleri sıfırlar; böylece çalışan
+        Streamlit veya `inspareai serve` süreci yeniden başlatılmadan güncel indeksi kullanır.
+        Her çağrıda yalnızca manifestin mtime ve boyutuna bakılır.
+        """
+        try:
+            stat = os.stat(INDEX_MANIFEST_FILE)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            stamp = None
+        if stamp == self._manifest_stamp:
+            return
+        with self._lock:
+            if stamp == self._manifest_stamp:
+                return
+            changed = self._manifest_stamp is not _UNSEEN
+            self._manifest_stamp = stamp
+            if changed:
+                print("İndeks manifesti değişti; indeks bileşenleri yeniden yüklenecek.")
+                self.reset(*INDEX_DEPENDENT_KEYS)
+
+    @property
+    def index_fingerprint(self):
+        """
+        Arama indeksinin parmak izi - belge getirme önbelleği kayıtları bununla etiketlenir.
+        Korpus özeti, embedding modeli, parça parametreleri ve arama ayarlarından oluşur;
+        indeks değiştiğinde eski kayıtlar eşleşmez. İndeks manifesti değiştiğinde yeniden hesaplanır.
+        """
+        self._check_index_manifest()
+
+        def factory():
+            from vector import load_index_manifest
+            from inspareai.utils.fingerprint import index_fingerprint
+            return index_fingerprint(load_index_manifest(), self.collection_name, self.embedding_model,
+                                     self.vector_backend, self.pca_dimensions)
+        return self._get("index_fingerprint", factory)
+
+    @property
+    def answer_fingerprint(self):
+        """Yanıt önbelleklerinin parmak izi - indeks parmak izi ve prompt şablonlarının özeti"""
+        from inspareai.utils.fingerprint import answer_fingerprint
+        return answer_fingerprint(self.index_fingerprint)
+
+    @property
+    def answer_store(self):
+        """Süreçler arasında paylaşılan kalıcı yanıt deposu (eski JSON önbelleği ilk açılışta aktarılır)"""
+        def factory():
+            from inspareai.utils.answer_store import AnswerStore
+            from inspareai.config.constants import CACHE_FILE
+            store = AnswerStore()
+            # Eski yanıtlar güncel indeksle üretilmiş kabul edilir
+            store.import_json(CACHE_FILE, self.answer_fingerprint)
+            return store
+        return self._get("answer_store", factory)
+
+    @property
+    def semantic_cache(self):
+        """Soru benzerliğiyle eşleşen anlamsal yanıt önbelleği"""
+        def factory():
+            from inspareai.utils.semantic_cache import SemanticAnswerCache
+            return SemanticAnswerCache()
+        return self._get("semantic_cache", factory)
+
+    @property
+    def scheduler(self):
+        """Modellere giden eşzamanlı üretimleri sınırlayan öncelikli zamanlayıcı"""
+        def factory():
+            from inspareai.core.scheduler import LLMScheduler
+            return LLMScheduler()
+        return self._get("scheduler", factory)
+
+    @property
+    def default_model(self):
+        """Ana LLM modeli (zamanlayıcının arkasında)"""
+        def factory():
+            from inspareai.core.model import create_model
+            from inspareai.core.scheduler import ScheduledModel
+            return ScheduledModel(create_model(), self.scheduler)
+        return self._get("default_model", factory)
+
+    @property
+    def emergency_model(self):
+        """Acil durum LLM modeli (zamanlayıcının arkasında)"""
+        def factory():
+            from inspareai.core.model import create_emergency_model
+            from inspareai.core.scheduler import ScheduledModel
+            return ScheduledModel(create_emergency_model(), self.scheduler)
+        return self._get("emergency_model", factory)
+
+    def vector_db_available(self):
+        """
+        Vektör veritabanının kullanılabilir olup olmadığını kontrol eder.
+        İlk çağrıda veritabanını yükler; hata olursa bir kez uyarı verir ve False döndürür.
+        """
+        already_failed = "retriever" in self._errors
+        try:
+            self.retriever
+            return True
+        except ImportError as e:
+            if not already_failed:
+                print(f"UYARI: vector.py dosyası bulunamadı veya içe aktarılamadı: {str(e)}")
+        except Exception as e:
+            if not already_failed:
+                print(f"UYARI: Vektör veritabanı yüklenirken hata oluştu: {str(e)}")
+        return False
+
+
+_runtime = None
+_runtime_lock = threading.Lock()
+
+
+def get_runtime():
+    """
+    Uygulama genelinde paylaşılan Runtime nesnesini döndürür.
+
+    Returns:
+        Runtime: Paylaşılan çalışma zamanı nesnesi
+    """
+    global _runtime
+    if _runtime is None:
+        with _runtime_lock:
+            if _runtime is None:
+                _runtime = Runtime()
+    return _runtime
@@ -0,0 +1,269 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - LLM istek zamanlayıcısı.
+Ollama aynı anda sınırlı sayıda üretimi verimli çalıştırabilir; fazlası tüm isteklerin
+gecikmesini birlikte artırır. LLMScheduler, modele aynı anda giden üretim sayısını
+LLM_MAX_CONCURRENCY ile sınırlar ve bekleyen işleri öncelik sınıflarına göre sıraya koyar:
+
+    interactive  Kullanıcının yanıtı beklediği/izlediği sorgular (akış ve normal mod)
+    quick        Hızlı mod sorguları
+    batch        parallel_query gibi toplu işler
+
+Boşalan yer her zaman en yüksek öncelikli sınıfın en eski işine verilir. Sırada sınıfının
+bekleme süresini (LLM_QUEUE_DEADLINES) aşan iş modele hiç gönderilmeden RequestShed ile
+düşürülür. ScheduledModel, model nesnesini sarar; böylece invoke/stream/ainvoke/astream
+çağıran kodun değişmesi gerekmez. Çağrının önceliği llm_priority() bağlamından okunur.
+"""
+
+import time
+import heapq
+import asyncio
+import itertools
+import threading
+import contextvars
+from collections import deque
+from contextlib import contextmanager, asynccontextmanager
+
+from inspareai.config.constants import LLM_MAX_CONCURRENCY, LLM_QUEUE_DEADLINES
+
+# Öncelik sınıfları (küçük değer önce çalışır)
+PRIORITIES = {"interactive": 0, "quick": 1, "batch": 2}
+
+# Bekleme süresi metrikleri için saklanacak son ölçüm sayısı
+_QUEUE_TIME_SAMPLES = 1000
+
+_current_priority = contextvars.ContextVar("inspareai_llm_priority", default="interactive")
+
+
+@contextmanager
+def llm_priority(name):
+    """
+    Bu bağlamda yapılan LLM çağrılarının öncelik sınıfını belirler.
+    Bağlam, asyncio görevlerine kendiliğinden aktarılır; thread havuzlarına aktarılmaz.
+    """
+    if name not in PRIORITIES:
+        raise ValueError(f"Bilinmeyen öncelik sınıfı: {name}")
+    token = _current_priority.set(name)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority():
+    """Geçerli bağlamın öncelik sınıfını döndürür"""
+    return _current_priority.get()
+
+
+class RequestShed(Exception):
+    """Sırada bekleme süresini aşan iş modele gönderilmeden düşürüldüğünde yükseltilir"""
+
+
+class _Waiter:
+    """Sırada bekleyen tek bir LLM çağrısı"""
+
+    __slots__ = ("priority", "enqueued", "deadline", "state", "event", "future", "loop")
+
+    def __init__(self, priority, deadline):
+        self.priority = priority
+        self.enqueued = time.monotonic()
+        self.deadline = self.enqueued + deadline
+        self.state = "waiting"         # waiting -> granted | shed | abandoned
+        self.event = None
+        self.future = None
+        self.loop = None
+
+    def wake(self):
+        """Bekleyen thread'i veya eş yordamı uyandırır"""
+        if self.event is not None:
+            self.event.set()
+        elif self.future is not None:
+            self.loop.call_soon_threadsafe(_resolve, self.future)
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class LLMScheduler:
+    """
+    Eşzamanlı LLM üretimlerini sınırlayan, öncelik sıralı ve thread-safe zamanlayıcı.
+    Hem thread'lerden (slot) hem asyncio görevlerinden (aslot) kullanılabilir.
+    """
+
+    def __init__(self, max_concurrent=LLM_MAX_CONCURRENCY, deadlines=None):
+        """
+        Args:
+            max_concurrent: Modele aynı anda gidebilecek en fazla üretim sayısı
+            deadlines: Sınıf başına sırada en fazla bekleme süresi (saniye)
+        """
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.deadlines = dict(LLM_QUEUE_DEADLINES if deadlines is None else deadlines)
+        self.running = 0
+        self._lock = threading.Lock()
+        self._queue = []
+        self._seq = itertools.count()
+        self._counters = {name: {"submitted": 0, "started": 0, "shed": 0} for name in PRIORITIES}
+        self._queue_times = {name: deque(maxlen=_QUEUE_TIME_SAMPLES) for name in PRIORITIES}
+
+    def _new_waiter(self, priority):
+        name = priority or current_priority()
+        if name not in PRIORITIES:
+            raise ValueError(f"Bilinmeyen öncelik sınıfı: {name}")
+        return _Waiter(name, self.deadlines[name])
+
+    def _start_locked(self, waiter):
+        """İşe yer verir ve bekleme süresini kaydeder (kilit tutulurken çağrılır)"""
+        waiter.state = "granted"
+        self.running += 1
+        self._counters[waiter.priority]["started"] += 1
+        self._queue_times[waiter.priority].append(time.monotonic() - waiter.enqueued)
+
+    def _shed_locked(self, waiter):
+        waiter.state = "shed"
+        self._counters[waiter.priority]["shed"] += 1
+
+    def _admit(self, waiter):
+        """İşi sıraya ekler ve boş yer varsa hemen başlatır. Başladıysa True döner."""
+        with self._lock:
+            self._counters[waiter.priority]["submitted"] += 1
+            heapq.heappush(self._queue, (PRIORITIES[waiter.priority], next(self._seq), waiter))
+            self._grant_next_locked()
+            return waiter.state == "granted"
+
+    def _grant_next_locked(self):
+        """Boşalan yerleri sıradaki en öncelikli işlere verir; süresi dolanları düşürür"""
+        now = time.monotonic()
+        while self._queue and self.running < self.max_concurrent:
+            _, _, waiter = heapq.heappop(self._queue)
+            if waiter.state != "waiting":
+                continue
+            if now > waiter.deadline:
+                self._shed_locked(waiter)
+            else:
+                self._start_locked(waiter)
+            waiter.wake()
+
+    def _settle(self, waiter):
+        """Bekleme bittiğinde işin başlayıp başlamadığını kesinleştirir"""
+        with self._lock:
+            if waiter.state == "waiting":
+                # Sıradan lazy olarak çıkarılır: _grant_next_locked bu kaydı atlar
+                self._shed_locked(waiter)
+            if waiter.state == "granted":
+                return
+        waited = time.monotonic() - waiter.enqueued
+        raise RequestShed(f"LLM isteği sırada {waited:.1f} saniye bekledi ve düşürüldü "
+                          f"(sınıf: {waiter.priority}, sınır: {self.deadlines[waiter.priority]} sn)")
+
+    def release(self):
+        """Üretim bittiğinde yeri boşaltır"""
+        with self._lock:
+            self.running -= 1
+            self._grant_next_locked()
+
+    def acquire(self, priority=None):
+        """Yer açılana kadar thread'i bekletir; süre dolarsa RequestShed yükseltir"""
+        waiter = self._new_waiter(priority)
+        waiter.event = threading.Event()
+        if not self._admit(waiter):
+            waiter.event.wait(max(0.0, waiter.deadline - time.monotonic()))
+            self._settle(waiter)
+
+    async def aacquire(self, priority=None):
+        """acquire'ın event loop'u bloklamayan karşılığı"""
+        waiter = self._new_waiter(priority)
+        waiter.loop = asyncio.get_running_loop()
+        waiter.future = waiter.loop.create_future()
+        if self._admit(waiter):
+            return
+        try:
+            await asyncio.wait_for(waiter.future, max(0.0, waiter.deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            pass
+        except asyncio.CancelledError:
+            # Çağıran vazgeçti (ör. zaman aşımı): verilmiş yer varsa geri bırakılır
+            with self._lock:
+                granted = waiter.state == "granted"
+                if not granted:
+                    waiter.state = "abandoned"
+            if granted:
+                self.release()
+            raise
+        self._settle(waiter)
+
+    @contextmanager
+    def slot(self, priority=None):
+        """Bağlam boyunca bir üretim yeri tutar"""
+        self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    @asynccontextmanager
+    async def aslot(self, priority=None):
+        """slot'un asyncio karşılığı"""
+        await self.aacquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self):
+        """Çalışan/bekleyen iş sayıları ile sınıf başına bekleme süresi metriklerini döndürür"""
+        with self._lock:
+            queued = {name: 0 for name in PRIORITIES}
+            for _, _, waiter in self._queue:
+                if waiter.state == "waiting":
+                    queued[waiter.priority] += 1
+            classes = {}
+            for name in PRIORITIES:
+                times = sorted(self._queue_times[name])
+                classes[name] = dict(
+                    self._counters[name],
+                    queued=queued[name],
+                    avg_queue_time=round(sum(times) / len(times), 4) if times else 0.0,
+                    p95_queue_time=round(times[min(len(times) - 1, int(len(times) * 0.95))], 4) if times else 0.0,
+                    max_queue_time=round(times[-1], 4) if times else 0.0,
+                )
+            return {"max_concurrent": self.max_concurrent, "running": self.running, "classes": classes}
+
+
+class ScheduledModel:
+    """
+    LLM nesnesini zamanlayıcının arkasına koyan ince sarmalayıcı.
+    Üretim yapan çağrılar bir yer alana kadar bekler; diğer öznitelikler modele iletilir.
+    """
+
+    def __init__(self, model, scheduler):
+        self.model = model
+        self.scheduler = scheduler
+
+    def invoke(self, *args, **kwargs):
+        with self.scheduler.slot():
+            return self.model.invoke(*args, **kwargs)
+
+    def stream(self, *args, **kwargs):
+        # Öncelik, generator ilk tüketildiğinde değil çağrı anında okunur
+        priority = current_priority()
+
+        def generate():
+            with self.scheduler.slot(priority):
+                yield from self.model.stream(*args, **kwargs)
+        return generate()
+
+    async def ainvoke(self, *args, **kwargs):
+        async with self.scheduler.aslot():
+            return await self.model.ainvoke(*args, **kwargs)
+
+    async def astream(self, *args, **kwargs):
+        async with self.scheduler.aslot():
+            async for chunk in self.model.astream(*args, **kwargs):
+                yield chunk
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - Kalıcı yanıt deposu.
+Bu modül, üretilen yanıtları soru anahtarıyla tek bir SQLite dosyasında (WAL
+modunda) saklar. Her yanıt tek bir satır olarak eklenir; okuma birincil anahtar
+üzerinden yapılır. Süresi dolan (TTL) kayıtlar okunmaz ve silinir, kayıt sayısı
+sınırı aşıldığında en uzun süredir kullanılmayanlar silinir. Kayıtlar yanıt
+parmak iziyle etiketlenir; farklı parmak iziyle okunan kayıt o anda silinir. Aynı makinedeki
+birden fazla CLI/Streamlit süreci aynı dosyayı eşzamanlı kullanabilir.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+
+from inspareai.config.constants import ANSWER_STORE_FILE, ANSWER_CACHE_TTL, ANSWER_CACHE_MAX_ENTRIES
+from inspareai.utils.sqlite_lru import evict_least_recently_used
+
+# Başka bir süreç yazarken beklenecek en uzun süre (saniye)
+_BUSY_TIMEOUT = 30
+
+
+class AnswerStore:
+    """
+    SQLite tabanlı, süre ve boyut sınırlı yanıt deposu.
+
+    Kayıtlar (key, question, answer, created_at, last_access, fingerprint) satırlarıdır.
+    created_at + ttl geçmiş kayıtlar bulunmamış sayılır; kayıt sayısı
+    max_entries değerini aştığında en eski erişilen kayıtlar silinir.
+    """
+
+    def __init__(self, path=ANSWER_STORE_FILE, ttl=ANSWER_CACHE_TTL, max_entries=ANSWER_CACHE_MAX_ENTRIES):
+        """
+        Args:
+            path: SQLite dosyasının yolu
+            ttl: Kayıtların geçerlilik süresi (saniye, None ise süresiz)
+            max_entries: Saklanacak en fazla yanıt sayısı (None ise sınırsız)
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # WAL modunda okuyucular yazarı beklemez; yazarlar birbirini busy timeout kadar bekler
+        self._conn = sqlite3.connect(path, timeout=_BUSY_TIMEOUT, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS answers ("
+            " key TEXT PRIMARY KEY,"
+            " question TEXT NOT NULL,"
+            " answer TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " last_access REAL NOT NULL,"
+            " fingerprint TEXT)"
+        )
+        # Parmak izi sütunu olmayan eski depolara sütun eklenir (eski kayıtlar ilk okumada geçersiz olur)
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(answers)")]
+        if "fingerprint" not in columns:
+            self._conn.execute("ALTER TABLE answers ADD COLUMN fingerprint TEXT")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_answers_access ON answers(last_access)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_answers_created ON answers(created_at)")
+        self._conn.commit()
+
+    def _expiry_cutoff(self):
+        """Bu zamandan önce oluşturulan kayıtların süresi dolmuştur"""
+        return time.time() - self.ttl if self.ttl else 0.0
+
+    def get(self, key, fingerprint=None):
+        """
+        Anahtara ait yanıtı döndürür.
+
+        Args:
+            key: Soru anahtarı
+            fingerprint: Güncel yanıt parmak izi (None ise denetlenmez)
+
+        Returns:
+            str: Yanıt, kayıt yoksa, süresi dolduysa veya parmak izi farklıysa None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT answer, fingerprint FROM answers WHERE key = ? AND created_at >= ?",
+                (key, self._expiry_cutoff())
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            if fingerprint is not None and row[1] != fingerprint:
+                # İndeks veya prompt değişmiş; eski yanıt okunduğu anda silinir
+                self._conn.execute("DELETE FROM answers WHERE key = ?", (key,))
+                self._conn.commit()
+                self.misses += 1
+                self.invalidations += 1
+                return None
+            self.hits += 1
+            self._conn.execute("UPDATE answers SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            return row[0]
+
+    def put(self, key, question, answer, fingerprint=None):
+        """Yanıtı parmak iziyle kaydeder (aynı anahtar varsa günceller) ve gerekirse tahliye yapar"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO answers (key, question, answer, created_at, last_access, fingerprint) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, question, answer, now, now, fingerprint)
+            )
+            self._conn.commit()
+            self._evict()
+
+    def _evict(self):
+        """Süresi dolan kayıtları ve sınırı aşan en eski erişilen kayıtları siler (kilit alınmış olmalı)"""
+        removed = self._conn.execute("DELETE FROM answers WHERE created_at < ?", (self._expiry_cutoff(),)).rowcount
+        removed += evict_least_recently_used(self._conn, "answers", self.max_entries)
+        self._conn.commit()
+        return removed
+
+    def import_json(self, json_path, fingerprint=None):
+        """
+        Eski query_cache.json dosyasındaki yanıtları depoya aktarır.
+        Aktarılan dosya .migrated uzantısıyla yeniden adlandırılır.
+
+        Args:
+            json_path: Eski önbellek dosyasının yolu
+            fingerprint: Aktarılan yanıtlara verilecek parmak izi
+
+        Returns:
+            int: Aktarılan yanıt sayısı
+        """
+        if not os.path.exists(json_path):
+            return 0
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except Exception as e:
+            print(f"Eski önbellek dosyası okunamadı: {e}")
+            return 0
+
+        now = time.time()
+        rows = [(key, key, answer, now, now, fingerprint) for key, answer in entries.items() if isinstance(answer, str)]
+        with self._lock:
+            # Depoda daha yeni bir yanıt varsa korunur
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO answers (key, question, answer, created_at, last_access, fingerprint) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+            self._evict()
+        os.replace(json_path, json_path + ".migrated")
+        print(f"{len(rows)} yanıt {json_path} dosyasından yanıt deposuna aktarıldı.")
+        return len(rows)
+
+    def checkpoint(self):
+        """WAL dosyasındaki değişiklikleri ana veritabanı dosyasına yazar"""
+        with self._lock:
+            self._conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def compact(self):
+        """Sınırları uygular ve veritabanı dosyasını sıkıştırarak boş alanı geri kazanır"""
+        with self._lock:
+            self._evict()
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._conn.execute("VACUUM")
+
+    def clear(self):
+        """Tüm yanıtları siler"""
+        with self._lock:
+            self._conn.execute("DELETE FROM answers")
+            self._conn.commit()
+
+    def stats(self):
+        """Kayıt sayısını, isabet/ıska/geçersizleşme sayılarını ve dosya boyutunu döndürür"""
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+        return {
+            "entries": count,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "file_size": os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+        }
+
+    def __contains__(self, key):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM answers WHERE key = ? AND created_at >= ?", (key, self._expiry_cutoff())
+            ).fetchone() is not None
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+
+    def close(self):
+        """Veritabanı bağlantısını kapatır"""
+        with self._lock:
+            self._conn.close()
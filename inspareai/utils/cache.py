@@ -3,57 +3,154 @@
 
 """
 InspareAI - Önbellek yönetimi için fonksiyonlar.
-Bu modül, önbelleğin yüklenmesi, kaydedilmesi ve yönetilmesi için fonksiyonları içerir.
+Bu modül, yanıtlar, sorgu vektörleri ve belge getirme sonuçları için bellek içi
+LRU önbelleklerini içerir. Yanıtların kalıcı önbelleği inspareai/utils/answer_store.py
+modülündedir.
 """
 
-import os
-import json
-import time
-from inspareai.config.constants import CACHE_FILE, CACHE_CLEAN_THRESHOLD, CACHE_KEEP_COUNT
+import re
+import sys
+import threading
+from collections import OrderedDict
 
-# Önbellek değişkenleri
-query_cache = {}
-memory_cache = {}
+from inspareai.config.constants import (MEMORY_CACHE_MAX_BYTES, QUERY_VECTOR_CACHE_SIZE,
+                                      RETRIEVAL_CACHE_SIZE)
 
-def load_cache():
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _default_sizeof(value):
+    """Öğenin bayt boyutunu tahmin eder (metinler için UTF-8 uzunluğu)"""
+    if isinstance(value, str):
+        return len(value.encode('utf-8'))
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    return sys.getsizeof(value)
+
+
+class LRUCache:
     """
-    Disk üzerindeki önbellek dosyasını yükler.
-    
-    Returns:
-        dict: Yüklenen önbellek veya boş sözlük
+    Boyutu sınırlı, thread-safe, en uzun süredir kullanılmayanı atan önbellek.
+
+    Sınır öğe sayısı (maxsize), toplam bayt (max_bytes) veya ikisi birden olabilir;
+    ekleme, okuma ve tahliye O(1)'dir. İsabet oranı, tahliye sayısı ve bellekte
+    tutulan bayt stats() ile okunabilir.
     """
-    if os.path.exists(CACHE_FILE):
-        try:
-            with open(CACHE_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Önbellek yüklenemedi: {e}")
-    return {}
+
+    def __init__(self, maxsize=128, max_bytes=None, sizeof=_default_sizeof):
+        """
+        Args:
+            maxsize: Saklanacak en fazla öğe sayısı (None ise sınırsız)
+            max_bytes: Öğelerin toplam bayt sınırı (None ise sınırsız)
+            sizeof: Bir öğenin bayt boyutunu döndüren fonksiyon
+        """
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.resident_bytes = 0
+        self._data = OrderedDict()  # anahtar -> (değer, bayt)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Öğeyi döndürür ve en son kullanılan olarak işaretler, yoksa default döndürür"""
+        with self._lock:
+            try:
+                value, _ = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """
+        Öğeyi ekler; sınır aşılırsa en uzun süredir kullanılmayan öğeler atılır.
+        Tek başına bayt sınırını aşan öğeler saklanmaz.
+        """
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.resident_bytes -= old[1]
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._data[key] = (value, size)
+            self.resident_bytes += size
+            while self._data and ((self.maxsize is not None and len(self._data) > self.maxsize) or
+                                  (self.max_bytes is not None and self.resident_bytes > self.max_bytes)):
+                _, (_, evicted_size) = self._data.popitem(last=False)
+                self.resident_bytes -= evicted_size
+                self.evictions += 1
+
+    def pop(self, key, default=None):
+        """Öğeyi önbellekten çıkarır ve döndürür"""
+        with self._lock:
+            item = self._data.pop(key, None)
+            if item is None:
+                return default
+            self.resident_bytes -= item[1]
+            return item[0]
+
+    def clear(self):
+        """Tüm öğeleri ve sayaçları temizler"""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = self.resident_bytes = 0
+
+    def stats(self):
+        """Önbellek istatistiklerini döndürür"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "max_bytes": self.max_bytes,
+                "resident_bytes": self.resident_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+
+def normalize_question(question):
+    """Soruyu önbellek anahtarı için normalleştirir (Türkçe küçük harf, tek boşluk)"""
+    question = question.strip().replace("İ", "i").replace("I", "ı").lower()
+    return _WHITESPACE_RE.sub(" ", question)
+
+
+# Süreç içi yanıt önbelleği - toplam yanıt baytıyla sınırlı
+memory_cache = LRUCache(maxsize=None, max_bytes=MEMORY_CACHE_MAX_BYTES)
+
+# Sorgu vektörleri ve belge getirme sonuçları (hızlı/normal mod ve akışlı/akışsız yollar ortak kullanır)
+query_vector_cache = LRUCache(QUERY_VECTOR_CACHE_SIZE)
+retrieval_cache = LRUCache(RETRIEVAL_CACHE_SIZE)
 
 def save_cache():
-    """Önbelleği disk üzerine kaydeder."""
-    try:
-        with open(CACHE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(query_cache, f, ensure_ascii=False, indent=2)
-    except Exception as e:
-        print(f"Önbellek kaydedilemedi: {e}")
-
-def clear_memory_cache():
-    """Bellek önbelleğini temizler ve periyodik olarak çağrılmalıdır."""
-    global memory_cache
-    
-    # Eşikten fazla öğe varsa eskilerini temizle 
-    if len(memory_cache) > CACHE_CLEAN_THRESHOLD:
-        # En son kullanılanları sakla
-        sorted_keys = sorted(memory_cache.keys(), key=lambda k: memory_cache[k].get('timestamp', 0), reverse=True)
-        keys_to_keep = sorted_keys[:CACHE_KEEP_COUNT]
-        
-        new_cache = {}
-        for key in keys_to_keep:
-            new_cache[key] = memory_cache[key]
-            
-        memory_cache = new_cache
-        print(f"Bellek önbelleği temizlendi. Kalan öğe sayısı: {len(memory_cache)}")
-
-# Önbelleği başlangıçta yükle
-query_cache = load_cache()
+    """
+    Yanıt deposunun WAL kayıtlarını ana veritabanı dosyasına yazar ve anlamsal önbelleğin
+    bekleyen değişikliklerini kaydeder. Yanıtlar eklendikleri anda kalıcıdır; bu çağrı
+    yalnızca çıkışta WAL dosyasını küçültür.
+    """
+    from inspareai.core.runtime import get_runtime
+
+    runtime = get_runtime()
+    if runtime.is_loaded("answer_store"):
+        try:
+            runtime.answer_store.checkpoint()
+        except Exception as e:
+            print(f"Önbellek kaydedilemedi: {e}")
+    if runtime.is_loaded("semantic_cache"):
+        runtime.semantic_cache.flush()
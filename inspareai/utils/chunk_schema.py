@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - Metin parçası (chunk) şeması.
+Bu modül, vektör veritabanındaki parçaların meta veri şemasını ve iki şema
+sürümünü de okuyabilen yardımcı fonksiyonları içerir.
+
+Şema 1 (eski): page_content "Time: ...\\nSpeaker: ...\\nContent: ..." biçiminde,
+meta veride dosya adı, dosya yolu, başlık, dil gibi tekrarlanan alanlar bulunur.
+
+Şema 2 (kompakt): page_content yalnızca konuşma metnidir. Meta veri; şema
+sürümü (v), kaynak dosya numarası (src), başlangıç/bitiş saniyesi (start/end),
+konuşmacı kodu (spk), konuşma (conv) ve parça (chunk) numaralarından oluşur.
+Dosya adları indeks manifestindeki dosya tablosundan okunur.
+"""
+
+import re
+from typing import NamedTuple
+
+from inspareai.utils.transcript import seconds_to_time
+
+CHUNK_SCHEMA_VERSION = 2
+
+# Şema 1 parçalarında içerikten önce gelen başlık satırları
+# (Parçalayıcı başlık satırlarını ayrı bir parçaya bölmüş olabilir)
+_LEGACY_HEADER_RE = re.compile(r'^(?:(?:Time|Speaker): [^\n]*(?:\n|$))*(?:Content: )?')
+_LEGACY_TIME_RE = re.compile(r"Time:\s*(\d+:\d+:\d+)\s*-\s*(\d+:\d+:\d+)")
+_LEGACY_SPEAKER_RE = re.compile(r"Speaker:\s*([A-Za-z0-9]+)")
+
+
+class ChunkFields(NamedTuple):
+    """Bir parçanın şemadan bağımsız alanları - zamanlar saniye cinsindendir"""
+    source: str
+    speaker: str
+    start: int
+    end: int
+    content: str
+
+    @property
+    def time(self):
+        """Zaman aralığını 00:00:00 - 00:00:00 biçiminde döndürür"""
+        return f"{seconds_to_time(self.start)} - {seconds_to_time(self.end)}"
+
+    @property
+    def has_time(self):
+        """Parçada anlamlı bir zaman bilgisi olup olmadığını döndürür"""
+        return self.start > 0 or self.end > 0
+
+
+def compact_metadata(source_id, start, end, speaker, conversation_id, chunk_index):
+    """
+    Şema 2 meta verisini oluşturur.
+
+    Args:
+        source_id (int): Dosya tablosundaki kaynak numarası
+        start (int): Konuşmanın başlangıç saniyesi
+        end (int): Konuşmanın bitiş saniyesi
+        speaker (str): Konuşmacı kodu (ör. "A")
+        conversation_id (int): Dosya içindeki konuşma numarası
+        chunk_index (int): Konuşma içindeki parça numarası
+
+    Returns:
+        dict: Kompakt meta veri
+    """
+    return {
+        "v": CHUNK_SCHEMA_VERSION,
+        "src": source_id,
+        "start": int(start),
+        "end": int(end),
+        "spk": speaker,
+        "conv": conversation_id,
+        "chunk": chunk_index,
+    }
+
+
+def schema_version(metadata):
+    """Meta verinin şema sürümünü döndürür"""
+    return (metadata or {}).get("v", 1)
+
+
+def time_to_seconds(time_str):
+    """00:00:00 biçimindeki zamanı saniyeye çevirir, geçersizse 0 döndürür"""
+    try:
+        hours, minutes, seconds = (int(part) for part in time_str.split(":"))
+    except (AttributeError, ValueError):
+        return 0
+    return hours * 3600 + minutes * 60 + seconds
+
+
+def strip_legacy_header(text):
+    """Şema 1 parçasındaki Time/Speaker/Content başlıklarını kaldırır"""
+    if not text:
+        return ""
+    match = _LEGACY_HEADER_RE.match(text)
+    if match.end():
+        return text[match.end():]
+    if 'Content: ' in text:
+        return text.split('Content: ')[-1]
+    return text
+
+
+def chunk_speaker(metadata):
+    """Parçanın konuşmacı kodunu döndürür (yoksa boş metin)"""
+    metadata = metadata or {}
+    if "spk" in metadata:
+        return metadata["spk"] or ""
+    return metadata.get("speaker", "") or ""
+
+
+def chunk_time_range(metadata):
+    """Parçanın (başlangıç, bitiş) saniyelerini döndürür"""
+    metadata = metadata or {}
+    if "start" in metadata:
+        return int(metadata["start"]), int(metadata.get("end", metadata["start"]))
+
+    time_str = metadata.get("time", "")
+    if time_str and " - " in time_str:
+        start_time, end_time = time_str.split(" - ", 1)
+    else:
+        start_time, end_time = metadata.get("start_time", ""), metadata.get("end_time", "")
+    return time_to_seconds(start_time), time_to_seconds(end_time)
+
+
+def chunk_source(metadata, sources=None):
+    """
+    Parçanın kaynak dosya adını döndürür.
+
+    Args:
+        metadata (dict): Parça meta verisi
+        sources (dict, optional): Kaynak numarası -> dosya adı tablosu
+            (varsayılan: çalışma zamanındaki indeks dosya tablosu)
+    """
+    metadata = metadata or {}
+    if "src" not in metadata:
+        return metadata.get("source", "Bilinmiyor")
+
+    if sources is None:
+        from inspareai.core.runtime import get_runtime
+        sources = get_runtime().source_table
+    return sources.get(metadata["src"], "Bilinmiyor")
+
+
+def read_chunk(doc, sources=None):
+    """
+    Bir belgeyi şema sürümünden bağımsız olarak okur.
+
+    Args:
+        doc (Document): Vektör veritabanından gelen belge
+        sources (dict, optional): Kaynak numarası -> dosya adı tablosu
+
+    Returns:
+        ChunkFields: Kaynak, konuşmacı, zaman ve içerik alanları
+    """
+    metadata = doc.metadata or {}
+    text = doc.page_content or ""
+    start, end = chunk_time_range(metadata)
+    speaker = chunk_speaker(metadata)
+
+    if schema_version(metadata) >= 2:
+        content = text
+    else:
+        content = strip_legacy_header(text)
+        # Eski parçalarda meta veri eksikse başlık satırlarına bak
+        if not start and not end:
+            match = _LEGACY_TIME_RE.search(text)
+            if match:
+                start, end = time_to_seconds(match.group(1)), time_to_seconds(match.group(2))
+        if not speaker:
+            match = _LEGACY_SPEAKER_RE.search(text)
+            if match:
+                speaker = match.group(1)
+
+    return ChunkFields(chunk_source(metadata, sources), speaker, start, end, content)
+
+
+def migrate_legacy_chunk(text, metadata, source_id):
+    """
+    Şema 1 parçasını şema 2'ye dönüştürür.
+
+    Args:
+        text (str): Eski page_content
+        metadata (dict): Eski meta veri
+        source_id (int): Kaynak dosyanın numarası
+
+    Returns:
+        tuple: (yeni içerik, yeni meta veri)
+    """
+    start, end = chunk_time_range(metadata)
+    new_metadata = compact_metadata(source_id, start, end, chunk_speaker(metadata),
+                                    metadata.get("conversation_id", 0), metadata.get("chunk_index", 0))
+    return strip_legacy_header(text), new_metadata
@@ -0,0 +1,275 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - Embedding vektör önbelleği.
+Bu modül, embedding vektörlerini tek bir SQLite dosyasında (model, tür, metin özeti)
+anahtarıyla saklar. Toplu okuma/yazma, boyut sınırı ile LRU tahliyesi ve
+sıkıştırma (VACUUM) desteklenir. Okumalar veritabanına yazmaz: isabetlerin erişim
+zamanları bellekte toplanır ve sonraki yazımda/tahliyede tek işlemde kaydedilir.
+"""
+
+import os
+import time
+import asyncio
+import sqlite3
+import hashlib
+import threading
+from array import array
+
+from langchain_core.embeddings import Embeddings
+
+from inspareai.config.constants import EMBEDDING_CACHE_FILE, EMBEDDING_CACHE_MAX_ENTRIES
+from inspareai.utils.sqlite_lru import evict_least_recently_used
+
+# SQLite tek sorguda sınırlı sayıda parametre kabul eder
+_SQLITE_BATCH = 500
+
+# Bellekte bekletilecek en fazla erişim zamanı güncellemesi
+_MAX_PENDING_ACCESS = 10000
+
+
+def text_digest(text):
+    """Metnin önbellek anahtarı olarak kullanılan SHA-1 özetini döndürür"""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def _pack(vector):
+    """Vektörü float32 blob'a dönüştürür"""
+    return array('f', vector).tobytes()
+
+
+def _unpack(blob):
+    """float32 blob'u Python listesine dönüştürür"""
+    vector = array('f')
+    vector.frombytes(blob)
+    return vector.tolist()
+
+
+class EmbeddingCache:
+    """
+    SQLite tabanlı, içerik adresli embedding önbelleği.
+
+    Her kayıt (model, kind, text_hash) ile anahtarlanır; böylece farklı bir
+    embedding modeline geçildiğinde eski modelin vektörleri kullanılmaz.
+    Vektörler float32 blob olarak saklanır. Kayıt sayısı max_entries değerini
+    aştığında en uzun süredir kullanılmayan kayıtlar silinir.
+    """
+
+    def __init__(self, path=EMBEDDING_CACHE_FILE, max_entries=EMBEDDING_CACHE_MAX_ENTRIES):
+        """
+        Args:
+            path: SQLite dosyasının yolu
+            max_entries: Saklanacak en fazla vektör sayısı (None ise sınırsız)
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # (model, kind, text_hash) -> son erişim zamanı; henüz veritabanına yazılmadı
+        self._pending_access = {}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Embedding işçileri farklı thread'lerden erişir - erişim kilit ile sıralanır
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " model TEXT NOT NULL,"
+            " kind TEXT NOT NULL,"
+            " text_hash TEXT NOT NULL,"
+            " vector BLOB NOT NULL,"
+            " last_access REAL NOT NULL,"
+            " PRIMARY KEY (model, kind, text_hash))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_access ON embeddings(last_access)")
+        self._conn.commit()
+
+    def get_many(self, model, kind, texts):
+        """
+        Birden fazla metnin vektörlerini tek seferde getirir.
+
+        Args:
+            model: Embedding modelinin adı
+            kind: Vektör türü ("doc" veya "query")
+            texts: Metin listesi
+
+        Returns:
+            list: Girdiyle aynı sırada vektörler; önbellekte olmayanlar için None
+        """
+        hashes = [text_digest(text) for text in texts]
+        found = {}
+
+        with self._lock:
+            unique_hashes = list(dict.fromkeys(hashes))
+            for start in range(0, len(unique_hashes), _SQLITE_BATCH):
+                chunk = unique_hashes[start:start + _SQLITE_BATCH]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND kind = ? AND text_hash IN ({placeholders})",
+                    [model, kind, *chunk]
+                ).fetchall()
+                found.update(rows)
+
+            # Kullanılan kayıtların erişim zamanını not et (LRU tahliyesi için) - yazım ertelenir
+            if found:
+                now = time.time()
+                for text_hash in found:
+                    self._pending_access[(model, kind, text_hash)] = now
+                if len(self._pending_access) >= _MAX_PENDING_ACCESS:
+                    self._flush_access()
+                    self._conn.commit()
+
+        return [_unpack(found[text_hash]) if text_hash in found else None for text_hash in hashes]
+
+    def put_many(self, model, kind, texts, vectors):
+        """
+        Birden fazla vektörü tek işlemde kaydeder ve gerekirse tahliye yapar.
+
+        Args:
+            model: Embedding modelinin adı
+            kind: Vektör türü ("doc" veya "query")
+            texts: Metin listesi
+            vectors: Metinlerle aynı sırada vektörler
+        """
+        now = time.time()
+        rows = [(model, kind, text_digest(text), _pack(vector), now) for text, vector in zip(texts, vectors)]
+
+        with self._lock:
+            self._flush_access()
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, kind, text_hash, vector, last_access) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+            self._evict()
+
+    def _flush_access(self):
+        """Bekleyen erişim zamanlarını veritabanına yazar; commit çağırana bırakılır (kilit alınmış olmalı)"""
+        if not self._pending_access:
+            return
+        self._conn.executemany(
+            "UPDATE embeddings SET last_access = ? WHERE model = ? AND kind = ? AND text_hash = ?",
+            [(now, *key) for key, now in self._pending_access.items()]
+        )
+        self._pending_access.clear()
+
+    def _evict(self):
+        """Kayıt sayısı sınırı aşıldıysa en eski erişilen kayıtları siler (kilit alınmış olmalı)"""
+        removed = evict_least_recently_used(self._conn, "embeddings", self.max_entries)
+        if removed:
+            self._conn.commit()
+        return removed
+
+    def compact(self):
+        """Sınırı uygular ve veritabanı dosyasını sıkıştırarak boş alanı geri kazanır"""
+        with self._lock:
+            self._flush_access()
+            self._conn.commit()
+            self._evict()
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._conn.execute("VACUUM")
+
+    def clear(self, model=None):
+        """Önbelleği (veya yalnızca bir modele ait kayıtları) temizler"""
+        with self._lock:
+            self._pending_access.clear()
+            if model is None:
+                self._conn.execute("DELETE FROM embeddings")
+            else:
+                self._conn.execute("DELETE FROM embeddings WHERE model = ?", (model,))
+            self._conn.commit()
+
+    def stats(self):
+        """Model başına kayıt sayısını ve dosya boyutunu döndürür"""
+        with self._lock:
+            rows = self._conn.execute("SELECT model, COUNT(*) FROM embeddings GROUP BY model").fetchall()
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        return {
+            "entries": sum(count for _, count in rows),
+            "models": dict(rows),
+            "file_size": size,
+        }
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def close(self):
+        """Veritabanı bağlantısını kapatır"""
+        with self._lock:
+            self._flush_access()
+            self._conn.commit()
+            self._conn.close()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Bir embedding modelini EmbeddingCache ile saran LangChain uyumlu sınıf.
+    Önbellekte bulunan metinler modele gönderilmez; sonuçlar her zaman girdi sırasıyla döner.
+    """
+
+    def __init__(self, embedding_model, model_name, cache):
+        """
+        Args:
+            embedding_model: Asıl embedding modeli (ör. OllamaEmbeddings)
+            model_name: Önbellek anahtarında kullanılan model adı
+            cache: EmbeddingCache örneği
+        """
+        self.embedding_model = embedding_model
+        self.model_name = model_name
+        self.cache = cache
+
+    def embed_documents(self, texts):
+        """Önbellekli doküman gömme fonksiyonu"""
+        texts = list(texts)
+        results = self.cache.get_many(self.model_name, "doc", texts)
+
+        # Önbellekte olmayan benzersiz metinleri bul
+        missing = {}
+        for i, vector in enumerate(results):
+            if vector is None:
+                missing.setdefault(texts[i], []).append(i)
+
+        if missing:
+            missing_texts = list(missing)
+            new_vectors = self.embedding_model.embed_documents(missing_texts)
+            self.cache.put_many(self.model_name, "doc", missing_texts, new_vectors)
+
+            # Her vektörü kendi konumuna yerleştir
+            for text, vector in zip(missing_texts, new_vectors):
+                for i in missing[text]:
+                    results[i] = vector
+
+        return results
+
+    def embed_query(self, text):
+        """Önbellekli sorgu gömme fonksiyonu"""
+        cached = self.cache.get_many(self.model_name, "query", [text])[0]
+        if cached is not None:
+            return cached
+
+        vector = self.embedding_model.embed_query(text)
+        self.cache.put_many(self.model_name, "query", [text], [vector])
+        return vector
+
+    async def aembed_query(self, text):
+        """Önbellekli asenkron sorgu gömme fonksiyonu (modelin asenkron istemcisini kullanır)"""
+        # SQLite erişimi ve önbellek kilidi event loop'u bloklamasın diye thread havuzunda çalışır
+        loop = asyncio.get_running_loop()
+        cached = (await loop.run_in_executor(None, self.cache.get_many, self.model_name, "query", [text]))[0]
+        if cached is not None:
+            return cached
+
+        vector = await self.embedding_model.aembed_query(text)
+        await loop.run_in_executor(None, self.cache.put_many, self.model_name, "query", [text], [vector])
+        return vector
+
+    def __getattr__(self, name):
+        # Model ayarlarına (ör. model, num_ctx) erişimi asıl modele yönlendir
+        if name == "embedding_model":
+            raise AttributeError(name)
+        return getattr(self.embedding_model, name)
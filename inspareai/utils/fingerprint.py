@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - İndeks parmak izi.
+Bu modül, önbellek kayıtlarını etiketlemek için kullanılan parmak izlerini üretir.
+
+İndeks parmak izi: korpus özeti, embedding modeli, parça parametreleri ve arama
+ayarları. Belge getirme sonuçları bununla etiketlenir.
+
+Yanıt parmak izi: indeks parmak izi + prompt şablonlarının özeti. Üretilen yanıtlar
+bununla etiketlenir; yalnızca prompt değiştiğinde belge getirme önbelleği korunur.
+
+Embedding önbelleği parça metninin özetiyle adreslendiği için parmak izine
+bağlı değildir; yeniden indekslemede değişmeyen parçaların vektörleri korunur.
+"""
+
+import json
+import hashlib
+from functools import lru_cache
+
+
+def _digest(value):
+    """JSON olarak seri hale getirilebilen değerin kısa SHA-256 özetini döndürür"""
+    payload = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+@lru_cache(maxsize=1)
+def prompt_hash():
+    """inspareai.config.prompts içindeki tüm prompt şablonlarının özetini döndürür"""
+    from inspareai.config import prompts
+
+    templates = {name: value for name, value in vars(prompts).items()
+                 if name.isupper() and isinstance(value, str)}
+    return _digest(templates)
+
+
+def index_fingerprint(manifest, collection_name, embedding_model, vector_backend="chroma", pca_dimensions=0):
+    """
+    Arama indeksinin parmak izini üretir.
+
+    Args:
+        manifest (dict): İndeks manifesti (yoksa boş sözlük)
+        collection_name (str): Koleksiyon adı
+        embedding_model (str): Sorgular için kullanılan embedding modeli
+        vector_backend (str): Vektör arama arka ucu
+        pca_dimensions (int): NumPy indeksindeki PCA boyutu
+
+    Returns:
+        str: 16 karakterlik onaltılık parmak izi
+    """
+    manifest = manifest or {}
+    return _digest({
+        "collection": collection_name,
+        "corpus_hash": manifest.get("corpus_hash"),
+        "index_embedding_model": manifest.get("embedding_model"),
+        "query_embedding_model": embedding_model,
+        "chunk_params": manifest.get("chunk_params"),
+        "chunk_schema": manifest.get("chunk_schema"),
+        "vector_backend": vector_backend,
+        "pca_dimensions": pca_dimensions,
+    })
+
+
+def answer_fingerprint(index_fp):
+    """Yanıt önbelleklerinin parmak izini (indeks parmak izi + prompt özeti) üretir"""
+    return _digest([index_fp, prompt_hash()])
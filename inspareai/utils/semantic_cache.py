@@ -0,0 +1,245 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - Anlamsal yanıt önbelleği.
+Bu modül, yanıtlanmış soruların embedding vektörlerini küçük bir vektör
+indeksinde tutar. Yeni sorunun vektörü önbellekteki bir soruya eşik değerinden
+daha benzerse (ör. aynı sorunun farklı ifadesi) kayıtlı yanıt yeniden kullanılır.
+Önbellek, kayıtların üretildiği yanıt parmak iziyle (indeks + prompt) etiketlenir;
+farklı bir parmak iziyle ilk erişimde kayıtlar geçersiz olur.
+Değişiklikler istek yolunda diske yazılmaz; SEMANTIC_CACHE_SAVE_INTERVAL boyunca
+biriktirilip arka planda tek seferde, çıkışta da flush() ile kaydedilir.
+"""
+
+import os
+import json
+import time
+import atexit
+import threading
+
+import numpy as np
+
+from inspareai.config.constants import (SEMANTIC_CACHE_FILE, SEMANTIC_CACHE_THRESHOLD,
+                                      SEMANTIC_CACHE_NEAR_MISS_MARGIN, SEMANTIC_CACHE_MAX_ENTRIES,
+                                      SEMANTIC_CACHE_SAVE_INTERVAL)
+
+
+class SemanticAnswerCache:
+    """
+    Soru vektörlerinin kosinüs benzerliğiyle eşleşen, diske kaydedilebilen yanıt önbelleği.
+
+    Sayaçlar eşik ayarı için tutulur: hits (eşik geçildi), misses (eşleşme yok),
+    near_misses (benzerlik eşiğin altında fakat eşik - near_miss_margin üstünde)
+    ve invalidations (parmak izi değiştiği için temizlenen önbellek sayısı).
+    """
+
+    def __init__(self, path=SEMANTIC_CACHE_FILE, threshold=SEMANTIC_CACHE_THRESHOLD,
+                 near_miss_margin=SEMANTIC_CACHE_NEAR_MISS_MARGIN, max_entries=SEMANTIC_CACHE_MAX_ENTRIES,
+                 save_interval=SEMANTIC_CACHE_SAVE_INTERVAL):
+        """
+        Args:
+            path: Önbellek dosyasının (.npz) yolu, None ise diske yazılmaz
+            threshold: Yanıtın yeniden kullanılması için gereken en düşük kosinüs benzerliği
+            near_miss_margin: Eşiğin bu kadar altındaki eşleşmeler "yakın ıska" sayılır
+            max_entries: Saklanacak en fazla yanıt sayısı (en uzun süredir kullanılmayan silinir)
+            save_interval: Değişikliklerin diske yazılmadan önce biriktiği süre (0 ise hemen yazılır)
+        """
+        self.path = path
+        self.threshold = threshold
+        self.near_miss_margin = near_miss_margin
+        self.max_entries = max_entries
+        self.save_interval = save_interval
+        self.hits = 0
+        self.misses = 0
+        self.near_misses = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+        # Arka plan kaydı ile çıkıştaki flush aynı geçici dosyaya aynı anda yazmasın
+        self._save_lock = threading.Lock()
+        self._dirty = False
+        self._timer = None
+        self._reset(None)
+        if path:
+            if os.path.exists(path):
+                self._load()
+            atexit.register(self.flush)
+
+    def _reset(self, fingerprint, dimension=0):
+        """Tüm kayıtları siler ve önbelleği verilen parmak izine bağlar"""
+        self.fingerprint = fingerprint
+        self._questions = []
+        self._answers = []
+        self._last_used = []
+        self._embeddings = np.zeros((0, dimension), dtype=np.float32)
+
+    def _load(self):
+        """Önbelleği diskten yükler; dosya bozuksa boş önbellekle devam eder"""
+        try:
+            with np.load(self.path) as data:
+                info = json.loads(str(data["info"]))
+                embeddings = data["embeddings"].astype(np.float32)
+        except Exception as e:
+            print(f"Anlamsal önbellek yüklenemedi: {e}")
+            return
+        if len(embeddings) != len(info["questions"]):
+            print("UYARI: Anlamsal önbellek dosyası tutarsız, yok sayılıyor.")
+            return
+        self.fingerprint = info.get("fingerprint")
+        self._questions = info["questions"]
+        self._answers = info["answers"]
+        self._last_used = info.get("last_used", [0.0] * len(self._questions))
+        self._embeddings = embeddings
+
+    def save(self):
+        """Önbelleği diske atomik olarak kaydeder"""
+        if not self.path:
+            return
+        with self._save_lock:
+            # Yazım kilit dışında yapılır; kayıtların anlık kopyası alınır
+            with self._lock:
+                self._dirty = False
+                info = {
+                    "fingerprint": self.fingerprint,
+                    "questions": list(self._questions),
+                    "answers": list(self._answers),
+                    "last_used": list(self._last_used),
+                }
+                embeddings = self._embeddings.copy()
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                # np.savez uzantısız yollara .npz ekler; geçici dosya adı buna göre seçilir
+                tmp_path = self.path + ".tmp.npz"
+                np.savez(tmp_path, embeddings=embeddings, info=np.array(json.dumps(info, ensure_ascii=False)))
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                print(f"Anlamsal önbellek kaydedilemedi: {e}")
+
+    def flush(self):
+        """Bekleyen değişiklikleri hemen diske yazar (çıkışta ve zamanlayıcıdan çağrılır)"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return
+        self.save()
+
+    def _schedule_save(self):
+        """Değişikliği işaretler ve henüz planlanmadıysa gecikmeli kaydı başlatır"""
+        if not self.path:
+            return
+        with self._lock:
+            self._dirty = True
+            if self.save_interval and self._timer is None:
+                self._timer = threading.Timer(self.save_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if not self.save_interval:
+            self.flush()
+
+    def _check_fingerprint(self, fingerprint, dimension):
+        """Parmak izi veya vektör boyutu değiştiyse önbelleği temizler"""
+        if self.fingerprint == fingerprint and self._embeddings.shape[1] == dimension:
+            return
+        if self._questions:
+            self.invalidations += 1
+            print("Anlamsal önbellek indeks veya prompt değiştiği için temizlendi.")
+        self._reset(fingerprint, dimension)
+
+    def lookup(self, query_embedding, fingerprint):
+        """
+        Soru vektörüne en benzer kayıtlı soruyu arar.
+
+        Args:
+            query_embedding: Sorunun embedding vektörü
+            fingerprint: Güncel yanıt parmak izi
+
+        Returns:
+            tuple: Eşik geçildiyse (yanıt, eşleşen soru, benzerlik), aksi halde None
+        """
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        with self._lock:
+            self._check_fingerprint(fingerprint, len(query))
+            if not self._questions or norm == 0:
+                self.misses += 1
+                return None
+
+            similarities = self._embeddings @ (query / norm)
+            best = int(np.argmax(similarities))
+            score = float(similarities[best])
+            if score >= self.threshold:
+                self.hits += 1
+                self._last_used[best] = time.time()
+                return self._answers[best], self._questions[best], score
+
+            self.misses += 1
+            if score >= self.threshold - self.near_miss_margin:
+                self.near_misses += 1
+                print(f"Anlamsal önbellek yakın ıska: benzerlik {score:.3f} < eşik {self.threshold:.3f} "
+                      f"(\"{self._questions[best]}\")")
+            return None
+
+    def add(self, question, query_embedding, answer, fingerprint):
+        """
+        Yanıtı soru vektörüyle birlikte önbelleğe ekler; diske kayıt gecikmeli yapılır.
+
+        Args:
+            question: Kullanıcı sorusu
+            query_embedding: Sorunun embedding vektörü
+            answer: Kaydedilecek yanıt
+            fingerprint: Yanıtın üretildiği yanıt parmak izi
+        """
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return
+        with self._lock:
+            self._check_fingerprint(fingerprint, len(query))
+            if question in self._questions:
+                row = self._questions.index(question)
+                self._answers[row] = answer
+                self._embeddings[row] = query / norm
+                self._last_used[row] = time.time()
+            else:
+                self._questions.append(question)
+                self._answers.append(answer)
+                self._last_used.append(time.time())
+                self._embeddings = np.vstack([self._embeddings, (query / norm)[None, :]])
+                if len(self._questions) > self.max_entries:
+                    self._evict(len(self._questions) - self.max_entries)
+        self._schedule_save()
+
+    def _evict(self, count):
+        """En uzun süredir kullanılmayan count kaydı siler"""
+        keep = np.sort(np.argsort(self._last_used, kind="stable")[count:])
+        self._questions = [self._questions[i] for i in keep]
+        self._answers = [self._answers[i] for i in keep]
+        self._last_used = [self._last_used[i] for i in keep]
+        self._embeddings = self._embeddings[keep]
+
+    def clear(self):
+        """Tüm kayıtları ve sayaçları temizler"""
+        with self._lock:
+            self._reset(self.fingerprint)
+            self.hits = self.misses = self.near_misses = self.invalidations = 0
+        self._schedule_save()
+
+    def stats(self):
+        """Eşik ayarı için önbellek istatistiklerini döndürür"""
+        with self._lock:
+            return {
+                "entries": len(self._questions),
+                "threshold": self.threshold,
+                "hits": self.hits,
+                "misses": self.misses,
+                "near_misses": self.near_misses,
+                "invalidations": self.invalidations,
+            }
+
+    def __len__(self):
+        with self._lock:
+            return len(self._questions)
@@ -0,0 +1,309 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - Eşzamanlı aynı sorguların birleştirilmesi (single-flight).
+Aynı soru (aynı modda) yanıtlanırken gelen yeni istekler ayrı bir belge getirme ve
+LLM üretimi başlatmaz; ilk isteğin (lider) sonucunu bekler. Akış modunda liderin
+ürettiği parçalar tüm abonelere dağıtılır; geç katılan abone o ana kadarki parçaları
+da alır. Bir abone ayrıldığında üretim sürer; yalnızca hiç abone kalmadığında
+üretim GenerationCancelled ile durdurulur.
+
+SingleFlight thread'ler (CLI, Streamlit oturumları), AsyncSingleFlight asyncio
+görevleri (HTTP servisi) içindir.
+"""
+
+import asyncio
+import threading
+
+
+class GenerationCancelled(BaseException):
+    """
+    Tüm aboneler ayrıldığı için üretim iptal edildiğinde yükseltilir.
+    asyncio.CancelledError gibi BaseException'dan türer; böylece yedek modele geçen
+    `except Exception` blokları iptali hata sanıp yeni bir üretim başlatmaz.
+    """
+
+
+class _Flight:
+    """Devam eden tek bir üretimin durumu"""
+
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.chunks = []
+        self.subscribers = 1
+        self.cancelled = False
+        self.done = False
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Aynı anahtarla eşzamanlı yapılan çağrıları tek çalıştırmada birleştiren thread-safe yapı.
+    coalesced sayacı, lidere bağlanan (kendi üretimini başlatmayan) çağrı sayısıdır.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+        self.coalesced = 0
+
+    def _join(self, key):
+        """Anahtar için süren üretime katılır, yoksa yeni üretim açar: (flight, lider mi)"""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                with flight.cond:
+                    if not flight.cancelled:
+                        flight.subscribers += 1
+                        self.coalesced += 1
+                        return flight, False
+            flight = self._flights[key] = _Flight()
+            return flight, True
+
+    def _leave(self, flight):
+        """Aboneyi ayırır; son abone ayrıldıysa üretimi iptal edilmiş olarak işaretler"""
+        with flight.cond:
+            flight.subscribers -= 1
+            if flight.subscribers == 0 and not flight.done:
+                flight.cancelled = True
+            return flight.cancelled
+
+    def _finish(self, key, flight, result=None, error=None):
+        """Üretimi sonlandırır ve bekleyen aboneleri uyandırır"""
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        with flight.cond:
+            flight.result = result
+            flight.error = error
+            flight.done = True
+            flight.cond.notify_all()
+
+    def do(self, key, fn):
+        """
+        fn'i çalıştırır; aynı anahtarla süren bir çağrı varsa onun sonucunu bekler.
+
+        Args:
+            key: Birleştirme anahtarı (ör. mod ve normalleştirilmiş soru)
+            fn: Argümansız çağrılan fonksiyon
+
+        Returns:
+            Liderin döndürdüğü değer (lider hata verdiyse aynı hata yükseltilir)
+        """
+        flight, leader = self._join(key)
+        if leader:
+            try:
+                result = fn()
+            except BaseException as e:
+                self._finish(key, flight, error=e)
+                raise
+            self._finish(key, flight, result=result)
+            return result
+
+        with flight.cond:
+            flight.cond.wait_for(lambda: flight.done)
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    def stream(self, key, producer, callback):
+        """
+        producer(emit) ile üretilen parçaları callback'e iletir; aynı anahtarla süren
+        bir üretim varsa ona abone olur ve liderin parçalarını alır.
+
+        callback hata yükseltirse (ör. kullanıcı sayfadan ayrıldı) abone ayrılır. Lider
+        ayrılsa bile diğer aboneler için üretim sürer ve lider çağrısı üretim bitince
+        callback hatasını yükseltir. Son abone ayrıldığında emit GenerationCancelled
+        yükseltir ve üretim durur.
+
+        Args:
+            key: Birleştirme anahtarı
+            producer: Her parça için emit(chunk) çağıran ve sonuç döndüren fonksiyon
+            callback: Her parça için çağrılacak fonksiyon
+
+        Returns:
+            producer'ın döndürdüğü değer
+        """
+        flight, leader = self._join(key)
+        if not leader:
+            return self._follow(flight, callback)
+
+        detach_error = None
+
+        def emit(chunk):
+            nonlocal detach_error
+            with flight.cond:
+                if flight.cancelled:
+                    raise GenerationCancelled()
+                flight.chunks.append(chunk)
+                flight.cond.notify_all()
+            if detach_error is None:
+                try:
+                    callback(chunk)
+                except Exception as e:
+                    detach_error = e
+                    if self._leave(flight):
+                        raise GenerationCancelled() from e
+
+        try:
+            result = producer(emit)
+        except BaseException as e:
+            self._finish(key, flight, error=e)
+            if isinstance(e, GenerationCancelled) and detach_error is not None:
+                raise detach_error
+            raise
+        self._finish(key, flight, result=result)
+        if detach_error is not None:
+            raise detach_error
+        return result
+
+    def _follow(self, flight, callback):
+        """Liderin parçalarını (başlangıçtan itibaren) callback'e iletir ve sonucunu döndürür"""
+        index = 0
+        try:
+            while True:
+                with flight.cond:
+                    flight.cond.wait_for(lambda: len(flight.chunks) > index or flight.done)
+                    chunks = flight.chunks[index:]
+                    done = flight.done
+                index += len(chunks)
+                for chunk in chunks:
+                    callback(chunk)
+                if done:
+                    break
+        except Exception:
+            self._leave(flight)
+            raise
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    def stats(self):
+        """Süren üretim ve birleştirilen çağrı sayısını döndürür"""
+        with self._lock:
+            return {"inflight": len(self._flights), "coalesced": self.coalesced}
+
+
+class _AsyncFlight:
+    """AsyncSingleFlight içinde devam eden tek bir üretimin durumu"""
+
+    def __init__(self):
+        self.chunks = []
+        self.subscribers = 0
+        self.cancelling = False
+        self.done = False
+        self.error = None
+        self.task = None
+        self._event = asyncio.Event()
+
+    def notify(self):
+        """Bekleyen aboneleri uyandırır"""
+        self._event.set()
+        self._event = asyncio.Event()
+
+    async def wait(self):
+        await self._event.wait()
+
+
+class AsyncSingleFlight:
+    """
+    SingleFlight'ın asyncio karşılığı. Üretim ayrı bir görevde çalışır; böylece
+    liderin isteği iptal edilse (ör. istemci bağlantıyı kapattı) bile diğer aboneler
+    yanıtı almaya devam eder. Son abone ayrıldığında görev iptal edilir.
+    """
+
+    def __init__(self):
+        self._flights = {}
+        self.coalesced = 0
+
+    def _join(self, key, start):
+        """Süren üretime katılır veya start() ile yeni bir üretim görevi başlatır"""
+        flight = self._flights.get(key)
+        if flight is not None and not flight.cancelling:
+            self.coalesced += 1
+        else:
+            flight = self._flights[key] = _AsyncFlight()
+            flight.task = asyncio.ensure_future(start(flight))
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+        flight.subscribers += 1
+        return flight
+
+    def _forget(self, key, flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def _leave(self, flight):
+        """Aboneyi ayırır; son abone ayrıldıysa üretim görevini iptal eder"""
+        flight.subscribers -= 1
+        if flight.subscribers == 0 and not flight.task.done():
+            flight.cancelling = True
+            flight.task.cancel()
+
+    async def do(self, key, coro_fn):
+        """
+        coro_fn() eş yordamını çalıştırır; aynı anahtarla süren bir çağrı varsa sonucunu bekler.
+
+        Args:
+            key: Birleştirme anahtarı
+            coro_fn: Argümansız çağrıldığında eş yordam döndüren fonksiyon
+        """
+        async def start(flight):
+            return await coro_fn()
+
+        flight = self._join(key, start)
+        try:
+            # shield: bu abonenin iptali görevi değil yalnızca beklemeyi iptal eder
+            return await asyncio.shield(flight.task)
+        finally:
+            self._leave(flight)
+
+    async def stream(self, key, agen_fn):
+        """
+        agen_fn() async generator'ının parçalarını verir; aynı anahtarla süren bir
+        üretim varsa ona abone olur ve o ana kadarki parçalardan başlayarak alır.
+
+        Args:
+            key: Birleştirme anahtarı
+            agen_fn: Argümansız çağrıldığında async generator döndüren fonksiyon
+
+        Yields:
+            Liderin ürettiği parçalar
+        """
+        async def start(flight):
+            agen = agen_fn()
+            try:
+                async for chunk in agen:
+                    flight.chunks.append(chunk)
+                    flight.notify()
+            except asyncio.CancelledError:
+                flight.error = GenerationCancelled()
+                raise
+            except Exception as e:
+                flight.error = e
+            finally:
+                flight.done = True
+                flight.notify()
+                await agen.aclose()
+
+        flight = self._join(key, start)
+        index = 0
+        try:
+            while True:
+                while len(flight.chunks) <= index and not flight.done:
+                    await flight.wait()
+                chunks = flight.chunks[index:]
+                index += len(chunks)
+                for chunk in chunks:
+                    yield chunk
+                if flight.done and index >= len(flight.chunks):
+                    break
+            if flight.error is not None:
+                raise flight.error
+        finally:
+            self._leave(flight)
+
+    def stats(self):
+        """Süren üretim ve birleştirilen çağrı sayısını döndürür"""
+        return {"inflight": len(self._flights), "coalesced": self.coalesced}
@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - SQLite LRU tahliyesi.
+Embedding önbelleği ve yanıt deposu, kayıt sayısı sınırını aynı yöntemle uygular:
+sınır aşıldığında last_access sütununa göre en eski erişilen satırlar silinir.
+"""
+
+
+def evict_least_recently_used(conn, table, max_entries):
+    """
+    Tablodaki kayıt sayısı max_entries değerini aştıysa en eski erişilen kayıtları siler.
+    Tablonun last_access sütunu olmalıdır; commit çağırana bırakılır.
+
+    Args:
+        conn: SQLite bağlantısı
+        table: Tablo adı (sabit, kullanıcı girdisi değil)
+        max_entries: Saklanacak en fazla kayıt sayısı (None veya 0 ise sınırsız)
+
+    Returns:
+        int: Silinen kayıt sayısı
+    """
+    if not max_entries:
+        return 0
+
+    count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    excess = count - max_entries
+    if excess <= 0:
+        return 0
+
+    # Her yazımda tahliye yapmamak için sınırın %10'u kadar ek yer aç
+    excess += max_entries // 10
+    return conn.execute(
+        f"DELETE FROM {table} WHERE rowid IN "
+        f"(SELECT rowid FROM {table} ORDER BY last_access ASC LIMIT ?)",
+        (excess,)
+    ).rowcount
@@ -0,0 +1,273 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - Paylaşılan Türkçe kök bulma (stemming) modülü.
+Bu modül, veritabanı oluşturma (BM25 indeksi) ve sorgu anahtar kelimeleri için
+aynı stemmer'ı sağlar. TurkishStemmer veya snowballstemmer bulunamazsa ters ek
+ağacı (trie), önceden hesaplanmış ünlü uyumu tabloları ve LRU önbelleği kullanan
+yerleşik kural tabanlı stemmer kullanılır.
+"""
+
+import functools
+
+# Önbellekte tutulacak en fazla kelime sayısı
+STEMMER_CACHE_SIZE = 200000
+
+# İsim çekimleri için ekler
+NOUN_SUFFIXES = [
+    'lar', 'ler', 'leri', 'ları', 'dan', 'den', 'tan', 'ten',
+    'a', 'e', 'i', 'ı', 'in', 'ın', 'un', 'ün', 'da', 'de', 'ta', 'te',
+    'nın', 'nin', 'nun', 'nün', 'ya', 'ye', 'yu', 'yü',
+    'nda', 'nde', 'nta', 'nte', 'ndan', 'nden', 'ki', 'lık', 'lik'
+]
+
+# Fiil çekimleri için ekler
+VERB_SUFFIXES = [
+    'mak', 'mek', 'yor', 'iyor', 'ıyor', 'uyor', 'üyor',
+    'acak', 'ecek', 'acağ', 'eceğ', 'miş', 'mış', 'muş', 'müş',
+    'di', 'dı', 'du', 'dü', 'ti', 'tı', 'tu', 'tü',
+    'sa', 'se', 'malı', 'meli', 'abil', 'ebil',
+    'ar', 'er', 'ır', 'ir', 'ur', 'ür',
+    'dik', 'dık', 'duk', 'dük', 'tik', 'tık', 'tuk', 'tük'
+]
+
+# Sık kullanılan fiil kökleri
+COMMON_VERB_ROOTS = [
+    'gel', 'git', 'ol', 'yap', 'et', 'de', 'ver', 'al', 'kal', 'bak',
+    'gör', 'bil', 'dur', 'bul', 'çık', 'geç', 'iste', 'söyle', 'başla',
+    'anla', 'çalış', 'düşün', 'konuş', 'oku', 'yaz', 'sev', 'bekle',
+    'gir', 'var', 'yok', 'aç', 'kapat', 'otur', 'koş', 'yürü', 'uyu',
+    'uyan', 'ye', 'iç', 'dinle', 'izle', 'kullan', 'yaşa', 'öl'
+]
+
+# Ünlü uyumu için sesli harfler ve sınıfları (kalın / ince)
+VOWELS = 'aeıioöuü'
+THICK_VOWELS = 'aıou'
+THIN_VOWELS = 'eiöü'
+_VOWEL_CLASS = {**{v: 1 for v in THICK_VOWELS}, **{v: 2 for v in THIN_VOWELS}}
+
+# Yumuşama kuralı için son harf değişimleri ve tersleri
+SOFTENING_MAP = {'p': 'b', 'ç': 'c', 't': 'd', 'k': 'ğ'}
+REVERSE_SOFTENING_MAP = {v: k for k, v in SOFTENING_MAP.items()}
+
+_END = object()
+
+
+def _build_reversed_trie(suffixes):
+    """Ekleri sondan başa okunacak şekilde bir trie'ye yerleştirir"""
+    root = {}
+    for suffix in suffixes:
+        node = root
+        for char in reversed(suffix):
+            node = node.setdefault(char, {})
+        # Her ek için ilk vokalin sınıfı önceden hesaplanır
+        node.setdefault(_END, (suffix, _first_vowel_class(suffix)))
+    return root
+
+
+def _build_prefix_trie(words):
+    """Kelimeleri baştan sona okunacak şekilde trie'ye yerleştirir (liste sırası korunur)"""
+    root = {}
+    for order, word in enumerate(words):
+        node = root
+        for char in word:
+            node = node.setdefault(char, {})
+        node.setdefault(_END, (order, word))
+    return root
+
+
+def _first_vowel_class(text):
+    """Metindeki ilk sesli harfin sınıfını döndürür (1: kalın, 2: ince, 0: yok)"""
+    for char in text:
+        vowel_class = _VOWEL_CLASS.get(char)
+        if vowel_class:
+            return vowel_class
+        if char in VOWELS:
+            return 0
+    return 0
+
+
+_VERB_SUFFIX_TRIE = _build_reversed_trie(VERB_SUFFIXES)
+_NOUN_SUFFIX_TRIE = _build_reversed_trie(NOUN_SUFFIXES)
+_VERB_ROOT_TRIE = _build_prefix_trie(COMMON_VERB_ROOTS)
+_VERB_ROOT_SET = frozenset(COMMON_VERB_ROOTS)
+
+
+def _matching_suffixes(trie, word):
+    """Kelimenin sonunda bulunan ekleri en uzundan en kısaya döndürür"""
+    matches = []
+    node = trie
+    for i in range(len(word) - 1, -1, -1):
+        node = node.get(word[i])
+        if node is None:
+            break
+        if _END in node:
+            matches.append(node[_END])
+    matches.reverse()
+    return matches
+
+
+class TurkishSuffixStemmer:
+    """
+    Kural tabanlı Türkçe stemmer - isim ve fiil çekimlerini destekler,
+    Türkçe ünlü uyumu kurallarını da göz önünde bulundurur.
+
+    Ekler ters yazılmış bir trie'de tutulur; kelimenin sonundan tek geçişle
+    eşleşen tüm ekler bulunur. Fiil kökleri önek trie'sinde tutulur ve ilk
+    eşleşme liste sırasına göre seçilir.
+    """
+
+    def __init__(self):
+        self.noun_suffixes = NOUN_SUFFIXES
+        self.verb_suffixes = VERB_SUFFIXES
+        self.common_verb_roots = COMMON_VERB_ROOTS
+        self.vowels = VOWELS
+        self.softening_map = SOFTENING_MAP
+
+    def _is_vowel(self, char):
+        """Bir karakterin sesli harf olup olmadığını kontrol eder"""
+        return char.lower() in VOWELS
+
+    def _has_turkish_vowel_harmony(self, word, suffix):
+        """Türkçe ünlü uyumuna göre ekin kelimeye uyup uymadığını kontrol eder"""
+        if not word or not suffix:
+            return False
+        word_class = _first_vowel_class(word.lower()[::-1])
+        suffix_class = _first_vowel_class(suffix.lower())
+        return bool(word_class) and word_class == suffix_class
+
+    def _check_verb_root(self, word):
+        """Kelimenin bilinen bir fiil kökü olup olmadığını kontrol eder"""
+        return word in _VERB_ROOT_SET
+
+    def _apply_softening_rule(self, word):
+        """
+        Yumuşama kuralını uygular
+        Örneğin: kitap -> kitab, ağaç -> ağac
+        """
+        if not word or len(word) < 2:
+            return word
+        softened = SOFTENING_MAP.get(word[-1])
+        return word[:-1] + softened if softened else word
+
+    def _reverse_softening_rule(self, word):
+        """
+        Yumuşama kuralını tersine çevirir
+        Örneğin: kitab -> kitap, ağac -> ağaç
+        """
+        if not word or len(word) < 2:
+            return word
+        hardened = REVERSE_SOFTENING_MAP.get(word[-1])
+        return word[:-1] + hardened if hardened else word
+
+    def _verb_root_prefix(self, word):
+        """Kelimenin başındaki fiil kökünü (liste sırasına göre ilkini) döndürür"""
+        best = None
+        node = _VERB_ROOT_TRIE
+        for i, char in enumerate(word):
+            node = node.get(char)
+            if node is None:
+                break
+            # Kök, kelimenin tamamı olmamalı (len(kelime) > len(kök))
+            if _END in node and i + 1 < len(word):
+                if best is None or node[_END][0] < best[0]:
+                    best = node[_END]
+        return best[1] if best else None
+
+    def stem(self, word):
+        """Kelimenin kökünü bulur"""
+        if not word or len(word) < 3:
+            return word
+
+        word = word.lower()
+
+        # Önce yumuşama kuralını uygula
+        word_softened = self._apply_softening_rule(word)
+        length = len(word_softened)
+
+        # Önce fiil kökü olup olmadığını kontrol et
+        verb_root = self._verb_root_prefix(word_softened)
+        if verb_root is not None:
+            return verb_root
+
+        # Her konumdaki son sesli harfin sınıfı - ünlü uyumu kontrolü için tek geçişte hesaplanır
+        last_vowel_class = [0] * (length + 1)
+        for i, char in enumerate(word_softened):
+            last_vowel_class[i + 1] = _VOWEL_CLASS.get(char, 0) if char in VOWELS else last_vowel_class[i]
+
+        # Fiil ekleri, sonra isim ekleri (en uzun ek önce)
+        for trie in (_VERB_SUFFIX_TRIE, _NOUN_SUFFIX_TRIE):
+            for suffix, suffix_class in _matching_suffixes(trie, word_softened):
+                stem_length = length - len(suffix)
+                if stem_length > 2 and suffix_class and last_vowel_class[stem_length] == suffix_class:
+                    return self._reverse_softening_rule(word_softened[:stem_length])
+
+        # Hiçbir ek bulunamadıysa kelimeyi olduğu gibi döndür
+        return self._reverse_softening_rule(word_softened)
+
+
+class MemoizedStemmer:
+    """
+    Herhangi bir stemmer'ı sınırlı bir LRU önbelleği ile saran sınıf.
+    Aynı kelime için stemmer yalnızca bir kez çağrılır.
+    """
+
+    def __init__(self, stemmer, maxsize=STEMMER_CACHE_SIZE):
+        self.stemmer = stemmer
+        # snowballstemmer 'stemWord', diğerleri 'stem' kullanır
+        stem_function = getattr(stemmer, 'stem', None) or getattr(stemmer, 'stemWord')
+        self._cached_stem = functools.lru_cache(maxsize=maxsize)(stem_function)
+
+    def stem(self, word):
+        """Kelimenin kökünü önbellekten veya stemmer'dan döndürür"""
+        return self._cached_stem(word)
+
+    def cache_info(self):
+        """Önbellek istatistiklerini döndürür"""
+        return self._cached_stem.cache_info()
+
+    def cache_clear(self):
+        """Önbelleği temizler"""
+        self._cached_stem.cache_clear()
+
+    def __getattr__(self, name):
+        # _check_verb_root gibi stemmer'a özgü yardımcılar asıl stemmer'dan okunur
+        if name == "stemmer":
+            raise AttributeError(name)
+        return getattr(self.stemmer, name)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_stemmer():
+    """Kullanılabilir en iyi Türkçe stemmer'ı ilk kullanımda yükler"""
+    # Gelişmiş Türkçe kök bulma için TurkishStemmer'ı dene
+    try:
+        from TurkishStemmer import TurkishStemmer
+        print("TurkishStemmer başarıyla yüklendi.")
+        return MemoizedStemmer(TurkishStemmer()), True
+    except ImportError:
+        pass
+    try:
+        # Alternatif olarak snowballstemmer'ı dene
+        from snowballstemmer import TurkishStemmer
+        print("Snowball TurkishStemmer başarıyla yüklendi.")
+        return MemoizedStemmer(TurkishStemmer()), True
+    except ImportError:
+        print("TurkishStemmer bulunamadı. Geliştirilmiş basit stemming kullanılacak.")
+        return MemoizedStemmer(TurkishSuffixStemmer()), False
+
+
+def get_stemmer():
+    """
+    Uygulama genelinde paylaşılan (önbellekli) stemmer nesnesini döndürür.
+
+    Returns:
+        MemoizedStemmer: Önbellekli stemmer
+    """
+    return _load_stemmer()[0]
+
+
+def stemmer_available():
+    """Harici bir Türkçe stemmer kütüphanesinin kullanılıp kullanılmadığını döndürür"""
+    return _load_stemmer()[1]
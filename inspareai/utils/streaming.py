@@ -6,8 +6,8 @@ Streaming işlemleri için yardımcı fonksiyonlar
 Bu modül, InspareAI'nin streaming yanıt oluşturma yeteneklerini yönetir.
 """
 
-from langchain_ollama import OllamaLLM
-from langchain_core.output_parsers import StrOutputParser
+from inspareai.core.scheduler import RequestShed
+
 
 class StreamHandler:
     """
@@ -62,12 +62,16 @@ def stream_llm_response(model, prompt, callback=None):
             for chunk in model.stream(prompt):
                 handler.handle_chunk(chunk)
             return None if callback else handler.get_response()
-            
+        
+        except RequestShed:
+            # Zamanlayıcının düşürdüğü istek normal modda yeniden sıraya sokulmaz
+            raise
         except Exception as e:
             print(f"Streaming sırasında hata oluştu: {e}")
             
             # Streaming başarısız olduysa normal modda dene
             try:
+                from langchain_core.output_parsers import StrOutputParser
                 response = model.invoke(prompt)
                 result = StrOutputParser().parse(response)
                 if callback:
@@ -80,6 +84,7 @@ def stream_llm_response(model, prompt, callback=None):
     else:
         # Model streaming desteklemiyorsa normal yanıt al
         print("Model streaming desteklemiyor, normal yanıt kullanılacak")
+        from langchain_core.output_parsers import StrOutputParser
         response = model.invoke(prompt)
         result = StrOutputParser().parse(response)
         
@@ -90,6 +95,40 @@ def stream_llm_response(model, prompt, callback=None):
         return result
 
 
+async def astream_llm_response(model, prompt):
+    """
+    stream_llm_response'un asenkron karşılığı - yanıt parçalarını async generator olarak verir.
+    Streaming ilk parçadan önce başarısız olursa yanıt ainvoke ile tek parça halinde alınır;
+    parçalar gönderilmeye başladıktan sonraki hatalar çağırana iletilir.
+    
+    Args:
+        model: Yanıt alınacak LLM modeli
+        prompt: LLM'e gönderilecek prompt
+        
+    Yields:
+        str: Modelden gelen metin parçaları
+    """
+    if hasattr(model, 'astream') and callable(model.astream):
+        started = False
+        try:
+            async for chunk in model.astream(prompt):
+                started = True
+                yield str(chunk)
+            return
+        except RequestShed:
+            raise
+        except Exception as e:
+            if started:
+                raise
+            print(f"Streaming sırasında hata oluştu: {e}")
+    else:
+        print("Model streaming desteklemiyor, normal yanıt kullanılacak")
+    
+    from langchain_core.output_parsers import StrOutputParser
+    response = await model.ainvoke(prompt)
+    yield StrOutputParser().parse(response)
+
+
 def create_academic_formatted_stream(model, prompt, system_instruction, question, context, callback=None):
     """
     Akademik formatlı streaming yanıtlar oluşturur.
@@ -7,30 +7,59 @@ Bu modül, anahtar kelime çıkarma ve belge alakalılık hesaplama için fonksi
 """
 
 import re
+import functools
 import numpy as np
 
-# TurkishStemmer için güvenli import
-try:
-    from TurkishStemmer import TurkishStemmer
-    stemmer = TurkishStemmer()
-    STEMMER_AVAILABLE = True
-    print("TurkishStemmer başarıyla yüklendi.")
-except ImportError:
-    print("TurkishStemmer bulunamadı. Basit stemming kullanılacak.")
-    # Basit bir stemmer tanımla
-    class DummyStemmer:
-        def stem(self, word):
-            # Çok basit bir stemming - sadece yaygın Türkçe ekleri çıkar
-            suffixes = ['lar', 'ler', 'leri', 'ları', 'dan', 'den', 'tan', 'ten', 
-                       'a', 'e', 'i', 'ı', 'in', 'ın', 'un', 'ün', 'da', 'de', 'ta', 'te']
-            result = word
-            for suffix in suffixes:
-                if word.endswith(suffix) and len(word) > len(suffix) + 2:
-                    result = word[:-len(suffix)]
-                    break
-            return result
-    stemmer = DummyStemmer()
-    STEMMER_AVAILABLE = False
+from inspareai.utils.stemmer import get_stemmer, stemmer_available
+from inspareai.utils.chunk_schema import chunk_speaker
+
+
+def __getattr__(name):
+    # Geriye uyumluluk: `text.stemmer` ve `text.STEMMER_AVAILABLE` ilk erişimde yüklenir
+    if name == "stemmer":
+        return get_stemmer()
+    if name == "STEMMER_AVAILABLE":
+        return stemmer_available()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Genişletilmiş Türkçe stopwords listesi
+TURKISH_STOPWORDS = frozenset([
+    've', 'veya', 'ile', 'bu', 'şu', 'o', 'bir', 'için', 'gibi', 'kadar', 'de', 'da',
+    'ne', 'ki', 'ama', 'fakat', 'lakin', 'ancak', 'hem', 'ya', 'ise', 'mi', 'mu', 'mı', 'mü',
+    'nasıl', 'neden', 'niçin', 'hangi', 'kim', 'kime', 'kimi', 'ne', 'nerede', 'her', 'tüm',
+    'bütün', 'hep', 'hiç', 'çok', 'daha', 'en', 'pek', 'sadece', 'yalnız', 'dolayı', 'üzere'
+])
+
+# Daha gelişmiş kelime ayırma (noktalama işaretlerini de dikkate alır)
+_WORD_RE = re.compile(r'\b[\wçğıöşüÇĞİÖŞÜ]+\b')
+
+
+def stem_word(word):
+    """Kelimenin kökünü bulur; stemmer başarısız olursa kelimeyi olduğu gibi döndürür
+    
+    Sonuçlar paylaşılan stemmer'ın LRU önbelleğinde tutulur; veritabanı oluşturma
+    (BM25 indeksi) ve sorgu anahtar kelimeleri aynı kökleri üretir.
+    """
+    try:
+        return get_stemmer().stem(word)
+    except Exception:
+        return word
+
+
+def tokenize_and_stem(text):
+    """
+    Metni kelimelere ayırır, stopword'leri ve kısa kelimeleri çıkarır, köklerini bulur.
+    Sorgu anahtar kelimeleri ve sözcüksel (BM25) indeks aynı fonksiyonu kullanır.
+    
+    Args:
+        text (str): İşlenecek metin
+        
+    Returns:
+        list: Kök haline getirilmiş kelimeler (metindeki sırayla, tekrarlar dahil)
+    """
+    return [stem_word(word) for word in _WORD_RE.findall(text.lower())
+            if word not in TURKISH_STOPWORDS and len(word) > 2]
 
 
 def extract_keywords(text):
@@ -43,28 +72,8 @@ def extract_keywords(text):
         list: Çıkarılan anahtar kelimeler
     """
     try:
-        # Genişletilmiş Türkçe stopwords listesi
-        stopwords = [
-            've', 'veya', 'ile', 'bu', 'şu', 'o', 'bir', 'için', 'gibi', 'kadar', 'de', 'da',
-            'ne', 'ki', 'ama', 'fakat', 'lakin', 'ancak', 'hem', 'ya', 'ise', 'mi', 'mu', 'mı', 'mü',
-            'nasıl', 'neden', 'niçin', 'hangi', 'kim', 'kime', 'kimi', 'ne', 'nerede', 'her', 'tüm',
-            'bütün', 'hep', 'hiç', 'çok', 'daha', 'en', 'pek', 'sadece', 'yalnız', 'dolayı', 'üzere'
-        ]
-        
-        # Daha gelişmiş kelime ayırma (noktalama işaretlerini de dikkate alır)
-        words = re.findall(r'\b[\wçğıöşüÇĞİÖŞÜ]+\b', text.lower())
-        
-        # Kök bulma işlemini daha güvenli hale getir
-        keywords = []
-        for word in words:
-            if word not in stopwords and len(word) > 2:
-                try:
-                    # Stemmer ile kök bul
-                    stemmed = stemmer.stem(word)
-                    keywords.append(stemmed)
-                except Exception:
-                    # Stemmer başarısız olursa kelimeyi olduğu gibi kullan
-                    keywords.append(word)
+        # Kelimeleri ayır, stopword'leri çıkar ve köklerini bul
+        keywords = tokenize_and_stem(text)
         
         # Anahtar kelimelerin ağırlıklandırılması
         keyword_counts = {}
@@ -90,92 +99,130 @@ def extract_keywords(text):
         return list(set([w for w in words if len(w) > 2 and w not in ['ve', 'ile', 'bu', 'şu', 'o']]))
 
 
-def calculate_relevance(doc, keywords):
-    """Belge ve anahtar kelimeler arasındaki alakayı hesapla
+# Toplu alaka puanlaması için önceden derlenmiş ifadeler
+_TOKEN_RE = re.compile(r'\w+')
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]+')
+_TIME_RE = re.compile(r'\d+:\d+:\d+')
+
+
+@functools.lru_cache(maxsize=20000)
+def _chunk_features(text):
+    """
+    Bir parçanın sorgudan bağımsız özelliklerini bir kez hesaplar ve saklar.
     
-    Args:
-        doc (Document): Alakalılığı hesaplanacak belge
-        keywords (list): Anahtar kelimeler listesi
-        
     Returns:
-        float: Alakalılık puanı
+        tuple: (küçük harfli metin, metindeki kelimeler kümesi, cümle uzunluğu puanı, soru-cevap puanı)
     """
-    doc_text = doc.page_content.lower()
-    speaker = doc.metadata.get("speaker", "")
-    time_info = doc.metadata.get("time", "")
-    score = 0.0
+    doc_text = text.lower()
     
-    # Anahtar kelime bazlı puanlama
-    keyword_matches = 0
-    keyword_match_positions = []
+    # Metindeki kelimeler - `\bkelime\b` eşleşmesi ancak kelime bu kümedeyse mümkündür
+    tokens = frozenset(_TOKEN_RE.findall(doc_text))
     
-    for keyword in keywords:
-        # Tam eşleşme veya kelime sınırlarında eşleşme
-        pattern = r'\b' + re.escape(keyword) + r'\b'
-        matches = re.finditer(pattern, doc_text)
-        
-        match_count = 0
-        for match in matches:
-            match_count += 1
-            keyword_match_positions.append(match.start())
-        
-        if match_count > 0:
-            keyword_matches += 1
-            # İlk eşleşmeler daha önemli
-            # Bir kelime çok tekrarlanıyorsa ekstra puan verir (logaritmik)
-            score += 1.0 + (0.2 * min(match_count - 1, 5))
-            
-            # Fiil kökü ise daha fazla puan ver
-            if hasattr(stemmer, '_check_verb_root') and callable(getattr(stemmer, '_check_verb_root')):
-                try:
-                    if stemmer._check_verb_root(keyword):
-                        score += 0.5  # Fiil kökleri daha önemli
-                except:
-                    pass
+    # Daha uzun ve anlamlı cümleler için puan
+    sentences = _SENTENCE_SPLIT_RE.split(doc_text)
+    mean_sentence_len = sum(len(s.split()) for s in sentences) / max(len(sentences), 1)
+    sentence_bonus = 0.5 if 5 <= mean_sentence_len <= 20 else 0.0
     
-    # Eğer hiç eşleşme yoksa düşük bir değer dön
-    if keyword_matches == 0 and keywords:
-        return 0.1
-        
-    # Belge uzunluğuna göre normalizasyon
-    doc_len = len(doc_text)
-    if doc_len > 50 and keyword_matches > 0:
-        density = keyword_matches / (doc_len / 100)  # Her 100 karakter başına eşleşme
-        score += min(density, 2.0)  # Maksimum 2.0 puan ekle
+    # İçeriğin genel kalitesi - metin içinde soru-cevap yapısı var mı?
+    question_bonus = 0.5 if '?' in doc_text and len(doc_text) > 100 else 0.0
     
-    # Eşleşen kelimelerin yakınlığı - birbirine yakın eşleşmeler daha değerli
-    if len(keyword_match_positions) > 1:
-        # Pozisyonları sırala
-        keyword_match_positions.sort()
-        
-        # Ardışık eşleşmeler arasındaki mesafeleri hesapla
-        distances = []
-        for i in range(1, len(keyword_match_positions)):
-            distance = keyword_match_positions[i] - keyword_match_positions[i-1]
-            distances.append(distance)
-        
-        # Ortalama mesafe - küçük olması daha iyi
-        avg_distance = sum(distances) / len(distances)
-        proximity_score = 1.0 / (1.0 + avg_distance / 100)  # Normalize edilmiş yakınlık puanı
-        score += proximity_score
+    return doc_text, tokens, sentence_bonus, question_bonus
+
+
+def calculate_relevance_batch(docs, keywords):
+    """Birden fazla belgenin anahtar kelimelerle alakasını tek seferde hesapla
     
-    # Zamansal bilgiler
-    if re.search(r'\d+:\d+:\d+', time_info):
-        score += 0.5
+    calculate_relevance ile aynı puan bileşenlerini (eşleşme, yoğunluk, yakınlık,
+    zaman, konuşmacı, cümle ve soru-cevap puanları) aynı sırayla toplar. Her parça
+    bir kez kelimelere ayrılır ve sonuç önbellekte tutulur; düzenli ifadeler anahtar
+    kelime başına bir kez derlenir ve yalnızca kelimeyi içeren parçalarda çalıştırılır.
     
-    # Konuşmacı bilgisinin varlığı
-    if speaker and len(speaker.strip()) > 0:
-        score += 0.3
+    Args:
+        docs (list): Alakalılığı hesaplanacak belgeler
+        keywords (list): Anahtar kelimeler listesi
+        
+    Returns:
+        list: Belgelerle aynı sırada alakalılık puanları
+    """
+    stemmer = get_stemmer()
     
-    # Daha uzun ve anlamlı cümleler için puan
-    sentences = re.split(r'[.!?]+', doc_text)
-    mean_sentence_len = sum(len(s.split()) for s in sentences) / max(len(sentences), 1)
-    if 5 <= mean_sentence_len <= 20:  # İdeal cümle uzunluğu
-        score += 0.5
+    # Anahtar kelimeye bağlı bilgiler belge sayısından bağımsız olarak bir kez hesaplanır
+    check_verb_root = getattr(stemmer, '_check_verb_root', None)
+    keyword_info = []
+    for keyword in keywords:
+        verb_bonus = 0.0
+        if callable(check_verb_root):
+            try:
+                if check_verb_root(keyword):
+                    verb_bonus = 0.5  # Fiil kökleri daha önemli
+            except Exception:
+                pass
+        # Yalnızca kelime karakterlerinden oluşan anahtar kelimeler kelime kümesiyle elenebilir
+        plain = _TOKEN_RE.fullmatch(keyword) is not None
+        pattern = re.compile(r'\b' + re.escape(keyword) + r'\b')
+        keyword_info.append((keyword, verb_bonus, pattern, plain))
     
-    # İçeriğin genel kalitesi - metin içinde soru-cevap yapısı var mı?
-    if '?' in doc_text and len(doc_text) > 100:
-        score += 0.5  # Muhtemelen bir soru-cevap var, bu faydalı olabilir
+    scores = []
+    for doc in docs:
+        doc_text, tokens, sentence_bonus, question_bonus = _chunk_features(doc.page_content)
+        doc_len = len(doc_text)
+        score = 0.0
+        keyword_matches = 0
+        match_positions = []
+        
+        for keyword, verb_bonus, pattern, plain in keyword_info:
+            # Çoğu anahtar kelime parçada geçmez - küme kontrolü düzenli ifade taramasını atlar
+            if (keyword not in tokens) if plain else (keyword not in doc_text):
+                continue
+            keyword_positions = [m.start() for m in pattern.finditer(doc_text)]
+            
+            match_count = len(keyword_positions)
+            if match_count > 0:
+                keyword_matches += 1
+                match_positions.extend(keyword_positions)
+                score += 1.0 + (0.2 * min(match_count - 1, 5))
+                score += verb_bonus
+        
+        # Eğer hiç eşleşme yoksa düşük bir değer dön
+        if keyword_matches == 0 and keywords:
+            scores.append(0.1)
+            continue
+        
+        # Belge uzunluğuna göre normalizasyon
+        if doc_len > 50 and keyword_matches > 0:
+            density = keyword_matches / (doc_len / 100)
+            score += min(density, 2.0)
+        
+        # Eşleşmelerin yakınlığı - ardışık mesafelerin ortalaması (son - ilk) / (n - 1)
+        if len(match_positions) > 1:
+            avg_distance = (max(match_positions) - min(match_positions)) / (len(match_positions) - 1)
+            score += 1.0 / (1.0 + avg_distance / 100)
+        
+        # Zamansal bilgiler - şema 2'de saniye olarak, şema 1'de metin olarak saklanır
+        if "start" in doc.metadata or _TIME_RE.search(doc.metadata.get("time", "")):
+            score += 0.5
+        
+        # Konuşmacı bilgisinin varlığı
+        speaker = chunk_speaker(doc.metadata)
+        if speaker and len(speaker.strip()) > 0:
+            score += 0.3
+        
+        score += sentence_bonus
+        score += question_bonus
+        
+        scores.append(max(score, 0.1))
+    
+    return scores
+
+
+def calculate_relevance(doc, keywords):
+    """Belge ve anahtar kelimeler arasındaki alakayı hesapla
     
-    # Sonucun pozitif olmasını sağla
-    return max(score, 0.1)
+    Args:
+        doc (Document): Alakalılığı hesaplanacak belge
+        keywords (list): Anahtar kelimeler listesi
+        
+    Returns:
+        float: Alakalılık puanı
+    """
+    return calculate_relevance_batch([doc], keywords)[0]
@@ -0,0 +1,371 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - Transkript ayrıştırma ve parçalama fonksiyonları.
+Bu modül, transkript dosyalarının okunması, konuşmalara ayrılması ve metin
+parçalarına bölünmesi için fonksiyonları içerir. Modül yan etkisiz olarak içe
+aktarılabildiği için süreç havuzu (process pool) işçilerinde güvenle kullanılır.
+"""
+
+import os
+import re
+import time
+import hashlib
+from typing import NamedTuple
+
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+# Metin bölme ayırıcıları - Türkçe noktalama yapısına göre sıralı
+TEXT_SEPARATORS = ["\n\n", "\n", ". ", "? ", "! ", "; ", ", ", " ", ""]
+
+
+# Metin temizleme desenleri - modül yüklenirken bir kez derlenir
+_URL_RE = re.compile(r'https?://\S+')
+_MULTI_DOT_RE = re.compile(r'[.]{2,}')
+_MULTI_EXCLAMATION_RE = re.compile(r'[!]{2,}')
+_MULTI_QUESTION_RE = re.compile(r'[?]{2,}')
+_SPECIAL_CHAR_RE = re.compile(r'[^\w\s\.,?!;:\-\'\"()çğıöşüÇĞİÖŞÜ]')
+_PHONE_RE = re.compile(r'(\+90|0)?\s*?5\d{2}\s*?\d{3}\s*?\d{2}\s*?\d{2}')
+_SINGLE_CONSONANT_RE = re.compile(r'\s[bcdfghjklmnpqrstvwxyzçğşBCDFGHJKLMNPQRSTVWXYZÇĞŞ]\s')
+_REPEATED_CONSONANT_RE = re.compile(r'([bcdfghjklmnpqrstvwxyzçğşBCDFGHJKLMNPQRSTVWXYZÇĞŞ])\1{2,}')
+
+# Türkçe için özel metin temizleme fonksiyonu
+def clean_turkish_text(text):
+    """Türkçe metni temizler ve gelişmiş normalizasyon uygular"""
+    if not text or not isinstance(text, str):
+        return ""
+        
+    # Gereksiz boşlukları kaldır (baştaki/sondaki tek boşluk sonraki kurallar için korunur)
+    collapsed = ' '.join(text.split())
+    if text[0].isspace():
+        collapsed = ' ' + collapsed
+    if text[-1].isspace() and collapsed:
+        collapsed += ' '
+    text = collapsed
+    
+    # Aşağıdaki desenler yalnızca ucuz bir alt dizgi kontrolü geçerse çalıştırılır
+    # URL'leri temizle veya basitleştir
+    if 'http' in text:
+        text = _URL_RE.sub('[URL]', text)
+    
+    # Birden fazla noktalama işaretlerini normalleştir
+    if '..' in text:
+        text = _MULTI_DOT_RE.sub('...', text)
+    if '!!' in text:
+        text = _MULTI_EXCLAMATION_RE.sub('!', text)
+    if '??' in text:
+        text = _MULTI_QUESTION_RE.sub('?', text)
+    
+    # Emojileri ve özel karakterleri temizle ama Türkçe karakterleri koru
+    text = _SPECIAL_CHAR_RE.sub('', text)
+    
+    # Rakamları standardize et (telefon numaraları, tarihler vb.)
+    # Telefon numaraları: 5xx xxx xx xx formatına dönüştür
+    if '5' in text:
+        text = _PHONE_RE.sub('5XX XXX XX XX', text)
+    
+    # Kelimeler arasındaki tek harfleri temizle (genellikle hata)
+    text = _SINGLE_CONSONANT_RE.sub(' ', text)
+    
+    # Fazla tekrarlayan harfleri normalleştir (örn: "çooook" -> "çok")
+    text = _REPEATED_CONSONANT_RE.sub(r'\1', text)
+    
+    return text.strip()
+
+def normalize_time_format(time_str):
+    """Zaman formatını standartlaştırır (00:00:00 formatına dönüştürür)"""
+    if not time_str or not isinstance(time_str, str):
+        return "00:00:00"
+    
+    # Boşlukları temizle
+    time_str = time_str.strip()
+    
+    # Eğer format zaten doğruysa (00:00:00)
+    if re.match(r'^\d{2}:\d{2}:\d{2}$', time_str):
+        return time_str
+    
+    # 0:00:00 formatındaysa başa 0 ekle
+    if re.match(r'^\d:\d{2}:\d{2}$', time_str):
+        return f"0{time_str}"
+    
+    # xx:xx formatındaysa başına 00: ekle
+    if re.match(r'^\d{1,2}:\d{2}$', time_str):
+        return f"00:{time_str}"
+    
+    # Diğer durumlar - varsayılan değer döndür
+    return "00:00:00"
+
+# Konuşma başlığı desenleri - satır başında eşleşir (eski regex sırasıyla aynı öncelik)
+_SEGMENT_HEADER_PATTERNS = [
+    # Standart format: 0:00:00 - 0:00:44 Speaker A: Konuşma
+    re.compile(r"\s*(\d+):(\d+):(\d+)\s*-\s*(\d+):(\d+):(\d+)\s*Speaker\s*([A-Za-z0-9]+):\s*(.*)"),
+    # Alt format: 00:00:00 Konuşmacı: Konuşma
+    re.compile(r"\s*(\d+):(\d+):(\d+)()()()\s*([A-Za-z0-9]+):\s*(.*)"),
+    # Başka bir format: [00:00:00] Speaker X: Konuşma
+    re.compile(r"\s*\[(\d+):(\d+):(\d+)\]()()()\s*([A-Za-z0-9]+):\s*(.*)"),
+]
+
+# Format tespiti için incelenecek en fazla dolu satır sayısı
+_FORMAT_SNIFF_LINES = 50
+
+
+class TranscriptSegment(NamedTuple):
+    """Ayrıştırılmış tek bir konuşma bölümü - zamanlar saniye cinsindendir"""
+    start: int
+    end: int
+    speaker: str
+    content: str
+
+
+def seconds_to_time(seconds):
+    """Saniye değerini 00:00:00 formatına dönüştürür"""
+    seconds = max(int(seconds), 0)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def _sniff_header_pattern(lines):
+    """İlk dolu satırlara bakarak dosyanın konuşma formatını bir kez belirler"""
+    checked = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        for pattern in _SEGMENT_HEADER_PATTERNS:
+            if pattern.match(line):
+                return pattern
+        checked += 1
+        if checked >= _FORMAT_SNIFF_LINES:
+            break
+    return None
+
+
+def iter_transcript_segments(content):
+    """
+    Transkripti tek geçişte, satır satır tarayarak konuşma bölümlerine ayırır.
+
+    Format dosya başına bir kez tespit edilir; ardından her satır yalnızca bu
+    formatın derlenmiş başlık deseniyle karşılaştırılır. Başlık içermeyen
+    satırlar bir önceki konuşmanın devamı sayılır.
+
+    Args:
+        content (str): Transkript dosyasının içeriği
+
+    Yields:
+        TranscriptSegment: Zamanları saniyeye çevrilmiş, temizlenmiş konuşma bölümü
+    """
+    if not content or not isinstance(content, str):
+        return
+
+    lines = content.splitlines()
+    pattern = _sniff_header_pattern(lines)
+
+    # Hiçbir desen eşleşmediyse her satırı ayrı bir konuşma kabul et
+    if pattern is None:
+        print("UYARI: Transkript deseni bulunamadı. Metin tam metinden ayrıştırılacak.")
+        for line in lines:
+            line = line.strip()
+            if len(line) > 10:  # Kısa satırları atla
+                yield TranscriptSegment(0, 0, "Unknown", clean_turkish_text(line))
+        return
+
+    match_header = pattern.match
+    current = None
+    body = []
+
+    for line in lines:
+        match = match_header(line)
+        if match is None:
+            if current is not None:
+                body.append(line)
+            continue
+
+        if current is not None:
+            text = clean_turkish_text("\n".join(body))
+            if text:
+                yield TranscriptSegment(current[0], current[1], current[2], text)
+
+        h, m, s, end_h, end_m, end_s, speaker, first_line = match.groups()
+        start = int(h) * 3600 + int(m) * 60 + int(s)
+        end = int(end_h) * 3600 + int(end_m) * 60 + int(end_s) if end_h else start
+        current = (start, end, speaker)
+        body = [first_line]
+
+    if current is not None:
+        text = clean_turkish_text("\n".join(body))
+        if text:
+            yield TranscriptSegment(current[0], current[1], current[2], text)
+
+
+def parse_transcript(content):
+    """
+    Konuşma yapısını parse et - eski sözlük formatıyla uyumlu sarmalayıcı
+
+    Returns:
+        list: {"time", "speaker", "content"} sözlüklerinin listesi
+    """
+    return [
+        {
+            "time": f"{seconds_to_time(segment.start)} - {seconds_to_time(segment.end)}",
+            "speaker": segment.speaker,
+            "content": segment.content
+        }
+        for segment in iter_transcript_segments(content)
+    ]
+
+def calculate_time_difference(start_time, end_time):
+    """İki zaman arasındaki farkı saniye cinsinden hesaplar"""
+    def time_to_seconds(time_str):
+        h, m, s = map(int, time_str.split(':'))
+        return h * 3600 + m * 60 + s
+        
+    start_seconds = time_to_seconds(start_time)
+    end_seconds = time_to_seconds(end_time)
+    return end_seconds - start_seconds
+
+# Dinamik chunk_size ve overlap hesaplama fonksiyonu
+def calculate_dynamic_chunking(content, base_chunk_size=350, base_overlap=40):
+    """
+    İçerik uzunluğuna ve karmaşıklığına göre dinamik chunk_size ve overlap hesaplar
+    
+    Args:
+        content: İşlenecek metin içeriği
+        base_chunk_size: Temel chunk boyutu
+        base_overlap: Temel örtüşme boyutu
+    
+    Returns:
+        tuple: (chunk_size, chunk_overlap)
+    """
+    # İçerik uzunluğu
+    content_length = len(content)
+    
+    # Cümle sayısı (kabaca noktalama işaretlerine göre)
+    sentences = re.split(r'[.!?]+', content)
+    sentence_count = len([s for s in sentences if len(s.strip()) > 0])
+    
+    # Ortalama cümle uzunluğu
+    if sentence_count > 0:
+        avg_sentence_length = content_length / sentence_count
+    else:
+        avg_sentence_length = 20  # Varsayılan değer
+    
+    # İçerik karmaşıklığı göstergeleri
+    complexity_indicators = {
+        'uzun_cümleler': sum(1 for s in sentences if len(s.split()) > 20) / max(sentence_count, 1),
+        'teknik_terimler': len(re.findall(r'\b[A-Z][a-z]+(?:[A-Z][a-z]+)+\b', content)) / max(content_length / 100, 1),
+        'noktalama_yoğunluğu': len(re.findall(r'[,;:\(\)\[\]\{\}]', content)) / max(content_length / 100, 1)
+    }
+    
+    # Karmaşıklık skoru (0-1 arası)
+    complexity_score = (
+        0.4 * complexity_indicators['uzun_cümleler'] + 
+        0.3 * complexity_indicators['teknik_terimler'] + 
+        0.3 * complexity_indicators['noktalama_yoğunluğu']
+    )
+    complexity_score = min(max(complexity_score, 0), 1)  # 0-1 aralığına sınırla
+    
+    # İçerik uzunluğuna göre ayarlama
+    length_factor = 1.0
+    if content_length > 10000:  # Uzun dokümanlar
+        length_factor = 1.3
+    elif content_length < 1000:  # Kısa dokümanlar
+        length_factor = 0.8
+    
+    # Cümle uzunluğuna göre ayarlama
+    sentence_factor = 1.0
+    if avg_sentence_length > 30:  # Uzun cümleler
+        sentence_factor = 1.2
+    elif avg_sentence_length < 10:  # Kısa cümleler
+        sentence_factor = 0.9
+    
+    # Dinamik chunk_size hesaplama
+    chunk_size = int(base_chunk_size * length_factor * sentence_factor * (1 + 0.5 * complexity_score))
+    
+    # Dinamik overlap hesaplama - karmaşıklık arttıkça overlap artar
+    overlap_ratio = 0.12 + (0.08 * complexity_score)  # %12-%20 arası
+    chunk_overlap = int(chunk_size * overlap_ratio)
+      # Minimum ve maksimum değerleri kontrol et
+    chunk_size = max(500, min(chunk_size, 1000))  # 500-1000 arası (daha büyük chunks)
+    chunk_overlap = max(100, min(chunk_overlap, 250))  # 100-250 arası (daha büyük overlap)
+    
+    print(f"Dinamik chunking: size={chunk_size}, overlap={chunk_overlap} (Karmaşıklık skoru: {complexity_score:.2f})")
+    return chunk_size, chunk_overlap
+
+def make_chunk_id(source, conversation_id, chunk_index):
+    """
+    Bir metin parçası için deterministik ID üretir.
+    Aynı dosyanın aynı konuşma/parça konumu her çalıştırmada aynı ID'yi alır,
+    böylece Chroma'ya yazma işlemi yinelenen kayıt yerine güncelleme (upsert) olur.
+    """
+    key = f"{source}|{conversation_id}|{chunk_index}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def process_transcript_file(file_path, chunk_size=800, chunk_overlap=180, dynamic_chunking=True, source_id=0):
+    """
+    Tek bir transkript dosyasını okur, konuşmalara ayırır ve parçalara böler.
+    Süreç havuzu işçilerinde çalıştırılabilmesi için sonuçlar pickle edilebilir
+    basit kayıtlar olarak döndürülür. Parçalar kompakt şemadadır (şema 2):
+    içerik yalnızca konuşma metnidir, zaman/konuşmacı/kaynak meta veride tutulur.
+
+    Args:
+        file_path (str): Transkript dosyasının yolu
+        chunk_size (int): Metin parçalarının boyutu
+        chunk_overlap (int): Parçalar arası örtüşme
+        dynamic_chunking (bool): Dinamik chunk boyutu kullanılsın mı
+        source_id (int): Dosyanın indeks dosya tablosundaki numarası
+
+    Returns:
+        dict: filename, chunks [(chunk_id, page_content, metadata), ...], bytes, segments,
+              elapsed ve pid alanlarını içeren işlem kaydı
+    """
+    # Döngüsel içe aktarmayı önlemek için şema modülü burada yüklenir
+    from inspareai.utils.chunk_schema import compact_metadata
+
+    start = time.perf_counter()
+    filename = os.path.basename(file_path)
+    chunks = []
+
+    print(f"Dosya işleniyor: {filename}")
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    # Dinamik chunking kullanılıyorsa, dosya içeriğine göre chunk_size ve overlap ayarla
+    local_chunk_size = chunk_size
+    local_chunk_overlap = chunk_overlap
+    if dynamic_chunking:
+        local_chunk_size, local_chunk_overlap = calculate_dynamic_chunking(content, chunk_size, chunk_overlap)
+
+    text_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=local_chunk_size,
+        chunk_overlap=local_chunk_overlap,
+        length_function=len,
+        separators=TEXT_SEPARATORS
+    )
+
+    # Konuşmaları tek geçişte ayrıştır ve parçala
+    segment_count = 0
+    total_duration = 0
+    for i, segment in enumerate(iter_transcript_segments(content)):
+        segment_count += 1
+        total_duration += segment.end - segment.start
+
+        # İçerik çok kısaysa atla (gürültü olabilir)
+        if len(segment.content) < 10:
+            continue
+
+        # Konuşma metnini böl - zaman ve konuşmacı bilgisi yalnızca meta veride tutulur
+        for chunk_index, chunk_text in enumerate(text_splitter.split_text(segment.content)):
+            chunk_metadata = compact_metadata(source_id, segment.start, segment.end, segment.speaker, i, chunk_index)
+            chunks.append((make_chunk_id(filename, i, chunk_index), chunk_text, chunk_metadata))
+
+    print(f"{filename} içinde {segment_count} konuşma bulundu")
+    print(f"Toplam konuşma süresi: {total_duration//60} dakika {total_duration%60} saniye")
+
+    return {
+        "filename": filename,
+        "chunks": chunks,
+        "bytes": len(content.encode('utf-8')),
+        "segments": segment_count,
+        "elapsed": time.perf_counter() - start,
+        "pid": os.getpid(),
+    }
@@ -13,7 +13,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 # CLI arayüzünü çağır
-from inspareai.cli.interface import main
+from inspareai.cli import main
 
 # Geriye uyumluluk için ana fonksiyonları doğrudan dışa aktar
 from inspareai.core.query import query_transcripts, quick_query
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - Transkript ayrıştırıcı karşılaştırma aracı
+Bu script, tek geçişli satır tarayıcıyı (iter_transcript_segments) eski üç
+desenli regex ayrıştırıcısı ve eski metin temizleme fonksiyonuyla paket
+içindeki transkript korpusu üzerinde karşılaştırır ve süre, verim ve çıktı
+uyumu bilgilerini raporlar.
+
+Kullanım:
+    python scripts/benchmark_parser.py [--dir transcripts] [--repeat 3]
+"""
+
+import sys
+import os
+import re
+import io
+import time
+import argparse
+import contextlib
+
+# Ana dizini ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inspareai.utils.transcript import parse_transcript
+
+
+def legacy_clean_turkish_text(text):
+    """Eski metin temizleme fonksiyonu (karşılaştırma için korunmuştur)"""
+    if not text or not isinstance(text, str):
+        return ""
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'https?://\S+', '[URL]', text)
+    text = re.sub(r'[.]{2,}', '...', text)
+    text = re.sub(r'[!]{2,}', '!', text)
+    text = re.sub(r'[?]{2,}', '?', text)
+    text = re.sub(r'[^\w\s\.,?!;:\-\'\"()çğıöşüÇĞİÖŞÜ]', '', text)
+    text = re.sub(r'(\+90|0)?\s*?5\d{2}\s*?\d{3}\s*?\d{2}\s*?\d{2}', '5XX XXX XX XX', text)
+    text = re.sub(r'\s[bcdfghjklmnpqrstvwxyzçğşBCDFGHJKLMNPQRSTVWXYZÇĞŞ]\s', ' ', text)
+    text = re.sub(r'([bcdfghjklmnpqrstvwxyzçğşBCDFGHJKLMNPQRSTVWXYZÇĞŞ])\1{2,}', r'\1', text)
+    return text.strip()
+
+
+def legacy_normalize_time_format(time_str):
+    """Eski ayrıştırıcının zaman normalizasyonu (karşılaştırma için korunmuştur)"""
+    if not time_str or not isinstance(time_str, str):
+        return "00:00:00"
+    time_str = time_str.strip()
+    if re.match(r'^\d{2}:\d{2}:\d{2}$', time_str):
+        return time_str
+    if re.match(r'^\d:\d{2}:\d{2}$', time_str):
+        return f"0{time_str}"
+    if re.match(r'^\d{1,2}:\d{2}$', time_str):
+        return f"00:{time_str}"
+    return "00:00:00"
+
+
+def legacy_parse_transcript(content):
+    """Eski üç desenli regex ayrıştırıcısı (karşılaştırma için korunmuştur)"""
+    if not content or not isinstance(content, str):
+        return []
+
+    patterns = [
+        r"(\d+:\d+:\d+)\s*-\s*(\d+:\d+:\d+)\s*Speaker\s*([A-Za-z0-9]+):\s*(.*?)(?=\d+:\d+:\d+\s*-|\Z)",
+        r"(\d+:\d+:\d+)\s*([A-Za-z0-9]+):\s*(.*?)(?=\d+:\d+:\d+|\Z)",
+        r"\[(\d+:\d+:\d+)\]\s*([A-Za-z0-9]+):\s*(.*?)(?=\[|\Z)"
+    ]
+
+    conversations = []
+    for pattern_idx, pattern in enumerate(patterns):
+        matches = list(re.finditer(pattern, content, re.DOTALL))
+        if matches:
+            print(f"Transkript deseni {pattern_idx+1} kullanılıyor. {len(matches)} konuşma bulundu.")
+            for match in matches:
+                if pattern_idx == 0:
+                    start_time = legacy_normalize_time_format(match.group(1))
+                    end_time = legacy_normalize_time_format(match.group(2))
+                    speaker = match.group(3)
+                    text = match.group(4).strip()
+                else:
+                    start_time = legacy_normalize_time_format(match.group(1))
+                    end_time = start_time
+                    speaker = match.group(2)
+                    text = match.group(3).strip()
+
+                if not text:
+                    continue
+                text = legacy_clean_turkish_text(text)
+                if text:
+                    conversations.append({
+                        "time": f"{start_time} - {end_time}",
+                        "speaker": speaker,
+                        "content": text
+                    })
+            if conversations:
+                break
+
+    if not conversations:
+        for line in content.split('\n'):
+            line = line.strip()
+            if len(line) > 10:
+                conversations.append({
+                    "time": "00:00:00 - 00:00:00",
+                    "speaker": "Unknown",
+                    "content": legacy_clean_turkish_text(line)
+                })
+
+    return conversations
+
+
+def time_parser(parse_fn, contents, repeat):
+    """Ayrıştırıcıyı tüm korpus üzerinde çalıştırır, en iyi süreyi ve sonuçları döndürür"""
+    best = float("inf")
+    results = None
+    for _ in range(repeat):
+        # Eski ayrıştırıcının dosya başına çıktısını ölçüme katmamak için bastır
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            results = [parse_fn(content) for content in contents]
+            best = min(best, time.perf_counter() - start)
+    return best, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transkript ayrıştırıcı karşılaştırması")
+    parser.add_argument("--dir", default="transcripts", help="Transkript klasörü")
+    parser.add_argument("--repeat", type=int, default=3, help="Tekrar sayısı (en iyi süre raporlanır)")
+    args = parser.parse_args()
+
+    files = sorted(f for f in os.listdir(args.dir) if f.endswith(".txt") and not f.startswith('.'))
+    contents = []
+    for filename in files:
+        with open(os.path.join(args.dir, filename), 'r', encoding='utf-8') as f:
+            contents.append(f.read())
+
+    total_mb = sum(len(c.encode('utf-8')) for c in contents) / (1024 * 1024)
+    print(f"{len(files)} dosya, {total_mb:.1f} MB")
+
+    legacy_time, legacy_results = time_parser(legacy_parse_transcript, contents, args.repeat)
+    new_time, new_results = time_parser(parse_transcript, contents, args.repeat)
+
+    legacy_segments = sum(len(r) for r in legacy_results)
+    new_segments = sum(len(r) for r in new_results)
+    identical_files = sum(1 for a, b in zip(legacy_results, new_results) if a == b)
+
+    print(f"Eski regex ayrıştırıcı : {legacy_time:.3f} sn ({total_mb / legacy_time:.1f} MB/sn), {legacy_segments} konuşma")
+    print(f"Tek geçişli tarayıcı   : {new_time:.3f} sn ({total_mb / new_time:.1f} MB/sn), {new_segments} konuşma")
+    print(f"Hızlanma: {legacy_time / new_time:.2f}x")
+    print(f"Birebir aynı çıktı veren dosyalar: {identical_files}/{len(files)}")
+
+    for filename, a, b in zip(files, legacy_results, new_results):
+        if a != b:
+            print(f" - Fark: {filename} (eski {len(a)}, yeni {len(b)} konuşma)")
+
+
+if __name__ == "__main__":
+    main()
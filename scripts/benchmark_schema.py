@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - Parça şeması karşılaştırma aracı
+Bu script, eski (şema 1: formatlı metin + tekrarlanan meta veri) ve kompakt
+(şema 2: yalnızca içerik + dosya tablosuna işaret eden kısa meta veri) parça
+şemalarını paket içindeki transkript korpusu üzerinde karşılaştırır. Her iki
+şema için aynı vektörlerle geçici bir Chroma koleksiyonu oluşturulur; disk
+boyutu, parça başına metin/meta veri boyutu, embedding girdisi uzunluğu ve
+sorgu + bağlam biçimlendirme süresi raporlanır.
+
+Vektörler rastgele üretilir (her iki şemada aynı); böylece ölçüm Ollama
+gerektirmez ve yalnızca şema farkını yansıtır.
+
+Kullanım:
+    python scripts/benchmark_schema.py [--dir transcripts] [--files 50] [--queries 200]
+"""
+
+import sys
+import os
+import io
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import contextlib
+
+import numpy as np
+
+# Ana dizini ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from inspareai.utils.transcript import (TEXT_SEPARATORS, iter_transcript_segments, make_chunk_id,
+                                        process_transcript_file, seconds_to_time)
+from inspareai.core.retrieval import format_context
+
+
+def legacy_chunks(file_path, chunk_size, chunk_overlap):
+    """Eski şemadaki parçaları üretir (karşılaştırma için korunmuştur)"""
+    filename = os.path.basename(file_path)
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap,
+                                              length_function=len, separators=TEXT_SEPARATORS)
+    chunks = []
+    for i, segment in enumerate(iter_transcript_segments(content)):
+        if len(segment.content) < 10:
+            continue
+        start_time = seconds_to_time(segment.start)
+        end_time = seconds_to_time(segment.end)
+        time_range = f"{start_time} - {end_time}"
+        metadata = {
+            "source": filename,
+            "file_path": file_path,
+            "file_type": "transcript",
+            "time": time_range,
+            "speaker": segment.speaker,
+            "conversation_id": i,
+            "start_time": start_time,
+            "end_time": end_time,
+            "title": f"{filename} - Konuşma {i+1} - {segment.speaker} ({time_range})",
+            "language": "Turkish",
+            "content_length": len(segment.content),
+        }
+        formatted = f"Time: {time_range}\nSpeaker: {segment.speaker}\nContent: {segment.content}"
+        for chunk_index, chunk_text in enumerate(splitter.split_text(formatted)):
+            chunk_metadata = dict(metadata, chunk_index=chunk_index,
+                                  chunk_id=make_chunk_id(filename, i, chunk_index))
+            chunks.append((chunk_metadata["chunk_id"], chunk_text, chunk_metadata))
+    return chunks
+
+
+def directory_size(path):
+    """Klasördeki dosyaların toplam boyutunu döndürür"""
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def build_collection(path, chunks, dimension, seed):
+    """Parçaları rastgele vektörlerle kalıcı bir Chroma koleksiyonuna yazar"""
+    import chromadb
+
+    client = chromadb.PersistentClient(path=path)
+    collection = client.create_collection("benchmark", metadata={"hnsw:space": "cosine"})
+    rng = np.random.default_rng(seed)
+    for start in range(0, len(chunks), 1000):
+        batch = chunks[start:start + 1000]
+        collection.add(
+            ids=[chunk_id for chunk_id, _, _ in batch],
+            documents=[text for _, text, _ in batch],
+            metadatas=[metadata for _, _, metadata in batch],
+            embeddings=rng.standard_normal((len(batch), dimension)).astype(np.float32),
+        )
+    return client, collection
+
+
+def time_queries(collection, queries, n_results):
+    """Sorgu + belge oluşturma + bağlam biçimlendirme süresini ölçer"""
+    start = time.perf_counter()
+    for query in queries:
+        results = collection.query(query_embeddings=[query], n_results=n_results,
+                                   include=["documents", "metadatas"])
+        docs = [Document(page_content=text, metadata=metadata, id=doc_id)
+                for doc_id, text, metadata in zip(results["ids"][0], results["documents"][0],
+                                                  results["metadatas"][0])]
+        format_context(docs)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parça şeması karşılaştırması")
+    parser.add_argument("--dir", default="transcripts", help="Transkript klasörü")
+    parser.add_argument("--files", type=int, default=50, help="Kullanılacak dosya sayısı (0: tümü)")
+    parser.add_argument("--chunk-size", type=int, default=350, help="Metin parça boyutu")
+    parser.add_argument("--chunk-overlap", type=int, default=40, help="Metin parça örtüşmesi")
+    parser.add_argument("--dimension", type=int, default=768, help="Vektör boyutu")
+    parser.add_argument("--queries", type=int, default=200, help="Sorgu sayısı")
+    parser.add_argument("--k", type=int, default=50, help="Sorgu başına getirilecek parça")
+    args = parser.parse_args()
+
+    files = sorted(f for f in os.listdir(args.dir) if f.endswith(".txt") and not f.startswith('.'))
+    if args.files:
+        files = files[:args.files]
+    sources = {i: filename for i, filename in enumerate(files)}
+
+    # Dosya başına ilerleme çıktısını ölçüme katmamak için bastır
+    with contextlib.redirect_stdout(io.StringIO()):
+        schemas = {
+            "Şema 1 (eski)": [chunk for filename in files
+                              for chunk in legacy_chunks(os.path.join(args.dir, filename),
+                                                         args.chunk_size, args.chunk_overlap)],
+            "Şema 2 (kompakt)": [chunk for i, filename in enumerate(files)
+                                 for chunk in process_transcript_file(os.path.join(args.dir, filename),
+                                                                      args.chunk_size, args.chunk_overlap,
+                                                                      False, source_id=i)["chunks"]],
+        }
+
+    # Kompakt şemada dosya adları çalışma zamanı tablosu yerine bu tablodan okunur
+    from inspareai.core.runtime import get_runtime
+    get_runtime()._instances["source_table"] = sources
+
+    queries = np.random.default_rng(1).standard_normal((args.queries, args.dimension)).astype(np.float32)
+    print(f"{len(files)} dosya, vektör boyutu {args.dimension}, {args.queries} sorgu (k={args.k})")
+
+    for label, chunks in schemas.items():
+        text_bytes = sum(len(text.encode('utf-8')) for _, text, _ in chunks)
+        metadata_bytes = sum(len(json.dumps(metadata, ensure_ascii=False).encode('utf-8')) for _, _, metadata in chunks)
+        work_dir = tempfile.mkdtemp(prefix="inspareai_schema_")
+        try:
+            client, collection = build_collection(work_dir, chunks, args.dimension, seed=0)
+            time_queries(collection, queries[:5], args.k)  # ısınma
+            query_time = time_queries(collection, queries, args.k)
+            del collection, client
+            size = directory_size(work_dir)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        count = len(chunks)
+        print(f"{label}: {count} parça, disk {size / (1024 * 1024):.1f} MB, "
+              f"metin (embedding girdisi) {text_bytes / count:.0f} B/parça, meta veri {metadata_bytes / count:.0f} B/parça, "
+              f"sorgu + bağlam {query_time * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
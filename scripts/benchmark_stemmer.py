@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - Stemmer karşılaştırma aracı
+Bu script, paylaşılan trie tabanlı stemmer'ı (TurkishSuffixStemmer) eski
+vector.py DummyStemmer uygulamasıyla paket içindeki transkript korpusunun
+kelimeleri üzerinde karşılaştırır. Kelime başına maliyet önbelleksiz,
+önbellekli (MemoizedStemmer) ve kurulu ise TurkishStemmer için raporlanır.
+
+Kullanım:
+    python scripts/benchmark_stemmer.py [--dir transcripts] [--limit 0]
+"""
+
+import sys
+import os
+import time
+import argparse
+
+# Ana dizini ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inspareai.utils.stemmer import (TurkishSuffixStemmer, MemoizedStemmer, NOUN_SUFFIXES,
+                                     VERB_SUFFIXES, COMMON_VERB_ROOTS)
+from inspareai.utils.text import TURKISH_STOPWORDS, _WORD_RE
+
+
+class LegacyDummyStemmer:
+    """Eski vector.py DummyStemmer uygulaması (karşılaştırma için korunmuştur)"""
+
+    def __init__(self):
+        self.noun_suffixes = list(NOUN_SUFFIXES)
+        self.verb_suffixes = list(VERB_SUFFIXES)
+        self.common_verb_roots = list(COMMON_VERB_ROOTS)
+        self.vowels = 'aeıioöuü'
+        self.softening_map = {'p': 'b', 'ç': 'c', 't': 'd', 'k': 'ğ'}
+
+    def _is_vowel(self, char):
+        return char.lower() in self.vowels
+
+    def _has_turkish_vowel_harmony(self, word, suffix):
+        if not word or not suffix:
+            return False
+        word_last_vowel = None
+        for char in reversed(word):
+            if self._is_vowel(char):
+                word_last_vowel = char.lower()
+                break
+        suffix_first_vowel = None
+        for char in suffix:
+            if self._is_vowel(char):
+                suffix_first_vowel = char.lower()
+                break
+        if not word_last_vowel or not suffix_first_vowel:
+            return False
+        thick_vowels = 'aıou'
+        thin_vowels = 'eiöü'
+        if word_last_vowel in thick_vowels and suffix_first_vowel in thick_vowels:
+            return True
+        if word_last_vowel in thin_vowels and suffix_first_vowel in thin_vowels:
+            return True
+        return False
+
+    def _check_verb_root(self, word):
+        return word in self.common_verb_roots
+
+    def _apply_softening_rule(self, word):
+        if not word or len(word) < 2:
+            return word
+        last_char = word[-1]
+        if last_char in self.softening_map:
+            return word[:-1] + self.softening_map[last_char]
+        return word
+
+    def _reverse_softening_rule(self, word):
+        if not word or len(word) < 2:
+            return word
+        reverse_map = {v: k for k, v in self.softening_map.items()}
+        last_char = word[-1]
+        if last_char in reverse_map:
+            return word[:-1] + reverse_map[last_char]
+        return word
+
+    def stem(self, word):
+        if not word or len(word) < 3:
+            return word
+        word = word.lower()
+        word_softened = self._apply_softening_rule(word)
+        for verb_root in self.common_verb_roots:
+            if word_softened.startswith(verb_root) and len(word_softened) > len(verb_root):
+                return verb_root
+        for suffix in sorted(self.verb_suffixes, key=len, reverse=True):
+            if word_softened.endswith(suffix) and len(word_softened) > len(suffix) + 2:
+                stem_candidate = word_softened[:-len(suffix)]
+                if self._has_turkish_vowel_harmony(stem_candidate, suffix):
+                    if self._check_verb_root(stem_candidate) or len(stem_candidate) > 2:
+                        return self._reverse_softening_rule(stem_candidate)
+        for suffix in sorted(self.noun_suffixes, key=len, reverse=True):
+            if word_softened.endswith(suffix) and len(word_softened) > len(suffix) + 2:
+                stem_candidate = word_softened[:-len(suffix)]
+                if self._has_turkish_vowel_harmony(stem_candidate, suffix):
+                    return self._reverse_softening_rule(stem_candidate)
+        return self._reverse_softening_rule(word_softened)
+
+
+def time_stemmer(stem_fn, tokens):
+    """Stemmer'ı tüm kelimeler üzerinde çalıştırır, süreyi ve sonuçları döndürür"""
+    start = time.perf_counter()
+    results = [stem_fn(token) for token in tokens]
+    return time.perf_counter() - start, results
+
+
+def report(label, elapsed, token_count):
+    """Toplam süreyi ve kelime başına maliyeti yazdırır"""
+    print(f"{label:<34}: {elapsed:.3f} sn, {elapsed * 1e9 / token_count:,.0f} ns/kelime")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stemmer karşılaştırması")
+    parser.add_argument("--dir", default="transcripts", help="Transkript klasörü")
+    parser.add_argument("--limit", type=int, default=0, help="En fazla kelime sayısı (0: tümü)")
+    args = parser.parse_args()
+
+    files = sorted(f for f in os.listdir(args.dir) if f.endswith(".txt") and not f.startswith('.'))
+    tokens = []
+    for filename in files:
+        with open(os.path.join(args.dir, filename), 'r', encoding='utf-8') as f:
+            # tokenize_and_stem ile aynı kelime seçimi
+            tokens.extend(word for word in _WORD_RE.findall(f.read().lower())
+                          if word not in TURKISH_STOPWORDS and len(word) > 2)
+    if args.limit:
+        tokens = tokens[:args.limit]
+
+    print(f"{len(files)} dosya, {len(tokens)} kelime, {len(set(tokens))} benzersiz kelime")
+
+    legacy_time, legacy_results = time_stemmer(LegacyDummyStemmer().stem, tokens)
+    report("Eski DummyStemmer", legacy_time, len(tokens))
+
+    trie_time, trie_results = time_stemmer(TurkishSuffixStemmer().stem, tokens)
+    report("Trie stemmer (önbelleksiz)", trie_time, len(tokens))
+
+    memo_time, memo_results = time_stemmer(MemoizedStemmer(TurkishSuffixStemmer()).stem, tokens)
+    report("Trie stemmer (önbellekli)", memo_time, len(tokens))
+
+    mismatches = sum(1 for a, b in zip(legacy_results, trie_results) if a != b)
+    mismatches += sum(1 for a, b in zip(legacy_results, memo_results) if a != b)
+    print(f"Hızlanma (önbelleksiz): {legacy_time / trie_time:.2f}x, (önbellekli): {legacy_time / memo_time:.2f}x")
+    print(f"Eski stemmer'dan farklı kök: {mismatches}")
+
+    try:
+        from TurkishStemmer import TurkishStemmer
+    except ImportError:
+        print("TurkishStemmer kurulu değil, karşılaştırma atlandı.")
+        return
+
+    raw_time, raw_results = time_stemmer(TurkishStemmer().stem, tokens)
+    report("TurkishStemmer (önbelleksiz)", raw_time, len(tokens))
+    cached_time, cached_results = time_stemmer(MemoizedStemmer(TurkishStemmer()).stem, tokens)
+    report("TurkishStemmer (önbellekli)", cached_time, len(tokens))
+    print(f"Hızlanma: {raw_time / cached_time:.2f}x, farklı kök: "
+          f"{sum(1 for a, b in zip(raw_results, cached_results) if a != b)}")
+
+
+if __name__ == "__main__":
+    main()
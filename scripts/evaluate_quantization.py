@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - Vektör nicemleme değerlendirme aracı
+Bu script, NumPy vektör indeksinin nicemlenmiş (int8 / float16) ilk taramasının
+doğruluğunu ölçer. Her yöntem için tam (float32) arama sonucuna göre recall@k,
+mevcut Chroma `hnsw:space=cosine` sonuçlarıyla örtüşme, sorgu süresi ve ilk
+taramada bellekte tutulması gereken matris boyutu raporlanır.
+
+Vektörler mevcut Chroma koleksiyonundan (chrome_langchain_db) okunur; koleksiyon
+yoksa kümelenmiş sentetik vektörlerle geçici bir koleksiyon oluşturulur. Sorgular,
+saklı parça vektörlerine gürültü eklenerek üretilir; böylece ölçüm Ollama gerektirmez.
+
+Kullanım:
+    python scripts/evaluate_quantization.py [--collection turkce_transkript] [--queries 200] [--k 10]
+"""
+
+import sys
+import os
+import time
+import shutil
+import argparse
+import tempfile
+
+import numpy as np
+
+# Ana dizini ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inspareai.core.numpy_index import NumpyVectorIndex
+
+HNSW_METADATA = {"hnsw:space": "cosine", "hnsw:construction_ef": 100, "hnsw:search_ef": 50, "hnsw:M": 16}
+
+
+def load_collection_vectors(db_path, collection_name):
+    """Kalıcı Chroma koleksiyonunu ve saklı vektörlerini okur, yoksa (None, None) döndürür"""
+    import chromadb
+
+    if not os.path.exists(db_path):
+        return None, None
+    client = chromadb.PersistentClient(path=db_path)
+    try:
+        collection = client.get_collection(collection_name)
+    except Exception:
+        return None, None
+    if not collection.count():
+        return None, None
+
+    ids, vectors = [], []
+    offset = 0
+    while True:
+        page = collection.get(limit=2000, offset=offset, include=["embeddings"])
+        if not page["ids"]:
+            break
+        ids.extend(page["ids"])
+        vectors.append(np.asarray(page["embeddings"], dtype=np.float32))
+        offset += len(page["ids"])
+    return collection, (ids, np.concatenate(vectors))
+
+
+def synthetic_collection(work_dir, count, dimension, seed):
+    """Kümelenmiş sentetik vektörlerle geçici bir Chroma koleksiyonu oluşturur"""
+    import chromadb
+
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((max(count // 50, 1), dimension)).astype(np.float32)
+    vectors = centers[rng.integers(0, len(centers), count)]
+    vectors = vectors + 0.6 * rng.standard_normal((count, dimension)).astype(np.float32)
+    ids = [f"c{i}" for i in range(count)]
+
+    client = chromadb.PersistentClient(path=work_dir)
+    collection = client.create_collection("quantization", metadata=HNSW_METADATA)
+    for start in range(0, count, 1000):
+        collection.add(ids=ids[start:start + 1000], embeddings=vectors[start:start + 1000])
+    return collection, (ids, vectors)
+
+
+def make_queries(vectors, count, noise, seed):
+    """Rastgele seçilen saklı vektörlere gürültü ekleyerek sorgu vektörleri üretir"""
+    rng = np.random.default_rng(seed)
+    base = vectors[rng.integers(0, len(vectors), count)]
+    base = base / np.linalg.norm(base, axis=1, keepdims=True)
+    perturbation = rng.standard_normal(base.shape).astype(np.float32)
+    perturbation *= noise / np.linalg.norm(perturbation, axis=1, keepdims=True)
+    return (base + perturbation).astype(np.float32)
+
+
+def run_numpy(index, queries, k):
+    """NumPy indeksinde sorguları çalıştırır, (satır kimlikleri, ortalama süre) döndürür"""
+    start = time.perf_counter()
+    results = [[doc.id for doc in index.query_with_embeddings(query, k)[0]] for query in queries]
+    return results, (time.perf_counter() - start) / len(queries)
+
+
+def run_hnsw(collection, queries, k):
+    """Chroma HNSW koleksiyonunda sorguları çalıştırır"""
+    start = time.perf_counter()
+    results = [collection.query(query_embeddings=[query], n_results=k, include=[])["ids"][0] for query in queries]
+    return results, (time.perf_counter() - start) / len(queries)
+
+
+def recall(results, truth):
+    """Ortalama recall@k: doğru sonuçların bulunan sonuçlar içindeki oranı"""
+    return float(np.mean([len(set(found) & set(expected)) / len(expected)
+                          for found, expected in zip(results, truth) if expected]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vektör nicemleme recall@k değerlendirmesi")
+    parser.add_argument("--db", default="chrome_langchain_db", help="Chroma veritabanı klasörü")
+    parser.add_argument("--collection", default="turkce_transkript", help="Koleksiyon adı")
+    parser.add_argument("--synthetic", type=int, default=50000,
+                        help="Koleksiyon yoksa üretilecek sentetik vektör sayısı")
+    parser.add_argument("--dimension", type=int, default=768, help="Sentetik vektör boyutu")
+    parser.add_argument("--queries", type=int, default=200, help="Sorgu sayısı")
+    parser.add_argument("--k", type=int, default=10, help="recall@k için k")
+    parser.add_argument("--noise", type=float, default=0.5, help="Sorgu gürültüsünün (birim vektöre göre) büyüklüğü")
+    parser.add_argument("--rescore", default="0,100,300",
+                        help="Denenecek yeniden puanlama aday sayıları (0: yeniden puanlama yok)")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="inspareai_quantization_")
+    try:
+        collection, data = load_collection_vectors(args.db, args.collection)
+        if collection is None:
+            print(f"'{args.collection}' koleksiyonu bulunamadı, {args.synthetic} sentetik vektör kullanılacak.")
+            collection, data = synthetic_collection(os.path.join(work_dir, "chroma"), args.synthetic,
+                                                    args.dimension, seed=0)
+        ids, vectors = data
+        queries = make_queries(vectors, args.queries, args.noise, seed=1)
+        print(f"{len(ids)} vektör, boyut {vectors.shape[1]}, {args.queries} sorgu, k={args.k}")
+
+        indexes = {}
+        for quantization in ("none", "float16", "int8"):
+            path = os.path.join(work_dir, quantization)
+            records = ((chunk_id, "", {}, vector) for chunk_id, vector in zip(ids, vectors))
+            NumpyVectorIndex.build(records, len(ids), path=path, quantization=quantization)
+            indexes[quantization] = NumpyVectorIndex.load(path)
+
+        truth, exact_time = run_numpy(indexes["none"], queries, args.k)
+        hnsw, hnsw_time = run_hnsw(collection, queries, args.k)
+
+        rows = [("Chroma HNSW (cosine)", recall(hnsw, truth), 1.0, hnsw_time, None),
+                ("NumPy float32 (tam)", 1.0, recall(truth, hnsw), exact_time, indexes["none"].embeddings.nbytes)]
+        for quantization in ("float16", "int8"):
+            index = indexes[quantization]
+            for rescore in (int(value) for value in args.rescore.split(",")):
+                # Aday sayısı k ise yeniden puanlama yalnızca sıralamayı düzeltir, recall ilk taramanınkidir
+                index.rescore_candidates = rescore or args.k
+                results, elapsed = run_numpy(index, queries, args.k)
+                label = f"NumPy {quantization}" + (f" + {rescore} aday float32" if rescore else " (yalnız tarama)")
+                rows.append((label, recall(results, truth), recall(results, hnsw), elapsed, index.quantized.nbytes))
+
+        print(f"{'Yöntem':<36} {'recall@k':>9} {'HNSW örtüşme':>13} {'süre':>10} {'tarama matrisi':>15}")
+        for label, exact_recall, hnsw_overlap, elapsed, nbytes in rows:
+            size = f"{nbytes / (1024 * 1024):.1f} MB" if nbytes is not None else "-"
+            print(f"{label:<36} {exact_recall:>9.4f} {hnsw_overlap:>13.4f} {elapsed * 1000:>7.2f} ms {size:>15}")
+
+        for index in indexes.values():
+            index.close()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -17,13 +17,12 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 # Modüler API fonksiyonlarını içe aktar
 from inspareai.api.streamlit_handler import stream_query, get_transcript_list, get_transcript_content
-from inspareai.cli.command_handler import view_transcript as get_transcript_text
 
 # Transkript görüntüleme fonksiyonu
 def view_transcript(file_name, show_all=False):
     """Transkript dosyasını görüntüleme fonksiyonu"""
     file_path = os.path.join("transcripts", file_name)
-    content = get_transcript_text(file_path)
+    content = get_transcript_content(file_path)
     
     # İçerik uzunsa ve tümünü gösterme seçeneği aktif değilse, kısalt
     if not show_all and len(content.split('\n')) > 20:
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - Ortak Test Düzeneği
+Sorgu hattı testlerinin paylaştığı sahte LLM/embedding sınıfları ile küçük bir NumPy
+indeksi ve yanıt önbellekleri kurulmuş çalışma zamanını sağlayan query_runtime fixture'ı.
+"""
+
+import os
+import sys
+import zlib
+import time
+import asyncio
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inspareai.core.numpy_index import NumpyVectorIndex
+from inspareai.core.runtime import get_runtime
+from inspareai.utils.answer_store import AnswerStore
+from inspareai.utils.cache import memory_cache, query_vector_cache, retrieval_cache
+from inspareai.utils.semantic_cache import SemanticAnswerCache
+
+ANSWER_WORDS = ["Libya", "konusunda", "konuşmacılar", "farklı", "görüşler", "dile", "getiriyor."]
+ANSWER = (" ".join(ANSWER_WORDS) + " ") * 2
+
+# query_runtime'ın kurduğu ve test sonunda sıfırladığı çalışma zamanı bileşenleri
+RUNTIME_KEYS = ("embeddings", "vectorstore", "lexical_index", "retriever", "index_fingerprint",
+                "source_table", "answer_store", "semantic_cache", "default_model", "emergency_model",
+                "scheduler")
+
+
+class FakeEmbeddings:
+    """Aynı metne aynı, farklı metinlere farklı vektör veren sahte embedding"""
+
+    def embed_query(self, text):
+        return np.random.default_rng(zlib.crc32(text.encode("utf-8"))).normal(size=8).astype(np.float32)
+
+    async def aembed_query(self, text):
+        await asyncio.sleep(0)
+        return self.embed_query(text)
+
+
+class FakeLLM:
+    """Sabit ANSWER yanıtını veren, çağrı sayısını tutan sahte senkron/asenkron model"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        time.sleep(self.delay)
+        return ANSWER
+
+    def stream(self, prompt):
+        self.calls += 1
+        time.sleep(self.delay)
+        for word in ANSWER.split(" "):
+            yield word + " "
+
+    async def ainvoke(self, prompt):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return ANSWER
+
+    async def astream(self, prompt):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        for word in ANSWER.split(" "):
+            yield word + " "
+
+
+@pytest.fixture
+def query_runtime(tmp_path):
+    """
+    Paylaşılan çalışma zamanını 30 parçalık bir NumPy indeksi, geçici yanıt deposu ve
+    bellek içi anlamsal önbellekle kurar. Bellek içi önbellekler ve sayaçları boş başlar.
+    Modeller ve (çağrı sayan) embedding parametre olarak verilir:
+
+        runtime = query_runtime(default_model, emergency_model, embeddings=None)
+    """
+    opened = []
+
+    def setup(default_model, emergency_model, embeddings=None):
+        embeddings = embeddings or FakeEmbeddings()
+        for cache in (memory_cache, query_vector_cache, retrieval_cache):
+            cache.clear()
+        rng = np.random.default_rng(0)
+        records = [(f"id{i}", f"Libya ve Türkiye hakkında konuşma {i}",
+                    {"v": 2, "src": 0, "start": i, "end": i + 5, "spk": "A"}, rng.normal(size=8))
+                   for i in range(30)]
+        path = str(tmp_path / "numpy_index")
+        NumpyVectorIndex.build(records, len(records), path=path, quantization="none")
+        index = NumpyVectorIndex.load(path, embedding_function=embeddings)
+        opened.append(index)
+
+        runtime = get_runtime()
+        runtime._instances.update({
+            "embeddings": embeddings, "vectorstore": index, "lexical_index": None,
+            "retriever": index.as_retriever(search_kwargs={"k": 5}), "index_fingerprint": "test",
+            "source_table": {0: "libya.txt"}, "default_model": default_model, "emergency_model": emergency_model,
+            "answer_store": AnswerStore(str(tmp_path / "answers.sqlite3")),
+            "semantic_cache": SemanticAnswerCache(path=None),
+        })
+        return runtime
+
+    yield setup
+
+    if opened:
+        runtime = get_runtime()
+        runtime.answer_store.close()
+        runtime.reset(*RUNTIME_KEYS)
+        for cache in (memory_cache, query_vector_cache, retrieval_cache):
+            cache.clear()
+        for index in opened:
+            index.close()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - Yanıt Deposu Testi
+SQLite yanıt deposunun süre/boyut sınırlarını, eski JSON önbelleğinin aktarılmasını, parmak izi değişince kayıtların geçersiz olmasını ve süreçler arası paylaşımı test eder.
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from inspareai.utils.answer_store import AnswerStore
+from inspareai.utils.fingerprint import index_fingerprint
+
+
+def test_ttl_and_max_entries(tmp_path):
+    store = AnswerStore(str(tmp_path / "answers.sqlite3"), ttl=60, max_entries=10)
+    for i in range(12):
+        store.put(f"soru {i}", f"Soru {i}", f"yanıt {i}")
+    assert store.get("soru 11") == "yanıt 11"
+    # Sınır aşıldığında en eski erişilenler (sınırın %10'u kadar fazlasıyla) silinir
+    assert len(store) == 10 and store.get("soru 0") is None and store.get("soru 2") == "yanıt 2"
+
+    store.ttl = 1e-3
+    time.sleep(0.01)
+    assert store.get("soru 11") is None and "soru 11" not in store
+    assert store.stats()["hits"] == 2 and store.stats()["misses"] == 2
+    store.close()
+
+
+def test_json_migration_and_sharing_between_processes(tmp_path):
+    legacy_path = tmp_path / "query_cache.json"
+    legacy_path.write_text(json.dumps({"ahlak nedir": "eski yanıt"}, ensure_ascii=False), encoding="utf-8")
+    path = str(tmp_path / "answers.sqlite3")
+    store = AnswerStore(path)
+    assert store.import_json(str(legacy_path)) == 1
+    assert not legacy_path.exists() and os.path.exists(str(legacy_path) + ".migrated")
+    assert store.get("ahlak nedir") == "eski yanıt"
+
+    # Başka bir süreç yazarken bu süreç okumaya devam edebilir
+    code = (f"import sys; sys.path.insert(0, {ROOT!r})\n"
+            "from inspareai.utils.answer_store import AnswerStore\n"
+            f"AnswerStore({path!r}).put('din nedir', 'Din nedir?', 'diğer süreç')\n")
+    subprocess.run([sys.executable, "-c", code], check=True)
+    assert store.get("din nedir") == "diğer süreç"
+    store.close()
+
+
+def test_fingerprint_mismatch_invalidates_lazily(tmp_path):
+    path = str(tmp_path / "answers.sqlite3")
+    # Parmak izi sütunu olmayan eski şemadaki depo
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE answers (key TEXT PRIMARY KEY, question TEXT NOT NULL, answer TEXT NOT NULL,"
+                 " created_at REAL NOT NULL, last_access REAL NOT NULL)")
+    conn.execute("INSERT INTO answers VALUES ('eski', 'Eski', 'eski yanıt', ?, ?)", (time.time(), time.time()))
+    conn.commit()
+    conn.close()
+
+    store = AnswerStore(path)
+    store.put("ahlak nedir", "Ahlak nedir?", "yanıt", "fp1")
+    assert store.get("ahlak nedir", "fp1") == "yanıt"
+    assert store.get("eski", "fp1") is None and "eski" not in store
+    # Yeni parmak iziyle ilk okumada silinir, diğer kayıtlara dokunulmaz
+    store.put("din nedir", "Din nedir?", "yanıt 2", "fp1")
+    assert store.get("ahlak nedir", "fp2") is None and "ahlak nedir" not in store
+    assert len(store) == 1 and store.stats()["invalidations"] == 2
+    store.close()
+
+
+def test_index_fingerprint_tracks_corpus_and_chunking():
+    manifest = {"corpus_hash": "a", "embedding_model": "m", "chunk_params": {"chunk_size": 2000},
+                "updated_at": "2024-01-01 00:00:00"}
+    base = index_fingerprint(manifest, "sohbetler", "m")
+    assert index_fingerprint(dict(manifest, updated_at="2025-01-01 00:00:00"), "sohbetler", "m") == base
+    assert index_fingerprint(dict(manifest, corpus_hash="b"), "sohbetler", "m") != base
+    assert index_fingerprint(dict(manifest, chunk_params={"chunk_size": 1000}), "sohbetler", "m") != base
+    assert index_fingerprint(manifest, "sohbetler", "m2") != base
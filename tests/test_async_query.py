@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - Asenkron Sorgu Testi
+Asenkron sorgunun önbellekleri paylaştığını, akışlı yanıtın aynı metni verdiğini ve zaman aşımında yedek modele geçtiğini test eder.
+"""
+
+import os
+import sys
+import asyncio
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conftest import ANSWER, FakeLLM
+from inspareai.core import async_query
+
+
+async def _collect(stream):
+    return "".join([chunk async for chunk in stream])
+
+
+def test_async_query_caches_and_streams(query_runtime):
+    llm = FakeLLM()
+    query_runtime(llm, FakeLLM())
+
+    streamed = asyncio.run(_collect(async_query.astream_query("Libya'da neden olmalıyız?")))
+    assert streamed.startswith(ANSWER) and "libya.txt" in streamed and llm.calls == 1
+
+    # Akışlı yanıt önbelleğe kaydedildi; aynı soru LLM'e gitmez
+    answer = asyncio.run(async_query.aquery_transcripts("Libya'da neden olmalıyız?"))
+    assert answer == streamed and llm.calls == 1
+
+    quick = asyncio.run(async_query.aquick_query("!Libya nerede?"))
+    assert quick.startswith(ANSWER) and llm.calls == 2
+
+
+def test_async_query_falls_back_on_timeout(query_runtime, monkeypatch):
+    monkeypatch.setattr(async_query, "PRIMARY_TIMEOUT", 0.05)
+    monkeypatch.setattr(async_query, "SECONDARY_TIMEOUT", 0.05)
+    slow, emergency = FakeLLM(delay=5), FakeLLM()
+    query_runtime(slow, emergency)
+
+    async def run_concurrently():
+        return await asyncio.gather(*(async_query.aquery_transcripts(f"Libya sorusu {i}") for i in range(5)))
+
+    answers = asyncio.run(run_concurrently())
+    assert all(answer.startswith(ANSWER) for answer in answers)
+    # Her soru için birincil ve ikincil deneme zaman aşımına uğrar, acil durum modeli yanıt verir
+    assert slow.calls == 10 and emergency.calls == 5
+
+    streamed = asyncio.run(_collect(async_query.astream_query("Libya akış sorusu")))
+    assert streamed.startswith(ANSWER) and emergency.calls == 6
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - Bellek İçi Önbellek Testi
+LRU önbelleğinin sınırını, tekrarlanan sorularda sorgu vektörü ile belge getirme sonuçlarının önbellekten geldiğini ve akışla üretilen yanıtların önbelleğe yazıldığını test eder.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conftest import ANSWER, FakeLLM
+from inspareai.core.query import query_transcripts
+from inspareai.core.retrieval import retrieve_relevant_documents
+from inspareai.utils.cache import LRUCache, normalize_question, retrieval_cache
+
+
+class CountingEmbedding:
+    def __init__(self, dimension):
+        self.dimension = dimension
+        self.calls = 0
+
+    def embed_query(self, text):
+        self.calls += 1
+        return np.random.default_rng(len(text)).normal(size=self.dimension).astype(np.float32)
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert "b" not in cache and cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.get("b") is None
+    stats = cache.stats()
+    assert (stats["size"], stats["hits"], stats["misses"], stats["evictions"]) == (2, 3, 1, 1)
+    assert stats["hit_ratio"] == 0.75
+    assert normalize_question("  Ahlak   NEDİR\n") == normalize_question("ahlak nedir")
+
+
+def test_lru_cache_byte_budget():
+    cache = LRUCache(maxsize=None, max_bytes=10)
+    cache.put("a", "çok")          # 4 bayt (UTF-8)
+    cache.put("b", "abc")
+    cache.put("a", "abcd")         # güncelleme eski boyutu düşer
+    assert cache.stats()["resident_bytes"] == 7
+    cache.put("c", "abcd")         # 11 bayt olur: en eski kullanılan "b" atılır
+    assert "b" not in cache and cache.stats()["resident_bytes"] == 8
+    cache.put("d", "x" * 11)       # tek başına sınırı aşan öğe saklanmaz
+    assert "d" not in cache and len(cache) == 2 and cache.stats()["evictions"] == 1
+
+
+def test_repeated_question_reuses_cached_retrieval(query_runtime):
+    embedding = CountingEmbedding(8)
+    runtime = query_runtime(FakeLLM(), FakeLLM(), embeddings=embedding)
+
+    first = retrieve_relevant_documents("Ahlak nedir?")
+    second = retrieve_relevant_documents("  ahlak   nedir? ")
+    assert embedding.calls == 1 and retrieval_cache.stats()["hits"] == 1
+    assert [doc.id for doc in second] == [doc.id for doc in first]
+    assert [doc.metadata["final_score"] for doc in second] == [doc.metadata["final_score"] for doc in first]
+
+    # İndeks parmak izi değişince önbellek kaydı kullanılmaz
+    runtime._instances["index_fingerprint"] = "test-2"
+    retrieve_relevant_documents("Ahlak nedir?")
+    assert retrieval_cache.stats()["misses"] == 2 and embedding.calls == 1
+
+
+def test_streamed_answer_is_cached(query_runtime):
+    model = FakeLLM()
+    query_runtime(model, FakeLLM())
+
+    chunks = []
+    answer = query_transcripts("Libya hakkında ne konuşuldu?", stream_callback=chunks.append)
+    assert answer == "".join(chunks) and answer.startswith(ANSWER) and model.calls == 1
+
+    # Aynı soru tekrar akışla sorulduğunda LLM çağrılmaz
+    assert query_transcripts("Libya hakkında ne konuşuldu?", stream_callback=[].append) == answer
+    assert model.calls == 1
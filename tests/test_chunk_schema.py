@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - Parça Şeması Testi
+Eski ve kompakt parça şemalarının aynı alanlarla okunduğunu ve eski parçaların dönüştürülebildiğini test eder.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.documents import Document
+
+from inspareai.utils.chunk_schema import (ChunkFields, compact_metadata, migrate_legacy_chunk,
+                                          read_chunk, strip_legacy_header)
+
+SOURCES = {3: "ornek.txt"}
+LEGACY_TEXT = "Time: 00:01:05 - 00:02:10\nSpeaker: B\nContent: Ahlak nedir?"
+LEGACY_METADATA = {
+    "source": "ornek.txt", "file_path": "transcripts/ornek.txt", "file_type": "transcript",
+    "time": "00:01:05 - 00:02:10", "speaker": "B", "conversation_id": 4,
+    "start_time": "00:01:05", "end_time": "00:02:10", "title": "ornek.txt - Konuşma 5 - B",
+    "language": "Turkish", "content_length": 12, "chunk_index": 0, "chunk_id": "x",
+}
+
+
+def test_both_schemas_read_the_same_fields():
+    expected = ChunkFields("ornek.txt", "B", 65, 130, "Ahlak nedir?")
+    legacy = Document(page_content=LEGACY_TEXT, metadata=LEGACY_METADATA)
+    compact = Document(page_content="Ahlak nedir?", metadata=compact_metadata(3, 65, 130, "B", 4, 0))
+
+    assert read_chunk(legacy, SOURCES) == expected
+    assert read_chunk(compact, SOURCES) == expected
+    assert expected.time == "00:01:05 - 00:02:10"
+
+
+def test_legacy_chunk_migration():
+    content, metadata = migrate_legacy_chunk(LEGACY_TEXT, LEGACY_METADATA, 3)
+
+    assert content == "Ahlak nedir?"
+    assert metadata == {"v": 2, "src": 3, "start": 65, "end": 130, "spk": "B", "conv": 4, "chunk": 0}
+    # Parçalayıcının ayırdığı, yalnızca başlıktan oluşan parçalar boş kalır
+    assert strip_legacy_header("Time: 00:00:00 - 00:00:26\nSpeaker: A") == ""
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - Korpus Manifesti Testi
+Korpus taramasının eklenen/değişen/silinen dosyaları doğru ayırdığını ve işlenemeyen
+dosyaların manifeste yeni özetleriyle yazılmadığını test eder.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import vector
+from vector import diff_corpus, exclude_failed_files, iter_transcript_chunks, scan_corpus
+
+
+def _write(directory, name, text):
+    (directory / name).write_text(text, encoding="utf-8")
+
+
+def test_scan_and_diff_detect_added_changed_and_removed_files(tmp_path):
+    _write(tmp_path, "a.txt", "Speaker A: merhaba")
+    _write(tmp_path, "b.txt", "Speaker B: selam")
+    _write(tmp_path, "c.txt", "Speaker C: silinecek")
+    _write(tmp_path, "notlar.md", "transkript değil")
+    previous = scan_corpus(str(tmp_path))
+    assert sorted(previous) == ["a.txt", "b.txt", "c.txt"]
+
+    _write(tmp_path, "b.txt", "Speaker B: selam, içerik değişti")
+    os.remove(tmp_path / "c.txt")
+    _write(tmp_path, "d.txt", "Speaker D: yeni dosya")
+    current = scan_corpus(str(tmp_path), previous)
+
+    assert diff_corpus(previous, current) == (["d.txt"], ["b.txt"], ["c.txt"])
+    # Dosya numaraları içerik değişse de korunur, yeni dosya kullanılmış numaralardan sonra gelir
+    assert current["a.txt"]["source_id"] == previous["a.txt"]["source_id"]
+    assert current["b.txt"]["source_id"] == previous["b.txt"]["source_id"]
+    assert current["d.txt"]["source_id"] == 3
+
+
+def test_unchanged_corpus_has_no_diff(tmp_path):
+    _write(tmp_path, "a.txt", "Speaker A: merhaba")
+    previous = scan_corpus(str(tmp_path))
+    assert diff_corpus(previous, scan_corpus(str(tmp_path), previous)) == ([], [], [])
+
+
+def test_failed_files_are_reported_and_kept_out_of_manifest(tmp_path, monkeypatch):
+    _write(tmp_path, "iyi.txt", "Speaker A: merhaba")
+    _write(tmp_path, "bozuk.txt", "Speaker B: bozuk")
+
+    def fake_process(file_path, *args, source_id=None):
+        if file_path.endswith("bozuk.txt"):
+            raise ValueError("ayrıştırılamadı")
+        return {"pid": 0, "bytes": 1, "elapsed": 0.0,
+                "chunks": [("c0", "merhaba", {"src": source_id})]}
+
+    monkeypatch.setattr(vector, "TRANSCRIPT_DIR", str(tmp_path))
+    monkeypatch.setattr(vector, "process_transcript_file", fake_process)
+    failed = []
+    chunks = list(iter_transcript_chunks(parallelize=False, failed_files=failed))
+    assert [chunk.id for chunk in chunks] == ["c0"]
+    assert failed == ["bozuk.txt"]
+
+    previous = {"bozuk.txt": {"size": 1, "mtime_ns": 1, "sha256": "eski", "source_id": 0}}
+    current = scan_corpus(str(tmp_path), previous)
+    # Değişmiş dosya eski kaydını korur (yeniden denenir), yeni dosya manifeste girmez
+    files = exclude_failed_files(current, previous, failed)
+    assert files["bozuk.txt"] == previous["bozuk.txt"]
+    assert diff_corpus(files, current)[1] == ["bozuk.txt"]
+    assert "bozuk.txt" not in exclude_failed_files(current, {}, failed)
+    assert "iyi.txt" in files
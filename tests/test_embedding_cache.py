@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - Embedding Önbelleği Testi
+SQLite tabanlı önbelleğin sıralamayı koruduğunu, modelleri ayırdığını ve tahliye yaptığını test eder.
+"""
+
+import os
+import sys
+import asyncio
+import sqlite3
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inspareai.utils.embedding_cache import EmbeddingCache, CachedEmbeddings, text_digest
+
+
+class CountingEmbeddings:
+    """Metin uzunluğundan vektör üreten ve çağrıları sayan sahte model"""
+
+    def __init__(self):
+        self.calls = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_query(self, text):
+        self.calls.append([text])
+        return [float(len(text)), 2.0]
+
+
+def test_mixed_cached_and_uncached_keep_input_order(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "emb.sqlite3"))
+    model = CountingEmbeddings()
+    embeddings = CachedEmbeddings(model, "test-model", cache)
+
+    embeddings.embed_documents(["bb", "dddd"])
+    result = embeddings.embed_documents(["a", "bb", "ccc", "dddd", "a"])
+
+    assert [vector[0] for vector in result] == [1.0, 2.0, 3.0, 4.0, 1.0]
+    # Yalnızca önbellekte olmayan benzersiz metinler modele gönderilir
+    assert model.calls[-1] == ["a", "ccc"]
+
+
+def test_cache_is_keyed_by_model_and_kind(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "emb.sqlite3"))
+    cache.put_many("model-a", "doc", ["metin"], [[1.0, 0.0]])
+
+    assert cache.get_many("model-a", "doc", ["metin"]) == [[1.0, 0.0]]
+    assert cache.get_many("model-b", "doc", ["metin"]) == [None]
+    assert cache.get_many("model-a", "query", ["metin"]) == [None]
+
+
+def test_eviction_and_compaction(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "emb.sqlite3"), max_entries=10)
+    cache.put_many("m", "doc", [f"metin {i}" for i in range(10)], [[float(i)] for i in range(10)])
+    cache.get_many("m", "doc", ["metin 0"])
+    cache.put_many("m", "doc", ["yeni"], [[99.0]])
+
+    assert len(cache) <= 10
+    # Yakın zamanda kullanılan kayıt tahliye edilmez
+    assert cache.get_many("m", "doc", ["metin 0", "yeni"]) == [[0.0], [99.0]]
+    cache.compact()
+    assert cache.stats()["entries"] == len(cache)
+
+
+def test_reads_defer_access_updates_until_next_write(tmp_path):
+    path = str(tmp_path / "emb.sqlite3")
+    cache = EmbeddingCache(path)
+    cache.put_many("m", "doc", ["metin"], [[1.0]])
+    reader = sqlite3.connect(path)
+    written = reader.execute("SELECT last_access FROM embeddings").fetchone()[0]
+
+    cache.get_many("m", "doc", ["metin"])
+    # Okuma veritabanına yazmaz; erişim zamanı bir sonraki yazımda kaydedilir
+    assert reader.execute("SELECT last_access FROM embeddings").fetchone()[0] == written
+    cache.put_many("m", "doc", ["başka"], [[2.0]])
+    assert reader.execute("SELECT last_access FROM embeddings WHERE text_hash = ?",
+                          (text_digest("metin"),)).fetchone()[0] > written
+    reader.close()
+
+
+def test_async_query_embedding_uses_cache(tmp_path):
+    class AsyncModel(CountingEmbeddings):
+        async def aembed_query(self, text):
+            return self.embed_query(text)
+
+    model = AsyncModel()
+    embeddings = CachedEmbeddings(model, "test-model", EmbeddingCache(str(tmp_path / "emb.sqlite3")))
+
+    first = asyncio.run(embeddings.aembed_query("soru"))
+    assert asyncio.run(embeddings.aembed_query("soru")) == first
+    assert model.calls == [["soru"]]
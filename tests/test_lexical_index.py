@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - Sözcüksel İndeks Testi
+BM25 indeksinin kök haline getirilmiş kelimelerle arama yaptığını ve RRF birleştirmesini test eder.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inspareai.core.lexical_index import BM25Index, reciprocal_rank_fusion
+from inspareai.utils.text import extract_keywords
+
+DOCUMENTS = [
+    ("c1", "Content: Bugün ahlak ve din konusunu konuştuk. Ahlakın kaynağı nedir?"),
+    ("c2", "Content: Kuantum fiziği ve bilinç arasındaki ilişki tartışıldı."),
+    ("c3", "Content: Ekonomi, enflasyon ve faiz oranları hakkında konuşma."),
+]
+
+
+def test_bm25_finds_stemmed_terms_and_survives_round_trip(tmp_path):
+    index = BM25Index.build(DOCUMENTS, corpus_hash="abc")
+    path = str(tmp_path / "bm25.npz")
+    index.save(path)
+    loaded = BM25Index.load(path)
+
+    hits = loaded.search(extract_keywords("ahlakın kaynağı"), top_k=3)
+    assert hits[0][0] == "c1"
+    assert loaded.corpus_hash == "abc"
+    assert loaded.search(extract_keywords("tamamen alakasız kelimeler"), top_k=3) == []
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["c", "d"]])
+    ids = [doc_id for doc_id, _ in fused]
+    assert ids[0] == "c"
+    assert set(ids) == {"a", "b", "c", "d"}
@@ -74,7 +74,7 @@ def test_functionality():
         print(f"✅ Maksimum döküman sayısı: {constants.MAX_DOCUMENTS}")
         
         # Önbellek
-        cache_loaded = isinstance(cache.query_cache, dict)
+        cache_loaded = isinstance(cache.memory_cache, cache.LRUCache)
         print(f"✅ Önbellek yükleme: {'Başarılı' if cache_loaded else 'Başarısız'}")
         
         # Text işleme
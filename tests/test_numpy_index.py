@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - NumPy Vektör İndeksi Testi
+Bellek eşlemeli indeksin tam arama, MMR, kimlikle getirme ve filtreleme sonuçlarını test eder.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inspareai.core.numpy_index import NumpyVectorIndex
+from inspareai.core.retrieval import _mmr_select
+
+
+class QueryEmbedding:
+    def __init__(self, vector):
+        self.vector = vector
+
+    def embed_query(self, text):
+        return self.vector
+
+
+def _build(tmp_path, count=60, dimension=12):
+    rng = np.random.default_rng(3)
+    vectors = rng.normal(size=(count, dimension)).astype(np.float32)
+    records = [(f"id{i}", f"parça {i}", {"v": 2, "src": i % 3}, vectors[i]) for i in range(count)]
+    path = str(tmp_path / "numpy_index")
+    assert NumpyVectorIndex.build(records, count, path=path, corpus_hash="abc") == count
+    return path, vectors
+
+
+def test_exact_search_and_mmr_match_brute_force(tmp_path):
+    path, vectors = _build(tmp_path)
+    query = np.random.default_rng(5).normal(size=vectors.shape[1]).astype(np.float32)
+    index = NumpyVectorIndex.load(path, embedding_function=QueryEmbedding(query))
+    assert index.corpus_hash == "abc" and len(index) == len(vectors)
+
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    expected = np.argsort(-(normalized @ query), kind="stable")[:10]
+    docs, embeddings = index.query_with_embeddings(query, 10)
+    assert [doc.id for doc in docs] == [f"id{i}" for i in expected]
+    assert np.allclose(embeddings, normalized[expected], atol=1e-6)
+
+    retriever = index.as_retriever(search_type="mmr", search_kwargs={"k": 4, "fetch_k": 20, "lambda_mult": 0.7})
+    candidates, candidate_embeddings = index.query_with_embeddings(query, 20)
+    selected = _mmr_select(query, candidate_embeddings, 4, 0.7)
+    assert [doc.id for doc in retriever.invoke("soru")] == [candidates[i].id for i in selected]
+    index.close()
+
+
+def test_get_by_id_and_equality_filter(tmp_path):
+    path, vectors = _build(tmp_path)
+    index = NumpyVectorIndex.load(path)
+
+    docs, embeddings = index.get_with_embeddings(["id7", "yok", "id2"])
+    assert [doc.id for doc in docs] == ["id7", "id2"]
+    assert docs[0].page_content == "parça 7" and docs[0].metadata == {"v": 2, "src": 1}
+    assert embeddings.shape == (2, vectors.shape[1])
+
+    filtered, _ = index.query_with_embeddings(vectors[0], 100, where={"src": 2})
+    assert len(filtered) == 20 and all(doc.metadata["src"] == 2 for doc in filtered)
+    index.close()
+
+
+def test_quantized_scan_rescores_candidates(tmp_path):
+    rng = np.random.default_rng(7)
+    vectors = rng.normal(size=(2000, 32)).astype(np.float32)
+    records = [(f"id{i}", f"parça {i}", {}, vectors[i]) for i in range(len(vectors))]
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    for quantization, itemsize in (("int8", 1), ("float16", 2)):
+        path = str(tmp_path / quantization)
+        NumpyVectorIndex.build(records, len(records), path=path, quantization=quantization)
+        index = NumpyVectorIndex.load(path)
+        index.rescore_candidates = 100
+        assert index.quantization == quantization and index.quantized.itemsize == itemsize
+
+        for query in rng.normal(size=(5, 32)).astype(np.float32):
+            expected = np.argsort(-(normalized @ query), kind="stable")[:10]
+            docs, embeddings = index.query_with_embeddings(query, 10)
+            # Yeniden puanlanan adaylar tam hassasiyetle sıralanır ve float32 vektörler döner
+            assert [doc.id for doc in docs] == [f"id{i}" for i in expected]
+            assert np.allclose(embeddings, normalized[expected], atol=1e-6)
+        index.close()
+
+
+def test_pca_projection_is_persisted_and_applied_to_queries(tmp_path):
+    rng = np.random.default_rng(11)
+    latent = rng.normal(size=(500, 6)).astype(np.float32)
+    vectors = latent @ rng.normal(size=(6, 48)).astype(np.float32) + 0.05 * rng.normal(size=(500, 48)).astype(np.float32)
+    records = [(f"id{i}", f"parça {i}", {}, vectors[i]) for i in range(len(vectors))]
+    path = str(tmp_path / "pca")
+    NumpyVectorIndex.build(records, len(records), path=path, quantization="none", pca_dimensions=8)
+
+    query = vectors[42] + 0.05 * rng.normal(size=48).astype(np.float32)
+    index = NumpyVectorIndex.load(path, embedding_function=QueryEmbedding(query))
+    assert index.pca_dimensions == 8 and index.embeddings.shape == (500, 8)
+    assert index.info["pca"]["source_dimension"] == 48 and index.info["pca"]["recall_at_10"] > 0.8
+
+    # Tam boyutlu sorgu otomatik olarak izdüşürülür; indirgenmiş sorgu olduğu gibi kullanılır
+    projected = index.project_query(query)
+    assert projected.shape == (8,) and np.array_equal(index.project_query(projected), projected)
+    expected = np.argsort(-(index.embeddings @ (projected / np.linalg.norm(projected))), kind="stable")[:5]
+    docs, embeddings = index.query_with_embeddings(query, 5)
+    assert [doc.id for doc in docs] == [f"id{i}" for i in expected] and docs[0].id == "id42"
+    assert embeddings.shape == (5, 8) and len(index.as_retriever(search_type="mmr").invoke("soru")) == 4
+    index.close()
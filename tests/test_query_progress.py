@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - Sorgu Aşama Olayları Testi
+query_transcripts ve quick_query'nin gerçek aşama olaylarını sırasıyla bildirdiğini ve Streamlit düşünme sürecinin bu olaylardan gecikmesiz oluşturulduğunu test eder.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conftest import ANSWER, FakeLLM
+from inspareai.api.streamlit_handler import stream_query
+from inspareai.core.query import query_transcripts, quick_query
+
+
+def test_progress_events_follow_pipeline(query_runtime):
+    query_runtime(FakeLLM(), FakeLLM())
+
+    events = []
+    answer = query_transcripts("Libya'da neden olmalıyız?", progress_callback=events.append)
+    assert answer.startswith(ANSWER)
+    assert [e["stage"] for e in events] == ["keywords", "retrieved", "filtered", "done"]
+    assert events[1]["count"] > 0 and "libya" in events[0]["keywords"]
+    assert all(a["elapsed"] <= b["elapsed"] for a, b in zip(events, events[1:]))
+
+    # Aynı soru önbellekten yanıtlanır
+    events.clear()
+    query_transcripts("Libya'da neden olmalıyız?", progress_callback=events.append)
+    assert [e["stage"] for e in events] == ["cache_hit", "done"]
+
+    chunks, events = [], []
+    quick_query("Libya nerede?", stream_callback=chunks.append, progress_callback=events.append)
+    assert [e["stage"] for e in events] == ["keywords", "retrieved", "filtered", "first_token", "done"]
+    assert "".join(chunks).startswith(ANSWER)
+
+
+def test_stream_query_renders_real_stages_without_delay(query_runtime):
+    query_runtime(FakeLLM(), FakeLLM())
+
+    shown = []
+    start = time.time()
+    result = stream_query("Libya hakkında ne konuşuldu?", shown.append, hizli_mod=True, dusunme_sureci=True)
+    assert time.time() - start < 0.5
+
+    thinking = [text for text in shown if "🔍" in text and "▌" not in text]
+    assert "📑" in thinking[-1] and "🧠 Yanıt oluşturuluyor" in thinking[-1]
+    assert result.startswith(ANSWER) and shown[-1] == result
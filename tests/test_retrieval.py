@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - Belge Getirme Testi
+NumPy MMR seçiminin ve saklı vektörlerle puanlamanın doğru çalıştığını test eder.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.documents import Document
+from langchain_chroma.vectorstores import maximal_marginal_relevance
+
+from inspareai.core.retrieval import _mmr_select, score_and_sort_documents
+
+
+def test_mmr_select_matches_langchain_reference():
+    rng = np.random.default_rng(7)
+    for _ in range(20):
+        query = rng.normal(size=16).astype(np.float32)
+        embeddings = rng.normal(size=(40, 16)).astype(np.float32)
+        lambda_mult = float(rng.uniform())
+        expected = maximal_marginal_relevance(query, embeddings, lambda_mult=lambda_mult, k=8)
+        assert _mmr_select(query, embeddings, 8, lambda_mult) == expected
+
+
+def test_scoring_uses_stored_embeddings():
+    docs = [
+        Document(page_content="Content: bugün hava çok güzel", metadata={"speaker": "A"}),
+        Document(page_content="Content: ahlak ve din üzerine konuşma", metadata={"speaker": "B"}),
+    ]
+    query_embedding = [1.0, 0.0]
+    doc_embeddings = np.array([[0.0, 1.0], [1.0, 0.0]], dtype=np.float32)
+
+    ranked = score_and_sort_documents(docs, "ahlak nedir", ["ahlak"],
+                                      query_embedding=query_embedding, doc_embeddings=doc_embeddings)
+
+    assert ranked[0].page_content.endswith("konuşma")
+    assert ranked[0].metadata["final_score"] > ranked[1].metadata["final_score"]
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - Tembel Çalışma Zamanı Testi
+Modüllerin içe aktarılmasının pahalı bileşenleri oluşturmadığını ve süre bütçesini aşmadığını test eder.
+"""
+
+import os
+import sys
+import json
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from inspareai.core.runtime import Runtime
+
+# CLI ve Streamlit açılışında içe aktarılan modüller için süre bütçesi (saniye)
+IMPORT_BUDGET_SECONDS = 1.5
+HEAVY_MODULES = ["chromadb", "langchain_chroma", "langchain_ollama", "vector", "nltk", "TurkishStemmer"]
+
+
+def _import_in_subprocess(module_name, cwd):
+    code = (
+        "import sys, time, json\n"
+        f"sys.path.insert(0, {ROOT!r})\n"
+        "start = time.perf_counter()\n"
+        f"import {module_name}\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"print(json.dumps({{'elapsed': elapsed, 'loaded': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))\n"
+    )
+    output = subprocess.run([sys.executable, "-c", code], cwd=cwd, capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def test_import_is_side_effect_free_and_within_budget(tmp_path):
+    for module_name in ("inspareai.cli.interface", "inspareai.api.streamlit_handler"):
+        result = _import_in_subprocess(module_name, str(tmp_path))
+        assert result["loaded"] == [], f"{module_name} ağır modülleri yükledi: {result['loaded']}"
+        assert result["elapsed"] < IMPORT_BUDGET_SECONDS, f"{module_name} içe aktarımı {result['elapsed']:.2f} sn sürdü"
+
+    # Vektör veritabanı içe aktarma sırasında oluşturulmamalı
+    assert not os.path.exists(tmp_path / "chrome_langchain_db")
+
+
+def test_runtime_memoizes_components_and_retries_failures_after_backoff(monkeypatch):
+    from inspareai.core import runtime as runtime_module
+    runtime = Runtime()
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return object()
+
+    first = runtime._get("component", factory)
+    assert runtime._get("component", factory) is first
+    assert len(calls) == 1
+
+    def failing_factory():
+        calls.append(1)
+        raise RuntimeError("bağlantı yok")
+
+    for _ in range(2):
+        try:
+            runtime._get("broken", failing_factory)
+        except RuntimeError:
+            pass
+    # Başarısız oluşturma bekleme süresi dolmadan tekrar denenmez
+    assert len(calls) == 2
+
+    # Süre dolunca yeniden denenir ve başarılı olursa saklanır
+    monkeypatch.setattr(runtime_module, "FAILURE_BACKOFF_SECONDS", 0.0)
+    runtime.reset("broken")
+    try:
+        runtime._get("broken", failing_factory)
+    except RuntimeError:
+        pass
+    recovered = runtime._get("broken", factory)
+    assert runtime._get("broken", failing_factory) is recovered
+    assert len(calls) == 4
+
+    runtime.reset("broken")
+    assert not runtime.is_loaded("broken")
+
+
+def test_index_components_reload_when_manifest_changes(tmp_path, monkeypatch):
+    from inspareai.core import runtime as runtime_module
+    manifest = tmp_path / "index_manifest.json"
+    monkeypatch.setattr(runtime_module, "INDEX_MANIFEST_FILE", str(manifest))
+    manifest.write_text(json.dumps({"corpus_hash": "a"}), encoding="utf-8")
+
+    runtime = Runtime()
+    runtime._check_index_manifest()
+    runtime._instances.update({"index_fingerprint": "eski", "source_table": {0: "a.txt"}, "answer_store": "depo"})
+    runtime._check_index_manifest()
+    assert runtime.index_fingerprint == "eski"
+
+    # Başka bir süreç yeniden indeksledi: indekse bağlı bileşenler atılır, diğerleri korunur
+    manifest.write_text(json.dumps({"corpus_hash": "bb"}), encoding="utf-8")
+    runtime._check_index_manifest()
+    assert not runtime.is_loaded("index_fingerprint") and not runtime.is_loaded("source_table")
+    assert runtime.is_loaded("answer_store")
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - LLM Zamanlayıcı Testi
+Eşzamanlı üretim sınırını, öncelik sırasını, süresi dolan işlerin modele gitmeden düşürülmesini, düşürülen sorgunun yeniden denenmemesini ve asenkron kullanımı test eder.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import conftest
+from inspareai.core import async_query, query
+from inspareai.core.query import query_transcripts, BUSY_MESSAGE
+from inspareai.core.scheduler import LLMScheduler, ScheduledModel, RequestShed, llm_priority
+
+
+class FakeLLM:
+    """Aynı anda kaç üretim yapıldığını ölçen sahte model"""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def _enter(self, prompt):
+        with self._lock:
+            self.calls.append(prompt)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+    def _exit(self):
+        with self._lock:
+            self.active -= 1
+
+    def invoke(self, prompt):
+        self._enter(prompt)
+        time.sleep(self.delay)
+        self._exit()
+        return f"yanıt: {prompt}"
+
+    async def ainvoke(self, prompt):
+        self._enter(prompt)
+        await asyncio.sleep(self.delay)
+        self._exit()
+        return f"yanıt: {prompt}"
+
+
+def _wait_queued(scheduler, count):
+    while sum(c["queued"] for c in scheduler.stats()["classes"].values()) < count:
+        time.sleep(0.001)
+
+
+def test_queued_work_runs_by_priority_within_cap():
+    scheduler = LLMScheduler(max_concurrent=1)
+    model = ScheduledModel(FakeLLM(delay=0.01), scheduler)
+
+    def ask(priority):
+        with llm_priority(priority):
+            model.invoke(priority)
+
+    scheduler.acquire()                      # tek yer dolu: gelen işler sıraya girer
+    threads = []
+    for index, priority in enumerate(["batch", "quick", "batch", "interactive"]):
+        threads.append(threading.Thread(target=ask, args=(priority,)))
+        threads[-1].start()
+        _wait_queued(scheduler, index + 1)
+    scheduler.release()
+    for thread in threads:
+        thread.join(5)
+
+    assert model.model.calls == ["interactive", "quick", "batch", "batch"]
+    assert model.model.peak == 1
+    stats = scheduler.stats()
+    assert stats["running"] == 0
+    assert stats["classes"]["batch"]["started"] == 2 and stats["classes"]["batch"]["max_queue_time"] > 0
+
+
+def test_expired_work_is_shed_before_reaching_model():
+    scheduler = LLMScheduler(max_concurrent=1, deadlines={"interactive": 5, "quick": 5, "batch": 0.05})
+    model = ScheduledModel(FakeLLM(), scheduler)
+
+    with scheduler.slot():
+        with llm_priority("batch"), pytest.raises(RequestShed):
+            model.invoke("geç kalan iş")
+    assert model.model.calls == []
+    assert scheduler.stats()["classes"]["batch"]["shed"] == 1
+
+    # Yer boşalınca yeni işler yine çalışır
+    assert model.invoke("soru") == "yanıt: soru"
+
+
+def test_async_calls_respect_cap_and_cancellation():
+    scheduler = LLMScheduler(max_concurrent=2)
+    model = ScheduledModel(FakeLLM(), scheduler)
+
+    async def scenario():
+        answers = await asyncio.gather(*(model.ainvoke(f"s{i}") for i in range(6)))
+        assert answers == [f"yanıt: s{i}" for i in range(6)]
+        assert model.model.peak == 2
+
+        # Sırada beklerken iptal edilen çağrı yer tutmaz
+        async with scheduler.aslot(), scheduler.aslot():
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(model.ainvoke("iptal"), 0.05)
+        assert await model.ainvoke("sonra") == "yanıt: sonra"
+        assert "iptal" not in model.model.calls
+
+    asyncio.run(scenario())
+    assert scheduler.stats()["running"] == 0
+
+
+def test_shed_query_is_not_retried_or_cached(query_runtime):
+    scheduler = LLMScheduler(max_concurrent=1, deadlines={"interactive": 0.05, "quick": 0.05, "batch": 0.05})
+    llm, emergency = conftest.FakeLLM(), conftest.FakeLLM()
+    query_runtime(ScheduledModel(llm, scheduler), ScheduledModel(emergency, scheduler))
+
+    with scheduler.slot():
+        # Ne yedek zincir yöntemleri ne de acil durum modeli yeniden sıraya girer
+        assert query_transcripts("Libya'da neden olmalıyız?") == BUSY_MESSAGE
+        assert asyncio.run(async_query.aquery_transcripts("Libya nerede?")) == BUSY_MESSAGE
+        assert llm.calls == 0 and emergency.calls == 0
+        assert scheduler.stats()["classes"]["interactive"]["shed"] == 2
+
+    # Meşgul yanıtı önbelleğe yazılmadı; yer boşalınca soru modele gider
+    assert query_transcripts("Libya'da neden olmalıyız?").startswith(conftest.ANSWER)
+    assert llm.calls == 1
+
+
+def test_timed_out_generation_releases_its_slot(query_runtime, monkeypatch):
+    monkeypatch.setattr(query, "PRIMARY_TIMEOUT", 0.05)
+    monkeypatch.setattr(query, "SECONDARY_TIMEOUT", 0.05)
+    scheduler = LLMScheduler(max_concurrent=1)
+    slow, emergency = conftest.FakeLLM(delay=0.2), conftest.FakeLLM()
+    query_runtime(ScheduledModel(slow, scheduler), ScheduledModel(emergency, scheduler))
+
+    start = time.time()
+    assert query.query_transcripts("Libya'da neden olmalıyız?").startswith(conftest.ANSWER)
+    # Birincil ve ikincil akış süre dolunca kapatılır; acil durum modeli tek yeri hemen alır
+    assert slow.calls == 2 and emergency.calls == 1
+    assert time.time() - start < 1.0 and scheduler.stats()["running"] == 0
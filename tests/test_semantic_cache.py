@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - Anlamsal Yanıt Önbelleği Testi
+Benzer soruların eşik değerine göre eşleştiğini, sayaçları, kaydetmeyi ve parmak izi değişince geçersiz kılmayı test eder.
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inspareai.utils.semantic_cache import SemanticAnswerCache
+
+
+def _vector(angle):
+    """İlk vektörle kosinüs benzerliği cos(angle) olan 3 boyutlu vektör"""
+    return [float(np.cos(angle)), float(np.sin(angle)), 0.0]
+
+
+def test_threshold_counters_and_persistence(tmp_path):
+    path = str(tmp_path / "semantic_cache.npz")
+    cache = SemanticAnswerCache(path=path, threshold=0.9, near_miss_margin=0.1)
+    cache.add("Libya'da neden olmalıyız?", _vector(0.0), "yanıt", "v1")
+
+    assert cache.lookup(_vector(0.3), "v1")[0] == "yanıt"      # benzerlik 0.955
+    assert cache.lookup(_vector(0.5), "v1") is None            # benzerlik 0.878 - yakın ıska
+    assert cache.lookup([0.0, 0.0, 1.0], "v1") is None         # benzerlik 0
+    assert cache.stats() == {"entries": 1, "threshold": 0.9, "hits": 1, "misses": 2,
+                             "near_misses": 1, "invalidations": 0}
+
+    # Ekleme istek yolunda diske yazmaz; bekleyen değişiklikler flush ile kaydedilir
+    assert not os.path.exists(path)
+    cache.flush()
+    reloaded = SemanticAnswerCache(path=path, threshold=0.9)
+    answer, question, similarity = reloaded.lookup(_vector(0.0), "v1")
+    assert (answer, question) == ("yanıt", "Libya'da neden olmalıyız?") and similarity > 0.999
+
+
+def test_fingerprint_change_invalidates_entries(tmp_path):
+    cache = SemanticAnswerCache(path=str(tmp_path / "semantic_cache.npz"), threshold=0.9, max_entries=2)
+    for i, angle in enumerate((0.0, 1.0, 2.0)):
+        cache.add(f"soru {i}", _vector(angle), f"yanıt {i}", "v1")
+    assert len(cache) == 2 and cache.lookup(_vector(0.0), "v1") is None
+
+    assert cache.lookup(_vector(2.0), "v2") is None
+    assert len(cache) == 0 and cache.stats()["invalidations"] == 1
+
+
+def test_pending_changes_are_saved_by_the_timer(tmp_path):
+    path = str(tmp_path / "semantic_cache.npz")
+    cache = SemanticAnswerCache(path=path, threshold=0.9, save_interval=0.05)
+    cache.add("soru", _vector(0.0), "yanıt", "v1")
+    cache.add("başka soru", _vector(1.0), "başka yanıt", "v1")
+
+    deadline = time.monotonic() + 5
+    while not os.path.exists(path) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(SemanticAnswerCache(path=path, threshold=0.9)) == 2
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - HTTP Servis Testi
+Sahte bir Ollama sunucusuna bağlı servisin sorgu, SSE akışı ve transkript uç noktalarını istemci üzerinden test eder.
+"""
+
+import os
+import sys
+import json
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_ollama import OllamaEmbeddings, OllamaLLM
+
+from conftest import ANSWER_WORDS
+from inspareai.api.client import InspareClient, ServerError
+from inspareai.api.server import QueryServer
+from inspareai.core.runtime import get_runtime
+from inspareai.core.scheduler import ScheduledModel
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    """Ollama'nın /api/generate (NDJSON akışı) ve /api/embed uç noktalarını taklit eder"""
+    generate_calls = 0
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if self.path == "/api/embed":
+            inputs = request["input"] if isinstance(request["input"], list) else [request["input"]]
+            lines = [{"model": request["model"], "embeddings": [[1.0] * 8 for _ in inputs]}]
+        else:
+            FakeOllamaHandler.generate_calls += 1
+            lines = [{"model": request["model"], "created_at": "2024-01-01T00:00:00Z",
+                      "response": word + " ", "done": False} for word in ANSWER_WORDS]
+            lines.append({"model": request["model"], "created_at": "2024-01-01T00:00:00Z",
+                          "response": "", "done": True, "done_reason": "stop"})
+        body = "".join(json.dumps(line) + "\n" for line in lines).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def client(tmp_path, query_runtime):
+    ollama = ThreadingHTTPServer(("127.0.0.1", 0), FakeOllamaHandler)
+    threading.Thread(target=ollama.serve_forever, daemon=True).start()
+    ollama_url = f"http://127.0.0.1:{ollama.server_address[1]}"
+
+    scheduler = get_runtime().scheduler
+    query_runtime(ScheduledModel(OllamaLLM(model="sahte", base_url=ollama_url), scheduler),
+                  ScheduledModel(OllamaLLM(model="sahte", base_url=ollama_url), scheduler),
+                  embeddings=OllamaEmbeddings(model="sahte", base_url=ollama_url))
+
+    transcripts = tmp_path / "transcripts"
+    transcripts.mkdir()
+    (transcripts / "libya.txt").write_text("[00:00:01] A: Libya hakkında konuşma", encoding="utf-8")
+
+    loop = asyncio.new_event_loop()
+    server = QueryServer("127.0.0.1", 0, transcripts_dir=str(transcripts))
+    loop.run_until_complete(server.start())
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        yield InspareClient(f"http://127.0.0.1:{server.port}", timeout=30)
+    finally:
+        asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+        ollama.shutdown()
+
+
+def test_stream_query_and_transcripts(client):
+    assert client.health()["status"] == "ok"
+    FakeOllamaHandler.generate_calls = 0
+
+    events = []
+    chunks = list(client.stream("Libya'da neden olmalıyız?", progress_callback=events.append))
+    assert [e["stage"] for e in events] == ["keywords", "retrieved", "filtered", "first_token", "done"]
+    assert len(chunks) > len(ANSWER_WORDS)
+    answer = "".join(chunks)
+    assert answer.startswith(" ".join(ANSWER_WORDS)) and "libya.txt" in answer
+
+    # Aynı soru paylaşılan çalışma zamanındaki önbellekten yanıtlanır
+    assert client.query("Libya'da neden olmalıyız?") == answer
+    assert FakeOllamaHandler.generate_calls == 1
+    assert client.query("Libya nerede?", quick=True).startswith("Libya konusunda")
+    scheduler = client.health()["scheduler"]
+    assert scheduler["running"] == 0
+    assert scheduler["classes"]["interactive"]["started"] == 1 and scheduler["classes"]["quick"]["started"] == 1
+
+    assert client.list_transcripts() == ["libya.txt"]
+    assert "Libya hakkında konuşma" in client.get_transcript("libya")
+    with pytest.raises(ServerError, match="404"):
+        client.get_transcript("../requests.jsonl")
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - Eşzamanlı Sorgu Birleştirme Testi
+Aynı anda gelen aynı isteklerin tek üretimde birleştiğini, akışın tüm abonelere dağıtıldığını ve üretimin yalnızca son abone ayrılınca iptal edildiğini test eder.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inspareai.utils.singleflight import SingleFlight, AsyncSingleFlight, GenerationCancelled
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+
+    def slow_answer():
+        calls.append(1)
+        time.sleep(0.2)
+        return "yanıt"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("soru", slow_answer))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ["yanıt"] * 5 and len(calls) == 1
+    assert flight.stats() == {"inflight": 0, "coalesced": 4}
+
+
+def test_stream_fans_out_and_cancels_when_all_subscribers_leave():
+    flight = SingleFlight()
+    follower_joined = threading.Event()
+    produced, cancelled = [], []
+
+    def producer(emit):
+        try:
+            for i in range(50):
+                if i == 3:
+                    follower_joined.wait(5)
+                produced.append(i)
+                emit(f"p{i} ")
+                time.sleep(0.01)
+        except GenerationCancelled:
+            cancelled.append(len(produced))
+            raise
+        return "bitti"
+
+    class Left(Exception):
+        pass
+
+    leader_chunks, follower_chunks = [], []
+
+    def leader_callback(chunk):
+        leader_chunks.append(chunk)
+        if len(leader_chunks) == 5:
+            raise Left()                       # lider ayrılır, takipçi için üretim sürer
+
+    def follower_callback(chunk):
+        follower_chunks.append(chunk)
+        if len(follower_chunks) == 20:
+            raise Left()                       # son abone de ayrılır: üretim durur
+
+    errors = []
+
+    def subscribe(callback):
+        try:
+            flight.stream("soru", producer, callback)
+        except BaseException as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=subscribe, args=(leader_callback,))
+    leader.start()
+    while not produced:
+        time.sleep(0.001)
+    follower = threading.Thread(target=subscribe, args=(follower_callback,))
+    follower.start()
+    while flight.stats()["coalesced"] == 0:
+        time.sleep(0.001)
+    follower_joined.set()
+    leader.join(5)
+    follower.join(5)
+
+    # Takipçi baştan itibaren tüm parçaları aldı; üretim ikisi de ayrılınca durdu
+    assert follower_chunks == [f"p{i} " for i in range(20)]
+    assert len(leader_chunks) == 5 and len(produced) < 50
+    # Üretici iptali son abone ayrıldığında emit'ten GenerationCancelled olarak aldı
+    assert cancelled == [len(produced)]
+    # Her iki çağrı da kendi callback hatasını alır (GenerationCancelled dışarı sızmaz)
+    assert len(errors) == 2 and all(isinstance(e, Left) for e in errors)
+
+
+def test_async_stream_survives_one_subscriber_leaving():
+    flight = AsyncSingleFlight()
+    state = {"started": 0, "cancelled": False}
+
+    async def generate():
+        state["started"] += 1
+        try:
+            for i in range(10):
+                await asyncio.sleep(0.01)
+                yield f"p{i}"
+        except (asyncio.CancelledError, GeneratorExit):
+            state["cancelled"] = True
+            raise
+
+    async def consume(limit=None):
+        chunks = []
+        stream = flight.stream("soru", generate)
+        try:
+            async for chunk in stream:
+                chunks.append(chunk)
+                if limit and len(chunks) == limit:
+                    break
+        finally:
+            await stream.aclose()
+        return chunks
+
+    async def scenario():
+        full, partial = await asyncio.gather(consume(), consume(limit=2))
+        assert full == [f"p{i}" for i in range(10)] and partial == ["p0", "p1"]
+        assert state == {"started": 1, "cancelled": False}
+
+        # Tek abone erken ayrılırsa üretim iptal edilir
+        assert await consume(limit=1) == ["p0"]
+        await asyncio.sleep(0.05)
+        assert state == {"started": 2, "cancelled": True}
+
+    asyncio.run(scenario())
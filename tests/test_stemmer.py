@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - Stemmer Testi
+Trie tabanlı stemmer'ın eski DummyStemmer ile aynı kökleri ürettiğini test eder.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inspareai.utils.stemmer import TurkishSuffixStemmer, MemoizedStemmer
+
+
+def test_suffix_stemmer_matches_legacy_stems():
+    stemmer = TurkishSuffixStemmer()
+    words = ['kitaplar', 'gelecek', 'evlerden', 'ağaçlar', 'konuşmalı', 'düşünceler', 'ab', 'masada']
+
+    # Eski vector.py DummyStemmer uygulamasının ürettiği kökler
+    expected = ['kitapl', 'gel', 'evler', 'ağaçl', 'konuş', 'düşün', 'ab', 'masa']
+
+    assert [stemmer.stem(word) for word in words] == expected
+    assert stemmer._check_verb_root('gel')
+    assert not stemmer._check_verb_root('kitap')
+
+
+def test_memoized_stemmer_caches_and_delegates():
+    stemmer = MemoizedStemmer(TurkishSuffixStemmer(), maxsize=16)
+
+    assert stemmer.stem('masada') == 'masa'
+    assert stemmer.stem('masada') == 'masa'
+    assert stemmer.cache_info().hits == 1
+    assert stemmer._check_verb_root('yap')
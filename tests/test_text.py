@@ -0,0 +1,34 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - Metin İşleme Testi
+Toplu alaka puanlayıcısının eski düzenli ifade tabanlı puanlarla aynı sonucu verdiğini test eder.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.documents import Document
+
+from inspareai.utils.text import calculate_relevance, calculate_relevance_batch
+
+
+def test_batch_relevance_matches_legacy_scores():
+    docs = [
+        Document(
+            page_content="Time: 00:00:01 - 00:00:09\nSpeaker: Speaker A\nContent: Ahlak nedir? "
+                         "Ahlak ve din arasındaki ilişki üzerine uzun bir konuşma yaptık.",
+            metadata={"speaker": "Speaker A", "time": "00:00:01 - 00:00:09"},
+        ),
+        Document(page_content="Content: hava bugün güzel", metadata={}),
+    ]
+    keywords = ["ahlak", "din", "ilişk"]
+
+    # Eski calculate_relevance uygulamasının ürettiği değerler
+    expected = [6.439362439362439, 0.1]
+
+    assert calculate_relevance_batch(docs, keywords) == expected
+    assert [calculate_relevance(doc, keywords) for doc in docs] == expected
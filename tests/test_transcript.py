@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+InspareAI - Transkript Ayrıştırıcı Testi
+Tek geçişli ayrıştırıcının desteklenen formatları doğru tanıdığını test eder.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inspareai.utils.transcript import iter_transcript_segments, parse_transcript
+
+
+def test_standard_format_with_continuation_lines():
+    content = (
+        "0:00:05 - 0:01:47 Speaker A: Merhaba arkadaşlar.\n"
+        "Devam eden satır.\n"
+        "0:01:48 - 1:02:03 Speaker B: Hoş bulduk.\n"
+    )
+    segments = list(iter_transcript_segments(content))
+    assert [(s.start, s.end, s.speaker) for s in segments] == [(5, 107, "A"), (108, 3723, "B")]
+    assert segments[0].content == "Merhaba arkadaşlar. Devam eden satır."
+    assert parse_transcript(content)[1]["time"] == "00:01:48 - 01:02:03"
+
+
+def test_bracket_and_plain_formats():
+    bracket = list(iter_transcript_segments("[00:00:10] X: Birinci konuşma\n[00:00:20] Y: İkinci konuşma"))
+    assert [(s.start, s.end, s.speaker) for s in bracket] == [(10, 10, "X"), (20, 20, "Y")]
+
+    plain = list(iter_transcript_segments("00:00:10 Ali: Birinci konuşma\n00:00:20 Veli: İkinci konuşma"))
+    assert [s.speaker for s in plain] == ["Ali", "Veli"]
+
+
+def test_unstructured_text_falls_back_to_lines():
+    segments = list(iter_transcript_segments("Bu satır yeterince uzun bir satır.\nkısa\n"))
+    assert len(segments) == 1
+    assert segments[0].speaker == "Unknown"
@@ -6,192 +6,45 @@
 # Eski vector.py içeriği:
 from langchain_chroma import Chroma
 from langchain_ollama import OllamaEmbeddings
-from langchain_community.document_loaders import TextLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+from langchain_core.documents import Document
 import os
 import re
 import time
-import nltk
 import concurrent.futures
 import psutil
 import sys
 import argparse
 import subprocess
+import hashlib
+import json
 
-# Türkçe NLP için gerekli bileşenleri yükle
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
-
-# Gelişmiş Türkçe kök bulma için TurkishStemmer'ı dene
-try:
-    from TurkishStemmer import TurkishStemmer
-    stemmer = TurkishStemmer()
-    STEMMER_AVAILABLE = True
-    print("TurkishStemmer başarıyla yüklendi.")
-except ImportError:
+# Ayrıştırma ve parçalama fonksiyonları yan etkisiz modülde tutulur (süreç havuzu işçileri için)
+from inspareai.utils.transcript import process_transcript_file
+from inspareai.utils.embedding_cache import EmbeddingCache, CachedEmbeddings
+from inspareai.config.constants import EMBEDDING_CACHE_FILE, LEXICAL_INDEX_FILE
+from inspareai.core.lexical_index import build_lexical_index
+from inspareai.core.runtime import get_runtime
+from inspareai.utils.stemmer import get_stemmer, stemmer_available
+from inspareai.utils.chunk_schema import CHUNK_SCHEMA_VERSION, schema_version, migrate_legacy_chunk
+
+# Vektör veritabanı ve korpus manifest dosyalarının konumları
+PERSIST_DIRECTORY = "chrome_langchain_db"
+TRANSCRIPT_DIR = "transcripts"
+CORPUS_MANIFEST_FILE = os.path.join(PERSIST_DIRECTORY, "corpus_manifest.json")
+CORPUS_MANIFEST_VERSION = 1
+# İndeks manifesti: açılışta koleksiyonu taramadan okunan küçük meta veri dosyası
+INDEX_MANIFEST_FILE = os.path.join(PERSIST_DIRECTORY, "index_manifest.json")
+INDEX_MANIFEST_VERSION = 1
+DB_VERSION = "2.0"
+
+# Türkçe NLP için gerekli bileşenleri yükle (yalnızca veritabanı oluşturulurken çağrılır)
+def ensure_nltk_resources():
+    """NLTK punkt verisinin varlığını kontrol eder, yoksa indirir"""
+    import nltk
     try:
-        # Alternatif olarak snowballstemmer'ı dene
-        from snowballstemmer import TurkishStemmer
-        stemmer = TurkishStemmer()
-        STEMMER_AVAILABLE = True
-        print("Snowball TurkishStemmer başarıyla yüklendi.")
-    except ImportError:
-        print("TurkishStemmer bulunamadı. Geliştirilmiş basit stemming kullanılacak.")
-        # Geliştirilmiş basit stemmer tanımla
-        class DummyStemmer:
-            def __init__(self):
-                # İsim çekimleri için ekler
-                self.noun_suffixes = [
-                    'lar', 'ler', 'leri', 'ları', 'dan', 'den', 'tan', 'ten', 
-                    'a', 'e', 'i', 'ı', 'in', 'ın', 'un', 'ün', 'da', 'de', 'ta', 'te',
-                    'nın', 'nin', 'nun', 'nün', 'ya', 'ye', 'yu', 'yü',
-                    'nda', 'nde', 'nta', 'nte', 'ndan', 'nden', 'ki', 'lık', 'lik'
-                ]
-                
-                # Fiil çekimleri için ekler
-                self.verb_suffixes = [
-                    'mak', 'mek', 'yor', 'iyor', 'ıyor', 'uyor', 'üyor',
-                    'acak', 'ecek', 'acağ', 'eceğ', 'miş', 'mış', 'muş', 'müş',
-                    'di', 'dı', 'du', 'dü', 'ti', 'tı', 'tu', 'tü',
-                    'sa', 'se', 'malı', 'meli', 'abil', 'ebil',
-                    'ar', 'er', 'ır', 'ir', 'ur', 'ür', 
-                    'dik', 'dık', 'duk', 'dük', 'tik', 'tık', 'tuk', 'tük'
-                ]
-                
-                # Sık kullanılan fiil kökleri
-                self.common_verb_roots = [
-                    'gel', 'git', 'ol', 'yap', 'et', 'de', 'ver', 'al', 'kal', 'bak',
-                    'gör', 'bil', 'dur', 'bul', 'çık', 'geç', 'iste', 'söyle', 'başla',
-                    'anla', 'çalış', 'düşün', 'konuş', 'oku', 'yaz', 'sev', 'bekle',
-                    'gir', 'var', 'yok', 'aç', 'kapat', 'otur', 'koş', 'yürü', 'uyu',
-                    'uyan', 'ye', 'iç', 'dinle', 'izle', 'kullan', 'yaşa', 'öl'
-                ]
-                
-                # Ünlü uyumu için sesli harfler
-                self.vowels = 'aeıioöuü'
-                
-                # Yumuşama kuralı için son harf değişimleri
-                self.softening_map = {
-                    'p': 'b', 'ç': 'c', 't': 'd', 'k': 'ğ'
-                }
-                
-            def _is_vowel(self, char):
-                """Bir karakterin sesli harf olup olmadığını kontrol eder"""
-                return char.lower() in self.vowels
-                
-            def _has_turkish_vowel_harmony(self, word, suffix):
-                """Türkçe ünlü uyumuna göre ekin kelimeye uyup uymadığını kontrol eder"""
-                if not word or not suffix:
-                    return False
-                    
-                # Kelime ve ekteki son sesli harfleri bul
-                word_last_vowel = None
-                for char in reversed(word):
-                    if self._is_vowel(char):
-                        word_last_vowel = char.lower()
-                        break
-                        
-                suffix_first_vowel = None
-                for char in suffix:
-                    if self._is_vowel(char):
-                        suffix_first_vowel = char.lower()
-                        break
-                
-                if not word_last_vowel or not suffix_first_vowel:
-                    return False
-                    
-                # Kalın ünlü uyumu
-                thick_vowels = 'aıou'
-                thin_vowels = 'eiöü'
-                
-                # Ünlü uyumu kontrolü
-                if word_last_vowel in thick_vowels and suffix_first_vowel in thick_vowels:
-                    return True
-                if word_last_vowel in thin_vowels and suffix_first_vowel in thin_vowels:
-                    return True
-                    
-                return False
-            
-            def _check_verb_root(self, word):
-                """Kelimenin bilinen bir fiil kökü olup olmadığını kontrol eder"""
-                return word in self.common_verb_roots
-                
-            def _apply_softening_rule(self, word):
-                """
-                Yumuşama kuralını uygular
-                Örneğin: kitap -> kitab, ağaç -> ağac
-                """
-                if not word or len(word) < 2:
-                    return word
-                    
-                last_char = word[-1]
-                if last_char in self.softening_map:
-                    return word[:-1] + self.softening_map[last_char]
-                    
-                return word
-                
-            def _reverse_softening_rule(self, word):
-                """
-                Yumuşama kuralını tersine çevirir
-                Örneğin: kitab -> kitap, ağac -> ağaç
-                """
-                if not word or len(word) < 2:
-                    return word
-                    
-                reverse_map = {v: k for k, v in self.softening_map.items()}
-                last_char = word[-1]
-                if last_char in reverse_map:
-                    return word[:-1] + reverse_map[last_char]
-                    
-                return word
-                
-            def stem(self, word):
-                """
-                Geliştirilmiş stemming - isim ve fiil çekimlerini destekler
-                Türkçe ünlü uyumu kurallarını da göz önünde bulundurur
-                """
-                if not word or len(word) < 3:
-                    return word
-                    
-                original_word = word
-                word = word.lower()
-                
-                # Önce yumuşama kuralını uygula
-                word_softened = self._apply_softening_rule(word)
-                
-                # Önce fiil kökü olup olmadığını kontrol et
-                for verb_root in self.common_verb_roots:
-                    if word_softened.startswith(verb_root) and len(word_softened) > len(verb_root):
-                        # Fiil kökü bulundu, çekim eki olabilir
-                        return verb_root
-                
-                # Fiil ekleri için kontrol
-                for suffix in sorted(self.verb_suffixes, key=len, reverse=True):
-                    if word_softened.endswith(suffix) and len(word_softened) > len(suffix) + 2:
-                        stem_candidate = word_softened[:-len(suffix)]
-                        
-                        # Ünlü uyumu kontrolü
-                        if self._has_turkish_vowel_harmony(stem_candidate, suffix):
-                            # Eğer kalan kısım bir fiil kökü ise veya 2 harften uzunsa
-                            if self._check_verb_root(stem_candidate) or len(stem_candidate) > 2:
-                                return self._reverse_softening_rule(stem_candidate)
-                
-                # İsim ekleri için kontrol
-                for suffix in sorted(self.noun_suffixes, key=len, reverse=True):
-                    if word_softened.endswith(suffix) and len(word_softened) > len(suffix) + 2:
-                        stem_candidate = word_softened[:-len(suffix)]
-                        
-                        # Ünlü uyumu kontrolü
-                        if self._has_turkish_vowel_harmony(stem_candidate, suffix):
-                            return self._reverse_softening_rule(stem_candidate)
-                
-                # Hiçbir ek bulunamadıysa kelimeyi olduğu gibi döndür
-                return self._reverse_softening_rule(word_softened)
-        
-        stemmer = DummyStemmer()
-        STEMMER_AVAILABLE = False
+        nltk.data.find('tokenizers/punkt')
+    except LookupError:
+        nltk.download('punkt')
 
 # Modelin varlığını kontrol eden fonksiyon
 def check_model_availability(model_name):
@@ -248,16 +101,6 @@ def create_embeddings(model_name="nomic-embed-text", use_cache=True):
         
     print(f"Sistem kaynakları: {cpu_count} çekirdek, {ram_gb:.1f} GB RAM. {num_thread} thread kullanılacak.")
     
-    # Önbellek dizini oluştur
-    embedding_cache_dir = "embedding_cache"
-    if use_cache and not os.path.exists(embedding_cache_dir):
-        try:
-            os.makedirs(embedding_cache_dir)
-            print(f"Önbellek dizini oluşturuldu: {embedding_cache_dir}")
-        except Exception as e:
-            print(f"Önbellek dizini oluşturulamadı: {e}")
-            use_cache = False
-    
     # Embedding modelini yapılandırma optimizasyonları
     # Modele göre uygun ayarları belirle
     if model_name == "nomic-embed-text":
@@ -293,497 +136,605 @@ def create_embeddings(model_name="nomic-embed-text", use_cache=True):
         )
     
     # Önbellek sistemi ekleme - embedding işlemlerini hızlandırmak için
+    # Vektörler (model, metin özeti) anahtarıyla tek bir SQLite dosyasında saklanır
     if use_cache:
         try:
-            import hashlib
-            import pickle
-            import time
-            
-            # Orjinal embed_documents fonksiyonunu sakla
-            original_embed_documents = embedding_model.embed_documents
-            original_embed_query = embedding_model.embed_query
-            
-            # Önbellekli embed_documents fonksiyonu
-            def cached_embed_documents(texts):
-                """Önbellekli doküman gömme fonksiyonu"""
-                results = []
-                uncached_texts = []
-                uncached_indices = []
-                
-                # Önbellekteki dokümanları kontrol et
-                for i, text in enumerate(texts):
-                    # Doküman içeriğinden hash oluştur
-                    text_hash = hashlib.md5(text.encode('utf-8')).hexdigest()
-                    cache_path = os.path.join(embedding_cache_dir, f"doc_{text_hash}.pkl")
-                    
-                    if os.path.exists(cache_path):
-                        # Önbellekten yükle
-                        try:
-                            with open(cache_path, 'rb') as f:
-                                embedding = pickle.load(f)
-                            results.append(embedding)
-                        except Exception:
-                            # Önbellekten yüklenemezse yeniden hesapla
-                            uncached_texts.append(text)
-                            uncached_indices.append(i)
-                    else:
-                        uncached_texts.append(text)
-                        uncached_indices.append(i)
-                
-                # Önbellekte olmayan dokümanları göm
-                if uncached_texts:
-                    uncached_embeddings = original_embed_documents(uncached_texts)
-                    
-                    # Sonuçları birleştir ve önbelleğe kaydet
-                    for j, (idx, embedding) in enumerate(zip(uncached_indices, uncached_embeddings)):
-                        # Doküman içeriğinden hash oluştur
-                        text_hash = hashlib.md5(uncached_texts[j].encode('utf-8')).hexdigest()
-                        cache_path = os.path.join(embedding_cache_dir, f"doc_{text_hash}.pkl")
-                        
-                        try:
-                            with open(cache_path, 'wb') as f:
-                                pickle.dump(embedding, f)
-                        except Exception:
-                            # Önbelleğe kaydedilemezse devam et
-                            pass
-                        
-                        # Sonuç listesinde doğru konuma ekle
-                        results.insert(idx, embedding)
-                
-                return results
-            
-            # Önbellekli embed_query fonksiyonu
-            def cached_embed_query(text):
-                """Önbellekli sorgu gömme fonksiyonu"""
-                # Sorgu içeriğinden hash oluştur
-                text_hash = hashlib.md5(text.encode('utf-8')).hexdigest()
-                cache_path = os.path.join(embedding_cache_dir, f"query_{text_hash}.pkl")
-                
-                if os.path.exists(cache_path):
-                    # Önbellekten yükle
-                    try:
-                        with open(cache_path, 'rb') as f:
-                            embedding = pickle.load(f)
-                        return embedding
-                    except Exception:
-                        # Önbellekten yüklenemezse yeniden hesapla
-                        pass
-                
-                # Yeni gömme hesapla
-                embedding = original_embed_query(text)
-                
-                # Önbelleğe kaydet
-                try:
-                    with open(cache_path, 'wb') as f:
-                        pickle.dump(embedding, f)
-                except Exception:
-                    # Önbelleğe kaydedilemezse devam et
-                    pass
-                
-                return embedding
-            
-            # Fonksiyonları değiştir
-            embedding_model.embed_documents = cached_embed_documents
-            embedding_model.embed_query = cached_embed_query
-            
-            print("Embedding önbellek sistemi etkinleştirildi.")
-            
+            cache = EmbeddingCache(EMBEDDING_CACHE_FILE)
+            # Anahtar, istenen değil gerçekten kurulan modelin adıdır (bilinmeyen model yedeğe düşer)
+            embedding_model = CachedEmbeddings(embedding_model, embedding_model.model, cache)
+            print(f"Embedding önbellek sistemi etkinleştirildi: {EMBEDDING_CACHE_FILE} ({len(cache)} vektör)")
         except Exception as e:
             print(f"Önbellek sistemi etkinleştirilemedi: {e}")
     
     return embedding_model
 
-# Embedding modelini oluştur
-embeddings = create_embeddings("nomic-embed-text")
+# Artımlı (incremental) indeksleme için korpus manifest fonksiyonları
+def compute_file_hash(file_path, block_size=1024 * 1024):
+    """Dosya içeriğinin SHA-256 özetini hesaplar"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
 
-# Türkçe için özel metin temizleme fonksiyonu
-def clean_turkish_text(text):
-    """Türkçe metni temizler ve gelişmiş normalizasyon uygular"""
-    if not text or not isinstance(text, str):
-        return ""
-        
-    # Gereksiz boşlukları kaldır
-    text = re.sub(r'\s+', ' ', text)
-    
-    # URL'leri temizle veya basitleştir
-    text = re.sub(r'https?://\S+', '[URL]', text)
-    
-    # Birden fazla noktalama işaretlerini normalleştir
-    text = re.sub(r'[.]{2,}', '...', text)
-    text = re.sub(r'[!]{2,}', '!', text)
-    text = re.sub(r'[?]{2,}', '?', text)
-    
-    # Emojileri ve özel karakterleri temizle ama Türkçe karakterleri koru
-    text = re.sub(r'[^\w\s\.,?!;:\-\'\"()çğıöşüÇĞİÖŞÜ]', '', text)
-    
-    # Rakamları standardize et (telefon numaraları, tarihler vb.)
-    # Telefon numaraları: 5xx xxx xx xx formatına dönüştür
-    text = re.sub(r'(\+90|0)?\s*?5\d{2}\s*?\d{3}\s*?\d{2}\s*?\d{2}', '5XX XXX XX XX', text)
-    
-    # Kelimeler arasındaki tek harfleri temizle (genellikle hata)
-    text = re.sub(r'\s[bcdfghjklmnpqrstvwxyzçğşBCDFGHJKLMNPQRSTVWXYZÇĞŞ]\s', ' ', text)
-    
-    # Fazla tekrarlayan harfleri normalleştir (örn: "çooook" -> "çok")
-    text = re.sub(r'([bcdfghjklmnpqrstvwxyzçğşBCDFGHJKLMNPQRSTVWXYZÇĞŞ])\1{2,}', r'\1', text)
-    
-    return text.strip()
+def scan_corpus(transcript_dir=TRANSCRIPT_DIR, previous_files=None):
+    """
+    Transkript klasörünü tarar ve her dosya için boyut, mtime ve içerik özetini döndürür.
+    Boyutu ve mtime değeri önceki manifest ile aynı olan dosyalar yeniden okunmaz.
 
-def normalize_time_format(time_str):
-    """Zaman formatını standartlaştırır (00:00:00 formatına dönüştürür)"""
-    if not time_str or not isinstance(time_str, str):
-        return "00:00:00"
-    
-    # Boşlukları temizle
-    time_str = time_str.strip()
-    
-    # Eğer format zaten doğruysa (00:00:00)
-    if re.match(r'^\d{2}:\d{2}:\d{2}$', time_str):
-        return time_str
-    
-    # 0:00:00 formatındaysa başa 0 ekle
-    if re.match(r'^\d:\d{2}:\d{2}$', time_str):
-        return f"0{time_str}"
-    
-    # xx:xx formatındaysa başına 00: ekle
-    if re.match(r'^\d{1,2}:\d{2}$', time_str):
-        return f"00:{time_str}"
-    
-    # Diğer durumlar - varsayılan değer döndür
-    return "00:00:00"
+    Args:
+        transcript_dir: Taranacak klasör
+        previous_files: Önceki manifestteki dosya kayıtları
 
-def parse_transcript(content):
-    """Konuşma yapısını parse et - Daha esnek regex desenleriyle"""
-    if not content or not isinstance(content, str):
-        return []
-        
-    # Desteklenen format desenleri (çeşitli formatları destekler)
-    patterns = [
-        # Standart format: 0:00:00 - 0:00:44 Speaker A: Konuşma (başta sıfır olabilir veya olmayabilir)
-        r"(\d+:\d+:\d+)\s*-\s*(\d+:\d+:\d+)\s*Speaker\s*([A-Za-z0-9]+):\s*(.*?)(?=\d+:\d+:\d+\s*-|\Z)",
-        
-        # Alt format: 00:00:00 Konuşmacı: Konuşma
-        r"(\d+:\d+:\d+)\s*([A-Za-z0-9]+):\s*(.*?)(?=\d+:\d+:\d+|\Z)",
-        
-        # Başka bir format: [00:00:00] Speaker X: Konuşma
-        r"\[(\d+:\d+:\d+)\]\s*([A-Za-z0-9]+):\s*(.*?)(?=\[|\Z)"
-    ]
-    
-    conversations = []
-    
-    # Her bir deseni sırayla dene
-    for pattern_idx, pattern in enumerate(patterns):
-        matches = list(re.finditer(pattern, content, re.DOTALL))
-        
-        # Eğer eşleşme bulunduysa bu deseni kullan
-        if matches:
-            print(f"Transkript deseni {pattern_idx+1} kullanılıyor. {len(matches)} konuşma bulundu.")
-            
-            for match in matches:
-                if pattern_idx == 0:  # Standart format
-                    start_time = normalize_time_format(match.group(1))
-                    end_time = normalize_time_format(match.group(2))
-                    speaker = match.group(3)
-                    content = match.group(4).strip()
-                elif pattern_idx == 1:  # Alt format
-                    start_time = normalize_time_format(match.group(1))
-                    end_time = start_time  # Aynı zaman
-                    speaker = match.group(2)
-                    content = match.group(3).strip()
-                else:  # Diğer format
-                    start_time = normalize_time_format(match.group(1))
-                    end_time = start_time  # Aynı zaman
-                    speaker = match.group(2)
-                    content = match.group(3).strip()
-                
-                # Boş içeriği filtrele
-                if not content:
-                    continue
-                    
-                # Metni temizle
-                content = clean_turkish_text(content)
-                
-                # Hala içerik varsa ekle
-                if content:
-                    conversations.append({
-                        "time": f"{start_time} - {end_time}",
-                        "speaker": speaker,
-                        "content": content
-                    })
-            
-            # Eğer eşleşme bulduysan diğer desenleri deneme
-            if conversations:
-                break
-    
-    # Hiçbir desen eşleşmediyse
-    if not conversations:
-        print("UYARI: Transkript deseni bulunamadı. Metin tam metinden ayrıştırılacak.")
-        # Metin içindeki her bir satırı konuşma olarak kabul et
-        lines = content.split('\n')
-        for i, line in enumerate(lines):
-            line = line.strip()
-            if len(line) > 10:  # Kısa satırları atla
-                conversations.append({
-                    "time": "00:00:00 - 00:00:00",
-                    "speaker": "Unknown",
-                    "content": clean_turkish_text(line)
-                })
-    
-    return conversations
-
-def calculate_time_difference(start_time, end_time):
-    """İki zaman arasındaki farkı saniye cinsinden hesaplar"""
-    def time_to_seconds(time_str):
-        h, m, s = map(int, time_str.split(':'))
-        return h * 3600 + m * 60 + s
+    Returns:
+        dict: dosya_adı -> {"size", "mtime_ns", "sha256", "source_id"}
+    """
+    previous_files = previous_files or {}
+    files = {}
+
+    if not os.path.exists(transcript_dir):
+        return files
+
+    for filename in os.listdir(transcript_dir):
+        if not filename.endswith(".txt") or filename.startswith('.'):
+            continue
+
+        file_path = os.path.join(transcript_dir, filename)
+        stat = os.stat(file_path)
+        entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+        previous = previous_files.get(filename)
+        if previous and previous.get("size") == entry["size"] and previous.get("mtime_ns") == entry["mtime_ns"]:
+            # Dosyaya dokunulmamış - önceki özeti kullan
+            entry["sha256"] = previous.get("sha256")
+        else:
+            entry["sha256"] = compute_file_hash(file_path)
+
+        # Dosya tablosundaki numara dosya içeriği değişse de korunur
+        if previous and "source_id" in previous:
+            entry["source_id"] = previous["source_id"]
+
+        files[filename] = entry
+
+    assign_source_ids(files, previous_files)
+    return files
+
+def assign_source_ids(files, previous_files=None):
+    """Numarası olmayan dosyalara, kullanılmış numaralardan sonra gelen yeni numaralar verir"""
+    used_ids = [entry["source_id"] for entry in list(files.values()) + list((previous_files or {}).values())
+                if "source_id" in entry]
+    next_id = max(used_ids, default=-1) + 1
+    for filename in sorted(files):
+        if "source_id" not in files[filename]:
+            files[filename]["source_id"] = next_id
+            next_id += 1
+    return files
+
+def load_corpus_manifest(manifest_path=CORPUS_MANIFEST_FILE):
+    """Kayıtlı korpus manifestini yükler, yoksa None döndürür"""
+    if not os.path.exists(manifest_path):
+        return None
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get("version") != CORPUS_MANIFEST_VERSION:
+            print("UYARI: Korpus manifest sürümü uyumsuz, yok sayılıyor.")
+            return None
+        return manifest
+    except Exception as e:
+        print(f"UYARI: Korpus manifesti okunamadı: {e}")
+        return None
+
+def save_corpus_manifest(files, chunk_params, manifest_path=CORPUS_MANIFEST_FILE):
+    """Korpus manifestini atomik olarak diske yazar"""
+    manifest = {
+        "version": CORPUS_MANIFEST_VERSION,
+        "updated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "chunk_params": chunk_params,
+        "files": files,
+    }
+    os.makedirs(os.path.dirname(manifest_path) or ".", exist_ok=True)
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, manifest_path)
+
+def compute_corpus_hash(files):
+    """Korpus manifestindeki dosya adları ve içerik özetlerinden tek bir özet üretir"""
+    digest = hashlib.sha256()
+    for filename in sorted(files):
+        digest.update(f"{filename}\0{files[filename].get('sha256', '')}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+def get_embedding_model_name(embedding):
+    """Embedding nesnesinden model adını okur"""
+    return getattr(embedding, "model_name", None) or getattr(embedding, "model", None) or "bilinmiyor"
+
+def load_index_manifest(manifest_path=INDEX_MANIFEST_FILE):
+    """İndeks manifestini yükler, yoksa veya uyumsuzsa None döndürür"""
+    if not os.path.exists(manifest_path):
+        return None
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get("manifest_version") != INDEX_MANIFEST_VERSION:
+            print("UYARI: İndeks manifest sürümü uyumsuz, yok sayılıyor.")
+            return None
+        return manifest
+    except Exception as e:
+        print(f"UYARI: İndeks manifesti okunamadı: {e}")
+        return None
+
+def save_index_manifest(vectorstore, collection_name, embedding, chunk_params, corpus_files,
+                        manifest_path=INDEX_MANIFEST_FILE):
+    """
+    Veritabanı oluşturulduktan/güncellendikten sonra indeks meta verisini atomik olarak yazar.
+    Oluşturma tarihi artımlı güncellemelerde korunur.
+    """
+    previous = load_index_manifest(manifest_path) or {}
+    now = time.strftime("%Y-%m-%d %H:%M:%S")
+    manifest = {
+        "manifest_version": INDEX_MANIFEST_VERSION,
+        "db_version": DB_VERSION,
+        "collection_name": collection_name,
+        "created_at": previous.get("created_at", now) if previous.get("collection_name") == collection_name else now,
+        "updated_at": now,
+        "embedding_model": get_embedding_model_name(embedding),
+        "chunk_params": chunk_params,
+        "doc_count": vectorstore._collection.count(),
+        "file_count": len(corpus_files),
+        "corpus_hash": compute_corpus_hash(corpus_files),
+        "chunk_schema": CHUNK_SCHEMA_VERSION,
+        # Dosya tablosu: parçaların "src" numarası -> dosya adı
+        "sources": {str(entry["source_id"]): filename for filename, entry in sorted(corpus_files.items())
+                    if "source_id" in entry},
+    }
+    os.makedirs(os.path.dirname(manifest_path) or ".", exist_ok=True)
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, manifest_path)
+    return manifest
+
+def iter_collection_texts(vectorstore, page_size=5000):
+    """Koleksiyondaki (chunk_id, metin) çiftlerini sayfa sayfa döndürür"""
+    offset = 0
+    while True:
+        page = vectorstore._collection.get(limit=page_size, offset=offset, include=["documents"])
+        if not page["ids"]:
+            break
+        yield from zip(page["ids"], page["documents"])
+        offset += len(page["ids"])
+
+def rebuild_lexical_index(vectorstore, corpus_files):
+    """Koleksiyonun tamamından BM25 sözcüksel indeksini yeniden oluşturur"""
+    return build_lexical_index(iter_collection_texts(vectorstore), LEXICAL_INDEX_FILE,
+                               corpus_hash=compute_corpus_hash(corpus_files))
+
+def rebuild_search_indexes(vectorstore, collection_name, corpus_files):
+    """
+    Koleksiyondan türetilen arama indekslerini yeniden oluşturur: BM25 indeksi ve
+    NumPy arka ucu seçiliyse NumPy vektör indeksi.
+    """
+    rebuild_lexical_index(vectorstore, corpus_files)
+    runtime = get_runtime()
+    if runtime.vector_backend == "numpy":
+        from inspareai.core.numpy_index import export_numpy_index
+        export_numpy_index(vectorstore, collection_name=collection_name, pca_dimensions=runtime.pca_dimensions,
+                           corpus_hash=compute_corpus_hash(corpus_files))
+    # Aynı süreçte sorgu yapılacaksa indeksler ve dosya tablosu diskten yeniden okunur
+    runtime.reset("lexical_index", "source_table", "index_fingerprint")
+    if runtime.vector_backend == "numpy":
+        runtime.reset("vectorstore", "retriever")
+
+def needs_schema_migration(vectorstore):
+    """Koleksiyondaki parçaların eski (şema 1) meta veri şemasında olup olmadığını kontrol eder"""
+    sample = vectorstore._collection.get(limit=1, include=["metadatas"])
+    if not sample["ids"]:
+        return False
+    return schema_version(sample["metadatas"][0]) < CHUNK_SCHEMA_VERSION
+
+def migrate_chunk_schema(vectorstore, corpus_files, embedding=None, batch_size=500):
+    """
+    Şema 1 parçalarını kompakt şemaya (şema 2) dönüştürür.
+    Parça kimlikleri değişmez. Embedding modeli verilmezse saklı vektörler korunur
+    (Ollama gerekmez); verilirse yeni içerik yeniden vektörleştirilir.
+    Args:
+        vectorstore: Chroma vektör veritabanı
+        corpus_files: Korpus manifestindeki dosya kayıtları (dosya numaraları eklenir)
+        embedding: Yeniden vektörleştirme için embedding modeli (isteğe bağlı)
+        batch_size: Bir seferde dönüştürülecek parça sayısı
+    Returns:
+        int: Dönüştürülen parça sayısı
+    """
+    assign_source_ids(corpus_files)
+    source_ids = {filename: entry["source_id"] for filename, entry in corpus_files.items()}
+    include = ["documents", "metadatas"] + ([] if embedding else ["embeddings"])
+    
+    # Yazma sırasında sayfa kaymasını önlemek için önce tüm kimlikler alınır
+    all_ids = vectorstore._collection.get(include=[])["ids"]
+    migrated = 0
+    removed = 0
+    skipped = 0
+    for start in range(0, len(all_ids), batch_size):
+        page = vectorstore._collection.get(ids=all_ids[start:start + batch_size], include=include)
+        ids, documents, metadatas, vectors, empty_ids = [], [], [], [], []
+        for i, (doc_id, text, metadata) in enumerate(zip(page["ids"], page["documents"], page["metadatas"])):
+            metadata = metadata or {}
+            if schema_version(metadata) >= CHUNK_SCHEMA_VERSION:
+                continue
+            source_id = source_ids.get(metadata.get("source"))
+            if source_id is None:
+                skipped += 1
+                continue
+            content, new_metadata = migrate_legacy_chunk(text, metadata, source_id)
+            if not content.strip():
+                # Yalnızca başlık satırlarından oluşan parçaların kompakt şemada karşılığı yok
+                empty_ids.append(doc_id)
+                continue
+            # Chroma upsert meta veriyi birleştirir - eski alanlar None verilerek silinir
+            new_metadata.update({key: None for key in metadata if key not in new_metadata})
+            ids.append(doc_id)
+            documents.append(content)
+            metadatas.append(new_metadata)
+            if not embedding:
+                vectors.append(page["embeddings"][i])
         
-    start_seconds = time_to_seconds(start_time)
-    end_seconds = time_to_seconds(end_time)
-    return end_seconds - start_seconds
+        if empty_ids:
+            vectorstore._collection.delete(ids=empty_ids)
+            removed += len(empty_ids)
+        if not ids:
+            continue
+        if embedding:
+            vectors = embedding.embed_documents(documents)
+        vectorstore._collection.upsert(ids=ids, embeddings=vectors, documents=documents, metadatas=metadatas)
+        migrated += len(ids)
+        print(f"{migrated}/{len(all_ids)} doküman parçası kompakt şemaya dönüştürüldü...")
+    
+    if removed:
+        print(f"İçeriksiz {removed} başlık parçası silindi.")
+    if skipped:
+        print(f"UYARI: Korpus manifestinde bulunmayan {skipped} parça eski şemada bırakıldı.")
+    return migrated
 
-# Dinamik chunk_size ve overlap hesaplama fonksiyonu
-def calculate_dynamic_chunking(content, base_chunk_size=350, base_overlap=40):
+def migrate_vectorstore(collection_name="turkce_transkript", reembed=False, embedding=None):
     """
-    İçerik uzunluğuna ve karmaşıklığına göre dinamik chunk_size ve overlap hesaplar
-    
+    Var olan veritabanını kompakt parça şemasına dönüştürür ve manifestleri günceller.
     Args:
-        content: İşlenecek metin içeriği
-        base_chunk_size: Temel chunk boyutu
-        base_overlap: Temel örtüşme boyutu
+        collection_name: Koleksiyonun adı
+        reembed: True ise parçalar yeni içerikleriyle yeniden vektörleştirilir
+        embedding: Embedding modeli (varsayılan: çalışma zamanı embedding modeli)
+    """
+    manifest = load_corpus_manifest()
+    if not os.path.exists(PERSIST_DIRECTORY) or manifest is None:
+        print("HATA: Korpus manifesti bulunamadı. Dönüştürme yerine yeniden oluşturun: python vector.py --force")
+        return None
     
+    embedding = embedding or get_runtime().embeddings
+    start_time = time.time()
+    vectorstore = Chroma(
+        persist_directory=PERSIST_DIRECTORY,
+        embedding_function=embedding,
+        collection_name=collection_name,
+    )
+    corpus_files = manifest.get("files", {})
+    migrated = migrate_chunk_schema(vectorstore, corpus_files, embedding=embedding if reembed else None)
+    
+    chunk_params = manifest.get("chunk_params")
+    save_corpus_manifest(corpus_files, chunk_params)
+    save_index_manifest(vectorstore, collection_name, embedding, chunk_params, corpus_files)
+    rebuild_search_indexes(vectorstore, collection_name, corpus_files)
+    print(f"Şema dönüştürme tamamlandı: {migrated} parça, {time.time() - start_time:.2f} saniye")
+    return vectorstore
+
+def diff_corpus(previous_files, current_files):
+    """
+    İki korpus taramasını karşılaştırır.
+
     Returns:
-        tuple: (chunk_size, chunk_overlap)
+        tuple: (eklenen, değişen, silinen) dosya adı listeleri
     """
-    # İçerik uzunluğu
-    content_length = len(content)
-    
-    # Cümle sayısı (kabaca noktalama işaretlerine göre)
-    sentences = re.split(r'[.!?]+', content)
-    sentence_count = len([s for s in sentences if len(s.strip()) > 0])
-    
-    # Ortalama cümle uzunluğu
-    if sentence_count > 0:
-        avg_sentence_length = content_length / sentence_count
-    else:
-        avg_sentence_length = 20  # Varsayılan değer
-    
-    # İçerik karmaşıklığı göstergeleri
-    complexity_indicators = {
-        'uzun_cümleler': sum(1 for s in sentences if len(s.split()) > 20) / max(sentence_count, 1),
-        'teknik_terimler': len(re.findall(r'\b[A-Z][a-z]+(?:[A-Z][a-z]+)+\b', content)) / max(content_length / 100, 1),
-        'noktalama_yoğunluğu': len(re.findall(r'[,;:\(\)\[\]\{\}]', content)) / max(content_length / 100, 1)
-    }
-    
-    # Karmaşıklık skoru (0-1 arası)
-    complexity_score = (
-        0.4 * complexity_indicators['uzun_cümleler'] + 
-        0.3 * complexity_indicators['teknik_terimler'] + 
-        0.3 * complexity_indicators['noktalama_yoğunluğu']
+    added = sorted(f for f in current_files if f not in previous_files)
+    removed = sorted(f for f in previous_files if f not in current_files)
+    changed = sorted(
+        f for f in current_files
+        if f in previous_files and current_files[f].get("sha256") != previous_files[f].get("sha256")
     )
-    complexity_score = min(max(complexity_score, 0), 1)  # 0-1 aralığına sınırla
-    
-    # İçerik uzunluğuna göre ayarlama
-    length_factor = 1.0
-    if content_length > 10000:  # Uzun dokümanlar
-        length_factor = 1.3
-    elif content_length < 1000:  # Kısa dokümanlar
-        length_factor = 0.8
-    
-    # Cümle uzunluğuna göre ayarlama
-    sentence_factor = 1.0
-    if avg_sentence_length > 30:  # Uzun cümleler
-        sentence_factor = 1.2
-    elif avg_sentence_length < 10:  # Kısa cümleler
-        sentence_factor = 0.9
-    
-    # Dinamik chunk_size hesaplama
-    chunk_size = int(base_chunk_size * length_factor * sentence_factor * (1 + 0.5 * complexity_score))
-    
-    # Dinamik overlap hesaplama - karmaşıklık arttıkça overlap artar
-    overlap_ratio = 0.12 + (0.08 * complexity_score)  # %12-%20 arası
-    chunk_overlap = int(chunk_size * overlap_ratio)
-      # Minimum ve maksimum değerleri kontrol et
-    chunk_size = max(500, min(chunk_size, 1000))  # 500-1000 arası (daha büyük chunks)
-    chunk_overlap = max(100, min(chunk_overlap, 250))  # 100-250 arası (daha büyük overlap)
-    
-    print(f"Dinamik chunking: size={chunk_size}, overlap={chunk_overlap} (Karmaşıklık skoru: {complexity_score:.2f})")
-    return chunk_size, chunk_overlap
-
-def load_transcripts(chunk_size=800, chunk_overlap=180, parallelize=True, dynamic_chunking=True):
+    return added, changed, removed
+
+def exclude_failed_files(current_files, previous_files, failed_files):
     """
-    Transcripts klasöründeki tüm txt dosyalarını yükler ve işler
+    İşlenemeyen dosyaların yeni taramasını manifestten çıkarır; sonraki artımlı
+    güncelleme bu dosyaları yeniden dener. Önceki manifestte kaydı olan dosyanın eski
+    kaydı (özeti farklı olduğu için yine değişmiş sayılır) korunur, yeni dosya çıkarılır.
+
+    Returns:
+        dict: Manifeste yazılacak dosya kayıtları
+    """
+    files = dict(current_files)
+    for filename in failed_files:
+        if filename in previous_files:
+            files[filename] = previous_files[filename]
+        else:
+            files.pop(filename, None)
+    if failed_files:
+        print(f"UYARI: {len(failed_files)} dosya işlenemedi, sonraki güncellemede yeniden denenecek: "
+              f"{', '.join(sorted(failed_files))}")
+    return files
+
+def iter_transcript_chunks(chunk_size=800, chunk_overlap=180, parallelize=True, dynamic_chunking=True, files=None,
+                           executor_type="process", max_in_flight=None, source_ids=None, failed_files=None):
+    """
+    Transkript dosyalarını işler ve parçaları üretildikçe tek tek döndürür (generator).
+    Aynı anda işlenen dosya sayısı sınırlıdır; tüketici yavaşladığında yeni dosya
+    gönderilmez, böylece bellek kullanımı korpus boyutundan bağımsız kalır.
     Args:
         chunk_size: Metin parçalarının boyutu (varsayılan: 800)
         chunk_overlap: Parçalar arası örtüşme (varsayılan: 180)
         parallelize: Paralel işleme yapılsın mı
         dynamic_chunking: Dinamik chunk boyutu kullanılsın mı
+        files: Yalnızca bu dosyaları işle (None ise klasördeki tüm dosyalar)
+        executor_type: Paralel işleme türü - "process" (süreç havuzu) veya "thread"
+        max_in_flight: Aynı anda işlenebilecek en fazla dosya (varsayılan: işçi sayısının 2 katı)
+        source_ids: dosya adı -> dosya tablosu numarası (None ise dosyalar sırayla numaralandırılır)
+        failed_files: Verilirse işlenemeyen dosyaların adları bu listeye eklenir
+    Yields:
+        Document: Vektörleştirilmeye hazır metin parçası (id alanı parça kimliğidir)
     """
-    transcript_docs = []
-    transcript_dir = "transcripts"
-    
-    # Metin bölme stratejisini oluştur - Optimize edilmiş ayarlar
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=chunk_size,        # Türkçe için optimize edilmiş boyut
-        chunk_overlap=chunk_overlap,  # Türkçe için optimize edilmiş örtüşme
-        length_function=len,
-        separators=["\n\n", "\n", ". ", "? ", "! ", "; ", ", ", " ", ""]
-    )
+    transcript_dir = TRANSCRIPT_DIR
     
     if not os.path.exists(transcript_dir):
         print(f"HATA: {transcript_dir} klasörü bulunamadı.")
         print("Lütfen 'transcripts' adında bir klasör oluşturun ve içine txt dosyalarını ekleyin.")
-        return []
+        return
     
     print(f"'{transcript_dir}' klasöründeki dosyalar taranıyor...")
     
     # Önce dosyaların listesini al
-    files = [f for f in os.listdir(transcript_dir) if f.endswith(".txt") and not f.startswith('.')]
+    if files is None:
+        files = [f for f in os.listdir(transcript_dir) if f.endswith(".txt") and not f.startswith('.')]
     total_files = len(files)
     
     if total_files == 0:
         print("UYARI: Hiç transcript dosyası bulunamadı.")
         print("Lütfen 'transcripts' klasörüne .txt uzantılı dosyalar ekleyin.")
-        return []
+        return
     
     print(f"Toplam {total_files} transcript dosyası bulundu.")
     
-    # Maksimum thread sayısı belirle (CPU çekirdek sayısı veya dosya sayısı, hangisi daha azsa)
-    max_workers = min(os.cpu_count() or 2, total_files)
+    if source_ids is None:
+        source_ids = {filename: i for i, filename in enumerate(sorted(files))}
     
-    # Fonksiyon: Tek bir dosyayı yükle ve işle
-    def process_file(filename):
-        file_path = os.path.join(transcript_dir, filename)
-        file_docs = []
-        
-        # Metadata'ya dosya adını ekle
-        metadata = {
-            "source": filename,
-            "file_path": file_path,
-            "file_type": "transcript",
-        }
-        
-        # Dosyayı yükle
-        try:
-            print(f"Dosya işleniyor: {filename}")
-            loader = TextLoader(file_path, encoding="utf-8")  # UTF-8 encoding
-            docs = loader.load()
-            
-            # Her bir dokümanı işle ve konuşma yapısını ayır
-            for doc in docs:
-                content = doc.page_content
-                
-                # Dinamik chunking kullanılıyorsa, dosya içeriğine göre chunk_size ve overlap ayarla
-                local_chunk_size = chunk_size
-                local_chunk_overlap = chunk_overlap
-                
-                if dynamic_chunking:
-                    local_chunk_size, local_chunk_overlap = calculate_dynamic_chunking(content, chunk_size, chunk_overlap)
-                    # Dosyaya özel text_splitter oluştur
-                    text_splitter_local = RecursiveCharacterTextSplitter(
-                        chunk_size=local_chunk_size,
-                        chunk_overlap=local_chunk_overlap,
-                        length_function=len,
-                        separators=["\n\n", "\n", ". ", "? ", "! ", "; ", ", ", " ", ""]
-                    )
-                else:
-                    text_splitter_local = text_splitter
-                
-                # Konuşmaları parçala
-                conversations = parse_transcript(content)
-                
-                print(f"{filename} içinde {len(conversations)} konuşma bulundu")
-                
-                # Konuşmaların toplam süresini hesapla
-                total_duration = 0
-                for conv in conversations:
-                    time_parts = conv["time"].split(" - ")
-                    if len(time_parts) == 2:
-                        try:
-                            duration = calculate_time_difference(time_parts[0], time_parts[1])
-                            total_duration += duration
-                        except:
-                            pass
-                
-                print(f"Toplam konuşma süresi: {total_duration//60} dakika {total_duration%60} saniye")
-                
-                # Her bir konuşmayı ayrı bir doküman olarak ekle
-                for i, conv in enumerate(conversations):
-                    # Metadata'yı her konuşma için güncelle
-                    conv_metadata = metadata.copy()
-                    
-                    # Zamanı ayrıştır
-                    time_parts = conv["time"].split(" - ")
-                    start_time = time_parts[0] if len(time_parts) > 0 else "00:00:00"
-                    end_time = time_parts[1] if len(time_parts) > 1 else "00:00:00"
-                    
-                    conv_metadata.update({
-                        "time": conv["time"],
-                        "speaker": conv["speaker"],
-                        "conversation_id": i,
-                        "start_time": start_time,
-                        "end_time": end_time,
-                        "title": f"{filename} - Konuşma {i+1} - {conv['speaker']} ({conv['time']})",
-                        "language": "Turkish",
-                        "content_length": len(conv["content"])
-                    })
-                    
-                    # Konuşma içeriğini formatlı şekilde oluştur
-                    content = f"Time: {conv['time']}\nSpeaker: {conv['speaker']}\nContent: {conv['content']}"
-                    
-                    # İçerik çok kısaysa atla (gürültü olabilir)
-                    if len(conv["content"]) < 10:
-                        continue
-                    
-                    # Dokümanı böl ve her parçayı ayrı ayrı ekle
-                    splits = text_splitter_local.create_documents(
-                        texts=[content],
-                        metadatas=[conv_metadata]
-                    )
-                    file_docs.extend(splits)
-        
-        except Exception as e:
-            print(f"HATA: {filename} dosyası yüklenirken bir sorun oluştu: {e}")
-            return []
-            
-        return file_docs
+    # En büyük dosyaları önce zamanla - uzun bir dosya çalışmanın sonunu tek başına uzatmasın
+    file_paths = sorted((os.path.join(transcript_dir, f) for f in files), key=os.path.getsize, reverse=True)
+    
+    # Maksimum işçi sayısı belirle (CPU çekirdek sayısı veya dosya sayısı, hangisi daha azsa)
+    max_workers = min(os.cpu_count() or 2, total_files)
+    max_in_flight = max_in_flight or max_workers * 2
     
     start_time = time.time()
     processed_count = 0
+    chunk_count = 0
+    worker_stats = {}
+    
+    def record(result):
+        """İşçi istatistiklerini günceller"""
+        stats = worker_stats.setdefault(result["pid"], {"files": 0, "bytes": 0, "chunks": 0, "elapsed": 0.0})
+        stats["files"] += 1
+        stats["bytes"] += result["bytes"]
+        stats["chunks"] += len(result["chunks"])
+        stats["elapsed"] += result["elapsed"]
+    
+    worker_args = (chunk_size, chunk_overlap, dynamic_chunking)
     
     # Paralel işleme yapılsın mı?
     if parallelize and max_workers > 1:
-        print(f"Dosyalar {max_workers} thread ile paralel işlenecek...")
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Dosyaları paralel olarak işle
-            futures = {executor.submit(process_file, filename): filename for filename in files}
+        if executor_type == "process":
+            # Ayrıştırma ve parçalama saf Python (GIL'e bağlı) - çekirdeklere dağıtmak için süreç havuzu
+            print(f"Dosyalar {max_workers} süreç ile paralel işlenecek...")
+            executor = concurrent.futures.ProcessPoolExecutor(max_workers=max_workers)
+        else:
+            print(f"Dosyalar {max_workers} thread ile paralel işlenecek...")
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        
+        with executor:
+            pending_paths = iter(file_paths)
+            futures = {}
+            
+            def submit_next():
+                """Sıradaki (en büyük) dosyayı kuyruğa ekler"""
+                file_path = next(pending_paths, None)
+                if file_path is not None:
+                    futures[executor.submit(process_transcript_file, file_path, *worker_args,
+                                            source_id=source_ids[os.path.basename(file_path)])] = file_path
             
-            # Sonuçları topla
-            for future in concurrent.futures.as_completed(futures):
-                filename = futures[future]
-                try:
-                    result = future.result()
+            for _ in range(max_in_flight):
+                submit_next()
+            
+            # Biten her dosyanın yerine yenisini gönder, parçaları hemen tüketiciye ilet
+            while futures:
+                done, _ = concurrent.futures.wait(futures, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    filename = os.path.basename(futures.pop(future))
+                    submit_next()
                     processed_count += 1
-                    transcript_docs.extend(result)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        print(f"HATA: {filename} dosyası yüklenirken bir sorun oluştu: {e}")
+                        if failed_files is not None:
+                            failed_files.append(filename)
+                        continue
+                    
+                    record(result)
                     print(f"İşlenen dosyalar: {processed_count}/{total_files} - {filename} tamamlandı.")
-                except Exception as e:
-                    print(f"Dosya işlenirken hata: {filename} - {e}")
+                    for chunk_id, text, metadata in result["chunks"]:
+                        chunk_count += 1
+                        yield Document(page_content=text, metadata=metadata, id=chunk_id)
     else:
         # Sıralı (tek thread) işleme
         print("Dosyalar sıralı olarak işlenecek...")
-        for filename in files:
-            result = process_file(filename)
-            transcript_docs.extend(result)
+        for file_path in file_paths:
             processed_count += 1
+            try:
+                result = process_transcript_file(file_path, *worker_args,
+                                                 source_id=source_ids[os.path.basename(file_path)])
+            except Exception as e:
+                print(f"HATA: {os.path.basename(file_path)} dosyası yüklenirken bir sorun oluştu: {e}")
+                if failed_files is not None:
+                    failed_files.append(os.path.basename(file_path))
+                continue
+            
+            record(result)
             print(f"İşlenen dosyalar: {processed_count}/{total_files}")
+            for chunk_id, text, metadata in result["chunks"]:
+                chunk_count += 1
+                yield Document(page_content=text, metadata=metadata, id=chunk_id)
     
     end_time = time.time()
     processing_time = end_time - start_time
     
     print(f"Tüm dosyalar işlendi. Toplam süre: {processing_time:.1f} saniye")
-    print(f"Toplam {len(transcript_docs)} doküman parçası yüklendi")
+    print(f"Toplam {chunk_count} doküman parçası üretildi")
     
-    return transcript_docs
+    # İşçi başına verim raporu
+    for pid, stats in sorted(worker_stats.items()):
+        throughput = stats["bytes"] / (1024 * 1024) / stats["elapsed"] if stats["elapsed"] > 0 else 0.0
+        print(f" - İşçi {pid}: {stats['files']} dosya, {stats['chunks']} parça, "
+              f"{stats['bytes'] / 1024:.0f} KB, {stats['elapsed']:.2f} sn meşgul, {throughput:.2f} MB/sn")
 
-def create_vectorstore(collection_name="turkce_transkript", force_recreate=False, chunk_size=800, chunk_overlap=180, dynamic_chunking=True):
+def load_transcripts(chunk_size=800, chunk_overlap=180, parallelize=True, dynamic_chunking=True, files=None,
+                     executor_type="process", failed_files=None):
+    """
+    Transcripts klasöründeki tüm txt dosyalarını yükler ve işler
+    Not: Tüm parçaları bellekte toplar; büyük korpuslarda iter_transcript_chunks kullanın.
+    Args:
+        chunk_size: Metin parçalarının boyutu (varsayılan: 800)
+        chunk_overlap: Parçalar arası örtüşme (varsayılan: 180)
+        parallelize: Paralel işleme yapılsın mı
+        dynamic_chunking: Dinamik chunk boyutu kullanılsın mı
+        files: Yalnızca bu dosyaları işle (None ise klasördeki tüm dosyalar)
+        executor_type: Paralel işleme türü - "process" (süreç havuzu) veya "thread"
+        failed_files: Verilirse işlenemeyen dosyaların adları bu listeye eklenir
+    """
+    return list(iter_transcript_chunks(chunk_size=chunk_size, chunk_overlap=chunk_overlap, parallelize=parallelize,
+                                       dynamic_chunking=dynamic_chunking, files=files, executor_type=executor_type,
+                                       failed_files=failed_files))
+
+# Akışlı vektörleştirme hattı varsayılanları
+EMBED_BATCH_SIZE = 256   # Bir embedding isteğindeki parça sayısı
+EMBED_WORKERS = 4        # Eşzamanlı embedding isteği sayısı
+
+def index_documents(vectorstore, documents, embedding=None, batch_size=EMBED_BATCH_SIZE, embed_workers=EMBED_WORKERS):
+    """
+    Dokümanları üretici/tüketici hattı ile vektörleştirip Chroma'ya yazar.
+    
+    Ana thread doküman akışını batch'lere böler ve sınırlı bir kuyruğa koyar;
+    embedding işçileri Ollama çağrılarını eşzamanlı yapar; tek bir yazıcı thread
+    sonuçları koleksiyona upsert eder. Kuyruklar dolduğunda üretici bekler, bu
+    yüzden bellekte yalnızca birkaç batch bulunur ve ayrıştırma ile embedding
+    işlemleri üst üste biner.
+    
+    Args:
+        vectorstore: Yazılacak Chroma vektör veritabanı
+        documents: Document üreten iterable (ör. iter_transcript_chunks)
+        embedding: Embedding modeli (varsayılan: modül embedding modeli)
+        batch_size: Batch başına doküman sayısı
+        embed_workers: Eşzamanlı embedding işçisi sayısı
+    
+    Returns:
+        int: Yazılan doküman sayısı
+    """
+    import queue
+    import threading
+    
+    embedding = embedding or get_runtime().embeddings
+    embed_queue = queue.Queue(maxsize=embed_workers * 2)
+    write_queue = queue.Queue(maxsize=embed_workers * 2)
+    stop_event = threading.Event()
+    errors = []
+    written = [0]
+    
+    def put(target_queue, item):
+        """Hat durdurulmadığı sürece kuyruğa ekler (dolu kuyrukta bekler)"""
+        while not stop_event.is_set():
+            try:
+                target_queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def embed_worker():
+        while True:
+            batch = embed_queue.get()
+            if batch is None:
+                break
+            if stop_event.is_set():
+                continue
+            try:
+                texts = [doc.page_content for doc in batch]
+                vectors = embedding.embed_documents(texts)
+                put(write_queue, (batch, vectors))
+            except Exception as e:
+                errors.append(e)
+                stop_event.set()
+    
+    def writer():
+        while True:
+            item = write_queue.get()
+            if item is None:
+                break
+            if stop_event.is_set():
+                continue
+            batch, vectors = item
+            try:
+                vectorstore._collection.upsert(
+                    ids=[doc.id for doc in batch],
+                    embeddings=vectors,
+                    documents=[doc.page_content for doc in batch],
+                    metadatas=[doc.metadata for doc in batch]
+                )
+                written[0] += len(batch)
+                print(f"{written[0]} doküman parçası vektörleştirildi ve yazıldı...")
+            except Exception as e:
+                errors.append(e)
+                stop_event.set()
+    
+    embed_threads = [threading.Thread(target=embed_worker, daemon=True) for _ in range(embed_workers)]
+    writer_thread = threading.Thread(target=writer, daemon=True)
+    for thread in embed_threads:
+        thread.start()
+    writer_thread.start()
+    
+    try:
+        batch = []
+        for doc in documents:
+            if stop_event.is_set():
+                break
+            batch.append(doc)
+            if len(batch) >= batch_size:
+                put(embed_queue, batch)
+                batch = []
+        if batch:
+            put(embed_queue, batch)
+    finally:
+        # İşçileri sırayla kapat: önce embedding işçileri, sonra yazıcı
+        for _ in embed_threads:
+            embed_queue.put(None)
+        for thread in embed_threads:
+            thread.join()
+        write_queue.put(None)
+        writer_thread.join()
+    
+    if errors:
+        raise errors[0]
+    
+    return written[0]
+
+def create_vectorstore(collection_name="turkce_transkript", force_recreate=False, chunk_size=800, chunk_overlap=180, dynamic_chunking=True,
+                       parallelize=True, executor_type="process", batch_size=EMBED_BATCH_SIZE, embed_workers=EMBED_WORKERS,
+                       embedding=None):
     """
     Vektör veritabanını oluşturur veya günceller
     Args:
@@ -792,60 +743,64 @@ def create_vectorstore(collection_name="turkce_transkript", force_recreate=False
         chunk_size: Metin parçalarının boyutu (varsayılan: 800)
         chunk_overlap: Parçalar arası örtüşme (varsayılan: 180)
         dynamic_chunking: Dinamik chunk boyutu kullanılsın mı
+        parallelize: Dosyalar paralel işlensin mi
+        executor_type: Paralel işleme türü - "process" veya "thread"
+        batch_size: Embedding batch boyutu
+        embed_workers: Eşzamanlı embedding işçisi sayısı
+        embedding: Embedding modeli (varsayılan: çalışma zamanı embedding modeli)
     """
+    embedding = embedding or get_runtime().embeddings
     start_time = time.time()
     print("Vektör veritabanı oluşturuluyor...")
     
     # Veritabanını yeniden oluşturmak için kontrol et
-    if force_recreate and os.path.exists("chrome_langchain_db"):
+    if force_recreate and os.path.exists(PERSIST_DIRECTORY):
         import shutil
         print("Mevcut vektör veritabanı siliniyor...")
-        shutil.rmtree("chrome_langchain_db")
+        shutil.rmtree(PERSIST_DIRECTORY)
         print("Vektör veritabanı silindi. Yeniden oluşturuluyor...")
     
-    # Transcript verilerini yükle
-    transcript_docs = load_transcripts(chunk_size=chunk_size, chunk_overlap=chunk_overlap, dynamic_chunking=dynamic_chunking)
-    
-    if not transcript_docs:
-        print("HATA: Vektör veritabanı oluşturulamadı çünkü doküman bulunamadı.")
-        return None
-    
-    # İlerleme göstergesi için toplam doküman sayısı
-    total_docs = len(transcript_docs)
-    print(f"Toplam {total_docs} doküman vektörleştirilecek...")
-    
-    # İşleme performansı için parçalara ayırarak işleme
-    batch_size = 2000  # Her seferde işlenecek doküman sayısı
-    all_batches = [transcript_docs[i:i + batch_size] for i in range(0, len(transcript_docs), batch_size)]
-    
-    # İlk batch ile veritabanını oluştur
-    print(f"İlk {min(batch_size, len(transcript_docs))} doküman vektörleştiriliyor...")
+    # Korpusu tara - manifest, yükleme öncesindeki dosya durumunu kaydeder
+    corpus_files = scan_corpus(TRANSCRIPT_DIR)
     
     # Vektör veritabanı yapılandırması
-    vectorstore = Chroma.from_documents(
-        documents=all_batches[0],
-        embedding=embeddings,
-        persist_directory="chrome_langchain_db",
+    vectorstore = Chroma(
+        persist_directory=PERSIST_DIRECTORY,
+        embedding_function=embedding,
         collection_name=collection_name,
         collection_metadata={
             "hnsw:space": "cosine",           # Benzerlik metriği
             "hnsw:construction_ef": 100,      # İnşa kalite parametresi
             "hnsw:search_ef": 50,             # Arama kalite parametresi
             "hnsw:M": 16,                     # Her düğüm başına bağlantı sayısı
-            "chroma_db:version": "2.0",       # Veritabanı sürümü
+            "chroma_db:version": DB_VERSION,  # Veritabanı sürümü
             "created_at": time.strftime("%Y-%m-%d %H:%M:%S"), # Oluşturma tarihi
             "document_language": "Turkish"    # Belge dili
         }
     )
     
-    # Kalan batch'leri ekle (eğer varsa)
-    remaining_batches = all_batches[1:]
-    for i, batch in enumerate(remaining_batches, 1):
-        print(f"Batch {i+1}/{len(all_batches)} vektörleştiriliyor... ({len(batch)} doküman)")
-        vectorstore.add_documents(documents=batch)
+    # Transkriptleri ayrıştırırken eşzamanlı olarak vektörleştir ve yaz
+    failed_files = []
+    chunks = iter_transcript_chunks(chunk_size=chunk_size, chunk_overlap=chunk_overlap, dynamic_chunking=dynamic_chunking,
+                                    files=sorted(corpus_files), parallelize=parallelize, executor_type=executor_type,
+                                    source_ids={f: entry["source_id"] for f, entry in corpus_files.items()},
+                                    failed_files=failed_files)
+    total_docs = index_documents(vectorstore, chunks, embedding=embedding, batch_size=batch_size, embed_workers=embed_workers)
+    corpus_files = exclude_failed_files(corpus_files, {}, failed_files)
     
-    # Not: Yeni versiyonlarda persist() metodu olmayabilir
-    # vectorstore.persist() metodu yerine direkt olarak diske kaydedilir
+    if not total_docs:
+        print("HATA: Vektör veritabanı oluşturulamadı çünkü doküman bulunamadı.")
+        return None
+    
+    # Sonraki artımlı güncellemeler için korpus manifestini, hızlı açılış için indeks manifestini kaydet
+    chunk_params = {
+        "chunk_size": chunk_size,
+        "chunk_overlap": chunk_overlap,
+        "dynamic_chunking": dynamic_chunking,
+    }
+    save_corpus_manifest(corpus_files, chunk_params)
+    save_index_manifest(vectorstore, collection_name, embedding, chunk_params, corpus_files)
+    rebuild_search_indexes(vectorstore, collection_name, corpus_files)
     
     end_time = time.time()
     print(f"Vektör veritabanı oluşturuldu. İşlem süresi: {end_time - start_time:.2f} saniye")
@@ -853,23 +808,131 @@ def create_vectorstore(collection_name="turkce_transkript", force_recreate=False
     
     return vectorstore
 
-def load_vectorstore(collection_name="turkce_transkript"):
+def update_vectorstore(collection_name="turkce_transkript", chunk_size=800, chunk_overlap=180, dynamic_chunking=True,
+                       parallelize=True, executor_type="process", batch_size=EMBED_BATCH_SIZE, embed_workers=EMBED_WORKERS,
+                       embedding=None):
+    """
+    Vektör veritabanını artımlı olarak günceller.
+    Korpus manifestine göre yalnızca yeni veya değişen dosyalar yeniden işlenir,
+    silinen dosyaların parçaları veritabanından kaldırılır.
+    Args:
+        collection_name: Koleksiyonun adı
+        chunk_size: Metin parçalarının boyutu (varsayılan: 800)
+        chunk_overlap: Parçalar arası örtüşme (varsayılan: 180)
+        dynamic_chunking: Dinamik chunk boyutu kullanılsın mı
+        parallelize: Dosyalar paralel işlensin mi
+        executor_type: Paralel işleme türü - "process" veya "thread"
+        batch_size: Embedding batch boyutu
+        embed_workers: Eşzamanlı embedding işçisi sayısı
+        embedding: Embedding modeli (varsayılan: çalışma zamanı embedding modeli)
+    """
+    embedding = embedding or get_runtime().embeddings
+    start_time = time.time()
+    chunk_params = {
+        "chunk_size": chunk_size,
+        "chunk_overlap": chunk_overlap,
+        "dynamic_chunking": dynamic_chunking,
+    }
+    build_options = {
+        "parallelize": parallelize,
+        "executor_type": executor_type,
+        "batch_size": batch_size,
+        "embed_workers": embed_workers,
+        "embedding": embedding,
+    }
+    
+    manifest = load_corpus_manifest()
+    if not os.path.exists(PERSIST_DIRECTORY) or manifest is None:
+        print("Korpus manifesti bulunamadı. Tam yeniden oluşturma yapılacak...")
+        return create_vectorstore(collection_name=collection_name, force_recreate=True, **chunk_params, **build_options)
+    
+    if manifest.get("chunk_params") != chunk_params:
+        print("Parçalama ayarları değişmiş. Tam yeniden oluşturma yapılacak...")
+        return create_vectorstore(collection_name=collection_name, force_recreate=True, **chunk_params, **build_options)
+    
+    previous_files = manifest.get("files", {})
+    # Eski manifestlerde dosya numarası yoktur - taramadan önce verilir ki korunsun
+    assign_source_ids(previous_files)
+    current_files = scan_corpus(TRANSCRIPT_DIR, previous_files)
+    added, changed, removed = diff_corpus(previous_files, current_files)
+    print(f"Artımlı güncelleme: {len(added)} yeni, {len(changed)} değişmiş, {len(removed)} silinmiş dosya.")
+    
+    vectorstore = Chroma(
+        persist_directory=PERSIST_DIRECTORY,
+        embedding_function=embedding,
+        collection_name=collection_name,
+        collection_metadata={
+            "hnsw:space": "cosine",           # Benzerlik metriği
+            "hnsw:construction_ef": 100,      # İnşa kalite parametresi
+            "hnsw:search_ef": 50,             # Arama kalite parametresi
+            "hnsw:M": 16                      # Her düğüm başına bağlantı sayısı
+        }
+    )
+    
+    # Eski şemadaki parçalar, saklı vektörleri korunarak kompakt şemaya dönüştürülür
+    migrated = 0
+    if needs_schema_migration(vectorstore):
+        print("Vektör veritabanı eski parça şemasında. Kompakt şemaya dönüştürülüyor...")
+        migrated = migrate_chunk_schema(vectorstore, previous_files)
+    
+    if not (added or changed or removed):
+        print("Vektör veritabanı güncel. Yapılacak işlem yok.")
+        if migrated:
+            save_corpus_manifest(current_files, chunk_params)
+        if migrated or load_index_manifest() is None:
+            save_index_manifest(vectorstore, collection_name, embedding, chunk_params, current_files)
+        if migrated or not os.path.exists(LEXICAL_INDEX_FILE):
+            rebuild_search_indexes(vectorstore, collection_name, current_files)
+        return vectorstore
+    
+    # Değişen ve silinen dosyaların eski parçalarını kaldır
+    for filename in changed + removed:
+        vectorstore._collection.delete(where={"src": previous_files[filename]["source_id"]})
+    
+    # Yeni ve değişen dosyaları işle
+    files_to_index = added + changed
+    total_docs = 0
+    failed_files = []
+    if files_to_index:
+        chunks = iter_transcript_chunks(chunk_size=chunk_size, chunk_overlap=chunk_overlap,
+                                        dynamic_chunking=dynamic_chunking, files=files_to_index,
+                                        parallelize=parallelize, executor_type=executor_type,
+                                        source_ids={f: current_files[f]["source_id"] for f in files_to_index},
+                                        failed_files=failed_files)
+        total_docs = index_documents(vectorstore, chunks, embedding=embedding, batch_size=batch_size, embed_workers=embed_workers)
+    
+    # İşlenemeyen dosyalar yeni özetleriyle kaydedilirse bir sonraki güncellemede atlanır
+    current_files = exclude_failed_files(current_files, previous_files, failed_files)
+    save_corpus_manifest(current_files, chunk_params)
+    save_index_manifest(vectorstore, collection_name, embedding, chunk_params, current_files)
+    rebuild_search_indexes(vectorstore, collection_name, current_files)
+    
+    end_time = time.time()
+    print(f"Artımlı güncelleme tamamlandı. İşlem süresi: {end_time - start_time:.2f} saniye")
+    print(f"{total_docs} doküman parçası eklendi/güncellendi, {len(removed)} dosyanın parçaları silindi.")
+    
+    return vectorstore
+
+def load_vectorstore(collection_name="turkce_transkript", embedding=None):
     """
     Var olan vektör veritabanını yükler
     Args:
         collection_name: Koleksiyonun adı
+        embedding: Embedding modeli (varsayılan: çalışma zamanı embedding modeli)
     """
+    embedding = embedding or get_runtime().embeddings
+    
     # Vektör veritabanı var mı kontrol et
-    if not os.path.exists("chrome_langchain_db"):
+    if not os.path.exists(PERSIST_DIRECTORY):
         print("UYARI: Vektör veritabanı bulunamadı. Yeni veritabanı oluşturuluyor...")
-        return create_vectorstore(collection_name=collection_name)
+        return create_vectorstore(collection_name=collection_name, embedding=embedding)
     
     # Var olan vektör veritabanını yükle
     print("Var olan vektör veritabanı yükleniyor...")
     try:
         vectorstore = Chroma(
-            persist_directory="chrome_langchain_db",
-            embedding_function=embeddings,
+            persist_directory=PERSIST_DIRECTORY,
+            embedding_function=embedding,
             collection_name=collection_name,
             collection_metadata={
                 "hnsw:space": "cosine",           # Benzerlik metriği
@@ -879,23 +942,33 @@ def load_vectorstore(collection_name="turkce_transkript"):
             }
         )
         
-        # Veritabanı boyutunu kontrol et
-        collection_count = vectorstore._collection.count()
+        # Meta veriyi indeks manifestinden O(1) oku - doküman tablosuna dokunma
+        manifest = load_index_manifest()
+        if manifest is not None and manifest.get("collection_name") == collection_name:
+            collection_count = manifest.get("doc_count", 0)
+        else:
+            # Eski veritabanı: manifest yok, yalnızca sayım yap
+            manifest = None
+            collection_count = vectorstore._collection.count()
+        
         if collection_count == 0:
             print("UYARI: Vektör veritabanı boş. Yeni vektör veritabanı oluşturuluyor...")
-            return create_vectorstore(collection_name=collection_name)
+            return create_vectorstore(collection_name=collection_name, embedding=embedding)
             
         print(f"Vektör veritabanı başarıyla yüklendi. {collection_count} doküman parçası mevcut.")
         
         # Veritabanı metadata'sını görüntüle
-        try:
-            metadata = vectorstore._collection.get()
-            if "collection_metadata" in metadata and metadata["collection_metadata"]:
-                version = metadata["collection_metadata"].get("chroma_db:version", "Bilinmiyor")
-                created_at = metadata["collection_metadata"].get("created_at", "Bilinmiyor")
-                print(f"Veritabanı Sürümü: {version}, Oluşturma Tarihi: {created_at}")
-        except:
-            pass
+        if manifest is not None:
+            print(f"Veritabanı Sürümü: {manifest.get('db_version', 'Bilinmiyor')}, "
+                  f"Oluşturma Tarihi: {manifest.get('created_at', 'Bilinmiyor')}")
+            embedding_model = get_embedding_model_name(embedding)
+            if manifest.get("embedding_model") not in (None, embedding_model):
+                print(f"UYARI: Veritabanı '{manifest['embedding_model']}' modeliyle oluşturulmuş, "
+                      f"şu an '{embedding_model}' kullanılıyor. Yeniden oluşturmak için: python vector.py --force")
+        else:
+            collection_metadata = vectorstore._collection.metadata or {}
+            print(f"Veritabanı Sürümü: {collection_metadata.get('chroma_db:version', 'Bilinmiyor')}, "
+                  f"Oluşturma Tarihi: {collection_metadata.get('created_at', 'Bilinmiyor')}")
             
         return vectorstore
         
@@ -904,9 +977,42 @@ def load_vectorstore(collection_name="turkce_transkript"):
         print("Vektör veritabanı yeniden oluşturuluyor...")
         # Veritabanını temizle ve yeniden oluştur
         import shutil
-        if os.path.exists("chrome_langchain_db"):
-            shutil.rmtree("chrome_langchain_db")
-        return create_vectorstore(collection_name=collection_name)
+        if os.path.exists(PERSIST_DIRECTORY):
+            shutil.rmtree(PERSIST_DIRECTORY)
+        return create_vectorstore(collection_name=collection_name, embedding=embedding)
+
+# Doğrudan çağrılabilir sorgulama fonksiyonu
+def search_by_keywords(keywords, limit=5):
+    """
+    Anahtar kelimelere göre vektör veritabanında arama yapar.
+    Args:
+        keywords: Aranacak anahtar kelimeler listesi veya string
+        limit: Döndürülecek maksimum sonuç sayısı
+    Returns:
+        Metin parçalarının listesi
+    """
+    if isinstance(keywords, str):
+        keywords = keywords.split()
+        
+    # Anahtar kelimeleri birleştir
+    query = " ".join(keywords)
+    
+    # Vektör veritabanında ara
+    results = get_runtime().retriever.invoke(query)
+    
+    # Sonuçları limit ile sınırla
+    return results[:limit]
+
+# Geriye uyumluluk: `from vector import retriever, vectorstore, embeddings` gibi
+# eski kullanımlar, bileşenleri ilk erişimde çalışma zamanından oluşturur
+def __getattr__(name):
+    if name in ("embeddings", "vectorstore", "retriever"):
+        return getattr(get_runtime(), name)
+    if name == "stemmer":
+        return get_stemmer()
+    if name == "STEMMER_AVAILABLE":
+        return stemmer_available()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Bu dosya doğrudan çalıştırıldığında vektör veritabanı oluştur
 if __name__ == "__main__":
@@ -915,12 +1021,27 @@ if __name__ == "__main__":
     # Komut satırı argümanlarını ayarla
     parser = argparse.ArgumentParser(description="Türkçe Transkript Vektör Veritabanı Oluşturma Aracı")
     parser.add_argument("--force", action="store_true", help="Mevcut veritabanını silip yeniden oluştur")
+    parser.add_argument("--incremental", action="store_true", help="Yalnızca yeni/değişen/silinen dosyaları güncelle")
     parser.add_argument("--collection", type=str, default="turkce_transkript", help="Koleksiyon adı")
     parser.add_argument("--chunk-size", type=int, default=350, help="Metin parça boyutu")
     parser.add_argument("--chunk-overlap", type=int, default=40, help="Metin parça örtüşmesi")
     parser.add_argument("--model", type=str, default="nomic-embed-text", help="Kullanılacak embedding modeli")
     parser.add_argument("--sequential", action="store_true", help="Paralel işleme yerine sıralı işleme kullan")
+    parser.add_argument("--executor", choices=["process", "thread"], default="process",
+                        help="Paralel işleme türü: süreç havuzu (varsayılan) veya thread havuzu")
+    parser.add_argument("--batch-size", type=int, default=EMBED_BATCH_SIZE, help="Embedding batch boyutu")
+    parser.add_argument("--embed-workers", type=int, default=EMBED_WORKERS, help="Eşzamanlı embedding işçisi sayısı")
     parser.add_argument("--dynamic", action="store_true", help="Dinamik chunk boyutu kullanılsın mı")
+    parser.add_argument("--backend", choices=["chroma", "numpy"], default=None,
+                        help="Vektör arama arka ucu (varsayılan: INSPAREAI_VECTOR_BACKEND veya chroma); "
+                             "numpy seçilirse NumPy indeksi de oluşturulur")
+    parser.add_argument("--pca-dimensions", type=int, default=None,
+                        help="NumPy indeksinde vektörleri PCA ile bu boyuta indir (0: kapalı, "
+                             "varsayılan: INSPAREAI_PCA_DIMENSIONS)")
+    parser.add_argument("--migrate-schema", action="store_true",
+                        help="Var olan veritabanını kompakt parça şemasına dönüştür (vektörler korunur)")
+    parser.add_argument("--reembed", action="store_true",
+                        help="Şema dönüştürülürken parçaları yeniden vektörleştir")
     
     args = parser.parse_args()
     
@@ -934,66 +1055,51 @@ if __name__ == "__main__":
     print(f"Kullanılan ayarlar:")
     print(f"- Koleksiyon adı: {args.collection}")
     print(f"- Zorla yeniden oluştur: {args.force}")
+    print(f"- Artımlı güncelleme: {args.incremental}")
     print(f"- Metin parça boyutu: {args.chunk_size}")
     print(f"- Metin parça örtüşmesi: {args.chunk_overlap}")
     print(f"- Embedding modeli: {args.model}")
-    print(f"- Paralel işleme: {not args.sequential}")
+    print(f"- Paralel işleme: {not args.sequential} ({args.executor})")
+    print(f"- Embedding: {args.embed_workers} işçi, batch boyutu {args.batch_size}")
     print(f"- Dinamik chunking: {args.dynamic}")
+    print(f"- Vektör arka ucu: {args.backend or get_runtime().vector_backend}")
+    print(f"- PCA boyutu: {args.pca_dimensions if args.pca_dimensions is not None else get_runtime().pca_dimensions}")
     print("=" * 60)
     
-    # Embedding modelini oluştur (eğer farklı model seçildiyse)
-    if args.model != "nomic-embed-text":
-        # embeddings değişkeni daha önce tanımlandığı için global kullanmıyoruz
-        embeddings = create_embeddings(args.model)
-    
-    # Vektör veritabanını oluştur
-    create_vectorstore(
-        collection_name=args.collection,
-        force_recreate=args.force,
-        chunk_size=args.chunk_size,
-        chunk_overlap=args.chunk_overlap,
-        dynamic_chunking=args.dynamic
-    )
+    # Embedding modelini seç - model ilk kullanımda oluşturulur
+    get_runtime().configure(embedding_model=args.model, collection_name=args.collection, vector_backend=args.backend,
+                            pca_dimensions=args.pca_dimensions)
+    ensure_nltk_resources()
+    
+    # Vektör veritabanını dönüştür, oluştur veya artımlı olarak güncelle
+    if args.migrate_schema:
+        migrate_vectorstore(collection_name=args.collection, reembed=args.reembed)
+    elif args.incremental and not args.force:
+        update_vectorstore(
+            collection_name=args.collection,
+            chunk_size=args.chunk_size,
+            chunk_overlap=args.chunk_overlap,
+            dynamic_chunking=args.dynamic,
+            parallelize=not args.sequential,
+            executor_type=args.executor,
+            batch_size=args.batch_size,
+            embed_workers=args.embed_workers
+        )
+    else:
+        create_vectorstore(
+            collection_name=args.collection,
+            force_recreate=args.force,
+            chunk_size=args.chunk_size,
+            chunk_overlap=args.chunk_overlap,
+            dynamic_chunking=args.dynamic,
+            parallelize=not args.sequential,
+            executor_type=args.executor,
+            batch_size=args.batch_size,
+            embed_workers=args.embed_workers
+        )
     
     print("\n" + "=" * 60)
     print("Vektör veritabanı başarıyla oluşturuldu!")
     print("Artık main.py'yi çalıştırarak hızlı sorgu yapabilirsiniz.")
     print("Not: Yeni dosyalar eklerseniz, bu dosyayı tekrar çalıştırarak vektör veritabanını güncelleyin.")
     print("=" * 60)
-# Import edildiğinde hazır bir retriever objesi sağlar
-else:
-    # Vektör veritabanını yükle
-    vectorstore = load_vectorstore()
-    
-    # Retriever'ı oluştur - Optimize edilmiş parametreler
-    retriever = vectorstore.as_retriever(
-        search_type="mmr",        # Maximum Marginal Relevance - hem alakalı hem de çeşitli sonuçlar
-        search_kwargs={
-            "k": 8,                # Transkriptlerden 8 en alakalı sonuç
-            "fetch_k": 30,         # Daha az aday (daha hızlı işleme)
-            "lambda_mult": 0.7,    # Çeşitlilik için lambda değeri düşürüldü
-            "filter": None         # Gerektiğinde filtre eklemek için hazır
-        }
-    )
-    
-    # Doğrudan çağrılabilir sorgulama fonksiyonu
-    def search_by_keywords(keywords, limit=5):
-        """
-        Anahtar kelimelere göre vektör veritabanında arama yapar.
-        Args:
-            keywords: Aranacak anahtar kelimeler listesi veya string
-            limit: Döndürülecek maksimum sonuç sayısı
-        Returns:
-            Metin parçalarının listesi
-        """
-        if isinstance(keywords, str):
-            keywords = keywords.split()
-            
-        # Anahtar kelimeleri birleştir
-        query = " ".join(keywords)
-        
-        # Vektör veritabanında ara
-        results = retriever.invoke(query)
-        
-        # Sonuçları limit ile sınırla
-        return results[:limit]
\ No newline at end of file